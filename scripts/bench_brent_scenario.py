@@ -0,0 +1,105 @@
+"""
+Benchmark: Brent scenario slider requests with and without the per-data-day artifact.
+
+The "mined per request" path is the history-derived work a slider request
+did whenever a worker's hourly cache had expired: mine GERI episodes,
+fit the sensitivity regression and score analogs. "artifact build" is
+that work done once per data day (plus the analog grid and .npz
+encoding); "artifact load" is what the other workers pay instead. The
+request rows time what every slider move now costs: compute_scenario()
+plus an analog lookup, on the grid (whole-point GERI changes) and off it.
+
+Usage:
+    python scripts/bench_brent_scenario.py                # synthetic, 5 years of daily data
+    python scripts/bench_brent_scenario.py --years 10 --requests 20000
+    python scripts/bench_brent_scenario.py --db           # real GERI/Brent/VIX history (read-only)
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from src.market.brent_scenario import (
+    DEMAND,
+    SUPPLY_SHOCKS,
+    ScenarioArtifact,
+    compute_scenario,
+    historical_sensitivity,
+    load_history,
+    mine_episodes,
+    score_analogs,
+)
+
+
+def synthetic_history(years):
+    rng = random.Random(7)
+    geri, brent, rows = 40, 80.0, []
+    for i in range(int(years * 365)):
+        geri = max(1, min(100, geri + rng.choice([-9, -4, -2, -1, 0, 0, 1, 2, 3, 8, 15])))
+        brent *= 1 + rng.gauss(0, 0.015)
+        rows.append({'date': date(2020, 1, 1) + timedelta(days=i), 'geri': geri,
+                     'brent': None if rng.random() < 0.25 else brent, 'vix': 15 + rng.random() * 10})
+    return rows
+
+
+def per_request(label, fn, n, baseline=None):
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    us = (time.perf_counter() - t0) / n * 1e6
+    speedup = f"   {baseline / us:8.0f}x" if baseline else ''
+    print(f"  {label:<30} {us:10.1f} us/request{speedup}")
+    return us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--years', type=float, default=5, help="years of synthetic daily history")
+    parser.add_argument('--requests', type=int, default=10000, help="slider requests to time")
+    parser.add_argument('--db', action='store_true', help="use the real series store instead of synthetic data")
+    args = parser.parse_args()
+
+    rows = load_history() if args.db else synthetic_history(args.years)
+    rng = random.Random(1)
+    sliders = [(rng.uniform(60, 100), rng.randrange(-50, 101, 5), rng.randrange(-50, 101, 5),
+                rng.randrange(-50, 101, 5), rng.choice(list(SUPPLY_SHOCKS)), rng.choice(list(DEMAND)))
+               for _ in range(args.requests)]
+    off_grid = [s[1] + rng.random() for s in sliders]
+
+    t0 = time.perf_counter()
+    artifact = ScenarioArtifact.build(rows[-1]['date'] if rows else None, rows)
+    build_ms = (time.perf_counter() - t0) * 1000
+    body = artifact.to_bytes()
+    t0 = time.perf_counter()
+    ScenarioArtifact.from_bytes(body)
+    load_ms = (time.perf_counter() - t0) * 1000
+    print(f"{len(rows):,} history days, {len(artifact.episodes)} episodes, artifact {len(body):,} bytes")
+    print(f"  {'artifact build':<30} {build_ms:10.1f} ms")
+    print(f"  {'artifact load':<30} {load_ms:10.1f} ms")
+
+    def mined(i):
+        brent, geri, vix, gas, supply, demand = sliders[i]
+        compute_scenario(brent, geri, vix, gas, supply, demand)
+        episodes = mine_episodes(rows)
+        historical_sensitivity(rows)
+        score_analogs(episodes, geri + SUPPLY_SHOCKS[supply] * 2)
+
+    def on_grid(i):
+        brent, geri, vix, gas, supply, demand = sliders[i]
+        compute_scenario(brent, geri, vix, gas, supply, demand)
+        artifact.analogs(geri + SUPPLY_SHOCKS[supply] * 2)
+
+    def exact(i):
+        brent, _, vix, gas, supply, demand = sliders[i]
+        compute_scenario(brent, off_grid[i], vix, gas, supply, demand)
+        artifact.analogs(off_grid[i] + SUPPLY_SHOCKS[supply] * 2)
+
+    baseline = per_request('mined per request', mined, max(args.requests // 100, 10))
+    per_request('artifact, on grid', on_grid, args.requests, baseline)
+    per_request('artifact, off grid (exact)', exact, args.requests, baseline)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Benchmark: Parquet / Arrow IPC bulk payloads vs the JSON and CSV history endpoints.
+
+Builds one dataset's rows (synthetic daily history, or --db to read the real
+table), then reports payload size, server-side encode time and client-side
+decode time for:
+
+  json     the dict-per-row body of /geri/history-table (no gzip; the app has none)
+  csv      the /history-table/download/csv body
+  parquet  /api/bulk/{dataset}?fmt=parquet
+  arrow    /api/bulk/{dataset}?fmt=arrow
+
+Usage:
+    python scripts/bench_bulk_data.py                    # geri + oil, 20 years of synthetic days
+    python scripts/bench_bulk_data.py --days 3650 --datasets geri,gas_storage
+    python scripts/bench_bulk_data.py --db               # real tables (read-only)
+"""
+import argparse
+import csv
+import io
+import json
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.api import columnar
+
+BANDS = ['LOW', 'MODERATE', 'ELEVATED', 'SEVERE', 'CRITICAL']
+
+
+def synthetic_rows(dataset, days):
+    rng = random.Random(7)
+    start = date.today() - timedelta(days=days)
+    level = {c.name: rng.uniform(20, 90) for c in dataset.columns if c.type in ('float', 'int')}
+    lead = next(iter(level))
+    rows = []
+    for i in range(days):
+        day = start + timedelta(days=i)
+        row = {}
+        for c in dataset.columns:
+            if c.type == 'date':
+                row[c.name] = day
+            elif c.type == 'timestamp':
+                row[c.name] = datetime(day.year, day.month, day.day, 6, rng.randrange(60))
+            elif c.type == 'float':
+                level[c.name] += rng.gauss(0, 1)
+                row[c.name] = round(level[c.name], 2)
+            elif c.type == 'int':
+                row[c.name] = int(level[c.name])
+            else:
+                band = BANDS[min(len(BANDS) - 1, max(0, int(level[lead]) // 20))]
+                row[c.name] = band if 'band' in c.name else 'yahoo_finance'
+        rows.append(row)
+    return rows
+
+
+def db_rows(dataset):
+    from src.db.db import execute_production_query
+    return execute_production_query(*columnar.select_query(dataset, dataset.columns))
+
+
+def _json_body(rows):
+    data = [{k: (v.isoformat() if isinstance(v, (date, datetime)) else v) for k, v in r.items()} for r in rows]
+    return json.dumps({'success': True, 'count': len(data), 'data': data}).encode()
+
+
+def _csv_body(rows, names):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(names)
+    for r in rows:
+        writer.writerow([r[n] for n in names])
+    return buf.getvalue().encode()
+
+
+def _timed(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return out, best
+
+
+def bench(dataset, rows):
+    names = dataset.column_names
+    cases = {
+        'json': (lambda: _json_body(rows), lambda b: json.loads(b)['data']),
+        'csv': (lambda: _csv_body(rows, names), lambda b: list(csv.reader(io.StringIO(b.decode())))),
+        'parquet': (lambda: columnar.encode(columnar.to_table(dataset.columns, rows), 'parquet'),
+                    lambda b: pq.read_table(io.BytesIO(b))),
+        'arrow': (lambda: columnar.encode(columnar.to_table(dataset.columns, rows), 'arrow'),
+                  lambda b: pa.ipc.open_file(b).read_all()),
+    }
+    json_size = None
+    print(f"{dataset.name}: {len(rows):,} rows x {len(names)} columns")
+    for label, (encode, decode) in cases.items():
+        body, encode_s = _timed(encode)
+        _, decode_s = _timed(lambda: decode(body))
+        json_size = json_size or len(body)
+        print(f"  {label:<8} {len(body) / 1024:9.1f} KiB  ({json_size / len(body):5.1f}x vs json)"
+              f"   encode {encode_s * 1000:7.2f} ms   decode {decode_s * 1000:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--days', type=int, default=7300, help="synthetic rows per dataset")
+    parser.add_argument('--datasets', default='geri,oil', help="comma-separated dataset names")
+    parser.add_argument('--db', action='store_true', help="read the real tables instead of synthetic rows")
+    args = parser.parse_args()
+    for name in args.datasets.split(','):
+        dataset = columnar.DATASETS[name.strip()]
+        bench(dataset, db_rows(dataset) if args.db else synthetic_rows(dataset, args.days))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Benchmark: API cold start with eager vs lazy router loading.
+
+Each run starts a fresh interpreter that imports src.api.app and then
+sends one request straight into the ASGI app (no server, no startup
+events, so no DB migrations are involved). Reported per mode, as the
+median over --runs:
+
+    process   interpreter start + app import (what a cold instance waits
+              for before it can accept the first connection)
+    import    `import src.api.app` alone
+    first     latency of the first request to --path, including the lazy
+              import of the module that serves it
+    ready     import + first
+
+The default path is served by src/api/seo_routes.py, the largest route
+module. A path that queries the database needs DATABASE_URL to return
+200; the timing still includes the lazy import either way.
+
+Usage:
+    python scripts/bench_cold_start.py
+    python scripts/bench_cold_start.py --runs 10 --path /api/v1/indices/geri/latest
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import asyncio, json, sys, time
+started = time.perf_counter()
+from src.api.app import app
+imported = time.perf_counter()
+
+async def first_request(path):
+    status = {}
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status['code'] = message['status']
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'root_path': '', 'query_string': b'', 'headers': [(b'host', b'localhost')],
+        'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+    }
+    await app(scope, receive, send)
+    return status.get('code')
+
+code = asyncio.run(first_request(sys.argv[1]))
+done = time.perf_counter()
+print(json.dumps({'import': imported - started, 'first': done - imported, 'status': code}))
+"""
+
+
+def _run_once(path: str, lazy: bool) -> Dict[str, float]:
+    env = {**os.environ, 'LAZY_ROUTERS': 'true' if lazy else 'false', 'LAZY_ROUTERS_WARMUP_SECONDS': '-1'}
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', CHILD, path], cwd=ROOT_DIR, env=env,
+                            capture_output=True, text=True, timeout=300)
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'child failed')
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings['process'] = wall - timings['first']
+    timings['ready'] = timings['import'] + timings['first']
+    return timings
+
+
+def bench(path: str, runs: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for mode, lazy in (('eager', False), ('lazy', True)):
+        samples: List[Dict[str, float]] = [_run_once(path, lazy) for _ in range(runs)]
+        results[mode] = {key: statistics.median(s[key] for s in samples)
+                         for key in ('process', 'import', 'first', 'ready')}
+        results[mode]['status'] = samples[-1]['status']
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cold-start latency, eager vs lazy routers")
+    parser.add_argument('--path', default='/indices/global-energy-risk-index')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.runs} runs per mode, first request GET {args.path}\n")
+    results = bench(args.path, args.runs)
+
+    print(f"{'mode':6s} {'process':>9s} {'import':>9s} {'first':>9s} {'ready':>9s}  status")
+    for mode, r in results.items():
+        print(f"{mode:6s} {r['process'] * 1000:7.0f}ms {r['import'] * 1000:7.0f}ms "
+              f"{r['first'] * 1000:7.0f}ms {r['ready'] * 1000:7.0f}ms  {r['status']}")
+
+    eager, lazy = results['eager'], results['lazy']
+    if eager['process']:
+        print(f"\nlazy routers: process start {(1 - lazy['process'] / eager['process']) * 100:.0f}% faster, "
+              f"ready for {args.path} {(1 - lazy['ready'] / eager['ready']) * 100:.0f}% faster")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
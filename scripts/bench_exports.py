@@ -0,0 +1,120 @@
+"""
+Benchmark: streaming CSV/XLSX exports vs fetchall() + in-memory file.
+
+The "buffered" path is what the download endpoints did before
+src/api/exports.py: materialise every row, write the whole file into
+io.StringIO / a regular openpyxl Workbook + BytesIO, then send it. The
+"streaming" path runs csv_stream / xlsx_stream over a row generator the way
+the endpoints now consume src.db.db.stream_query. Reports time to first
+chunk and total time from an untraced run, then peak memory from a second
+run under tracemalloc.
+
+Usage:
+    python scripts/bench_exports.py                        # 1M CSV rows, 200k XLSX rows (synthetic)
+    python scripts/bench_exports.py --rows 1000000 --xlsx-rows 1000000
+    python scripts/bench_exports.py --no-memory            # timings only
+    python scripts/bench_exports.py --db                   # user_activity_events via a server-side cursor
+
+A 1M-row buffered Workbook needs several GB; keep --xlsx-rows lower on
+small machines. --db only reads.
+"""
+import argparse
+import csv
+import io
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from src.api.exports import csv_stream, xlsx_stream
+
+HEADERS = ["created_at", "user_id", "email", "event_type", "page_path",
+           "section", "duration_ms", "device", "browser", "referrer"]
+BASE = datetime(2026, 1, 1)
+
+
+def synthetic_rows(n):
+    for i in range(n):
+        yield [
+            (BASE + timedelta(seconds=i)).isoformat(), i % 5000, f"user{i % 5000}@example.com",
+            "page_view", f"/indices/geri/{i % 365}", "hero", i % 90000, "desktop", "Chrome",
+            "https://www.google.com/",
+        ]
+
+
+def db_rows(n):
+    from src.db.db import stream_query
+    for r in stream_query("SELECT * FROM user_activity_events ORDER BY id DESC LIMIT %s", (n,)):
+        yield [r.get(h) for h in HEADERS]
+
+
+def buffered_csv(rows):
+    rows = list(rows)
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(HEADERS)
+    for r in rows:
+        writer.writerow(r)
+    yield buf.getvalue()
+
+
+def buffered_xlsx(rows):
+    from openpyxl import Workbook
+    rows = list(rows)
+    wb = Workbook()
+    ws = wb.active
+    ws.append(HEADERS)
+    for r in rows:
+        ws.append(r)
+    buf = io.BytesIO()
+    wb.save(buf)
+    yield buf.getvalue()
+
+
+def _drain(chunks):
+    t0 = time.perf_counter()
+    first = None
+    size = 0
+    for chunk in chunks:
+        if first is None:
+            first = time.perf_counter() - t0
+        size += len(chunk)
+    return first, time.perf_counter() - t0, size
+
+
+def measure(label, make_chunks, memory):
+    """Time one untraced run; with memory=True repeat it under tracemalloc for the peak."""
+    first, total, size = _drain(make_chunks())
+    peak = ''
+    if memory:
+        tracemalloc.start()
+        _drain(make_chunks())
+        peak = f"   peak {tracemalloc.get_traced_memory()[1] / 1024 / 1024:8.1f} MiB"
+        tracemalloc.stop()
+    print(f"  {label:<10} first chunk {first:7.2f}s   total {total:7.2f}s   "
+          f"{size / 1024 / 1024:.1f} MiB out{peak}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help="CSV rows")
+    parser.add_argument('--xlsx-rows', type=int, default=200_000, help="XLSX rows (0 skips XLSX)")
+    parser.add_argument('--db', action='store_true', help="read user_activity_events instead of synthetic rows")
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help="skip the (slow) tracemalloc pass that reports peak memory")
+    args = parser.parse_args()
+    source = db_rows if args.db else synthetic_rows
+
+    print(f"CSV, {args.rows:,} rows ({'database' if args.db else 'synthetic'})")
+    measure('buffered', lambda: buffered_csv(source(args.rows)), args.memory)
+    measure('streaming', lambda: csv_stream(HEADERS, source(args.rows)), args.memory)
+
+    if args.xlsx_rows:
+        print(f"XLSX, {args.xlsx_rows:,} rows")
+        measure('buffered', lambda: buffered_xlsx(source(args.xlsx_rows)), args.memory)
+        measure('streaming', lambda: xlsx_stream('Export', HEADERS, source(args.xlsx_rows)), args.memory)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
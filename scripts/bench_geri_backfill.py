@@ -0,0 +1,81 @@
+"""
+Benchmark: per-day GERI backfill vs the single-pass bulk engine.
+
+Runs both paths over the same range with force=True, checks that every
+day's value, band, trends and components match, and prints wall time for
+each. LLM interpretation is disabled for the run (fallback text) so the
+numbers measure the data path rather than OpenAI latency.
+
+Usage:
+    python scripts/bench_geri_backfill.py START_DATE END_DATE
+
+Both runs WRITE to intel_indices_daily in whatever database src/db/db.py
+resolves (PRODUCTION_DATABASE_URL first, then DATABASE_URL). Run against a
+dev DB with `env -u PRODUCTION_DATABASE_URL ...`.
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+os.environ.pop("AI_INTEGRATIONS_OPENAI_API_KEY", None)
+os.environ.pop("AI_INTEGRATIONS_OPENAI_BASE_URL", None)
+os.environ["ENABLE_GERI"] = "true"
+
+from src.geri.service import backfill
+from src.geri.repo import get_index_history
+
+
+def _snapshot(start, end):
+    rows = get_index_history(start, end)
+    return {
+        row['date']: (row['value'], row['band'], row['trend_1d'], row['trend_7d'], row['components'])
+        for row in rows
+    }
+
+
+def _strip_interpretation(snapshot):
+    cleaned = {}
+    for day, (value, band, t1, t7, components) in snapshot.items():
+        components = dict(components) if isinstance(components, dict) else components
+        if isinstance(components, dict):
+            components.pop('interpretation', None)
+        cleaned[day] = (value, band, t1, t7, components)
+    return cleaned
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python scripts/bench_geri_backfill.py START_DATE END_DATE")
+        sys.exit(1)
+    start = datetime.strptime(sys.argv[1], "%Y-%m-%d").date()
+    end = datetime.strptime(sys.argv[2], "%Y-%m-%d").date()
+    days = (end - start).days + 1
+
+    print(f"GERI backfill benchmark {start} -> {end} ({days} days)")
+
+    t0 = time.perf_counter()
+    per_day_summary = backfill(start, end, force=True, bulk=False)
+    per_day_secs = time.perf_counter() - t0
+    per_day_rows = _strip_interpretation(_snapshot(start, end))
+
+    t0 = time.perf_counter()
+    bulk_summary = backfill(start, end, force=True, bulk=True)
+    bulk_secs = time.perf_counter() - t0
+    bulk_rows = _strip_interpretation(_snapshot(start, end))
+
+    mismatches = [d for d in per_day_rows if per_day_rows[d] != bulk_rows.get(d)]
+
+    print("\n=== RESULTS ===")
+    print(f"per-day: {per_day_secs:8.2f}s  computed={per_day_summary['computed']} failed={per_day_summary['failed']}")
+    print(f"bulk:    {bulk_secs:8.2f}s  computed={bulk_summary['computed']} failed={bulk_summary['failed']}")
+    if bulk_secs > 0:
+        print(f"speedup: {per_day_secs / bulk_secs:.1f}x")
+    print(f"identical rows: {len(per_day_rows) - len(mismatches)}/{len(per_day_rows)}")
+    if mismatches:
+        print(f"MISMATCH on: {', '.join(d.isoformat() for d in mismatches[:10])}")
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Benchmark: hot region lookups before and after run_query_index_migration().
+
+Creates a scratch schema in the database at DATABASE_URL (meant to be a
+local Postgres), seeds risk_indices, asset_risk and alert_state with the
+baseline DDL and indexes from src/db/migrations.py, and routes every
+connection into that schema with PGOPTIONS, so the real tables are never
+touched. The statements are captured from the real helpers with
+src/db/query_audit.py and each one is timed --repeat times:
+
+    1. baseline indexes only
+    2. after run_query_index_migration()
+
+Reported per statement: median and p95 latency before/after and the plan
+each time. The schema is dropped afterwards unless --keep is given.
+
+Usage:
+    DATABASE_URL=postgresql://localhost/energyriskiq python scripts/bench_query_indexes.py
+    python scripts/bench_query_indexes.py --days 730 --runs-per-day 24 --repeat 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+SCHEMA = 'bench_query_indexes'
+SEEDED_TABLES = {'risk_indices', 'asset_risk', 'alert_state'}
+
+REGIONS = ['Europe', 'Middle East', 'Black Sea', 'Asia', 'North America', 'Africa',
+           'Latin America', 'North Sea', 'Caspian', 'Mediterranean', 'global', 'europe']
+ASSETS = ['oil', 'gas', 'lng', 'power', 'coal', 'freight', 'fx', 'carbon']
+
+BASELINE_DDL = [
+    """
+    CREATE TABLE risk_indices (
+        id SERIAL PRIMARY KEY,
+        region TEXT NOT NULL,
+        window_days INT NOT NULL,
+        risk_score FLOAT NOT NULL,
+        trend TEXT NOT NULL,
+        calculated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    CREATE TABLE asset_risk (
+        id SERIAL PRIMARY KEY,
+        asset TEXT NOT NULL,
+        region TEXT NOT NULL,
+        window_days INT NOT NULL,
+        risk_score FLOAT NOT NULL,
+        direction TEXT NOT NULL,
+        calculated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    CREATE TABLE alert_state (
+        id SERIAL PRIMARY KEY,
+        region TEXT NOT NULL,
+        window_days INT NOT NULL DEFAULT 7,
+        last_risk_score FLOAT NULL,
+        last_checked_at TIMESTAMP DEFAULT NOW(),
+        last_7d_score FLOAT NULL,
+        last_30d_score FLOAT NULL,
+        last_asset_scores JSONB NULL,
+        updated_at TIMESTAMP DEFAULT NOW(),
+        UNIQUE(region, window_days)
+    )
+    """,
+    "CREATE INDEX idx_risk_indices_region ON risk_indices (region)",
+    "CREATE INDEX idx_risk_indices_window ON risk_indices (window_days)",
+    "CREATE INDEX idx_risk_indices_calculated ON risk_indices (calculated_at DESC)",
+    "CREATE INDEX idx_asset_risk_asset ON asset_risk (asset)",
+    "CREATE INDEX idx_asset_risk_region ON asset_risk (region)",
+    "CREATE INDEX idx_asset_risk_window ON asset_risk (window_days)",
+    "CREATE INDEX idx_asset_risk_calculated ON asset_risk (calculated_at DESC)",
+    "CREATE INDEX idx_alert_state_region ON alert_state (region)",
+]
+
+
+def seed(cursor, days: int, runs_per_day: int) -> Dict[str, int]:
+    """One row per region/window (and asset) per risk engine run."""
+    step = f"{24 * 60 // runs_per_day} minutes"
+    cursor.execute("""
+        INSERT INTO risk_indices (region, window_days, risk_score, trend, calculated_at)
+        SELECT r, w, random() * 100, (ARRAY['rising', 'falling', 'stable'])[1 + floor(random() * 3)::int], t
+        FROM unnest(%s::text[]) r, unnest(ARRAY[7, 30]) w,
+             generate_series(NOW() - make_interval(days => %s), NOW(), %s::interval) t
+    """, (REGIONS, days, step))
+    cursor.execute("""
+        INSERT INTO asset_risk (asset, region, window_days, risk_score, direction, calculated_at)
+        SELECT a, r, w, random() * 100, (ARRAY['up', 'down', 'flat'])[1 + floor(random() * 3)::int], t
+        FROM unnest(%s::text[]) a, unnest(%s::text[]) r, unnest(ARRAY[7, 30]) w,
+             generate_series(NOW() - make_interval(days => %s), NOW(), %s::interval) t
+    """, (ASSETS, REGIONS, days, step))
+    cursor.execute("""
+        INSERT INTO alert_state (region, window_days, last_7d_score, last_30d_score)
+        SELECT r, w, random() * 100, random() * 100
+        FROM unnest(%s::text[]) r, unnest(ARRAY[7, 30]) w
+    """, (REGIONS,))
+    counts = {}
+    for table in sorted(SEEDED_TABLES):
+        cursor.execute(f"ANALYZE {table}")
+        cursor.execute(f"SELECT COUNT(*) AS n FROM {table}")
+        counts[table] = cursor.fetchone()['n']
+    return counts
+
+
+def capture_statements():
+    from src.db.query_audit import WORKLOADS, QueryCapture, is_explainable, run_workloads
+
+    workloads = [w for w in WORKLOADS if set(w.tables) <= SEEDED_TABLES]
+    capture = QueryCapture()
+    with capture:
+        errors = run_workloads(workloads, capture)
+    for name, error in errors.items():
+        if error:
+            print(f"workload {name} failed: {error}")
+    return [q for q in capture.queries.values() if is_explainable(q.sql)]
+
+
+def time_statement(cursor, sql: str, params, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def measure(statements, repeat: int) -> Dict[str, Dict]:
+    from src.db.db import get_cursor
+    from src.db.query_audit import explain, summarize_plan
+
+    results = {}
+    with get_cursor(commit=False) as cursor:
+        for captured in statements:
+            samples = time_statement(cursor, captured.sql, captured.params, repeat)
+            results[captured.sql] = {
+                'median': statistics.median(samples),
+                'p95': sorted(samples)[max(0, int(len(samples) * 0.95) - 1)],
+                'workloads': captured.workloads,
+            }
+    for captured in statements:
+        plan = summarize_plan(explain(captured.sql, captured.params, analyze=False))
+        results[captured.sql]['plan'] = ' -> '.join(plan['nodes'])
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Region lookup latency before/after the query index migration")
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--runs-per-day', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--keep', action='store_true', help=f"keep the {SCHEMA} schema afterwards")
+    args = parser.parse_args()
+
+    os.environ['PGOPTIONS'] = f"{os.environ.get('PGOPTIONS', '')} -c search_path={SCHEMA}".strip()
+
+    from src.db.db import get_cursor
+    from src.db.migrations import run_query_index_migration
+
+    with get_cursor() as cursor:
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+        for ddl in BASELINE_DDL:
+            cursor.execute(ddl)
+        started = time.perf_counter()
+        counts = seed(cursor, args.days, args.runs_per_day)
+    print(f"seeded {', '.join(f'{t}={n}' for t, n in counts.items())} "
+          f"in {time.perf_counter() - started:.1f}s\n")
+
+    try:
+        statements = capture_statements()
+        before = measure(statements, args.repeat)
+        run_query_index_migration()
+        after = measure(statements, args.repeat)
+    finally:
+        if not args.keep:
+            with get_cursor() as cursor:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+
+    print(f"{'before':>9s} {'after':>9s} {'speedup':>8s}  statement (median of {args.repeat}, p95 in brackets)")
+    for sql, b in before.items():
+        a = after[sql]
+        speedup = b['median'] / a['median'] if a['median'] else float('inf')
+        print(f"{b['median']:7.2f}ms {a['median']:7.2f}ms {speedup:7.1f}x  [{', '.join(b['workloads'])}]")
+        print(f"{'':28s}p95 {b['p95']:.2f}ms -> {a['p95']:.2f}ms")
+        print(f"{'':28s}{sql[:110]}")
+        print(f"{'':28s}before: {b['plan']}")
+        print(f"{'':28s}after:  {a['plan']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
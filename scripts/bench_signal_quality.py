@@ -0,0 +1,122 @@
+"""
+Benchmark: precompiled keyword matcher vs per-keyword substring scans.
+
+The "naive" path is what classifier.py and signal_quality.py did before
+src/ingest/keyword_matcher.py: lowercase the text and test `keyword in
+text` for every keyword of every family. The "matcher" path is
+event_matcher().scan(), cold (empty token cache) and warm. The
+"pipeline" rows time classify_event() + compute_signal_quality() per
+event, with one scan each (as separate calls would) and with the scan
+shared, as ingest_runner now does. Every event's found keywords are
+checked against the naive path before timing.
+
+Usage:
+    python scripts/bench_signal_quality.py                       # 5,000 synthetic events
+    python scripts/bench_signal_quality.py --events 20000
+    python scripts/bench_signal_quality.py --corpus events.jsonl # {"title", "raw_text", ...} per line
+    python scripts/bench_signal_quality.py --db --limit 20000    # stored events (read-only)
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+from src.ingest.classifier import classify_event
+from src.ingest.keyword_matcher import event_matcher, scan_event
+from src.ingest.signal_quality import SOURCE_CREDIBILITY, compute_signal_quality
+
+FILLER = ("the a of and to in on for with by from said officials week market prices analysts "
+          "report according statement expected government company year month sources talks").split()
+
+
+def synthetic_events(n):
+    rng = random.Random(11)
+    vocab = sorted({k for family in event_matcher().families.values() for k in family})
+    sources = list(SOURCE_CREDIBILITY) + ['Unknown Blog']
+
+    def text(words):
+        return ' '.join(rng.choice(vocab) if rng.random() < 0.08 else rng.choice(FILLER) for _ in range(words))
+
+    return [{'title': text(rng.randint(8, 16)).capitalize(), 'raw_text': text(rng.randint(40, 220)),
+             'source_name': rng.choice(sources), 'weight': rng.random(), 'category_hint': None,
+             'signal_type': None, 'region_hint': None} for _ in range(n)]
+
+
+def corpus_events(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def db_events(limit):
+    from src.db.db import execute_production_query
+    return execute_production_query("""
+        SELECT title, raw_text, source_name, event_time, category AS category_hint, region AS region_hint
+        FROM events ORDER BY inserted_at DESC LIMIT %s
+    """, (limit,))
+
+
+def naive_scan(families, text):
+    lowered = text.lower()
+    return {name: [k for k in keywords if k in lowered] for name, keywords in families.items()}
+
+
+def check(events, matcher):
+    for e in events:
+        text = f"{e.get('title') or ''} {e.get('raw_text') or ''}"
+        matches = matcher.scan(text)
+        for name, expected in naive_scan(matcher.families, text).items():
+            if matches.found(name) != expected:
+                raise SystemExit(f"mismatch in {name} for {e.get('title')!r}: {matches.found(name)} != {expected}")
+
+
+def pipeline(events, shared):
+    for e in events:
+        kwargs = {'matches': scan_event(e.get('title'), e.get('raw_text'))} if shared else {}
+        category, region, severity, _, confidence = classify_event(
+            e.get('title') or '', e.get('raw_text') or '', e.get('category_hint'), e.get('signal_type'),
+            e.get('region_hint'), **kwargs)
+        compute_signal_quality(e, category, region, severity, confidence, **kwargs)
+
+
+def timed(label, fn, events, baseline=None):
+    t0 = time.perf_counter()
+    fn()
+    per_event = (time.perf_counter() - t0) / len(events) * 1e6
+    speedup = f"   {baseline / per_event:5.1f}x" if baseline else ''
+    print(f"  {label:<26} {per_event:8.1f} us/event{speedup}")
+    return per_event
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--events', type=int, default=5000, help="synthetic events")
+    parser.add_argument('--corpus', help="JSONL file of events (title, raw_text, source_name, ...)")
+    parser.add_argument('--db', action='store_true', help="read stored events instead of synthetic ones")
+    parser.add_argument('--limit', type=int, default=20000, help="events to read with --db")
+    args = parser.parse_args()
+
+    if args.db:
+        events = db_events(args.limit)
+    elif args.corpus:
+        events = corpus_events(args.corpus)
+    else:
+        events = synthetic_events(args.events)
+    matcher = event_matcher()
+    texts = [f"{e.get('title') or ''} {e.get('raw_text') or ''}" for e in events]
+    keywords = sum(len(k) for k in matcher.families.values())
+    print(f"{len(events):,} events, avg {sum(map(len, texts)) / max(len(texts), 1):.0f} chars, "
+          f"{len(matcher.families)} families / {keywords} keywords")
+    check(events, matcher)
+
+    naive = timed('naive keyword scans', lambda: [naive_scan(matcher.families, t) for t in texts], events)
+    matcher._token_cache.clear()
+    timed('matcher (cold cache)', lambda: [matcher.scan(t) for t in texts], events, naive)
+    timed('matcher (warm cache)', lambda: [matcher.scan(t) for t in texts], events, naive)
+    separate = timed('pipeline, scan per call', lambda: pipeline(events, shared=False), events)
+    timed('pipeline, shared scan', lambda: pipeline(events, shared=True), events, separate)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Benchmark: shared NumPy time-series store vs per-request row lists.
+
+The "rows" path is what the callers did before src/market/series_store.py:
+fetch each series as a list of {'date', 'value'} dicts, build a dict per
+series and intersect the keys to align them. The "store" path aligns the
+same series with TimeSeriesStore.align() and runs pct_change/rolling_mean
+on the result.
+
+Usage:
+    python scripts/bench_timeseries_store.py                 # synthetic, 10 years of daily data
+    python scripts/bench_timeseries_store.py --years 3 --repeat 500
+    python scripts/bench_timeseries_store.py --db            # real tables (PRODUCTION_DATABASE_URL first)
+
+Synthetic mode needs no database. --db only reads.
+"""
+import argparse
+import math
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from src.market.series_store import SERIES, TimeSeriesStore, load_table
+
+ALIGNED = ['geri', 'brent', 'ttf', 'vix', 'eurusd']
+
+
+def synthetic_loader(years: int):
+    end = date.today()
+    days = [end - timedelta(days=i) for i in range(years * 365)][::-1]
+    rng = random.Random(42)
+    tables = {}
+    for spec in SERIES:
+        table = tables.setdefault(spec.table, {d: {'date': d} for d in days})
+        level = rng.uniform(20, 100)
+        for d in days:
+            level *= math.exp(rng.gauss(0, 0.01))
+            # markets close at weekends; indices publish daily
+            weekend = d.weekday() >= 5 and spec.table not in ('intel_indices_daily', 'reri_indices_daily', 'egsi_m_daily')
+            table[d][spec.column] = None if weekend else round(level, 2)
+
+    def load(table, date_column, columns, where, since):
+        rows = tables[table].values()
+        return [r for r in rows if since is None or r['date'] >= since]
+
+    return load
+
+
+def rows_path(loader, window_start):
+    """Fetch + dict-align + Python pct_change/rolling mean, as the callers did."""
+    by_name = {}
+    for spec in SERIES:
+        if spec.name in ALIGNED:
+            rows = loader(spec.table, spec.date_column, [spec.column], spec.where, None)
+            by_name[spec.name] = {r['date']: float(r[spec.column]) for r in rows
+                                  if r.get(spec.column) is not None and r['date'] >= window_start}
+    common = sorted(set.intersection(*(set(v) for v in by_name.values())))
+    result = {}
+    for name, values in by_name.items():
+        series = [values[d] for d in common]
+        pct = [(series[i] - series[i - 1]) / series[i - 1] * 100 for i in range(1, len(series))]
+        result[name] = [sum(pct[i - 29:i + 1]) / 30 for i in range(29, len(pct))]
+    return result
+
+
+def store_path(store, window_start):
+    frame = store.align(ALIGNED, start=window_start)
+    return {name: frame[name].pct_change().rolling_mean(30) for name in ALIGNED}
+
+
+def _time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def _rows_memory(loader):
+    tracemalloc.start()
+    kept = [loader(spec.table, spec.date_column, [spec.column], spec.where, None) for spec in SERIES]
+    kept = [[{'date': r['date'], 'value': r.get(spec.column)} for r in rows] for spec, rows in zip(SERIES, kept)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--db', action='store_true', help="use the real tables instead of synthetic data")
+    parser.add_argument('--years', type=int, default=10, help="synthetic history length")
+    parser.add_argument('--window', type=int, default=365, help="days aligned per query")
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    loader = load_table if args.db else synthetic_loader(args.years)
+    window_start = date.today() - timedelta(days=args.window)
+    print(f"Time-series store benchmark ({'database' if args.db else f'synthetic, {args.years} years'}, "
+          f"{len(ALIGNED)} series over {args.window} days)")
+
+    t0 = time.perf_counter()
+    store = TimeSeriesStore(loader=loader, refresh_seconds=float('inf'))
+    store.refresh(force=True)
+    print(f"  cold load (all {len(SERIES)} series): {(time.perf_counter() - t0) * 1000:.1f}ms")
+    stats = store.stats()
+    print(f"  store: {stats['days']} days x {stats['series']} series = {stats['bytes'] / 1024:.1f} KiB")
+    if not args.db:
+        print(f"  same data as row dicts: {_rows_memory(loader) / 1024:.1f} KiB")
+
+    rows_median, rows_max = _time(lambda: rows_path(loader, window_start), max(args.repeat // 20, 3) if args.db else args.repeat)
+    store_median, store_max = _time(lambda: store_path(store, window_start), args.repeat)
+    print(f"  rows  path: median {rows_median:.3f}ms  max {rows_max:.3f}ms"
+          + ("  (includes the queries)" if args.db else ''))
+    print(f"  store path: median {store_median:.3f}ms  max {store_max:.3f}ms")
+    if store_median:
+        print(f"  speedup: {rows_median / store_median:.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
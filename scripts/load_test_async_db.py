@@ -0,0 +1,135 @@
+"""
+Load test: latency of DB-backed async routes under concurrency.
+
+Fires REQUESTS requests per route at a running server with CONCURRENCY
+requests in flight, and prints p50 / p95 / p99 / max latency, throughput and
+error count per route. A slow route mixed in (--slow) shows whether one
+route's queries stall the others: with blocking psycopg2 calls on the event
+loop the fast routes inherit the slow route's tail latency; with
+src/db/async_db.py they stay flat.
+
+Usage:
+    python scripts/load_test_async_db.py http://localhost:5000
+    python scripts/load_test_async_db.py http://localhost:5000 -c 64 -n 500 --slow /research/global-energy-risk-timeline
+    python scripts/load_test_async_db.py http://localhost:5000 --route /api/hero-snapshot --route /geri/2026-01-15
+
+Run against the same build before and after a migration and compare p99.
+Only GET routes without side effects beyond page-view counters are used by
+default. Stdlib only, so it runs from any checkout.
+"""
+import argparse
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+DEFAULT_ROUTES = [
+    '/api/hero-snapshot',
+    '/api/ceri-sparklines',
+    '/indices/global-energy-risk-index',
+    '/indices',
+    '/sitemap.xml',
+]
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _fetch(url: str, timeout: float, token: Optional[str]) -> Optional[float]:
+    headers = {'Accept-Encoding': 'gzip', 'User-Agent': 'energyriskiq-loadtest/1.0'}
+    if token:
+        headers['X-User-Token'] = token
+    request = urllib.request.Request(url, headers=headers)
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            if response.status >= 500:
+                return None
+    except urllib.error.HTTPError as e:
+        if e.code >= 500 or e.code == 429:
+            return None
+    except Exception:
+        return None
+    return time.perf_counter() - started
+
+
+def run(base_url: str, routes: List[str], slow: List[str], concurrency: int,
+        requests_per_route: int, timeout: float, token: Optional[str]) -> Dict[str, dict]:
+    jobs = [(route, base_url.rstrip('/') + route) for route in routes + slow for _ in range(requests_per_route)]
+    # Interleave routes so every route sees the same background load.
+    random.Random(0).shuffle(jobs)
+
+    latencies: Dict[str, List[float]] = {route: [] for route in routes + slow}
+    errors: Dict[str, int] = {route: 0 for route in routes + slow}
+    lock = threading.Lock()
+
+    def worker(job):
+        route, url = job
+        elapsed = _fetch(url, timeout, token)
+        with lock:
+            if elapsed is None:
+                errors[route] += 1
+            else:
+                latencies[route].append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, jobs))
+    wall = time.perf_counter() - started
+
+    results = {}
+    for route in routes + slow:
+        values = sorted(latencies[route])
+        results[route] = {
+            'ok': len(values),
+            'errors': errors[route],
+            'p50_ms': _percentile(values, 50) * 1000,
+            'p95_ms': _percentile(values, 95) * 1000,
+            'p99_ms': _percentile(values, 99) * 1000,
+            'max_ms': (values[-1] if values else 0.0) * 1000,
+            'mean_ms': (statistics.mean(values) if values else 0.0) * 1000,
+        }
+    results['_total'] = {'wall_s': wall, 'rps': len(jobs) / wall if wall else 0.0}
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="p99 latency of DB-backed routes under concurrency")
+    parser.add_argument('base_url')
+    parser.add_argument('--route', action='append', dest='routes', help='Route to test (repeatable)')
+    parser.add_argument('--slow', action='append', default=[], help='Slow route mixed into the load (repeatable)')
+    parser.add_argument('-c', '--concurrency', type=int, default=32)
+    parser.add_argument('-n', '--requests', type=int, default=200, help='Requests per route')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--token', help='X-User-Token for gated routes')
+    args = parser.parse_args()
+
+    routes = args.routes or DEFAULT_ROUTES
+    print(f"{args.base_url}: {len(routes) + len(args.slow)} routes x {args.requests} requests, "
+          f"concurrency {args.concurrency}")
+
+    results = run(args.base_url, routes, args.slow, args.concurrency, args.requests, args.timeout, args.token)
+    total = results.pop('_total')
+
+    print(f"\n{'route':45s} {'ok':>5s} {'err':>4s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'max':>8s}")
+    for route, r in results.items():
+        label = route + (' (slow)' if route in args.slow else '')
+        print(f"{label:45s} {r['ok']:5d} {r['errors']:4d} "
+              f"{r['p50_ms']:7.0f}ms {r['p95_ms']:7.0f}ms {r['p99_ms']:7.0f}ms {r['max_ms']:7.0f}ms")
+    print(f"\nwall {total['wall_s']:.1f}s, {total['rps']:.1f} req/s")
+
+    return 1 if any(r['errors'] for r in results.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
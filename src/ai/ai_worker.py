@@ -3,14 +3,17 @@ import os
 import sys
 import json
 import time
-from typing import Optional, Dict, Any, Tuple
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from openai import OpenAI
-from src.db.db import get_cursor, execute_query
-from src.db.migrations import run_migrations
+from psycopg2.extras import execute_values
+from src.ai.dedup import cluster_events, pack_events
+from src.ai.rate_control import AIMDLimiter, RunStats
+from src.db.db import get_cursor
 
 logging.basicConfig(
     level=os.environ.get('LOG_LEVEL', 'INFO'),
@@ -21,8 +24,27 @@ logger = logging.getLogger(__name__)
 AI_MAX_EVENTS_PER_RUN = int(os.environ.get('AI_MAX_EVENTS_PER_RUN', '20'))
 AI_MAX_CHARS = int(os.environ.get('AI_MAX_CHARS', '6000'))
 AI_TEMPERATURE = float(os.environ.get('AI_TEMPERATURE', '0.2'))
-AI_SLEEP_BETWEEN_CALLS = float(os.environ.get('AI_SLEEP_BETWEEN_CALLS', '0.5'))
 AI_MAX_RETRIES = 2
+AI_MAX_ATTEMPTS = 3
+
+# In-flight model requests: the limiter starts at AI_INITIAL_CONCURRENCY and
+# adapts between 1 and AI_MAX_CONCURRENCY (see src/ai/rate_control.py).
+AI_MAX_CONCURRENCY = int(os.environ.get('AI_MAX_CONCURRENCY', '8'))
+AI_INITIAL_CONCURRENCY = int(os.environ.get('AI_INITIAL_CONCURRENCY', '4'))
+AI_LATENCY_TARGET_SECONDS = float(os.environ.get('AI_LATENCY_TARGET_SECONDS', '20'))
+AI_WRITE_BATCH_SIZE = int(os.environ.get('AI_WRITE_BATCH_SIZE', '20'))
+
+# Near-duplicate stories are enriched once and the result copied to the rest
+# of their cluster; small events are packed AI_BATCH_EVENTS to a request
+# (see src/ai/dedup.py). AI_BATCH_EVENTS=1 sends one event per request.
+AI_DEDUP_ENABLED = os.environ.get('AI_DEDUP_ENABLED', 'true').lower() == 'true'
+AI_BATCH_EVENTS = int(os.environ.get('AI_BATCH_EVENTS', '4'))
+AI_BATCH_MAX_CHARS = int(os.environ.get('AI_BATCH_MAX_CHARS', '8000'))
+AI_BATCH_SMALL_EVENT_CHARS = int(os.environ.get('AI_BATCH_SMALL_EVENT_CHARS', '2500'))
+
+# A claimed event is leased to one worker for this long; a worker that dies
+# mid-run releases its events to the next run once the lease expires.
+AI_CLAIM_LEASE_MINUTES = int(os.environ.get('AI_CLAIM_LEASE_MINUTES', '15'))
 
 OPENAI_MODEL = os.environ.get('OPENAI_MODEL', 'gpt-4.1-mini')
 
@@ -57,6 +79,12 @@ Rules:
 - Do not give investment advice
 - If the text is insufficient for analysis, still provide a valid JSON with "unclear" values"""
 
+BATCH_INSTRUCTIONS = """
+
+You will receive several independent news events, each introduced by a line "### EVENT <id>".
+Analyze each event on its own. Respond with ONLY a JSON object of the form
+{"results": [{"id": <id>, ...the schema above...}, ...]} with exactly one entry per event id."""
+
 def get_openai_client() -> OpenAI:
     base_url = os.environ.get('AI_INTEGRATIONS_OPENAI_BASE_URL')
     api_key = os.environ.get('AI_INTEGRATIONS_OPENAI_API_KEY')
@@ -69,45 +97,78 @@ def get_openai_client() -> OpenAI:
     
     return OpenAI(base_url=base_url, api_key=api_key)
 
-def fetch_unprocessed_events(limit: int) -> list:
-    query = """
-    SELECT id, title, raw_text, ai_attempts
-    FROM events
-    WHERE processed = FALSE AND ai_attempts < 3
-    ORDER BY inserted_at ASC
-    LIMIT %s
+def claim_events(limit: int) -> List[dict]:
     """
-    return execute_query(query, (limit,))
+    Lease up to limit unprocessed events to this worker.
 
-def increment_attempts(event_id: int):
+    FOR UPDATE SKIP LOCKED lets concurrent workers claim disjoint batches;
+    the attempt counter and ai_claimed_at are bumped in the same statement so
+    the lease outlives the short claim transaction.
+    """
     with get_cursor() as cursor:
-        cursor.execute(
-            "UPDATE events SET ai_attempts = ai_attempts + 1 WHERE id = %s",
-            (event_id,)
-        )
+        cursor.execute("""
+            UPDATE events e
+            SET ai_attempts = e.ai_attempts + 1,
+                ai_claimed_at = NOW()
+            FROM (
+                SELECT id FROM events
+                WHERE processed = FALSE
+                  AND ai_attempts < %s
+                  AND (ai_claimed_at IS NULL
+                       OR ai_claimed_at < NOW() - make_interval(mins => %s))
+                ORDER BY inserted_at ASC
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            ) claimed
+            WHERE e.id = claimed.id
+            RETURNING e.id, e.title, e.raw_text, e.ai_attempts, e.inserted_at
+        """, (AI_MAX_ATTEMPTS, AI_CLAIM_LEASE_MINUTES, limit))
+        rows = cursor.fetchall()
+    return sorted(rows, key=lambda r: r['inserted_at'])
+
+
+def save_ai_results(results: List[Tuple[int, str, dict, str]]):
+    """Write (event_id, summary, impact_json, model) rows in one statement."""
+    if not results:
+        return
+    with get_cursor() as cursor:
+        execute_values(cursor, """
+            UPDATE events e
+            SET processed = TRUE,
+                ai_summary = v.summary,
+                ai_impact_json = v.impact::jsonb,
+                ai_model = v.model,
+                ai_processed_at = NOW(),
+                ai_error = NULL,
+                ai_claimed_at = NULL
+            FROM (VALUES %s) AS v(id, summary, impact, model)
+            WHERE e.id = v.id
+        """, [
+            (event_id, summary, json.dumps(impact_json), model)
+            for event_id, summary, impact_json, model in results
+        ])
+
 
 def save_ai_result(event_id: int, summary: str, impact_json: dict, model: str):
+    save_ai_results([(event_id, summary, impact_json, model)])
+
+
+def save_ai_errors(errors: List[Tuple[int, str]]):
+    """Record (event_id, error) rows and release their leases for the next run."""
+    if not errors:
+        return
     with get_cursor() as cursor:
-        cursor.execute(
-            """UPDATE events 
-               SET processed = TRUE, 
-                   ai_summary = %s, 
-                   ai_impact_json = %s,
-                   ai_model = %s,
-                   ai_processed_at = NOW(),
-                   ai_error = NULL
-               WHERE id = %s""",
-            (summary, json.dumps(impact_json), model, event_id)
-        )
+        execute_values(cursor, """
+            UPDATE events e
+            SET ai_error = v.error,
+                ai_claimed_at = NULL
+            FROM (VALUES %s) AS v(id, error)
+            WHERE e.id = v.id
+        """, [(event_id, error[:500]) for event_id, error in errors])
+
 
 def save_ai_error(event_id: int, error_message: str):
-    with get_cursor() as cursor:
-        cursor.execute(
-            """UPDATE events 
-               SET ai_error = %s
-               WHERE id = %s""",
-            (error_message[:500], event_id)
-        )
+    save_ai_errors([(event_id, error_message)])
 
 def build_input_text(title: str, raw_text: Optional[str]) -> str:
     text = title
@@ -115,140 +176,332 @@ def build_input_text(title: str, raw_text: Optional[str]) -> str:
         text += "\n\n" + raw_text
     return text[:AI_MAX_CHARS]
 
+def _strip_fences(response_text: str) -> str:
+    cleaned = response_text.strip()
+    if cleaned.startswith('```'):
+        lines = cleaned.split('\n')
+        if lines[0].startswith('```'):
+            lines = lines[1:]
+        if lines and lines[-1].strip() == '```':
+            lines = lines[:-1]
+        cleaned = '\n'.join(lines)
+    return cleaned
+
+def _validate_result(result: Any) -> Tuple[bool, Dict[str, Any], str]:
+    if not isinstance(result, dict):
+        return False, {}, "Result is not a JSON object"
+    if 'summary' not in result:
+        return False, {}, "Missing 'summary' field in response"
+    if 'impact' not in result:
+        return False, {}, "Missing 'impact' field in response"
+    return True, result, ""
+
 def parse_ai_response(response_text: str) -> Tuple[bool, Dict[str, Any], str]:
     try:
-        cleaned = response_text.strip()
-        if cleaned.startswith('```'):
-            lines = cleaned.split('\n')
-            if lines[0].startswith('```'):
-                lines = lines[1:]
-            if lines and lines[-1].strip() == '```':
-                lines = lines[:-1]
-            cleaned = '\n'.join(lines)
-        
-        result = json.loads(cleaned)
-        
-        if 'summary' not in result:
-            return False, {}, "Missing 'summary' field in response"
-        if 'impact' not in result:
-            return False, {}, "Missing 'impact' field in response"
-        
-        return True, result, ""
+        return _validate_result(json.loads(_strip_fences(response_text)))
     
     except json.JSONDecodeError as e:
         return False, {}, f"Invalid JSON: {str(e)}"
     except Exception as e:
         return False, {}, f"Parse error: {str(e)}"
 
-def call_ai_with_retries(client: OpenAI, input_text: str, model: str) -> Tuple[bool, str, str]:
+def parse_batch_response(response_text: str, event_ids: List[int]) -> Dict[int, Tuple[bool, Dict[str, Any], str]]:
+    """Per-event (success, result, error) for a multi-event response."""
+    try:
+        payload = json.loads(_strip_fences(response_text))
+        items = payload.get('results') if isinstance(payload, dict) else payload
+        if not isinstance(items, list):
+            raise ValueError("Missing 'results' list in response")
+    except (json.JSONDecodeError, ValueError) as e:
+        return {event_id: (False, {}, f"Invalid batch JSON: {e}") for event_id in event_ids}
+
+    parsed = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            event_id = int(item.pop('id'))
+        except (KeyError, TypeError, ValueError):
+            continue
+        if event_id in event_ids:
+            parsed[event_id] = _validate_result(item)
+    for event_id in event_ids:
+        parsed.setdefault(event_id, (False, {}, "Event missing from batch response"))
+    return parsed
+
+def _is_rate_limited(error: Exception) -> bool:
+    return getattr(error, 'status_code', None) == 429 or type(error).__name__ == 'RateLimitError'
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        value = headers.get('retry-after')
+        return float(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def call_ai_with_retries(client: OpenAI, messages: List[dict], model: str,
+                         limiter: AIMDLimiter, stats: RunStats,
+                         max_tokens: int = 2000, json_mode: bool = False) -> Tuple[bool, str, str]:
+    """
+    Call the model through the limiter, retrying transient failures.
+
+    The limiter slot is returned before any backoff sleep, so a retrying
+    event never holds capacity other events could use.
+    """
     for attempt in range(AI_MAX_RETRIES + 1):
+        limiter.acquire()
+        started = time.monotonic()
         try:
+            extra = {'response_format': {'type': 'json_object'}} if json_mode else {}
             response = client.chat.completions.create(
                 model=model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": f"Analyze this news event:\n\n{input_text}"}
-                ],
+                messages=messages,
                 temperature=AI_TEMPERATURE,
-                max_tokens=2000
+                max_tokens=max_tokens,
+                **extra
             )
-            
-            response_text = response.choices[0].message.content
-            return True, response_text, ""
-        
         except Exception as e:
+            rate_limited = _is_rate_limited(e)
+            retry_after = _retry_after_seconds(e) if rate_limited else None
+            limiter.release(rate_limited=rate_limited, retry_after=retry_after)
+            if rate_limited:
+                stats.count('rate_limited')
             error_msg = str(e)
             logger.warning(f"AI call attempt {attempt + 1} failed: {error_msg}")
-            
+
             if attempt < AI_MAX_RETRIES:
-                sleep_time = (2 ** attempt) * 1.0
-                time.sleep(sleep_time)
-            else:
-                return False, "", error_msg
-    
+                stats.count('retries')
+                time.sleep(retry_after or (2 ** attempt) * 1.0)
+                continue
+            return False, "", error_msg
+
+        latency = time.monotonic() - started
+        limiter.release(latency=latency)
+        usage = getattr(response, 'usage', None)
+        stats.record_usage(
+            getattr(usage, 'prompt_tokens', 0),
+            getattr(usage, 'completion_tokens', 0),
+            latency,
+        )
+        return True, response.choices[0].message.content, ""
+
     return False, "", "Max retries exceeded"
 
-def process_event(client: OpenAI, event: dict, model: str) -> Tuple[bool, str]:
+
+@dataclass
+class EnrichmentOutcome:
+    event_id: int
+    success: bool
+    summary: str = ''
+    result: Optional[Dict[str, Any]] = None
+    error: str = ''
+
+
+def process_event(client: OpenAI, event: dict, model: str,
+                  limiter: AIMDLimiter, stats: RunStats) -> EnrichmentOutcome:
+    """Enrich one claimed event. DB writes are left to the caller's batches."""
     event_id = event['id']
-    title = event['title']
-    raw_text = event.get('raw_text')
-    
-    increment_attempts(event_id)
-    
-    input_text = build_input_text(title, raw_text)
-    
-    success, response_text, error = call_ai_with_retries(client, input_text, model)
-    
+    input_text = build_input_text(event['title'], event.get('raw_text'))
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"Analyze this news event:\n\n{input_text}"}
+    ]
+
+    success, response_text, error = call_ai_with_retries(client, messages, model, limiter, stats)
     if not success:
-        save_ai_error(event_id, error)
-        return False, f"API error: {error}"
-    
+        return EnrichmentOutcome(event_id, False, error=f"API error: {error}")
+
     parse_success, result, parse_error = parse_ai_response(response_text)
-    
     if not parse_success:
-        save_ai_error(event_id, parse_error)
-        return False, f"Parse error: {parse_error}"
-    
-    summary = result.get('summary', '')
-    save_ai_result(event_id, summary, result, model)
-    
-    return True, summary[:100]
+        return EnrichmentOutcome(event_id, False, error=f"Parse error: {parse_error}")
 
-def run_ai_worker():
+    return EnrichmentOutcome(event_id, True, summary=result.get('summary', ''), result=result)
+
+
+def process_event_batch(client: OpenAI, events: List[dict], model: str,
+                        limiter: AIMDLimiter, stats: RunStats) -> List[EnrichmentOutcome]:
+    """
+    Enrich several small events with one structured-output request.
+
+    Events the model leaves out or answers malformed are retried on their
+    own, so a bad batch costs one extra request, not the events.
+    """
+    if len(events) == 1:
+        return [process_event(client, events[0], model, limiter, stats)]
+
+    sections = [
+        f"### EVENT {event['id']}\n{build_input_text(event['title'], event.get('raw_text'))}"
+        for event in events
+    ]
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT + BATCH_INSTRUCTIONS},
+        {"role": "user", "content": "Analyze these news events:\n\n" + "\n\n".join(sections)}
+    ]
+    success, response_text, error = call_ai_with_retries(
+        client, messages, model, limiter, stats,
+        max_tokens=min(1200 * len(events), 8000), json_mode=True,
+    )
+    if not success:
+        return [EnrichmentOutcome(e['id'], False, error=f"API error: {error}") for e in events]
+
+    parsed = parse_batch_response(response_text, [e['id'] for e in events])
+    outcomes = []
+    for event in events:
+        ok, result, parse_error = parsed[event['id']]
+        if ok:
+            outcomes.append(EnrichmentOutcome(event['id'], True, summary=result.get('summary', ''), result=result))
+        else:
+            logger.warning(f"Batch result for event {event['id']} unusable ({parse_error}); retrying alone")
+            outcomes.append(process_event(client, event, model, limiter, stats))
+    return outcomes
+
+
+def plan_requests(events: List[dict]) -> Tuple[List[List[dict]], Dict[int, List[dict]]]:
+    """
+    Split claimed events into model requests.
+
+    Returns (packs, duplicates): packs are the groups of representatives
+    to send, duplicates maps a representative id to the events that reuse
+    its result.
+    """
+    if AI_DEDUP_ENABLED:
+        clusters = cluster_events(events)
+    else:
+        clusters = [[event] for event in events]
+    representatives = [cluster[0] for cluster in clusters]
+    duplicates = {cluster[0]['id']: cluster[1:] for cluster in clusters if len(cluster) > 1}
+
+    packs = pack_events(
+        representatives,
+        text_length=lambda e: len(build_input_text(e['title'], e.get('raw_text'))),
+        max_events=AI_BATCH_EVENTS,
+        max_chars=AI_BATCH_MAX_CHARS,
+        small_chars=AI_BATCH_SMALL_EVENT_CHARS,
+    )
+    return packs, duplicates
+
+
+class _ResultWriter:
+    """Buffers outcomes and flushes them in batches of AI_WRITE_BATCH_SIZE."""
+
+    def __init__(self, model: str, batch_size: int):
+        self.model = model
+        self.batch_size = batch_size
+        self.results: List[Tuple[int, str, dict, str]] = []
+        self.errors: List[Tuple[int, str]] = []
+
+    def add(self, outcome: EnrichmentOutcome):
+        if outcome.success:
+            self.results.append((outcome.event_id, outcome.summary, outcome.result, self.model))
+        else:
+            self.errors.append((outcome.event_id, outcome.error))
+        if len(self.results) + len(self.errors) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.results:
+            save_ai_results(self.results)
+            self.results = []
+        if self.errors:
+            save_ai_errors(self.errors)
+            self.errors = []
+
+
+def run_ai_worker(max_events: int = AI_MAX_EVENTS_PER_RUN) -> dict:
     logger.info("=" * 60)
     logger.info("Starting EnergyRiskIQ AI Processing Worker")
-    logger.info(f"Model: {OPENAI_MODEL}, Max events: {AI_MAX_EVENTS_PER_RUN}")
+    logger.info(f"Model: {OPENAI_MODEL}, Max events: {max_events}, Max concurrency: {AI_MAX_CONCURRENCY}")
     logger.info("=" * 60)
-    
-    run_migrations()
-    
+
+    stats = RunStats(model=OPENAI_MODEL)
+
     try:
         client = get_openai_client()
     except ValueError as e:
         logger.error(f"Failed to initialize AI client: {e}")
-        return 0, 0
-    
-    events = fetch_unprocessed_events(AI_MAX_EVENTS_PER_RUN)
-    
+        return stats.to_dict()
+
+    events = claim_events(max_events)
+    stats.claimed = len(events)
+
     if not events:
         logger.info("No unprocessed events found.")
-        return 0, 0
-    
-    logger.info(f"Found {len(events)} unprocessed events")
-    
-    success_count = 0
-    failure_count = 0
-    total_time = 0
-    
-    for i, event in enumerate(events):
-        start_time = time.time()
-        
-        logger.info(f"Processing event {i + 1}/{len(events)}: {event['title'][:50]}...")
-        
-        success, message = process_event(client, event, OPENAI_MODEL)
-        
-        elapsed = time.time() - start_time
-        total_time += elapsed
-        
-        if success:
-            success_count += 1
-            logger.info(f"  Success ({elapsed:.1f}s): {message}...")
+        return stats.to_dict()
+
+    logger.info(f"Claimed {len(events)} unprocessed events")
+
+    limiter = AIMDLimiter(
+        initial=AI_INITIAL_CONCURRENCY,
+        max_limit=AI_MAX_CONCURRENCY,
+        latency_target=AI_LATENCY_TARGET_SECONDS,
+    )
+    writer = _ResultWriter(OPENAI_MODEL, AI_WRITE_BATCH_SIZE)
+
+    packs, duplicates = plan_requests(events)
+    stats.deduplicated = sum(len(members) for members in duplicates.values())
+    logger.info(f"{len(events) - stats.deduplicated} distinct stories "
+                f"({stats.deduplicated} near-duplicates reuse a result) in {len(packs)} requests")
+
+    def record(outcome: EnrichmentOutcome, copied_from: Optional[int] = None):
+        source = f" (copy of {copied_from})" if copied_from else ""
+        if outcome.success:
+            stats.count('succeeded')
+            logger.info(f"  Success [{outcome.event_id}]{source}: {outcome.summary[:100]}...")
         else:
-            failure_count += 1
-            logger.error(f"  Failed ({elapsed:.1f}s): {message}")
-        
-        if i < len(events) - 1:
-            time.sleep(AI_SLEEP_BETWEEN_CALLS)
-    
-    avg_time = total_time / len(events) if events else 0
-    
+            stats.count('failed')
+            logger.error(f"  Failed [{outcome.event_id}]{source}: {outcome.error}")
+        writer.add(outcome)
+
+    try:
+        with ThreadPoolExecutor(max_workers=AI_MAX_CONCURRENCY, thread_name_prefix='ai') as pool:
+            futures = {
+                pool.submit(process_event_batch, client, pack, OPENAI_MODEL, limiter, stats): pack
+                for pack in packs
+            }
+            for future in as_completed(futures):
+                pack = futures[future]
+                try:
+                    outcomes = future.result()
+                except Exception as e:
+                    outcomes = [EnrichmentOutcome(ev['id'], False, error=f"Worker error: {e}") for ev in pack]
+
+                for outcome in outcomes:
+                    record(outcome)
+                    for duplicate in duplicates.get(outcome.event_id, []):
+                        record(EnrichmentOutcome(
+                            duplicate['id'], outcome.success,
+                            summary=outcome.summary, result=outcome.result, error=outcome.error,
+                        ), copied_from=outcome.event_id)
+    finally:
+        writer.flush()
+
+    stats.finish()
+    report = stats.to_dict()
+    report['concurrency_peak'] = limiter.peak_limit
+    report['concurrency_final'] = limiter.limit
+    report['concurrency_decreases'] = limiter.decreases
+
     logger.info("=" * 60)
-    logger.info(f"AI Processing Complete:")
-    logger.info(f"  Processed: {success_count} success, {failure_count} failed")
-    logger.info(f"  Average time per event: {avg_time:.1f}s")
+    logger.info("AI Processing Complete:")
+    logger.info(f"  Processed: {report['succeeded']} success, {report['failed']} failed "
+                f"({report['rate_limited']} rate-limited responses, {report['retries']} retries)")
+    logger.info(f"  Requests: {report['requests']} for {report['claimed']} events "
+                f"({report['deduplicated']} served from a duplicate's result)")
+    logger.info(f"  Throughput: {report['events_per_minute']} events/min over {report['elapsed_seconds']}s, "
+                f"avg {report['avg_api_seconds']}s per call")
+    logger.info(f"  Concurrency: peak {report['concurrency_peak']}, final {report['concurrency_final']}, "
+                f"{report['concurrency_decreases']} decreases")
+    logger.info(f"  Tokens: {report['prompt_tokens']} in / {report['completion_tokens']} out, "
+                f"cost ${report['cost_usd']:.4f} (${report['cost_per_event_usd']:.5f}/event)")
     logger.info("=" * 60)
-    
-    return success_count, failure_count
+
+    return report
 
 if __name__ == "__main__":
+    from src.db.migrations import run_migrations
+    run_migrations()
     run_ai_worker()
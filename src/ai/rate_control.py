@@ -0,0 +1,163 @@
+"""
+Adaptive concurrency control for AI enrichment calls.
+
+AIMDLimiter caps the number of in-flight model requests. Each fast
+success raises the cap additively (+1 per cap's worth of successes); a
+429 or a response slower than the latency target cuts it multiplicatively,
+at most once per cooldown window so a burst of rejections from a single
+window only halves the cap once. A Retry-After from the provider pauses
+new requests for that long.
+
+RunStats accumulates throughput, token usage and estimated cost for one
+worker run.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+# USD per 1M tokens (input, output). Override with AI_PRICE_INPUT_PER_1M /
+# AI_PRICE_OUTPUT_PER_1M for models not listed here.
+MODEL_PRICES_PER_1M: Dict[str, tuple] = {
+    'gpt-4.1-mini': (0.40, 1.60),
+    'gpt-4.1-nano': (0.10, 0.40),
+    'gpt-4.1': (2.00, 8.00),
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o': (2.50, 10.00),
+}
+
+
+def model_prices(model: str) -> tuple:
+    default_in, default_out = MODEL_PRICES_PER_1M.get(model, (0.0, 0.0))
+    return (
+        float(os.environ.get('AI_PRICE_INPUT_PER_1M', default_in)),
+        float(os.environ.get('AI_PRICE_OUTPUT_PER_1M', default_out)),
+    )
+
+
+class AIMDLimiter:
+    """Thread-safe additive-increase / multiplicative-decrease concurrency cap."""
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        latency_target: float = 20.0,
+        backoff: float = 0.5,
+        cooldown: float = 5.0,
+        clock=time.monotonic,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self._clock = clock
+        self._limit = float(max(min_limit, min(initial, max_limit)))
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = float('-inf')
+        self._cond = threading.Condition()
+        self.decreases = 0
+        self.peak_limit = int(self._limit)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> None:
+        """Block until a slot is free and no Retry-After pause is active."""
+        with self._cond:
+            while True:
+                wait = self._paused_until - self._clock()
+                if wait <= 0 and self._in_flight < int(self._limit):
+                    self._in_flight += 1
+                    return
+                self._cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self, latency: Optional[float] = None, rate_limited: bool = False,
+                retry_after: Optional[float] = None) -> None:
+        """Return a slot and adapt the cap to how the request went."""
+        with self._cond:
+            self._in_flight -= 1
+            now = self._clock()
+            if rate_limited or (latency is not None and latency > self.latency_target):
+                if now - self._last_decrease >= self.cooldown:
+                    self._limit = max(float(self.min_limit), self._limit * self.backoff)
+                    self._last_decrease = now
+                    self.decreases += 1
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+            elif latency is not None:
+                self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+                self.peak_limit = max(self.peak_limit, int(self._limit))
+            self._cond.notify_all()
+
+
+@dataclass
+class RunStats:
+    """Throughput and cost of one enrichment run."""
+    model: str
+    claimed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    rate_limited: int = 0
+    retries: int = 0
+    requests: int = 0
+    deduplicated: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    api_seconds: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_usage(self, prompt_tokens: int, completion_tokens: int, seconds: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += prompt_tokens or 0
+            self.completion_tokens += completion_tokens or 0
+            self.api_seconds += seconds
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def finish(self) -> None:
+        self.finished_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def cost_usd(self) -> float:
+        price_in, price_out = model_prices(self.model)
+        return (self.prompt_tokens * price_in + self.completion_tokens * price_out) / 1_000_000
+
+    def to_dict(self) -> dict:
+        elapsed = self.elapsed
+        done = self.succeeded + self.failed
+        return {
+            'model': self.model,
+            'claimed': self.claimed,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'rate_limited': self.rate_limited,
+            'retries': self.retries,
+            'requests': self.requests,
+            'deduplicated': self.deduplicated,
+            'elapsed_seconds': round(elapsed, 2),
+            'events_per_minute': round(done / elapsed * 60, 2) if elapsed > 0 else 0.0,
+            'avg_api_seconds': round(self.api_seconds / self.requests, 2) if self.requests else 0.0,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'cost_usd': round(self.cost_usd, 6),
+            'cost_per_event_usd': round(self.cost_usd / self.succeeded, 6) if self.succeeded else 0.0,
+        }
@@ -0,0 +1 @@
+"""AI Tests"""
@@ -0,0 +1,55 @@
+"""
+Unit tests for near-duplicate clustering and request packing.
+"""
+from src.ai.dedup import AI_DEDUP_MAX_DISTANCE, cluster_events, hamming, pack_events, simhash
+
+BODY = (
+    "Ukrainian drones struck the Novorossiysk oil terminal overnight, halting loadings "
+    "at the Caspian Pipeline Consortium berths. Port officials said repairs could take "
+    "several days while tankers wait offshore. Brent futures rose on the news as traders "
+    "priced in supply disruption risk across the Black Sea."
+)
+
+
+def _event(event_id, title, raw_text):
+    return {'id': event_id, 'title': title, 'raw_text': raw_text}
+
+
+def test_simhash_is_stable_and_close_for_rewordings():
+    a = simhash("Drone strike halts loadings at Novorossiysk oil terminal " + BODY)
+    b = simhash("Drone strike halts loadings at Novorossiysk oil terminal: report " + BODY)
+    c = simhash("Norway raises gas exports to Germany as maintenance season ends early")
+    assert a == simhash("Drone strike halts loadings at Novorossiysk oil terminal " + BODY)
+    assert hamming(a, b) <= AI_DEDUP_MAX_DISTANCE
+    assert hamming(a, c) > 2 * AI_DEDUP_MAX_DISTANCE
+
+
+def test_cluster_groups_syndicated_copies():
+    events = [
+        _event(1, "Drone strike halts loadings at Novorossiysk oil terminal", BODY),
+        _event(2, "Norway raises gas exports to Germany", "Equinor said flows to Germany rose after maintenance."),
+        _event(3, "Drone strike halts loadings at Novorossiysk oil terminal - Reuters", BODY + " More follows."),
+    ]
+    clusters = cluster_events(events)
+    by_rep = {c[0]['id']: [e['id'] for e in c] for c in clusters}
+
+    assert len(clusters) == 2
+    assert by_rep[3] == [3, 1]
+    assert by_rep[2] == [2]
+
+
+def test_short_texts_are_never_clustered():
+    events = [_event(1, "Oil prices rise", None), _event(2, "Oil prices rise", "")]
+    assert len(cluster_events(events)) == 2
+
+
+def test_pack_events_respects_limits():
+    events = [{'id': i, 'len': n} for i, n in enumerate([100, 200, 5000, 300, 100, 100, 100])]
+    packs = pack_events(events, lambda e: e['len'], max_events=3, max_chars=500, small_chars=1000)
+    assert [[e['id'] for e in p] for p in packs] == [[2], [0, 1], [3, 4, 5], [6]]
+
+
+def test_pack_events_single_mode():
+    events = [{'id': i, 'len': 10} for i in range(3)]
+    packs = pack_events(events, lambda e: e['len'], max_events=1, max_chars=500)
+    assert [[e['id'] for e in p] for p in packs] == [[0], [1], [2]]
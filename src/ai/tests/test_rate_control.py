@@ -0,0 +1,82 @@
+"""
+Unit tests for AI enrichment rate control.
+"""
+import threading
+
+from src.ai.rate_control import AIMDLimiter, RunStats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_additive_increase_on_fast_successes():
+    limiter = AIMDLimiter(initial=2, max_limit=4, latency_target=10, clock=FakeClock())
+    for _ in range(2):
+        limiter.acquire()
+        limiter.release(latency=1.0)
+    assert limiter.limit == 2
+    limiter.acquire()
+    limiter.release(latency=1.0)
+    assert limiter.limit == 3
+    for _ in range(50):
+        limiter.acquire()
+        limiter.release(latency=1.0)
+    assert limiter.limit == 4
+
+
+def test_multiplicative_decrease_once_per_cooldown():
+    clock = FakeClock()
+    limiter = AIMDLimiter(initial=8, max_limit=8, cooldown=5, clock=clock)
+    for _ in range(3):
+        limiter.acquire()
+    for _ in range(3):
+        limiter.release(rate_limited=True)
+    assert limiter.limit == 4
+    assert limiter.decreases == 1
+
+    clock.now = 6.0
+    limiter.acquire()
+    limiter.release(latency=60.0)
+    assert limiter.limit == 2
+
+
+def test_never_exceeds_limit_in_flight():
+    limiter = AIMDLimiter(initial=3, max_limit=3)
+    peak = []
+    lock = threading.Lock()
+
+    def task():
+        limiter.acquire()
+        with lock:
+            peak.append(limiter.in_flight)
+        limiter.release()
+
+    threads = [threading.Thread(target=task) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(peak) <= 3
+    assert limiter.in_flight == 0
+
+
+def test_run_stats_cost_and_throughput(monkeypatch):
+    monkeypatch.delenv('AI_PRICE_INPUT_PER_1M', raising=False)
+    monkeypatch.delenv('AI_PRICE_OUTPUT_PER_1M', raising=False)
+    stats = RunStats(model='gpt-4.1-mini', started_at=0.0)
+    stats.record_usage(1_000_000, 500_000, 10.0)
+    stats.count('succeeded', 4)
+    stats.count('failed')
+    stats.finished_at = 60.0
+
+    report = stats.to_dict()
+    assert report['cost_usd'] == 1.2
+    assert report['cost_per_event_usd'] == 0.3
+    assert report['events_per_minute'] == 5.0
+    assert report['avg_api_seconds'] == 10.0
+    assert report['requests'] == 1
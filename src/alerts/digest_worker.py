@@ -64,10 +64,10 @@ def has_digest_today(user_id: int, date_str: str) -> bool:
 
 def get_risk_indices(region: str = 'Europe') -> Dict:
     query = """
-    SELECT window_days, risk_score, trend
+    SELECT DISTINCT ON (window_days) window_days, risk_score, trend
     FROM risk_indices
-    WHERE LOWER(region) = LOWER(%s)
-    ORDER BY calculated_at DESC
+    WHERE LOWER(region) = LOWER(%s) AND window_days IN (7, 30)
+    ORDER BY window_days, calculated_at DESC
     """
     results = execute_query(query, (region,))
     
@@ -13,16 +13,17 @@ Routes:
   POST /api/alerts-access/cancel        — cancel at period end
   GET  /api/alerts-access/history.xlsx  — Excel download of alert history (subscribers)
 """
-import io
 import logging
+import os
 from datetime import datetime
 from typing import Optional
 
 import stripe
 from fastapi import APIRouter, Header, HTTPException
-from fastapi.responses import StreamingResponse
 
-from src.db.db import get_cursor
+from src.api.exports import export_response_async, xlsx_stream
+from src.db.db import get_cursor, stream_query
+from src.billing.entitlements import get_active_session, entitlements_changed, get_entitlements
 from src.billing.stripe_client import (
     init_stripe,
     ensure_stripe_initialized,
@@ -45,7 +46,18 @@ SUB_DESC = ("Full access to the geopolitical & energy risk alerts archive — "
             "daily pages, monthly archives, category views and Excel history "
             "downloads. €4.99/month.")
 
-EXCEL_MAX_ROWS = 5000
+EXCEL_MAX_ROWS = int(os.environ.get("ALERTS_EXCEL_MAX_ROWS", "50000"))
+
+_HISTORY_QUERY = """
+    SELECT created_at, alert_type, category, scope_region,
+           severity, headline, body
+    FROM alert_events
+    WHERE alert_type != 'DAILY_DIGEST'
+    ORDER BY created_at DESC
+    LIMIT %s
+"""
+_HISTORY_HEADERS = ["Date (UTC)", "Type", "Category", "Region",
+                    "Severity (1-5)", "Headline", "Details"]
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -219,13 +231,7 @@ def _active_for_mode(row) -> bool:
 def user_has_alerts_access(user_id: int) -> bool:
     """Mode-agnostic entitlement check for the gated alerts pages."""
     try:
-        with get_cursor(commit=False) as cur:
-            cur.execute(
-                "SELECT status FROM user_alerts_access_subs WHERE user_id = %s",
-                (user_id,)
-            )
-            row = cur.fetchone()
-        return _is_active(row)
+        return get_entitlements(user_id).active("alerts_access")
     except Exception:
         return False
 
@@ -233,13 +239,11 @@ def user_has_alerts_access(user_id: int) -> bool:
 def get_alerts_access_user(token: Optional[str]):
     """Resolve a session token to a user dict IF the user has an active
     alerts-access subscription. Returns None otherwise. Used by the gated
-    /alerts pages in seo_routes."""
-    user = _get_user_from_token(token)
-    if not user:
+    /alerts pages in seo_routes. Served from the session cache."""
+    session = get_active_session(token)
+    if not session or not session.has("alerts_access"):
         return None
-    if not user_has_alerts_access(user["id"]):
-        return None
-    return user
+    return session.user
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -399,6 +403,7 @@ async def confirm(x_user_token: Optional[str] = Header(None)):
             WHERE id = %s
         """, (subscription_id, customer_id, local_status, period_end_dt,
               matched_mode, row["id"]))
+    entitlements_changed(user["id"])
     logger.info(f"Alerts access subscription activated via confirm for user {user['id']}")
     return {
         "active": local_status in ("active", "trialing", "canceling"),
@@ -428,6 +433,7 @@ async def cancel(x_user_token: Optional[str] = Header(None)):
                 "updated_at = NOW() WHERE id = %s",
                 (row["id"],)
             )
+        entitlements_changed(user["id"])
         return {"canceled_at_period_end": True,
                 "current_period_end": sub.get("current_period_end")}
     except Exception as e:
@@ -439,6 +445,19 @@ async def cancel(x_user_token: Optional[str] = Header(None)):
 # Excel history download (subscribers only)
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _history_row(r: dict) -> list:
+    created = r.get("created_at")
+    return [
+        created.strftime("%Y-%m-%d %H:%M") if created else "",
+        (r.get("alert_type") or "").replace("_", " ").title(),
+        r.get("category") or "",
+        r.get("scope_region") or "",
+        r.get("severity"),
+        r.get("headline") or "",
+        (r.get("body") or "")[:2000],
+    ]
+
+
 @router.get("/api/alerts-access/history.xlsx")
 async def download_history(x_user_token: Optional[str] = Header(None)):
     # Header-only auth (frontend downloads via fetch + blob)
@@ -448,63 +467,13 @@ async def download_history(x_user_token: Optional[str] = Header(None)):
     if not user_has_alerts_access(user["id"]):
         raise HTTPException(402, "Alerts Archive subscription required")
 
-    with get_cursor(commit=False) as cur:
-        cur.execute("""
-            SELECT created_at, alert_type, category, scope_region,
-                   severity, headline, body
-            FROM alert_events
-            WHERE alert_type != 'DAILY_DIGEST'
-            ORDER BY created_at DESC
-            LIMIT %s
-        """, (EXCEL_MAX_ROWS,))
-        rows = cur.fetchall()
-
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill
-    from openpyxl.utils import get_column_letter
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Alert History"
-
-    headers = ["Date (UTC)", "Type", "Category", "Region",
-               "Severity (1-5)", "Headline", "Details"]
-    ws.append(headers)
-    header_fill = PatternFill(start_color="1E293B", end_color="1E293B",
-                              fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF")
-    for col_idx in range(1, len(headers) + 1):
-        c = ws.cell(row=1, column=col_idx)
-        c.fill = header_fill
-        c.font = header_font
-
-    for r in rows:
-        created = r.get("created_at")
-        ws.append([
-            created.strftime("%Y-%m-%d %H:%M") if created else "",
-            (r.get("alert_type") or "").replace("_", " ").title(),
-            r.get("category") or "",
-            r.get("scope_region") or "",
-            r.get("severity"),
-            r.get("headline") or "",
-            (r.get("body") or "")[:2000],
-        ])
-
-    widths = [17, 20, 16, 16, 14, 60, 90]
-    for i, w in enumerate(widths, start=1):
-        ws.column_dimensions[get_column_letter(i)].width = w
-    ws.freeze_panes = "A2"
-
-    buf = io.BytesIO()
-    wb.save(buf)
-    buf.seek(0)
+    rows = (_history_row(r) for r in stream_query(_HISTORY_QUERY, (EXCEL_MAX_ROWS,)))
+    chunks = xlsx_stream("Alert History", _HISTORY_HEADERS, rows,
+                         widths=[17, 20, 16, 16, 14, 60, 90],
+                         header_font_color="FFFFFF", center_header=False,
+                         freeze_header=True)
     filename = f"energyriskiq-alert-history-{datetime.utcnow().strftime('%Y-%m-%d')}.xlsx"
-    return StreamingResponse(
-        buf,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"',
-                 "Cache-Control": "no-store"},
-    )
+    return await export_response_async(chunks, filename, {"Cache-Control": "no-store"})
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -11,54 +11,18 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.api.routes import router
-from src.api.risk_routes import router as risk_router
-from src.api.alert_routes import router as alert_router
-from src.api.marketing_routes import router as marketing_router
-from src.api.internal_routes import router as internal_router
-from src.api.digest_routes import router as digest_router
-from src.api.daily_digest_routes import router as daily_digest_router
-from src.api.linkedin_routes import router as linkedin_router
-from src.api.contact_routes import router as contact_router
-from src.api.admin_routes import router as admin_router
-from src.api.user_routes import router as user_router
-from src.api.ops_routes import router as ops_router
-from src.api.telegram_routes import router as telegram_router
-from src.api.seo_routes import router as seo_router
-from src.billing.billing_routes import router as billing_router, stripe_webhook
-from src.db.migrations import run_migrations, run_seo_tables_migration, run_sources_migration, run_geri_migration, run_pro_delivery_migration, run_fix_skipped_alerts, run_signal_quality_migration, _recalculate_stale_bands, run_eriq_migration, run_lng_price_migration, run_stripe_mode_migration, run_lng_import_sources_migration, run_gas_storage_country_migration
+from src.api.lazy_routers import LazyRouters
+from src.api.import_profiler import IMPORT_PROFILE, log_import_profile
+from src.api.request_profiler import REQUEST_PROFILING, RequestProfilerMiddleware
+from src.db.migration_ledger import ensure_schema
+from src.db.db import arm_blocking_guard
+from src.db.query_metrics import enable_query_metrics
+from src.db.async_db import close_pools
+from src.jobs.runner import shutdown_job_runner
 from src.geri import ENABLE_GERI
-from src.geri.routes import router as geri_router
-from src.geri.live_routes import router as geri_live_router
 from src.reri import ENABLE_EERI
-from src.reri.routes import router as eeri_router
-from src.reri.seo_routes import router as eeri_seo_router
-from src.reri.pro_routes import router as eeri_pro_router
 from src.egsi.types import ENABLE_EGSI
-from src.egsi.routes import router as egsi_router
-from src.egsi.egsi_seo_routes import router as egsi_seo_router
 from src.eriq import ENABLE_ERIQ
-from src.api.eriq_routes import router as eriq_router
-from src.elsa.routes import router as elsa_router
-from src.api.signals_routes import router as signals_router
-from src.tickets.routes import router as tickets_router
-from src.blog.routes import router as blog_router
-from src.api.snapshot_routes import router as snapshot_router
-from src.api.forecast_routes import router as forecast_router
-from src.api.gas_storage_routes import router as gas_storage_router
-from src.api.gas_storage_germany_routes import router as gas_storage_germany_router
-from src.api.lng_routes import router as lng_router
-from src.api.jkm_routes import router as jkm_router
-from src.api.ttf_routes import router as ttf_router
-from src.api.brent_routes import router as brent_router
-from src.api.jkm_chart_routes import router as jkm_chart_router
-from src.api.lng_drivers_routes import router as lng_drivers_router
-from src.api.natgas_routes import router as natgas_router
-from src.api.wti_routes import router as wti_router
-from src.api.wti_widget_routes import router as wti_widget_router
-from src.api.gas_storage_widget_routes import router as gas_storage_widget_router
-from src.api.lng_widget_routes import router as lng_widget_router
-from src.api.geri_live_brent_routes import router as geri_live_brent_router
 
 logging.basicConfig(
     level=os.environ.get('LOG_LEVEL', 'INFO'),
@@ -148,6 +112,10 @@ class ClickjackingProtectionMiddleware(BaseHTTPMiddleware):
 
 app.add_middleware(ClickjackingProtectionMiddleware)
 
+# Outermost, so the timings include the other middleware.
+if REQUEST_PROFILING:
+    app.add_middleware(RequestProfilerMiddleware)
+
 STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
 
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
@@ -266,188 +234,128 @@ async def signals_landing_page():
     response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
     return response
 
-app.include_router(router)
-app.include_router(risk_router)
-app.include_router(alert_router)
-app.include_router(marketing_router)
-app.include_router(internal_router)
-app.include_router(digest_router)
-app.include_router(daily_digest_router)
-app.include_router(linkedin_router)
-app.include_router(contact_router)
-app.include_router(admin_router)
-app.include_router(user_router)
-app.include_router(ops_router)
-app.include_router(telegram_router)
-app.include_router(seo_router)
-app.include_router(billing_router)
-app.add_api_route("/api/v1/billing/webhook", stripe_webhook, methods=["POST"])
-app.include_router(signals_router)
+routers = LazyRouters(app)
+
+routers.include('src.api.routes')
+routers.include('src.api.risk_routes')
+routers.include('src.api.alert_routes')
+routers.include('src.api.marketing_routes')
+routers.include('src.api.internal_routes')
+routers.include('src.api.digest_routes')
+routers.include('src.api.daily_digest_routes')
+routers.include('src.api.linkedin_routes')
+routers.include('src.api.contact_routes')
+routers.include('src.api.admin_routes')
+routers.include('src.api.user_routes')
+routers.include('src.api.ops_routes')
+routers.include('src.api.telegram_routes')
+routers.include('src.api.seo_routes')
+routers.include('src.billing.billing_routes',
+                extra_routes=[("/api/v1/billing/webhook", "stripe_webhook", ["POST"])])
+routers.include('src.api.signals_routes')
 
 if ENABLE_GERI:
-    app.include_router(geri_router)
-    app.include_router(geri_live_router)
+    routers.include('src.geri.routes')
+    routers.include('src.geri.live_routes')
     logger.info("GERI module enabled - routes registered (including Live endpoints)")
 
 if ENABLE_EERI:
-    app.include_router(eeri_router)
-    app.include_router(eeri_seo_router)
-    app.include_router(eeri_pro_router)
+    routers.include('src.reri.routes')
+    routers.include('src.reri.seo_routes')
+    routers.include('src.reri.pro_routes')
     logger.info("EERI module enabled - routes registered (including Pro endpoints)")
 
 if ENABLE_EGSI:
-    app.include_router(egsi_router)
-    app.include_router(egsi_seo_router)
+    routers.include('src.egsi.routes')
+    routers.include('src.egsi.egsi_seo_routes')
     logger.info("EGSI module enabled - routes registered")
 
 if ENABLE_ERIQ:
-    app.include_router(eriq_router)
+    routers.include('src.api.eriq_routes')
     logger.info("ERIQ Expert Analyst module enabled - routes registered")
 
-app.include_router(elsa_router)
+routers.include('src.elsa.routes')
 logger.info("ELSA Marketing Bot module enabled - routes registered")
 
-app.include_router(tickets_router)
-app.include_router(blog_router)
-app.include_router(snapshot_router)
-app.include_router(forecast_router)
-app.include_router(gas_storage_router)
-app.include_router(gas_storage_germany_router)
-app.include_router(lng_router)
-app.include_router(jkm_router)
-app.include_router(ttf_router)
-app.include_router(brent_router)
-app.include_router(jkm_chart_router)
-app.include_router(lng_drivers_router)
-app.include_router(natgas_router)
-app.include_router(wti_router)
-app.include_router(wti_widget_router)
-app.include_router(gas_storage_widget_router)
-app.include_router(lng_widget_router)
-app.include_router(geri_live_brent_router)
-from src.api.contact_routes import run_contact_confirmation_migration
-try:
-    run_contact_confirmation_migration()
-except Exception as _e:
-    logger.error(f"contact confirmation migration error: {_e}")
-
-from src.api.brent_forecast_routes import router as brent_forecast_router, run_brent_forecast_migration
-app.include_router(brent_forecast_router)
-try:
-    run_brent_forecast_migration()
-except Exception as _e:
-    logger.error(f"brent_forecast migration error: {_e}")
-from src.api.wti_pro_widget_routes import router as wti_pro_widget_router, run_wti_pro_widget_migration
-app.include_router(wti_pro_widget_router)
-try:
-    run_wti_pro_widget_migration()
-except Exception as _e:
-    logger.error(f"wti_pro_widget migration error: {_e}")
-from src.api.lng_pro_widget_routes import router as lng_pro_widget_router, run_lng_pro_widget_migration
-app.include_router(lng_pro_widget_router)
-try:
-    run_lng_pro_widget_migration()
-except Exception as _e:
-    logger.error(f"lng_pro_widget migration error: {_e}")
-from src.api.gas_storage_pro_widget_routes import router as gas_storage_pro_widget_router, run_gas_storage_pro_widget_migration
-app.include_router(gas_storage_pro_widget_router)
-try:
-    run_gas_storage_pro_widget_migration()
-except Exception as _e:
-    logger.error(f"gas_storage_pro_widget migration error: {_e}")
-from src.api.indices_history_routes import router as indices_history_router, run_indices_history_migration
-app.include_router(indices_history_router)
-try:
-    run_indices_history_migration()
-except Exception as _e:
-    logger.error(f"indices_history migration error: {_e}")
-from src.api.daily_report_routes import router as daily_report_router, run_daily_report_migration
-app.include_router(daily_report_router)
-try:
-    run_daily_report_migration()
-except Exception as _e:
-    logger.error(f"daily_report migration error: {_e}")
-from src.api.alerts_access_routes import router as alerts_access_router, run_alerts_access_migration
-app.include_router(alerts_access_router)
-try:
-    run_alerts_access_migration()
-except Exception as _e:
-    logger.error(f"alerts_access migration error: {_e}")
-from src.api.geri_live_sub_routes import router as geri_live_sub_router, run_geri_live_sub_migration
-app.include_router(geri_live_sub_router)
-try:
-    run_geri_live_sub_migration()
-except Exception as _e:
-    logger.error(f"geri_live_sub migration error: {_e}")
-from src.api.widget_embed_tracking_routes import router as widget_embed_tracking_router, run_widget_embed_tracking_migration
-app.include_router(widget_embed_tracking_router)
-try:
-    run_widget_embed_tracking_migration()
-except Exception as _e:
-    logger.error(f"widget_embed_tracking migration error: {_e}")
-from src.api.user_activity_tracking_routes import router as user_activity_tracking_router, run_user_activity_migration
-app.include_router(user_activity_tracking_router)
-try:
-    run_user_activity_migration()
-except Exception as _e:
-    logger.error(f"user_activity migration error: {_e}")
+routers.include('src.tickets.routes')
+routers.include('src.blog.routes')
+routers.include('src.api.snapshot_routes')
+routers.include('src.api.forecast_routes')
+routers.include('src.api.gas_storage_routes')
+routers.include('src.api.gas_storage_germany_routes')
+routers.include('src.api.lng_routes')
+routers.include('src.api.jkm_routes')
+routers.include('src.api.ttf_routes')
+routers.include('src.api.brent_routes')
+routers.include('src.api.jkm_chart_routes')
+routers.include('src.api.lng_drivers_routes')
+routers.include('src.api.natgas_routes')
+routers.include('src.api.wti_routes')
+routers.include('src.api.wti_widget_routes')
+routers.include('src.api.gas_storage_widget_routes')
+routers.include('src.api.lng_widget_routes')
+routers.include('src.api.geri_live_brent_routes')
+
+routers.include('src.api.brent_forecast_routes')
+routers.include('src.api.wti_pro_widget_routes')
+routers.include('src.api.lng_pro_widget_routes')
+routers.include('src.api.gas_storage_pro_widget_routes')
+routers.include('src.api.indices_history_routes')
+routers.include('src.api.bulk_data_routes')
+routers.include('src.api.daily_report_routes')
+routers.include('src.api.alerts_access_routes')
+routers.include('src.api.geri_live_sub_routes')
+routers.include('src.api.widget_embed_tracking_routes')
+routers.include('src.api.user_activity_tracking_routes')
 logger.info("Tickets module enabled - routes registered")
 
 @app.on_event("startup")
 async def startup_event():
     logger.info("Starting EnergyRiskIQ API...")
     try:
-        run_migrations()
-        run_seo_tables_migration()
-        run_sources_migration()
-        run_geri_migration()
-        run_pro_delivery_migration()
-        run_fix_skipped_alerts()
-        run_lng_price_migration()
-        run_lng_import_sources_migration()
-        run_gas_storage_country_migration()
-        run_signal_quality_migration()
-        _recalculate_stale_bands()
-        run_stripe_mode_migration()
+        applied = ensure_schema()
+        if applied:
+            logger.info(f"Database migrations completed: {', '.join(applied)}")
         if ENABLE_ERIQ:
-            run_eriq_migration()
             logger.info("ERIQ Expert Analyst module is ENABLED")
-        from src.tickets.db import run_tickets_migration, auto_close_stale_tickets, auto_archive_closed_tickets
-        run_tickets_migration()
-        from src.blog.db import run_blog_migrations
-        run_blog_migrations()
-        try:
-            closed = auto_close_stale_tickets()
-            archived = auto_archive_closed_tickets()
-            if closed or archived:
-                logger.info(f"Ticket maintenance: {closed} auto-closed, {archived} auto-archived")
-        except Exception as e:
-            logger.warning(f"Ticket auto-maintenance skipped: {e}")
-        from src.api.admin_routes import _init_admin_sessions_table, _init_bulk_email_table
-        _init_admin_sessions_table()
-        _init_bulk_email_table()
-        from src.api.user_routes import _init_email_login_tokens_table, _init_password_reset_tokens_table, _init_last_login_column
-        _init_email_login_tokens_table()
-        _init_password_reset_tokens_table()
-        _init_last_login_column()
-        logger.info("Database migrations completed")
+        asyncio.create_task(asyncio.to_thread(_ticket_maintenance))
         app_url = os.environ.get("APP_URL", "")
         if app_url and os.environ.get("TELEGRAM_BOT_TOKEN"):
             from src.api.telegram_routes import setup_webhook
             setup_webhook(app_url.rstrip("/"))
-        from src.ingest.intraday_prices import run_intraday_migration
-        run_intraday_migration()
         if ENABLE_GERI:
-            from src.geri.live import run_geri_live_migration, run_geri_live_history_migration, periodic_geri_live_recompute
-            run_geri_live_migration()
-            run_geri_live_history_migration()
+            from src.geri.live import periodic_geri_live_recompute
             asyncio.create_task(periodic_geri_live_recompute())
             logger.info("GERI module is ENABLED (including Live + periodic recompute)")
         else:
             logger.info("GERI module is DISABLED (set ENABLE_GERI=true to enable)")
+        if routers.pending:
+            logger.info(f"{len(routers.pending)} route modules will load on first use")
+            asyncio.create_task(routers.warm_up())
+        if IMPORT_PROFILE:
+            asyncio.create_task(asyncio.to_thread(log_import_profile))
     except Exception as e:
         logger.error(f"Failed to run migrations: {e}")
         raise
+    arm_blocking_guard()
+    enable_query_metrics()
+
+
+def _ticket_maintenance():
+    try:
+        from src.tickets.db import auto_close_stale_tickets, auto_archive_closed_tickets
+        closed = auto_close_stale_tickets()
+        archived = auto_archive_closed_tickets()
+        if closed or archived:
+            logger.info(f"Ticket maintenance: {closed} auto-closed, {archived} auto-archived")
+    except Exception as e:
+        logger.warning(f"Ticket auto-maintenance skipped: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_job_runner()
+    close_pools()
 
 if __name__ == "__main__":
     import uvicorn
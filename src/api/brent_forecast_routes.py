@@ -13,7 +13,6 @@ login, 40% recurring referral commission (€3.20/invoice) tracked in
 import os
 import re
 import json
-import time
 import logging
 import secrets
 import string
@@ -27,6 +26,14 @@ from fastapi.responses import HTMLResponse, FileResponse
 from pydantic import BaseModel
 
 from src.db.db import get_cursor
+from src.billing.entitlements import email_entitlements_changed
+from src.market.brent_scenario import (
+    DEMAND as _DEMAND,
+    MIN_ANALOG_SHIFT,
+    SUPPLY_SHOCKS as _SUPPLY_SHOCKS,
+    compute_scenario as _compute_scenario,
+    get_scenario_artifact,
+)
 from src.billing.stripe_client import (
     get_stripe_mode, ensure_stripe_initialized,
 )
@@ -335,185 +342,17 @@ async def brent_forecast_market():
 # Scenario model
 # ─────────────────────────────────────────────────────────────────────────────
 
-# Elasticities: % Brent response per 100% driver change, dampened by horizon.
-_GERI_ELASTICITY = 0.085
-_VIX_ELASTICITY = -0.028   # rising fear alone weighs on demand outlook
-_GAS_ELASTICITY = 0.030
-_SUPPLY_SHOCKS = {          # preset → direct % impact on Brent
-    "normal": 0.0, "opec_cut": 4.5, "hormuz": 12.0,
-    "pipeline_attack": 3.0, "sanctions": 5.5,
-}
-_DEMAND = {"weak": -2.5, "neutral": 0.0, "strong": 2.5}
-_HORIZONS = {
-    "24_48h": {"factor": 0.55, "band": 0.02, "confidence": 78},
-    "0_24h":  {"factor": 0.35, "band": 0.015, "confidence": 84},
-    "72h":    {"factor": 0.75, "band": 0.03, "confidence": 66},
-    "7d":     {"factor": 1.0,  "band": 0.045, "confidence": 58},
-}
+# The model, history mining and analog matching live in
+# src/market/brent_scenario.py; the history-derived parts are served from a
+# per-data-day artifact shared across workers.
 
-# ─────────────────────────────────────────────────────────────────────────────
-# Real-data historical analog engine (production DB: intel_indices_daily +
-# oil_price_snapshots + vix_snapshots). Episodes of significant GERI shifts
-# are mined from the actual index history and paired with the real Brent
-# reaction. If no relevant episode matches a scenario, no analogs are shown.
-# ─────────────────────────────────────────────────────────────────────────────
-
-_HIST_CACHE = {"at": 0.0, "rows": None, "episodes": None, "sensitivity": None}
-_HIST_TTL = 3600  # seconds
-
-
-def _load_history():
-    """Daily joined GERI / Brent / VIX history, cached for 1 hour."""
-    now = time.time()
-    if _HIST_CACHE["rows"] is not None and now - _HIST_CACHE["at"] < _HIST_TTL:
-        return _HIST_CACHE["rows"]
-    rows = []
+def _historical_sensitivity():
+    """GERI/VIX -> Brent regression slopes from the current scenario artifact."""
     try:
-        with get_cursor(commit=False) as cur:
-            cur.execute("""
-                SELECT g.date, g.value AS geri, o.brent_price AS brent, v.vix_close AS vix
-                FROM intel_indices_daily g
-                LEFT JOIN oil_price_snapshots o ON o.date = g.date
-                LEFT JOIN vix_snapshots v ON v.date = g.date
-                WHERE g.index_id = 'global:geo_energy_risk'
-                ORDER BY g.date
-            """)
-            for r in cur.fetchall():
-                rows.append({
-                    "date": r["date"],
-                    "geri": int(r["geri"]) if r["geri"] is not None else None,
-                    "brent": float(r["brent"]) if r["brent"] is not None else None,
-                    "vix": float(r["vix"]) if r["vix"] is not None else None,
-                })
+        return get_scenario_artifact().sensitivity
     except Exception as e:
-        logger.error(f"Brent analog history load failed: {e}")
-        return _HIST_CACHE["rows"] or []
-    _HIST_CACHE.update({"at": now, "rows": rows, "episodes": None, "sensitivity": None})
-    return rows
-
-
-def _brent_near(rows, idx, max_span=4):
-    """Nearest non-null Brent price at/around rows[idx]."""
-    n = len(rows)
-    for off in range(max_span + 1):
-        for j in (idx + off, idx - off):
-            if 0 <= j < n and rows[j]["brent"] is not None:
-                return rows[j]["brent"]
-    return None
-
-
-def _mine_episodes():
-    """Detect significant GERI shift episodes and their real Brent reaction."""
-    if _HIST_CACHE["episodes"] is not None and time.time() - _HIST_CACHE["at"] < _HIST_TTL:
-        return _HIST_CACHE["episodes"]
-    rows = _load_history()
-    episodes = []
-    n = len(rows)
-    i = 7
-    while i < n:
-        base_row, cur_row = rows[i - 7], rows[i]
-        if base_row["geri"] is None or cur_row["geri"] is None:
-            i += 1
-            continue
-        delta = cur_row["geri"] - base_row["geri"]
-        if abs(delta) < 15:
-            i += 1
-            continue
-        # extend to local extreme
-        j = i
-        while (j + 1 < n and rows[j + 1]["geri"] is not None
-               and ((delta > 0 and rows[j + 1]["geri"] >= rows[j]["geri"])
-                    or (delta < 0 and rows[j + 1]["geri"] <= rows[j]["geri"]))):
-            j += 1
-        start, peak = i - 7, j
-        base_g, peak_g = rows[start]["geri"], rows[peak]["geri"]
-        shift_pts = peak_g - base_g
-        shift_pct = round(shift_pts / max(base_g, 5) * 100.0)
-        b_before = _brent_near(rows, start)
-        b_peak = _brent_near(rows, peak)
-        b_2d = _brent_near(rows, min(peak + 2, n - 1)) if peak + 2 < n + 4 else None
-        b_7d = _brent_near(rows, peak + 7) if peak + 7 < n else None
-        b_30d = _brent_near(rows, peak + 30) if peak + 30 < n else None
-
-        def _pct(a, b):
-            return round((b - a) / a * 100.0, 1) if (a and b) else None
-
-        # risk faded: GERI back within 30% of base within 21 days after peak
-        faded = None
-        for k in range(peak + 1, min(peak + 22, n)):
-            g = rows[k]["geri"]
-            if g is None:
-                continue
-            if (shift_pts > 0 and g <= base_g + 0.3 * shift_pts) or \
-               (shift_pts < 0 and g >= base_g + 0.3 * shift_pts):
-                faded = (rows[k]["date"] - rows[peak]["date"]).days
-                break
-        if faded is None and peak + 21 >= n:
-            faded_state = "recent"      # too recent to judge
-        elif faded is None:
-            faded_state = "persisted"
-        else:
-            faded_state = "faded"
-
-        direction = "surge" if shift_pts > 0 else "drop"
-        episodes.append({
-            "label": f"{rows[start]['date']:%d %b %Y} — GERI {direction} "
-                     f"{'+' if shift_pts > 0 else ''}{shift_pts} pts ({base_g} → {peak_g})",
-            "period": f"{rows[start]['date']:%b %Y}",
-            "start_date": rows[start]["date"].isoformat(),
-            "peak_date": rows[peak]["date"].isoformat(),
-            "duration_days": (rows[peak]["date"] - rows[start]["date"]).days,
-            "geri_shift_pts": shift_pts,
-            "geri_shift_pct": shift_pct,
-            "brent_before": round(b_before, 2) if b_before else None,
-            "brent_at_peak": round(b_peak, 2) if b_peak else None,
-            "brent_after_7d": round(b_7d, 2) if b_7d else None,
-            "brent_after_30d": round(b_30d, 2) if b_30d else None,
-            "move_to_peak_pct": _pct(b_before, b_peak),
-            "move_7d_pct": _pct(b_peak, b_7d),
-            "move_30d_pct": _pct(b_peak, b_30d),
-            "risk_state": faded_state,
-            "faded_after_days": faded,
-        })
-        i = j + 8
-    _HIST_CACHE["episodes"] = episodes
-    return episodes
-
-
-def _historical_sensitivity():
-    """Regression slope of daily Brent % change vs daily GERI point change,
-    and vs daily VIX % change, from real history."""
-    if _HIST_CACHE["sensitivity"] is not None and time.time() - _HIST_CACHE["at"] < _HIST_TTL:
-        return _HIST_CACHE["sensitivity"]
-    rows = _load_history()
-    g_pairs, v_pairs = [], []
-    prev = None
-    for r in rows:
-        if prev and r["brent"] and prev["brent"]:
-            b_ret = (r["brent"] - prev["brent"]) / prev["brent"] * 100.0
-            if r["geri"] is not None and prev["geri"] is not None:
-                g_pairs.append((r["geri"] - prev["geri"], b_ret))
-            if r["vix"] and prev["vix"]:
-                v_pairs.append(((r["vix"] - prev["vix"]) / prev["vix"] * 100.0, b_ret))
-        prev = r
-
-    def _slope(pairs):
-        if len(pairs) < 20:
-            return None
-        mx = sum(p[0] for p in pairs) / len(pairs)
-        my = sum(p[1] for p in pairs) / len(pairs)
-        var = sum((p[0] - mx) ** 2 for p in pairs)
-        if var == 0:
-            return None
-        return sum((p[0] - mx) * (p[1] - my) for p in pairs) / var
-
-    sens = {
-        "geri_slope_pct_per_pt": _slope(g_pairs),   # Brent % per 1 GERI pt
-        "vix_slope_pct_per_pct": _slope(v_pairs),   # Brent % per 1% VIX chg
-        "sample_days": len(g_pairs),
-    }
-    _HIST_CACHE["sensitivity"] = sens
-    return sens
+        logger.error(f"Brent sensitivity unavailable: {e}")
+        return {"geri_slope_pct_per_pt": None, "vix_slope_pct_per_pct": None, "sample_days": 0}
 
 
 def _clamp(v, lo, hi):
@@ -537,75 +376,13 @@ def _confidence_reasons(geri_pct, vix_pct, extra_drivers=False):
 def _match_analogs(scenario_shift_pct):
     """Match real mined episodes against the scenario's GERI shift (%).
     Returns [] when the scenario is too small or nothing matches well."""
-    if abs(scenario_shift_pct) < 8:
+    if abs(scenario_shift_pct) < MIN_ANALOG_SHIFT:
         return []
     try:
-        episodes = _mine_episodes()
+        return get_scenario_artifact().analogs(scenario_shift_pct)
     except Exception as e:
         logger.error(f"Analog mining failed: {e}")
         return []
-    scored = []
-    for ep in episodes:
-        ep_shift = ep["geri_shift_pct"]
-        if ep_shift == 0:
-            continue
-        same_dir = (ep_shift > 0) == (scenario_shift_pct > 0)
-        diff = abs(abs(ep_shift) - abs(scenario_shift_pct))
-        score = 100 - min(diff, 100) * 0.55 - (0 if same_dir else 45)
-        score = _clamp(int(round(score)), 0, 97)
-        if score < 55:
-            continue
-        explanation = (
-            f"Scenario models a {'+' if scenario_shift_pct > 0 else ''}{int(scenario_shift_pct)}% GERI shift; "
-            f"this real episode saw {'+' if ep_shift > 0 else ''}{ep_shift}% "
-            f"({'same' if same_dir else 'opposite'} direction, "
-            f"{diff:.0f} pp magnitude difference).")
-        scored.append({**ep, "match_pct": score, "similarity_explanation": explanation})
-    scored.sort(key=lambda x: -x["match_pct"])
-    return scored[:3]
-
-
-def _compute_scenario(brent, geri_pct, vix_pct, gas_pct=0.0,
-                      supply="normal", demand="neutral"):
-    """Returns per-horizon projections + attribution (all % on full horizon)."""
-    geri_impact = _GERI_ELASTICITY * geri_pct
-    vix_impact = _VIX_ELASTICITY * vix_pct
-    # sustained fear >+40% starts adding a risk premium instead
-    if vix_pct > 40:
-        vix_impact = 0.012 * (vix_pct - 40) + _VIX_ELASTICITY * 40
-    gas_impact = _GAS_ELASTICITY * gas_pct
-    supply_impact = _SUPPLY_SHOCKS.get(supply, 0.0)
-    demand_impact = _DEMAND.get(demand, 0.0)
-    total_pct = geri_impact + vix_impact + gas_impact + supply_impact + demand_impact
-    total_pct = _clamp(total_pct, -35.0, 45.0)
-
-    horizons = {}
-    for hz, cfg in _HORIZONS.items():
-        move = total_pct * cfg["factor"] / 100.0
-        mid = brent * (1 + move)
-        band = cfg["band"] * (1 + min(abs(total_pct) / 25.0, 1.2))
-        lo, hi = mid * (1 - band), mid * (1 + band)
-        conf = _clamp(int(cfg["confidence"] - abs(total_pct) * 0.45), 35, 90)
-        bias = "Bullish" if total_pct > 1.5 else "Bearish" if total_pct < -1.5 else "Neutral"
-        bull_prob = _clamp(int(round(50 + total_pct * 1.6)), 8, 92)
-        tail_dir = 1 if total_pct >= 0 else -1
-        tail = mid * (1 + tail_dir * band * 2.3)
-        horizons[hz] = {
-            "expected_low": round(lo, 2), "expected_high": round(hi, 2),
-            "most_likely": round(mid, 2), "move_pct": round(move * 100, 2),
-            "diff_vs_current": round(mid - brent, 2),
-            "bias": bias, "bullish_probability": bull_prob, "confidence": conf,
-            "distribution": {
-                "bearish": round(lo, 2), "base": round(mid, 2),
-                "bullish": round(hi, 2), "tail_risk": round(tail, 2),
-            },
-        }
-    attribution = {
-        "geri": round(geri_impact, 2), "vix": round(vix_impact, 2),
-        "gas_stress": round(gas_impact, 2), "supply": round(supply_impact, 2),
-        "demand": round(demand_impact, 2), "total": round(total_pct, 2),
-    }
-    return horizons, attribution, total_pct
 
 
 def _risk_score(snap, geri_pct, gas_pct, supply, demand):
@@ -1036,10 +813,12 @@ async def evaluate_alerts(x_brent_token: Optional[str] = Header(None)):
         horizons, _attr, _tp = _compute_scenario(brent, 0, 0)
         baseline_bias = horizons["24_48h"]["bias"]
     if "analog_match_above" in types_present:
-        rows = _load_history()
-        recent = [r for r in rows[-8:] if r["geri"] is not None]
-        if len(recent) >= 2 and recent[0]["geri"]:
-            shift = (recent[-1]["geri"] - recent[0]["geri"]) / max(recent[0]["geri"], 5) * 100
+        try:
+            shift = get_scenario_artifact().recent_shift
+        except Exception as e:
+            logger.error(f"Brent scenario artifact unavailable: {e}")
+            shift = None
+        if shift is not None:
             matches = _match_analogs(shift)
             best_match = matches[0]["match_pct"] if matches else None
 
@@ -1402,6 +1181,7 @@ async def brent_confirm(session_id: str):
         sub_status=(sub.get("status") if isinstance(sub, dict) else None) or "trialing",
         livemode=bool(session.get("livemode")),
         ref=(session.get("metadata") or {}).get("ref"))
+    email_entitlements_changed(result["user"]["email"])
     if result["created"] and result["password"]:
         _send_welcome_email(result["user"]["email"], result["password"])
     token = _create_session(result["user"]["id"])
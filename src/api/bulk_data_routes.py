@@ -0,0 +1,128 @@
+"""
+Bulk Data API — Parquet / Arrow IPC history for the indices and market tables.
+
+For enterprise accounts and Indices History subscribers who load history into
+dataframes. See src/api/columnar.py for the published datasets and encoding.
+
+Routes:
+  GET /api/bulk/datasets     — published datasets and their columns
+  GET /api/bulk/{dataset}    — ?fmt=parquet|arrow &columns=a,b &start= &end=
+
+Every response carries a strong ETag derived from the range's max date, row
+count and a digest of its rows, so a client that re-pulls with If-None-Match
+gets a 304 after one aggregate query, and a corrected day changes the tag. Encoded payloads are also kept in a
+small in-process LRU keyed by that ETag (BULK_DATA_CACHE_SIZE entries), so
+repeated pulls of an unchanged range skip the SELECT and the encode.
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response
+
+from src.api import columnar
+from src.billing.entitlements import get_active_session
+from src.db.async_db import AsyncDB, get_async_production_db, run_db
+from src.seo.snapshot_store import etag_matches
+
+router = APIRouter(tags=["bulk-data"])
+logger = logging.getLogger(__name__)
+
+BULK_DATA_CACHE_SIZE = int(os.environ.get("BULK_DATA_CACHE_SIZE", "32"))
+BULK_DATA_PLANS = ("enterprise",)
+BULK_DATA_FEATURE = "indices_history"
+
+_payloads: "OrderedDict[str, bytes]" = OrderedDict()
+_payloads_lock = threading.Lock()
+
+
+def _cached(tag: str) -> Optional[bytes]:
+    with _payloads_lock:
+        body = _payloads.get(tag)
+        if body is not None:
+            _payloads.move_to_end(tag)
+        return body
+
+
+def _store(tag: str, body: bytes) -> None:
+    if BULK_DATA_CACHE_SIZE <= 0:
+        return
+    with _payloads_lock:
+        _payloads[tag] = body
+        _payloads.move_to_end(tag)
+        while len(_payloads) > BULK_DATA_CACHE_SIZE:
+            _payloads.popitem(last=False)
+
+
+def _bulk_data_user(token: Optional[str]):
+    """Session user if the account is on an enterprise plan or holds Indices History."""
+    session = get_active_session(token)
+    if not session:
+        raise HTTPException(401, "Authentication required")
+    if session.plan not in BULK_DATA_PLANS and not session.has(BULK_DATA_FEATURE):
+        raise HTTPException(402, "Enterprise plan or Indices History subscription required")
+    return session.user
+
+
+def _encode(columns, rows, fmt: str) -> bytes:
+    return columnar.encode(columnar.to_table(columns, rows), fmt)
+
+
+@router.get("/api/bulk/datasets")
+async def list_datasets():
+    return {
+        "formats": list(columnar.FORMATS),
+        "datasets": [
+            {"name": d.name, "label": d.label, "columns": d.column_names}
+            for d in columnar.DATASETS.values()
+        ],
+    }
+
+
+@router.get("/api/bulk/{dataset}")
+async def bulk_dataset(
+    dataset: str,
+    fmt: str = Query("parquet"),
+    columns: Optional[str] = Query(None, description="Comma-separated projection; date is always included"),
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    x_user_token: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncDB = Depends(get_async_production_db),
+):
+    await run_db(_bulk_data_user, x_user_token)
+
+    spec = columnar.DATASETS.get(dataset)
+    if not spec:
+        raise HTTPException(404, "Unknown dataset")
+    fmt = (fmt or "parquet").lower()
+    if fmt not in columnar.FORMATS:
+        raise HTTPException(400, "Unknown format")
+    if start and end and start > end:
+        raise HTTPException(400, "start must not be after end")
+    try:
+        projection = columnar.project(spec, columns)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    version = await db.fetch_one(*columnar.version_query(spec, start, end))
+    tag = columnar.etag(spec, projection, fmt, start, end, version or {})
+    headers = {"ETag": tag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, tag):
+        return Response(status_code=304, headers=headers)
+
+    body = _cached(tag)
+    if body is None:
+        rows = await db.fetch_all(*columnar.select_query(spec, projection, start, end))
+        body = await run_db(_encode, projection, rows, fmt)
+        _store(tag, body)
+
+    media_type, ext = columnar.FORMATS[fmt]
+    max_date = version.get("max_date") if version else None
+    filename = f"{spec.name}_{max_date.isoformat() if max_date else 'empty'}.{ext}"
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return Response(content=body, media_type=media_type, headers=headers)
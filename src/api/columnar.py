@@ -0,0 +1,215 @@
+"""
+Columnar Bulk Data
+
+Parquet and Arrow IPC encodings of the daily index tables (GERI, EERI,
+EGSI-M, EGSI-S) and the market snapshot tables, for clients that load
+history straight into a dataframe instead of walking dict-per-row JSON.
+
+- DATASETS: the published tables. Each column maps a public name to a SQL
+  expression (NUMERIC is cast to float8 in SQL, so rows arrive as floats)
+  and an Arrow type. Only these columns can be projected, so no request
+  value is ever interpolated into SQL.
+- select_query / version_query: the projected, date-bounded SELECT and the
+  max(date)/count/content-digest query the ETag is derived from. Writers
+  upsert revised days in place (ON CONFLICT (date) DO UPDATE) without
+  touching created_at, so the digest is taken over the rows themselves.
+- encode: rows -> pyarrow Table -> Parquet (zstd, dictionary-encoded
+  strings) or Arrow IPC file (zstd buffers) bytes.
+
+Consumers:
+    pd.read_parquet(io.BytesIO(body))
+    pyarrow.ipc.open_file(body).read_all().to_pandas()
+
+Served by src/api/bulk_data_routes.py. scripts/bench_bulk_data.py compares
+payload size and encode time against the JSON/CSV endpoints.
+"""
+import hashlib
+import io
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+FORMATS = {
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.file', 'arrow'),
+}
+COMPRESSION = 'zstd'
+COMPRESSION_LEVEL = 9  # payloads are cached per ETag, so encode time matters less than size
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    sql: str
+    type: str  # 'date', 'timestamp', 'float', 'int' or 'string'
+
+
+@dataclass(frozen=True)
+class Dataset:
+    name: str
+    label: str
+    table: str
+    columns: Tuple[Column, ...]
+    date_column: str = 'date'
+    where: Optional[str] = None
+
+    @property
+    def column_names(self) -> List[str]:
+        return [c.name for c in self.columns]
+
+
+def _col(name: str, type_: str, sql: Optional[str] = None) -> Column:
+    if sql is None:
+        sql = f"{name}::float8" if type_ == 'float' else name
+    return Column(name, sql if sql == name else f"{sql} AS {name}", type_)
+
+
+def _index(name: str, label: str, table: str, where: Optional[str] = None,
+           date_column: str = 'date', value_column: str = 'value') -> Dataset:
+    return Dataset(name, label, table, (
+        _col('date', 'date', date_column),
+        _col('value', 'float', f"{value_column}::float8"),
+        _col('band', 'string'),
+        _col('trend_1d', 'float'),
+        _col('trend_7d', 'float'),
+        _col('computed_at', 'timestamp'),
+    ), date_column=date_column, where=where)
+
+
+def _snapshot(name: str, label: str, table: str, columns: Sequence[Column]) -> Dataset:
+    return Dataset(name, label, table, (_col('date', 'date'), *columns, _col('created_at', 'timestamp')))
+
+
+DATASETS: Dict[str, Dataset] = {d.name: d for d in [
+    _index('geri', 'GERI', 'intel_indices_daily', where="index_id = 'global:geo_energy_risk'"),
+    _index('eeri', 'EERI', 'reri_indices_daily', where="index_id = 'europe:eeri'"),
+    _index('egsi_m', 'EGSI-M', 'egsi_m_daily', where="region = 'Europe'",
+           date_column='index_date', value_column='index_value'),
+    _index('egsi_s', 'EGSI-S', 'egsi_s_daily', where="region = 'Europe'",
+           date_column='index_date', value_column='index_value'),
+    _snapshot('oil', 'Brent / WTI', 'oil_price_snapshots', [
+        _col('brent_price', 'float'), _col('brent_change_24h', 'float'), _col('brent_change_pct', 'float'),
+        _col('wti_price', 'float'), _col('wti_change_24h', 'float'), _col('wti_change_pct', 'float'),
+        _col('brent_wti_spread', 'float'), _col('source', 'string'),
+    ]),
+    _snapshot('ttf', 'TTF Gas', 'ttf_gas_snapshots', [
+        _col('ttf_price', 'float'), _col('currency', 'string'), _col('unit', 'string'), _col('source', 'string'),
+    ]),
+    _snapshot('jkm', 'LNG (JKM)', 'lng_price_snapshots', [
+        _col('jkm_price', 'float'), _col('jkm_change_24h', 'float'), _col('jkm_change_pct', 'float'),
+        _col('source', 'string'),
+    ]),
+    _snapshot('vix', 'VIX', 'vix_snapshots', [
+        _col('vix_close', 'float'), _col('vix_open', 'float'), _col('vix_high', 'float'),
+        _col('vix_low', 'float'), _col('source', 'string'),
+    ]),
+    _snapshot('eurusd', 'EUR/USD', 'eurusd_snapshots', [
+        _col('rate', 'float'), _col('currency_pair', 'string'), _col('source', 'string'),
+    ]),
+    _snapshot('gas_storage', 'EU Gas Storage', 'gas_storage_snapshots', [
+        _col('eu_storage_percent', 'float'), _col('seasonal_norm', 'float'),
+        _col('deviation_from_norm', 'float'), _col('refill_speed_7d', 'float'),
+        _col('withdrawal_rate_7d', 'float'), _col('winter_deviation_risk', 'string'),
+        _col('days_to_target', 'int'), _col('risk_score', 'int'), _col('risk_band', 'string'),
+    ]),
+]}
+
+
+def project(dataset: Dataset, columns: Optional[str]) -> List[Column]:
+    """Columns named in a comma-separated projection (all when empty); date is always included.
+
+    Raises ValueError naming any column the dataset doesn't publish.
+    """
+    if not columns:
+        return list(dataset.columns)
+    wanted = {name.strip() for name in columns.split(',') if name.strip()}
+    unknown = wanted - set(dataset.column_names)
+    if unknown:
+        raise ValueError(f"Unknown column(s) for {dataset.name}: {', '.join(sorted(unknown))}")
+    wanted.add('date')
+    return [c for c in dataset.columns if c.name in wanted]
+
+
+def _where(dataset: Dataset, start: Optional[date], end: Optional[date]) -> Tuple[str, List]:
+    clauses = [f"{dataset.date_column} IS NOT NULL"]
+    params: List = []
+    if dataset.where:
+        clauses.append(dataset.where)
+    if start:
+        clauses.append(f"{dataset.date_column} >= %s")
+        params.append(start)
+    if end:
+        clauses.append(f"{dataset.date_column} <= %s")
+        params.append(end)
+    return ' AND '.join(clauses), params
+
+
+def select_query(dataset: Dataset, columns: Sequence[Column],
+                 start: Optional[date] = None, end: Optional[date] = None) -> Tuple[str, Tuple]:
+    where, params = _where(dataset, start, end)
+    sql = (f"SELECT {', '.join(c.sql for c in columns)} FROM {dataset.table} "
+           f"WHERE {where} ORDER BY {dataset.date_column}")
+    return sql, tuple(params)
+
+
+def version_query(dataset: Dataset, start: Optional[date] = None,
+                  end: Optional[date] = None) -> Tuple[str, Tuple]:
+    """
+    max(date), row count and an md5 of every row in the range: what the ETag
+    changes with. The digest catches in-place corrections of existing days.
+    """
+    where, params = _where(dataset, start, end)
+    sql = (f"SELECT max({dataset.date_column}) AS max_date, count(*) AS row_count, "
+           f"md5(string_agg(t::text, ',' ORDER BY t.{dataset.date_column})) AS content_md5 "
+           f"FROM {dataset.table} t WHERE {where}")
+    return sql, tuple(params)
+
+
+def etag(dataset: Dataset, columns: Sequence[Column], fmt: str, start: Optional[date],
+         end: Optional[date], version: Dict) -> str:
+    """Strong ETag for one projection/range/format of a dataset at the given version row."""
+    key = '|'.join(str(part) for part in (
+        dataset.name, ','.join(c.name for c in columns), fmt, start, end,
+        version.get('max_date'), version.get('row_count'), version.get('content_md5'),
+    ))
+    return f'"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+
+def _arrow_type(type_: str):
+    import pyarrow as pa
+
+    return {
+        'date': pa.date32(),
+        'timestamp': pa.timestamp('us'),
+        'float': pa.float64(),
+        'int': pa.int32(),
+        'string': pa.string(),
+    }[type_]
+
+
+def to_table(columns: Sequence[Column], rows: Sequence):
+    """pyarrow Table from cursor rows (mappings keyed by column name), built column by column."""
+    import pyarrow as pa
+
+    return pa.table({
+        c.name: pa.array([r[c.name] for r in rows], type=_arrow_type(c.type))
+        for c in columns
+    })
+
+
+def encode(table, fmt: str) -> bytes:
+    """Serialize a pyarrow Table as Parquet or an Arrow IPC file."""
+    import pyarrow as pa
+
+    buf = io.BytesIO()
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(table, buf, compression=COMPRESSION, compression_level=COMPRESSION_LEVEL,
+                       use_dictionary=True)
+    elif fmt == 'arrow':
+        options = pa.ipc.IpcWriteOptions(compression=pa.Codec(COMPRESSION, COMPRESSION_LEVEL))
+        with pa.ipc.new_file(buf, table.schema, options=options) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+    return buf.getvalue()
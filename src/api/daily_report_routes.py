@@ -19,6 +19,7 @@ import stripe
 from fastapi import APIRouter, Header, HTTPException
 
 from src.db.db import get_cursor
+from src.billing.entitlements import entitlements_changed, get_entitlements
 from src.billing.stripe_client import (
     init_stripe,
     ensure_stripe_initialized,
@@ -230,13 +231,7 @@ def _trial_eligible(row) -> bool:
 def user_has_daily_report(user_id: int) -> bool:
     """Mode-agnostic entitlement check for the gated digest content."""
     try:
-        with get_cursor(commit=False) as cur:
-            cur.execute(
-                "SELECT status FROM user_daily_report_subs WHERE user_id = %s",
-                (user_id,)
-            )
-            row = cur.fetchone()
-        return _is_active(row)
+        return get_entitlements(user_id).active("daily_report")
     except Exception:
         return False
 
@@ -411,6 +406,7 @@ async def confirm(x_user_token: Optional[str] = Header(None)):
             WHERE id = %s
         """, (subscription_id, customer_id, local_status, period_end_dt,
               matched_mode, row["id"]))
+    entitlements_changed(user["id"])
     logger.info(f"Daily report subscription activated via confirm for user {user['id']}")
     return {
         "active": local_status in ("active", "trialing", "canceling"),
@@ -440,6 +436,7 @@ async def cancel(x_user_token: Optional[str] = Header(None)):
                 "updated_at = NOW() WHERE id = %s",
                 (row["id"],)
             )
+        entitlements_changed(user["id"])
         return {"canceled_at_period_end": True,
                 "current_period_end": sub.get("current_period_end")}
     except Exception as e:
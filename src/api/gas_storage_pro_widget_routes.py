@@ -31,6 +31,7 @@ from fastapi.responses import HTMLResponse, PlainTextResponse
 from pydantic import BaseModel
 
 from src.db.db import get_cursor, execute_production_one, execute_production_query
+from src.billing.entitlements import entitlements_changed
 from src.billing.stripe_client import (
     init_stripe,
     ensure_stripe_initialized,
@@ -466,6 +467,7 @@ async def widget_confirm(x_user_token: Optional[str] = Header(None)):
             WHERE id = %s
         """, (subscription_id, customer_id, local_status, period_end_dt,
               matched_mode, row["id"]))
+    entitlements_changed(user["id"])
     logger.info(f"Gas Storage Pro Widget activated via confirm for user {user['id']}")
     return {
         "active": local_status in ("active", "trialing", "canceling"),
@@ -552,6 +554,7 @@ async def widget_cancel(x_user_token: Optional[str] = Header(None)):
                 "WHERE id = %s",
                 (row["id"],)
             )
+        entitlements_changed(user["id"])
         return {"canceled_at_period_end": True,
                 "current_period_end": sub.get("current_period_end")}
     except Exception as e:
@@ -26,6 +26,7 @@ import stripe
 from fastapi import APIRouter, Header, HTTPException
 
 from src.db.db import get_cursor
+from src.billing.entitlements import entitlements_changed, get_entitlements
 from src.billing.stripe_client import (
     init_stripe,
     ensure_stripe_initialized,
@@ -316,13 +317,7 @@ def user_has_geri_live(user_id: int) -> bool:
     """Mode-agnostic runtime entitlement check for GERI Live and its launch
     bonus (Daily Intelligence Report, Pro Widgets, Indices History)."""
     try:
-        with get_cursor(commit=False) as cur:
-            cur.execute(
-                "SELECT status FROM user_geri_live_subs WHERE user_id = %s",
-                (user_id,)
-            )
-            row = cur.fetchone()
-        return _is_active(row)
+        return get_entitlements(user_id).active("geri_live")
     except Exception:
         return False
 
@@ -515,6 +510,7 @@ async def confirm(x_user_token: Optional[str] = Header(None)):
             WHERE id = %s
         """, (subscription_id, customer_id, local_status, period_end_dt,
               matched_mode, row["id"]))
+    entitlements_changed(user["id"])
     logger.info(f"GERI Live subscription activated via confirm for user {user['id']}")
     return {
         "active": local_status in ("active", "trialing", "canceling"),
@@ -544,6 +540,7 @@ async def cancel(x_user_token: Optional[str] = Header(None)):
                 "updated_at = NOW() WHERE id = %s",
                 (row["id"],)
             )
+        entitlements_changed(user["id"])
         return {"canceled_at_period_end": True,
                 "current_period_end": sub.get("current_period_end")}
     except Exception as e:
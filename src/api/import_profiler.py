@@ -0,0 +1,115 @@
+"""
+Import-time profiler
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+reports where the time went: the slowest modules by cumulative time (the
+module plus everything it pulled in first) and self time summed per
+top-level package, which is how heavy SDKs (stripe, openai, pandas) show up.
+
+Usage:
+    python -m src.api.import_profiler                  # profile src.api.app
+    python -m src.api.import_profiler src.api.seo_routes --top 40
+    LAZY_ROUTERS=false python -m src.api.import_profiler
+
+With IMPORT_PROFILE=true the API logs the same report for its own import
+in the background after startup.
+"""
+import argparse
+import logging
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+IMPORT_PROFILE = os.environ.get('IMPORT_PROFILE', 'false').lower() == 'true'
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.module.split('.')[0]
+
+
+def parse_importtime(text: str) -> List[ImportTiming]:
+    """Parse -X importtime output (stderr) into one entry per imported module."""
+    timings = []
+    for line in text.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            timings.append(ImportTiming(module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return timings
+
+
+def profile_imports(module: str = 'src.api.app', env: Optional[Dict[str, str]] = None,
+                    timeout: float = 120.0) -> List[ImportTiming]:
+    """Import `module` in a fresh interpreter with -X importtime and parse the result."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=_ROOT_DIR, env={**os.environ, **(env or {})},
+        capture_output=True, text=True, timeout=timeout,
+    )
+    if result.returncode != 0:
+        tail = result.stderr.strip().splitlines()[-1:] or ['no output']
+        raise RuntimeError(f"import {module} failed: {tail[0]}")
+    return parse_importtime(result.stderr)
+
+
+def package_totals(timings: List[ImportTiming]) -> Dict[str, int]:
+    """Self time in microseconds summed per top-level package, largest first."""
+    totals: Dict[str, int] = defaultdict(int)
+    for timing in timings:
+        totals[timing.package] += timing.self_us
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def format_report(timings: List[ImportTiming], module: str = 'src.api.app', top: int = 25) -> str:
+    total_us = sum(t.self_us for t in timings)
+    lines = [f"Import profile for {module}: {len(timings)} modules, {total_us / 1000:.0f}ms total"]
+
+    lines.append(f"\n{'cumulative':>11s} {'self':>8s}  module")
+    for timing in sorted(timings, key=lambda t: -t.cumulative_us)[:top]:
+        lines.append(f"{timing.cumulative_us / 1000:9.1f}ms {timing.self_us / 1000:6.1f}ms  "
+                     f"{'  ' * timing.depth}{timing.module}")
+
+    lines.append(f"\n{'self':>11s} {'share':>8s}  package")
+    for package, self_us in list(package_totals(timings).items())[:top]:
+        share = self_us / total_us * 100 if total_us else 0.0
+        lines.append(f"{self_us / 1000:9.1f}ms {share:7.1f}%  {package}")
+    return '\n'.join(lines)
+
+
+def log_import_profile(module: str = 'src.api.app', top: int = 25) -> None:
+    """Startup diagnostic; runs in a worker thread, never fails the caller."""
+    try:
+        logger.info(format_report(profile_imports(module), module, top))
+    except Exception as e:
+        logger.warning(f"Import profile of {module} failed: {e}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-module import time report")
+    parser.add_argument('module', nargs='?', default='src.api.app')
+    parser.add_argument('--top', type=int, default=25)
+    args = parser.parse_args(argv)
+    print(format_report(profile_imports(args.module), args.module, args.top))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -19,7 +19,9 @@ from typing import Optional
 import stripe
 from fastapi import APIRouter, Header, HTTPException, Query
 
+from src.api.exports import EXPORT_MAX_ROWS
 from src.db.db import get_cursor
+from src.billing.entitlements import get_active_session, entitlements_changed, get_entitlements
 from src.billing.stripe_client import (
     init_stripe,
     ensure_stripe_initialized,
@@ -219,27 +221,19 @@ def user_has_indices_history(user_id) -> bool:
     """Mode-agnostic runtime entitlement: active/trialing/canceling sub or the
     GERI Live launch-offer bonus."""
     try:
-        with get_cursor(commit=False) as cur:
-            cur.execute(
-                "SELECT status FROM user_index_history_subs WHERE user_id = %s",
-                (user_id,)
-            )
-            row = cur.fetchone()
-        if row and row.get("status") in ("active", "trialing", "canceling"):
-            return True
+        return get_entitlements(user_id).has("indices_history")
     except Exception:
-        pass
-    return _geri_live_bonus(user_id)
+        return False
 
 
 def get_indices_history_user(token: Optional[str]):
     """Resolve a session token to a user dict IF the user has an active
     Indices History subscription (or GERI Live bonus). Used to gate the
-    public index history/daily/monthly pages."""
-    user = _get_user_from_token(token)
-    if not user:
+    public index history/daily/monthly pages. Served from the session cache."""
+    session = get_active_session(token)
+    if not session:
         return None
-    return user if user_has_indices_history(user["id"]) else None
+    return session.user if session.has("indices_history") else None
 
 
 def _is_active(row) -> bool:
@@ -418,6 +412,7 @@ async def confirm(x_user_token: Optional[str] = Header(None)):
             WHERE id = %s
         """, (subscription_id, customer_id, local_status, period_end_dt,
               matched_mode, row["id"]))
+    entitlements_changed(user["id"])
     logger.info(f"Indices history subscription activated via confirm for user {user['id']}")
     return {
         "active": local_status in ("active", "trialing", "canceling"),
@@ -447,6 +442,7 @@ async def cancel(x_user_token: Optional[str] = Header(None)):
                 "updated_at = NOW() WHERE id = %s",
                 (row["id"],)
             )
+        entitlements_changed(user["id"])
         return {"canceled_at_period_end": True,
                 "current_period_end": sub.get("current_period_end")}
     except Exception as e:
@@ -459,10 +455,10 @@ async def download(
     index: str = Query(...),
     fmt: str = Query("csv"),
     x_user_token: Optional[str] = Header(None),
-    limit: int = Query(default=1000, ge=1, le=1000),
+    limit: int = Query(default=1000, ge=1, le=EXPORT_MAX_ROWS),
 ):
     """Gated download: requires an active indices-history subscription, then
-    reuses the existing per-index download generators."""
+    reuses the existing per-index streaming download endpoints."""
     user = _get_user_from_token(x_user_token)
     if not user:
         raise HTTPException(401, "Authentication required")
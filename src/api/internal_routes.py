@@ -1,9 +1,11 @@
 import os
 import json
+import uuid
 import logging
 from datetime import datetime, date, timedelta
 from typing import Optional
 from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import JSONResponse, RedirectResponse
 
 from src.db.db import advisory_lock
 
@@ -37,6 +39,8 @@ LOCK_IDS = {
     'intraday_price_capture': 6002,
     'linkedin_post': 6003,
     'daily_report': 6004,
+    'seo': 5005,
+    'backfill_alert_metadata': 5006,
 }
 
 
@@ -94,23 +98,136 @@ def run_job_with_lock(job_name: str, job_function, *args, **kwargs):
             }, 500
 
 
+def refresh_live_snapshots():
+    """
+    Re-prerender /indices and the research pages after an index job saves a
+    new value; their stored snapshots otherwise keep the previous figures
+    until the next GERI run. Failures are logged, not raised.
+    """
+    try:
+        from src.seo.prerender import prerender_live_pages
+        return prerender_live_pages()
+    except Exception as e:
+        logger.warning(f"Live page prerender failed: {e}")
+        return None
+
+
+def submit_job(job_name: str, job_function, *args, wait: int = 0, **kwargs):
+    """
+    Queue job_function on the background job runner (src/jobs/runner.py),
+    under the same advisory lock run_job_with_lock() takes, and return
+    without waiting for it: 202 with the job id, or a 303 to the job's
+    status URL when the caller passed ?wait=N (follow it to long-poll for
+    the result). 409 if a job with this name is already active.
+    """
+    if job_name not in LOCK_IDS:
+        raise ValueError(f"Unknown job: {job_name}")
+    
+    from src.jobs.runner import get_job_runner
+    
+    def locked_job():
+        response, _ = run_job_with_lock(job_name, job_function, *args, **kwargs)
+        return response
+    
+    job, created = get_job_runner().submit(job_name, locked_job, label=getattr(job_function, '__name__', None))
+    status_url = f"/internal/jobs/{job['id']}"
+    
+    if not created:
+        raise HTTPException(status_code=409, detail={
+            "status": "busy",
+            "job": job_name,
+            "job_id": job['id'],
+            "status_url": status_url,
+            "message": f"Job {job_name} is already running"
+        })
+    
+    if wait > 0:
+        return RedirectResponse(url=f"{status_url}?wait={wait}", status_code=303)
+    
+    return JSONResponse(status_code=202, content={
+        "status": "queued",
+        "job": job_name,
+        "job_id": job['id'],
+        "status_url": status_url
+    })
+
+
+def validate_job_token(x_runner_token: Optional[str], x_internal_token: Optional[str]):
+    """Job status is readable with either runner header (the SEO workflow sends x-internal-token)."""
+    if x_internal_token and not x_runner_token:
+        return validate_internal_token(x_internal_token)
+    return validate_runner_token(x_runner_token)
+
+
+@router.get("/jobs")
+def list_internal_jobs(
+    limit: int = 50,
+    name: Optional[str] = None,
+    status: Optional[str] = None,
+    x_runner_token: Optional[str] = Header(None),
+    x_internal_token: Optional[str] = Header(None)
+):
+    """Most recent background jobs, optionally filtered by job name or status."""
+    validate_job_token(x_runner_token, x_internal_token)
+    
+    from src.jobs.db import list_jobs
+    
+    jobs = list_jobs(limit=min(limit, 200), name=name, status=status)
+    
+    return {
+        "count": len(jobs),
+        "jobs": jobs
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(
+    job_id: str,
+    wait: int = 0,
+    x_runner_token: Optional[str] = Header(None),
+    x_internal_token: Optional[str] = Header(None)
+):
+    """
+    Status of a background job. With ?wait=N, waits up to N seconds for it
+    to finish. A finished job answers the way its endpoint used to answer
+    synchronously: 200 with the job response, 409 busy, 500 error (or
+    'lost' when its instance went away); 202 with the job record and its
+    status_url while it is queued or running.
+    """
+    validate_job_token(x_runner_token, x_internal_token)
+    
+    try:
+        uuid.UUID(job_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    from src.jobs.runner import HTTP_STATUS, wait_for_job
+    
+    job = await wait_for_job(job_id, wait)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    status_code = HTTP_STATUS.get(job['status'], 202)
+    if status_code == 202:
+        return JSONResponse(status_code=202, content={**job, "status_url": f"/internal/jobs/{job['id']}"})
+    if status_code == 200:
+        return {**(job['result'] or {}), "job_id": job['id']}
+    
+    detail = job['result'] or {"status": job['status'], "job": job['name'], "error": job['error']}
+    return JSONResponse(status_code=status_code, content={"detail": {**detail, "job_id": job['id']}})
+
+
 @router.post("/run/linkedin-post")
-def run_linkedin_post(x_runner_token: Optional[str] = Header(None)):
+def run_linkedin_post(wait: int = 0, x_runner_token: Optional[str] = Header(None)):
     validate_runner_token(x_runner_token)
 
     from src.linkedin.post_generator import scheduled_generate
 
-    response, status_code = run_job_with_lock('linkedin_post', scheduled_generate)
-
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    return response
+    return submit_job('linkedin_post', scheduled_generate, wait=wait)
 
 
 @router.post("/run/daily-report")
-def run_daily_report(x_runner_token: Optional[str] = Header(None)):
+def run_daily_report(wait: int = 0, x_runner_token: Optional[str] = Header(None)):
     """Pre-generate (warm) the Daily Intelligence Report AI narrative cache for all
     plan levels. Meant to run right after GERI/EERI/EGSI are computed by the daily
     index workflow, so the report is ready instantly on first user access instead of
@@ -120,17 +237,11 @@ def run_daily_report(x_runner_token: Optional[str] = Header(None)):
 
     from src.api.daily_digest_routes import warm_daily_digest_cache
 
-    response, status_code = run_job_with_lock('daily_report', warm_daily_digest_cache)
-
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    return response
+    return submit_job('daily_report', warm_daily_digest_cache, wait=wait)
 
 
 @router.post("/run/ingest")
-def run_ingest(x_runner_token: Optional[str] = Header(None)):
+def run_ingest(wait: int = 0, x_runner_token: Optional[str] = Header(None)):
     validate_runner_token(x_runner_token)
     
     from src.ingest.ingest_runner import run_ingestion
@@ -139,18 +250,11 @@ def run_ingest(x_runner_token: Optional[str] = Header(None)):
         stats = run_ingestion()
         return stats if stats else {}
     
-    response, status_code = run_job_with_lock('ingest', ingest_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('ingest', ingest_job, wait=wait)
 
 
 @router.post("/run/ai")
-def run_ai(x_runner_token: Optional[str] = Header(None)):
+def run_ai(wait: int = 0, x_runner_token: Optional[str] = Header(None)):
     validate_runner_token(x_runner_token)
     
     from src.ai.ai_worker import run_ai_worker
@@ -159,18 +263,11 @@ def run_ai(x_runner_token: Optional[str] = Header(None)):
         stats = run_ai_worker()
         return stats if stats else {}
     
-    response, status_code = run_job_with_lock('ai', ai_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('ai', ai_job, wait=wait)
 
 
 @router.post("/run/risk")
-def run_risk(x_runner_token: Optional[str] = Header(None)):
+def run_risk(wait: int = 0, x_runner_token: Optional[str] = Header(None)):
     validate_runner_token(x_runner_token)
     
     from src.risk.risk_engine import run_risk_engine
@@ -179,18 +276,11 @@ def run_risk(x_runner_token: Optional[str] = Header(None)):
         stats = run_risk_engine()
         return stats if stats else {}
     
-    response, status_code = run_job_with_lock('risk', risk_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('risk', risk_job, wait=wait)
 
 
 @router.post("/run/alerts")
-def run_alerts(x_runner_token: Optional[str] = Header(None)):
+def run_alerts(wait: int = 0, x_runner_token: Optional[str] = Header(None)):
     validate_runner_token(x_runner_token)
     
     alerts_v2 = os.environ.get('ALERTS_V2_ENABLED', 'true').lower() == 'true'
@@ -201,27 +291,18 @@ def run_alerts(x_runner_token: Optional[str] = Header(None)):
         def alerts_job():
             result = run_alerts_engine_v2(dry_run=False)
             return result
-        
-        response, status_code = run_job_with_lock('alerts', alerts_job)
     else:
         from src.alerts.alerts_engine import run_alerts_engine
         
         def alerts_job():
             alerts = run_alerts_engine(dry_run=False)
             return {"alerts_processed": len(alerts) if alerts else 0}
-        
-        response, status_code = run_job_with_lock('alerts', alerts_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
     
-    return response
+    return submit_job('alerts', alerts_job, wait=wait)
 
 
 @router.post("/run/digest")
-def run_digest(x_runner_token: Optional[str] = Header(None)):
+def run_digest(wait: int = 0, x_runner_token: Optional[str] = Header(None)):
     validate_runner_token(x_runner_token)
     
     from src.alerts.digest_worker import run_digest_worker
@@ -230,14 +311,7 @@ def run_digest(x_runner_token: Optional[str] = Header(None)):
         stats = run_digest_worker()
         return stats if stats else {}
     
-    response, status_code = run_job_with_lock('digest', digest_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('digest', digest_job, wait=wait)
 
 
 def validate_internal_token(x_internal_token: Optional[str] = Header(None)):
@@ -344,6 +418,7 @@ def run_seo_generator(
     date: Optional[str] = None,
     backfill: Optional[int] = None,
     dry_run: bool = False,
+    wait: int = 0,
     x_internal_token: Optional[str] = Header(None)
 ):
     """
@@ -370,17 +445,23 @@ def run_seo_generator(
         save_public_digest_page,
     )
     from src.db.migrations import run_seo_tables_migration
-    
-    run_seo_tables_migration()
+    from src.jobs.runner import report_progress
     
     yesterday = get_yesterday_date()
     
-    results = {
-        'pages': [],
-        'regional_pages': [],
-        'sitemap_entries': 0,
-        'dry_run': dry_run
-    }
+    if backfill and backfill > 0:
+        targets = [yesterday - timedelta(days=i) for i in range(min(backfill, 90))]
+    elif date:
+        try:
+            target = dt.strptime(date, '%Y-%m-%d').date()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+        
+        if target > yesterday:
+            raise HTTPException(status_code=400, detail=f"24h delay enforced. Cannot generate page for {target}. Maximum allowed date is {yesterday}.")
+        targets = [target]
+    else:
+        targets = [yesterday]
     
     def generate_regional_for_date(target_date, dry_run_flag):
         regional_results = []
@@ -399,9 +480,17 @@ def run_seo_generator(
                 regional_results.append({'date': target_date.isoformat(), 'region': region_slug, 'error': str(e)})
         return regional_results
     
-    if backfill and backfill > 0:
-        for i in range(min(backfill, 90)):
-            target = yesterday - timedelta(days=i)
+    def seo_job():
+        run_seo_tables_migration()
+        
+        results = {
+            'pages': [],
+            'regional_pages': [],
+            'sitemap_entries': 0,
+            'dry_run': dry_run
+        }
+        
+        for done, target in enumerate(targets):
             model = generate_daily_page_model(target)
             if not dry_run:
                 page_id = save_daily_page(target, model)
@@ -409,60 +498,57 @@ def run_seo_generator(
             else:
                 results['pages'].append({'date': target.isoformat(), 'alerts': model['stats']['total_alerts'], 'dry_run': True})
             results['regional_pages'].extend(generate_regional_for_date(target, dry_run))
-    elif date:
-        try:
-            target = dt.strptime(date, '%Y-%m-%d').date()
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+            report_progress(stage='pages', done=done + 1, total=len(targets))
         
-        if target > yesterday:
-            raise HTTPException(status_code=400, detail=f"24h delay enforced. Cannot generate page for {target}. Maximum allowed date is {yesterday}.")
+        results['digest_pages'] = []
+        digest_targets = set()
+        for p in results['pages']:
+            digest_targets.add(p['date'])
+        if not digest_targets:
+            digest_targets.add(yesterday.isoformat())
+    
+        for dt_str in digest_targets:
+            try:
+                digest_date = dt.strptime(dt_str, '%Y-%m-%d').date()
+                if not dry_run:
+                    digest_model = generate_public_digest_model(digest_date)
+                    digest_id = save_public_digest_page(digest_date, digest_model)
+                    results['digest_pages'].append({'date': dt_str, 'page_id': digest_id})
+                else:
+                    results['digest_pages'].append({'date': dt_str, 'dry_run': True})
+            except Exception as e:
+                results['digest_pages'].append({'date': dt_str, 'error': str(e)})
         
-        model = generate_daily_page_model(target)
-        if not dry_run:
-            page_id = save_daily_page(target, model)
-            results['pages'].append({'date': target.isoformat(), 'page_id': page_id, 'alerts': model['stats']['total_alerts']})
+        report_progress(stage='sitemaps')
+        if dry_run:
+            entries = generate_sitemap_entries()
+            results['sitemap_entries'] = len(entries)
         else:
-            results['pages'].append({'date': target.isoformat(), 'alerts': model['stats']['total_alerts'], 'dry_run': True})
-        results['regional_pages'].extend(generate_regional_for_date(target, dry_run))
-    else:
-        target = yesterday
-        model = generate_daily_page_model(target)
+            from src.seo.sitemap_generator import regenerate_sitemaps
+            sitemaps = regenerate_sitemaps()
+            results['sitemap_entries'] = sitemaps['entry_count']
+            results['sitemaps_changed'] = sitemaps['changed']
+        
         if not dry_run:
-            page_id = save_daily_page(target, model)
-            results['pages'].append({'date': target.isoformat(), 'page_id': page_id, 'alerts': model['stats']['total_alerts']})
-        else:
-            results['pages'].append({'date': target.isoformat(), 'alerts': model['stats']['total_alerts'], 'dry_run': True})
-        results['regional_pages'].extend(generate_regional_for_date(target, dry_run))
-    
-    results['digest_pages'] = []
-    digest_targets = set()
-    for p in results['pages']:
-        digest_targets.add(p['date'])
-    if not digest_targets:
-        digest_targets.add(yesterday.isoformat())
-
-    for dt_str in digest_targets:
-        try:
-            digest_date = dt.strptime(dt_str, '%Y-%m-%d').date()
-            if not dry_run:
-                digest_model = generate_public_digest_model(digest_date)
-                digest_id = save_public_digest_page(digest_date, digest_model)
-                results['digest_pages'].append({'date': dt_str, 'page_id': digest_id})
-            else:
-                results['digest_pages'].append({'date': dt_str, 'dry_run': True})
-        except Exception as e:
-            results['digest_pages'].append({'date': dt_str, 'error': str(e)})
-
-    entries = generate_sitemap_entries()
-    results['sitemap_entries'] = len(entries)
+            from src.seo.prerender import prerender_for_date
+            report_progress(stage='snapshots')
+            results['snapshots'] = []
+            for p in results['pages']:
+                try:
+                    snapshot_date = dt.strptime(p['date'], '%Y-%m-%d').date()
+                    results['snapshots'].append(prerender_for_date(snapshot_date))
+                except Exception as e:
+                    results['snapshots'].append({'date': p['date'], 'error': str(e)})
+        
+        return results
     
-    return results
+    return submit_job('seo', seo_job, wait=wait)
 
 
 @router.post("/backfill-alert-metadata")
-async def backfill_alert_metadata_endpoint(
+def backfill_alert_metadata_endpoint(
     dry_run: bool = False,
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -473,19 +559,15 @@ async def backfill_alert_metadata_endpoint(
     
     from src.alerts.backfill_metadata import backfill_alert_metadata
     
-    try:
-        summary = backfill_alert_metadata(dry_run=dry_run)
-        return {
-            "status": "success",
-            "summary": summary
-        }
-    except Exception as e:
-        logger.error(f"Error during alert metadata backfill: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    def backfill_job():
+        return {"summary": backfill_alert_metadata(dry_run=dry_run)}
+    
+    return submit_job('backfill_alert_metadata', backfill_job, wait=wait)
 
 
 @router.post("/run/pro-delivery")
 def run_pro_delivery(
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -503,16 +585,11 @@ def run_pro_delivery(
     
     from src.delivery.pro_delivery_worker import run_index_delivery
     
-    response, status_code = run_job_with_lock('pro_delivery', run_index_delivery)
-    
-    if status_code != 200:
-        raise HTTPException(status_code=status_code, detail=response.get('message', 'Error'))
-    
-    return response
+    return submit_job('pro_delivery', run_index_delivery, wait=wait)
 
 
 @router.post("/run/geri-delivery")
-def run_geri_delivery(x_runner_token: Optional[str] = Header(None)):
+def run_geri_delivery(wait: int = 0, x_runner_token: Optional[str] = Header(None)):
     """
     Trigger Index & Digest delivery (alias for /run/pro-delivery).
     Kept for backward compatibility.
@@ -521,18 +598,14 @@ def run_geri_delivery(x_runner_token: Optional[str] = Header(None)):
     
     from src.delivery.pro_delivery_worker import run_index_delivery
     
-    response, status_code = run_job_with_lock('pro_delivery', run_index_delivery)
-    
-    if status_code != 200:
-        raise HTTPException(status_code=status_code, detail=response.get('message', 'Error'))
-    
-    return response
+    return submit_job('pro_delivery', run_index_delivery, wait=wait)
 
 
 @router.post("/run/geri-compute")
 def run_geri_compute(
     mode: str = "yesterday",
     force: bool = False,
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -559,6 +632,12 @@ def run_geri_compute(
             yesterday = date.today() - timedelta(days=1)
             result = compute_geri_for_date(yesterday, force=force)
             if result:
+                snapshots = None
+                try:
+                    from src.seo.prerender import prerender_for_date
+                    snapshots = prerender_for_date(result.index_date)
+                except Exception as e:
+                    logger.warning(f"GERI page prerender failed: {e}")
                 return {
                     'date': result.index_date.isoformat(),
                     'value': result.value,
@@ -566,22 +645,17 @@ def run_geri_compute(
                     'model_version': result.model_version,
                     'trend_1d': result.trend_1d,
                     'trend_7d': result.trend_7d,
+                    'snapshots': snapshots,
                 }
             return {'message': 'No computation needed (already exists or no data)', 'model_version': MODEL_VERSION}
     
-    response, status_code = run_job_with_lock('geri_compute', geri_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('geri_compute', geri_job, wait=wait)
 
 
 @router.post("/run/trader-delivery")
 def run_trader_delivery(
     since_minutes: int = 30,
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -596,18 +670,14 @@ def run_trader_delivery(
     
     from src.delivery.trader_delivery_worker import run_trader_delivery as do_trader_delivery
     
-    response, status_code = run_job_with_lock('trader_delivery', do_trader_delivery, since_minutes)
-    
-    if status_code != 200:
-        raise HTTPException(status_code=status_code, detail=response.get('message', 'Error'))
-    
-    return response
+    return submit_job('trader_delivery', do_trader_delivery, since_minutes, wait=wait)
 
 
 @router.post("/run/eeri-compute")
 def run_eeri_compute(
     target_date: Optional[str] = None,
     force: bool = False,
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -648,6 +718,7 @@ def run_eeri_compute(
                 'band': result.band.value,
                 'trend_1d': result.trend_1d,
                 'computed': True,
+                'snapshots': refresh_live_snapshots(),
             }
         else:
             return {
@@ -656,20 +727,14 @@ def run_eeri_compute(
                 'message': 'Computation skipped or failed (already exists or no data)',
             }
     
-    response, status_code = run_job_with_lock('eeri_compute', eeri_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('eeri_compute', eeri_job, wait=wait)
 
 
 @router.post("/run/egsi-compute")
 def run_egsi_compute(
     target_date: Optional[str] = None,
     force: bool = False,
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -711,6 +776,7 @@ def run_egsi_compute(
                 'band': result.band.value,
                 'trend_1d': result.trend_1d,
                 'computed': True,
+                'snapshots': refresh_live_snapshots(),
             }
         else:
             return {
@@ -719,20 +785,14 @@ def run_egsi_compute(
                 'message': 'Computation skipped or failed (check if EERI exists for this date)',
             }
     
-    response, status_code = run_job_with_lock('egsi_compute', egsi_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('egsi_compute', egsi_job, wait=wait)
 
 
 @router.post("/run/egsi-s-compute")
 def run_egsi_s_compute(
     target_date: Optional[str] = None,
     force: bool = False,
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -775,6 +835,7 @@ def run_egsi_s_compute(
                 'trend_1d': result.trend_1d,
                 'data_source': result.components.data_sources[0] if result.components.data_sources else 'unknown',
                 'computed': True,
+                'snapshots': refresh_live_snapshots(),
             }
         else:
             return {
@@ -783,18 +844,12 @@ def run_egsi_s_compute(
                 'message': 'Computation skipped or failed (check logs for details)',
             }
     
-    response, status_code = run_job_with_lock('egsi_s_compute', egsi_s_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('egsi_s_compute', egsi_s_job, wait=wait)
 
 
 @router.post("/run/oil-price-capture")
 def run_oil_price_capture(
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -810,18 +865,12 @@ def run_oil_price_capture(
     def oil_price_job():
         return capture_oil_price_snapshot()
     
-    response, status_code = run_job_with_lock('oil_price_capture', oil_price_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('oil_price_capture', oil_price_job, wait=wait)
 
 
 @router.post("/run/lng-price-capture")
 def run_lng_price_capture(
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -837,18 +886,12 @@ def run_lng_price_capture(
     def lng_price_job():
         return capture_lng_price_snapshot()
 
-    response, status_code = run_job_with_lock('lng_price_capture', lng_price_job)
-
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-
-    return response
+    return submit_job('lng_price_capture', lng_price_job, wait=wait)
 
 
 @router.post("/run/intraday-price-capture")
 def run_intraday_price_capture(
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -865,19 +908,13 @@ def run_intraday_price_capture(
     def intraday_job():
         return capture_intraday_prices()
 
-    response, status_code = run_job_with_lock('intraday_price_capture', intraday_job)
-
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-
-    return response
+    return submit_job('intraday_price_capture', intraday_job, wait=wait)
 
 
 @router.post("/run/gas-storage-capture")
 def run_gas_storage_capture(
     target_date: Optional[str] = None,
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -956,84 +993,40 @@ def run_gas_storage_capture(
                     "country_capture": country_result,
                 }
     
-    response, status_code = run_job_with_lock('gas_storage_capture', gas_storage_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('gas_storage_capture', gas_storage_job, wait=wait)
 
 
 @router.post("/run/market-data")
 def run_market_data_capture(
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
     Capture daily VIX, TTF gas, and EUR/USD market data for GERI chart overlays.
     
     Captures:
-    - VIX (Volatility Index) from Yahoo Finance
+    - VIX (Volatility Index) from Yahoo Finance (FRED fallback)
     - TTF Gas prices from OilPriceAPI
-    - EUR/USD exchange rate from OilPriceAPI
+    - EUR/USD exchange rate from FRED (Yahoo Finance fallback)
+    
+    Yahoo tickers are fetched in one batched download, sources are fetched
+    concurrently and all three tables are written in one transaction; the
+    result includes per-source latency.
     
     Should run once daily, ideally after market close.
     Skips if data already exists for target date (idempotent).
     """
     validate_runner_token(x_runner_token)
     
-    from src.ingest.market_data import capture_vix_snapshot
-    from src.ingest.ttf_gas import capture_ttf_gas_snapshot
-    from src.ingest.eurusd import capture_eurusd_snapshot
-    
-    def market_data_job():
-        results = {}
-        
-        vix_result = capture_vix_snapshot()
-        results['vix'] = {
-            'status': vix_result.get('status', 'error'),
-            'message': vix_result.get('message', ''),
-            'count': vix_result.get('count', 0)
-        }
-        
-        ttf_result = capture_ttf_gas_snapshot()
-        results['ttf'] = {
-            'status': ttf_result.get('status', 'error'),
-            'message': ttf_result.get('message', ''),
-            'date': ttf_result.get('date'),
-            'price': ttf_result.get('ttf_price')
-        }
-        
-        eurusd_result = capture_eurusd_snapshot()
-        results['eurusd'] = {
-            'status': eurusd_result.get('status', 'error'),
-            'message': eurusd_result.get('message', ''),
-            'date': eurusd_result.get('date'),
-            'rate': eurusd_result.get('rate')
-        }
-        
-        success_count = sum(1 for r in results.values() if r.get('status') in ['success', 'skipped'])
-        
-        return {
-            'sources': results,
-            'success_count': success_count,
-            'total_sources': len(results)
-        }
-    
-    response, status_code = run_job_with_lock('market_data_capture', market_data_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
+    from src.ingest.market_capture import capture_daily_market_data
     
-    return response
+    return submit_job('market_data_capture', capture_daily_market_data, wait=wait)
 
 
 @router.post("/run/backfill-snapshots")
 def run_backfill_snapshots(
     days: int = 15,
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -1066,20 +1059,14 @@ def run_backfill_snapshots(
             "dates_processed": len(results["dates_processed"])
         }
     
-    response, status_code = run_job_with_lock('backfill_snapshots', backfill_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('backfill_snapshots', backfill_job, wait=wait)
 
 
 @router.post("/run/backfill-lng")
 def run_backfill_lng(
     start_date: str = "2026-01-13",
     end_date: str = "2026-02-16",
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -1114,18 +1101,12 @@ def run_backfill_lng(
             "dates_processed": len(results["dates_processed"])
         }
 
-    response, status_code = run_job_with_lock('lng_price_capture', backfill_lng_job)
-
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-
-    return response
+    return submit_job('lng_price_capture', backfill_lng_job, wait=wait)
 
 
 @router.post("/run/calculate-oil-changes")
 def run_calculate_oil_changes(
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -1142,19 +1123,13 @@ def run_calculate_oil_changes(
         logger.info("Calculating 24h changes for oil price snapshots...")
         return calculate_oil_price_changes()
     
-    response, status_code = run_job_with_lock('backfill_snapshots', calculate_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('backfill_snapshots', calculate_job, wait=wait)
 
 
 @router.post("/run/backfill-market-data")
 def run_backfill_market_data(
     vix_days: int = 90,
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -1201,20 +1176,14 @@ def run_backfill_market_data(
         
         return results
     
-    response, status_code = run_job_with_lock('market_data_capture', backfill_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('market_data_capture', backfill_job, wait=wait)
 
 
 @router.post("/run/backfill-vix-fred")
 def run_backfill_vix_fred(
     start_date: str = "2025-11-01",
     end_date: str = None,
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -1239,19 +1208,13 @@ def run_backfill_vix_fred(
     def backfill_job():
         return backfill_vix_from_fred(sd, ed)
     
-    response, status_code = run_job_with_lock('market_data_capture', backfill_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('market_data_capture', backfill_job, wait=wait)
 
 
 @router.post("/run/backfill-egsi")
 def run_backfill_egsi(
     days: int = 15,
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -1290,20 +1253,14 @@ def run_backfill_egsi(
             "dates_processed": len(results.get("dates_processed", []))
         }
     
-    response, status_code = run_job_with_lock('backfill_egsi', backfill_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('backfill_egsi', backfill_job, wait=wait)
 
 
 @router.post("/run/backfill-eurusd")
 def run_backfill_eurusd(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -1329,18 +1286,12 @@ def run_backfill_eurusd(
             result = backfill_eurusd_history(days=90)
         return result
     
-    response, status_code = run_job_with_lock('backfill_eurusd', backfill_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('backfill_eurusd', backfill_job, wait=wait)
 
 
 @router.post("/run/backfill-geri-overlays")
 def run_backfill_geri_overlays(
+    wait: int = 0,
     x_runner_token: Optional[str] = Header(None)
 ):
     """
@@ -1423,14 +1374,7 @@ def run_backfill_geri_overlays(
             'results': results
         }
     
-    response, status_code = run_job_with_lock('backfill_snapshots', backfill_job)
-    
-    if status_code == 409:
-        raise HTTPException(status_code=409, detail=response)
-    if status_code == 500:
-        raise HTTPException(status_code=500, detail=response)
-    
-    return response
+    return submit_job('backfill_snapshots', backfill_job, wait=wait)
 
 
 @router.post("/fix-skipped-alerts")
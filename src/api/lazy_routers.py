@@ -0,0 +1,345 @@
+"""
+Lazy Router Loading
+
+app.py registers route modules through LazyRouters.include() instead of
+importing them at module level. For every module the checked-in route
+manifest (route_manifest.json) lists the paths and methods its router
+serves; include() adds a placeholder route for each of them, in the same
+position the real routes would take. The first request that matches a
+placeholder imports the module in a worker thread, splices its real routes
+into the placeholders' slot and re-dispatches the request, so route order
+and 404/405 behaviour are the same as with eager registration.
+
+The manifest is built statically from the route decorators (no imports),
+and each entry carries a checksum of the module file. A module whose file
+changed since the manifest was written is imported eagerly at startup, so
+a stale manifest costs start-up time, never routes. Regenerate it after
+adding or changing routes:
+
+    python -m src.api.lazy_routers --write
+    python -m src.api.lazy_routers --check
+
+Shortly after startup warm_up() loads the remaining modules in the
+background (LAZY_ROUTERS_WARMUP_SECONDS, negative disables), so only the
+requests that arrive during a cold start pay for an import.
+
+LAZY_ROUTERS=false registers every router eagerly.
+"""
+import argparse
+import ast
+import asyncio
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+LAZY_ROUTERS = os.environ.get('LAZY_ROUTERS', 'true').lower() == 'true'
+LAZY_ROUTERS_WARMUP_SECONDS = float(os.environ.get('LAZY_ROUTERS_WARMUP_SECONDS', '20'))
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'route_manifest.json')
+
+_ROUTER_RE = re.compile(r'^router = APIRouter\(', re.MULTILINE)
+
+HTTP_METHOD_DECORATORS = {'get', 'post', 'put', 'patch', 'delete', 'options', 'head'}
+
+# (path, endpoint attribute, methods) registered with app.add_api_route()
+ExtraRoute = Tuple[str, str, Sequence[str]]
+
+
+class ManifestError(ValueError):
+    """A router whose routes can't be read from its source without importing it."""
+
+
+def module_file(module: str) -> str:
+    return os.path.join(_ROOT_DIR, *module.split('.')) + '.py'
+
+
+def file_checksum(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def _literal(node: Optional[ast.AST], what: str, filename: str, lineno: int):
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        raise ManifestError(f"{filename}:{lineno}: {what} is not a literal")
+
+
+def _keyword(call: ast.Call, name: str) -> Optional[ast.AST]:
+    for kw in call.keywords:
+        if kw.arg == name:
+            return kw.value
+    return None
+
+
+def _route_from_call(call: ast.Call, method: str, prefix: str, filename: str) -> Tuple[str, List[str]]:
+    path_node = call.args[0] if call.args else _keyword(call, 'path')
+    path = _literal(path_node, 'route path', filename, call.lineno)
+    if method in ('api_route', 'add_api_route'):
+        methods_node = _keyword(call, 'methods')
+        methods = _literal(methods_node, 'route methods', filename, call.lineno) if methods_node else ['GET']
+    else:
+        methods = [method]
+    return prefix + path, sorted({m.upper() for m in methods})
+
+
+def extract_routes(source: str, filename: str = '<string>', attr: str = 'router') -> dict:
+    """
+    Routes declared on the module-level APIRouter `attr`, in registration
+    order: {'routes': [[path, methods], ...], 'lifecycle': bool}. Raises
+    ManifestError for anything that can't be resolved statically (computed
+    paths, nested routers, websockets, mounts).
+    """
+    tree = ast.parse(source, filename=filename)
+
+    prefix = None
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == attr for t in node.targets)
+                and isinstance(node.value, ast.Call) and getattr(node.value.func, 'id', None) == 'APIRouter'):
+            prefix_node = _keyword(node.value, 'prefix')
+            prefix = _literal(prefix_node, 'router prefix', filename, node.lineno) if prefix_node else ''
+    if prefix is None:
+        raise ManifestError(f"{filename}: no module-level `{attr} = APIRouter(...)`")
+
+    decorators = {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for decorator in node.decorator_list:
+                decorators[id(decorator)] = node
+    module_calls = {id(node.value) for node in tree.body if isinstance(node, ast.Expr)}
+
+    # Stacked decorators register bottom-up.
+    routes: List[Tuple[Tuple[int, int], str, List[str]]] = []
+    lifecycle = False
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and isinstance(node.func.value, ast.Name) and node.func.value.id == attr):
+            continue
+        method = node.func.attr
+        if id(node) in decorators and (method in HTTP_METHOD_DECORATORS or method == 'api_route'):
+            path, methods = _route_from_call(node, method, prefix, filename)
+            routes.append(((decorators[id(node)].lineno, -node.lineno), path, methods))
+        elif id(node) in module_calls and method == 'add_api_route':
+            path, methods = _route_from_call(node, method, prefix, filename)
+            routes.append(((node.lineno, 0), path, methods))
+        elif id(node) in decorators and method == 'on_event':
+            lifecycle = True
+        else:
+            raise ManifestError(f"{filename}:{node.lineno}: {attr}.{method}() can't be resolved statically")
+
+    return {
+        'routes': [[path, methods] for _, path, methods in sorted(routes, key=lambda r: r[0])],
+        'lifecycle': lifecycle,
+    }
+
+
+def discover_route_modules(src_dir: str = os.path.join(_ROOT_DIR, 'src')) -> List[str]:
+    modules = []
+    for root, dirs, files in os.walk(src_dir):
+        dirs[:] = sorted(d for d in dirs if d not in ('__pycache__', 'tests'))
+        for name in sorted(files):
+            if not name.endswith('.py'):
+                continue
+            path = os.path.join(root, name)
+            with open(path, encoding='utf-8') as f:
+                if not _ROUTER_RE.search(f.read()):
+                    continue
+            relative = os.path.relpath(path, _ROOT_DIR)[:-3]
+            modules.append(relative.replace(os.sep, '.'))
+    return modules
+
+
+def build_manifest(modules: Sequence[str]) -> Tuple[Dict[str, dict], Dict[str, str]]:
+    """Manifest entries for the modules that can be loaded lazily, plus the reasons the rest can't."""
+    manifest, skipped = {}, {}
+    for module in modules:
+        path = module_file(module)
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        try:
+            entry = extract_routes(source, os.path.relpath(path, _ROOT_DIR))
+        except ManifestError as e:
+            skipped[module] = str(e)
+            continue
+        manifest[module] = {'checksum': file_checksum(path), **entry}
+    return manifest, skipped
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> Dict[str, dict]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        logger.warning(f"Ignoring unreadable route manifest {path}: {e}")
+        return {}
+
+
+def _placeholder_endpoint():
+    raise RuntimeError("lazy route placeholder endpoint called directly")
+
+
+def _placeholder_class():
+    from starlette.routing import Route
+
+    class LazyRoute(Route):
+        """Stands in for one route of a module that hasn't been imported yet."""
+
+        def __init__(self, path: str, methods: Sequence[str], loader: 'LazyRouters', module: str):
+            super().__init__(path, endpoint=_placeholder_endpoint, methods=list(methods),
+                             name=f"lazy:{module}", include_in_schema=False)
+            # Starlette adds HEAD to GET routes; FastAPI routes don't have it.
+            self.methods = set(methods)
+            self.loader = loader
+            self.module = module
+
+        async def handle(self, scope, receive, send):
+            await self.loader.load(self.module)
+            await self.loader.app.router(scope, receive, send)
+
+    return LazyRoute
+
+
+@dataclass
+class _PendingModule:
+    module: str
+    attr: str
+    extra_routes: Sequence[ExtraRoute]
+    routes: List[Tuple[str, List[str]]]
+    lifecycle: bool
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class LazyRouters:
+    """Registers route modules on an app, importing them on first use."""
+
+    def __init__(self, app, manifest: Optional[Dict[str, dict]] = None, enabled: bool = LAZY_ROUTERS):
+        self.app = app
+        self.enabled = enabled
+        self.manifest = manifest if manifest is not None else (load_manifest() if enabled else {})
+        self._pending: Dict[str, _PendingModule] = {}
+        self._route_class = _placeholder_class() if enabled else None
+        self.load_seconds: Dict[str, float] = {}
+
+    @property
+    def pending(self) -> List[str]:
+        return list(self._pending)
+
+    def include(self, module: str, attr: str = 'router', extra_routes: Sequence[ExtraRoute] = ()) -> None:
+        entry = self.manifest.get(module) if self.enabled else None
+        if entry is not None and entry['checksum'] != file_checksum(module_file(module)):
+            logger.info(f"Route manifest is stale for {module}; importing it eagerly "
+                        f"(run `python -m src.api.lazy_routers --write`)")
+            entry = None
+        if entry is None:
+            self._include_now(module, importlib.import_module(module), attr, extra_routes)
+            return
+
+        routes = [(path, methods) for path, methods in entry['routes']]
+        routes += [(path, sorted(m.upper() for m in methods)) for path, _, methods in extra_routes]
+        self._pending[module] = _PendingModule(module, attr, extra_routes, routes, entry['lifecycle'])
+        for path, methods in routes:
+            self.app.router.routes.append(self._route_class(path, methods, self, module))
+
+    def _include_now(self, module: str, mod, attr: str, extra_routes: Sequence[ExtraRoute]) -> None:
+        self.app.include_router(getattr(mod, attr))
+        for path, name, methods in extra_routes:
+            self.app.add_api_route(path, getattr(mod, name), methods=list(methods))
+
+    async def load(self, module: str) -> None:
+        """Import a pending module and swap its placeholders for the real routes."""
+        pending = self._pending.get(module)
+        if pending is None:
+            return
+        async with pending.lock:
+            if module not in self._pending:
+                return
+            started = time.monotonic()
+            mod = await asyncio.to_thread(importlib.import_module, module)
+            self._splice(pending, mod)
+            del self._pending[module]
+            if pending.lifecycle:
+                for handler in getattr(mod, pending.attr).on_startup:
+                    result = handler()
+                    if inspect.isawaitable(result):
+                        await result
+            self.load_seconds[module] = time.monotonic() - started
+            logger.info(f"Loaded routes from {module} in {self.load_seconds[module] * 1000:.0f}ms")
+
+    def _splice(self, pending: _PendingModule, mod) -> None:
+        routes = self.app.router.routes
+        slot = next(i for i, r in enumerate(routes) if getattr(r, 'module', None) == pending.module
+                    and isinstance(r, self._route_class))
+        before = len(routes)
+        self._include_now(pending.module, mod, pending.attr, pending.extra_routes)
+        real = routes[before:]
+        del routes[before:]
+        routes[:] = [r for r in routes if not (isinstance(r, self._route_class) and r.module == pending.module)]
+        routes[slot:slot] = real
+        self.app.openapi_schema = None
+
+        served = [(r.path, sorted(r.methods)) for r in real if getattr(r, 'methods', None)]
+        if served != pending.routes:
+            logger.warning(f"Route manifest for {pending.module} doesn't match its router "
+                           f"({len(pending.routes)} listed, {len(served)} registered); regenerate it")
+
+    async def load_all(self) -> None:
+        for module in list(self._pending):
+            await self.load(module)
+
+    async def warm_up(self, delay: float = LAZY_ROUTERS_WARMUP_SECONDS) -> None:
+        """Load whatever is still pending once the cold-start burst is over."""
+        if delay < 0 or not self._pending:
+            return
+        await asyncio.sleep(delay)
+        started = time.monotonic()
+        count = len(self._pending)
+        try:
+            await self.load_all()
+        except Exception as e:
+            logger.error(f"Lazy router warm-up failed: {e}")
+            return
+        logger.info(f"Warmed up {count} route modules in {time.monotonic() - started:.1f}s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build or check the lazy route manifest")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--write', action='store_true', help=f'Write {os.path.relpath(MANIFEST_PATH, _ROOT_DIR)}')
+    group.add_argument('--check', action='store_true', help='Exit 1 if the manifest is out of date')
+    args = parser.parse_args(argv)
+
+    manifest, skipped = build_manifest(discover_route_modules())
+    for module, reason in skipped.items():
+        print(f"eager  {module}: {reason}")
+
+    if args.check:
+        stale = sorted(m for m in manifest if load_manifest().get(m) != manifest[m])
+        for module in stale:
+            print(f"stale  {module}")
+        return 1 if stale else 0
+
+    if args.write:
+        with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+            f.write('\n')
+    routes = sum(len(entry['routes']) for entry in manifest.values())
+    print(f"{len(manifest)} lazy route modules, {routes} routes" + (' written' if args.write else ''))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, _ROOT_DIR)
+    sys.exit(main())
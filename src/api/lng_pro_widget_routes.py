@@ -28,6 +28,7 @@ from fastapi.responses import HTMLResponse, PlainTextResponse
 from pydantic import BaseModel
 
 from src.db.db import get_cursor, execute_production_one
+from src.billing.entitlements import entitlements_changed
 from src.billing.stripe_client import (
     init_stripe,
     ensure_stripe_initialized,
@@ -455,6 +456,7 @@ async def widget_confirm(x_user_token: Optional[str] = Header(None)):
             WHERE id = %s
         """, (subscription_id, customer_id, local_status, period_end_dt,
               matched_mode, row["id"]))
+    entitlements_changed(user["id"])
     logger.info(f"LNG Pro Widget activated via confirm for user {user['id']}")
     return {
         "active": local_status in ("active", "trialing", "canceling"),
@@ -541,6 +543,7 @@ async def widget_cancel(x_user_token: Optional[str] = Header(None)):
                 "WHERE id = %s",
                 (row["id"],)
             )
+        entitlements_changed(user["id"])
         return {"canceled_at_period_end": True,
                 "current_period_end": sub.get("current_period_end")}
     except Exception as e:
@@ -1,7 +1,11 @@
 import logging
+import os
 from datetime import datetime, timedelta
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query
 from src.db.db import get_cursor
+from src.db.query_metrics import get_query_metrics
+from src.api.request_profiler import REQUEST_PROFILING, route_stats
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/ops", tags=["operations"])
@@ -105,3 +109,52 @@ def get_worker_status():
             }
         }
     }
+
+
+def _require_internal_token(x_internal_token: Optional[str]):
+    expected_token = os.environ.get('INTERNAL_RUNNER_TOKEN')
+    if not expected_token:
+        raise HTTPException(status_code=500, detail="Internal token not configured")
+    if x_internal_token != expected_token:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+@router.get("/db-metrics")
+def get_db_metrics(
+    sort: str = Query("total_ms", pattern="^(total_ms|calls|mean_ms|p95_ms|p99_ms|max_ms|rows|errors)$"),
+    limit: int = Query(50, ge=1, le=500),
+    module: Optional[str] = Query(None, description="Only statements issued from this module prefix"),
+    reset: bool = False,
+    x_internal_token: Optional[str] = Header(None),
+):
+    """Per-statement DB timings recorded by src/db/query_metrics.py (DB_QUERY_METRICS=true)."""
+    _require_internal_token(x_internal_token)
+
+    metrics = get_query_metrics()
+    if metrics is None or not metrics.record:
+        return {"enabled": False, "detail": "Set DB_QUERY_METRICS=true to record query metrics"}
+
+    result = {"enabled": True, **metrics.snapshot(sort=sort, limit=limit, module=module),
+              "modules": metrics.by_module()}
+    if reset:
+        metrics.reset()
+    return result
+
+
+@router.get("/request-metrics")
+def get_request_metrics(
+    sort: str = Query("p95_ms", pattern="^(requests|errors|p50_ms|p95_ms|p99_ms|max_ms)$"),
+    limit: int = Query(50, ge=1, le=500),
+    reset: bool = False,
+    x_internal_token: Optional[str] = Header(None),
+):
+    """Rolling per-route latency split into db/llm/http/app (src/api/request_profiler.py)."""
+    _require_internal_token(x_internal_token)
+
+    if not REQUEST_PROFILING:
+        return {"enabled": False, "detail": "Set REQUEST_PROFILING=true to record request timings"}
+
+    routes = route_stats.snapshot(sort=sort, limit=limit)
+    if reset:
+        route_stats.reset()
+    return {"enabled": True, "routes": routes}
@@ -0,0 +1,378 @@
+"""
+Request profiler
+
+Middleware that splits each request's wall time into:
+
+    db     statements run through src/db (query observer)
+    llm    outbound HTTP to LLM APIs (OpenAI, Anthropic, Gemini)
+    http   any other outbound HTTP (requests / httpx)
+    app    the rest: Python work such as HTML rendering, JSON encoding
+
+and keeps rolling p50/p95/p99 per route template over the last
+REQUEST_PROFILE_WINDOW requests. The numbers are served at
+GET /ops/request-metrics. REQUEST_SERVER_TIMING=true also adds a
+Server-Timing header so the split shows up in browser dev tools.
+
+Sampling profiles on demand: an admin request with ?__profile=1 (and the
+usual X-Admin-Token header) runs the route while a sampler thread records
+stacks every REQUEST_PROFILE_INTERVAL_MS, and returns them in folded-stack
+format instead of the page:
+
+    curl -H "X-Admin-Token: $TOKEN" "$APP_URL/geri/research?__profile=1" > geri.folded
+    flamegraph.pl geri.folded > geri.svg          # or load into speedscope.app
+
+The sampler sees every thread running project code, so concurrent
+requests on the same instance show up in the profile too.
+
+Outbound HTTP is measured by wrapping requests.Session.send and
+httpx.Client/AsyncClient.send when profiling is enabled.
+"""
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+REQUEST_PROFILING = os.environ.get('REQUEST_PROFILING', 'true').lower() == 'true'
+REQUEST_SERVER_TIMING = os.environ.get('REQUEST_SERVER_TIMING', 'false').lower() == 'true'
+REQUEST_PROFILE_WINDOW = int(os.environ.get('REQUEST_PROFILE_WINDOW', '1000'))
+REQUEST_PROFILE_INTERVAL_MS = float(os.environ.get('REQUEST_PROFILE_INTERVAL_MS', '2'))
+REQUEST_PROFILE_MAX_SECONDS = float(os.environ.get('REQUEST_PROFILE_MAX_SECONDS', '60'))
+
+LLM_HOSTS = ('api.openai.com', 'api.anthropic.com', 'generativelanguage.googleapis.com')
+
+COMPONENTS = ('db', 'llm', 'http', 'app')
+
+_current: contextvars.ContextVar[Optional['RequestTiming']] = contextvars.ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    """Time spent in DB and outbound calls during one request, in milliseconds."""
+
+    __slots__ = ('started', 'db_ms', 'db_calls', 'http_ms', 'http_calls', 'llm_ms', 'llm_calls')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_ms = 0.0
+        self.db_calls = 0
+        self.http_ms = 0.0
+        self.http_calls = 0
+        self.llm_ms = 0.0
+        self.llm_calls = 0
+
+    def add_http(self, host: Optional[str], ms: float) -> None:
+        if host and host.endswith(LLM_HOSTS):
+            self.llm_ms += ms
+            self.llm_calls += 1
+        else:
+            self.http_ms += ms
+            self.http_calls += 1
+
+    def breakdown(self, wall_ms: float) -> Dict[str, float]:
+        """Component split of wall_ms; 'app' is what the DB and outbound calls don't explain."""
+        return {
+            'db': self.db_ms,
+            'llm': self.llm_ms,
+            'http': self.http_ms,
+            'app': max(0.0, wall_ms - self.db_ms - self.llm_ms - self.http_ms),
+        }
+
+    def server_timing(self, wall_ms: float) -> str:
+        parts = self.breakdown(wall_ms)
+        calls = {'db': self.db_calls, 'llm': self.llm_calls, 'http': self.http_calls}
+        header = []
+        for name in COMPONENTS:
+            entry = f"{name};dur={parts[name]:.1f}"
+            if name in calls:
+                entry += f';desc="{calls[name]} calls"'
+            header.append(entry)
+        header.append(f"total;dur={wall_ms:.1f}")
+        return ', '.join(header)
+
+
+def current_timing() -> Optional[RequestTiming]:
+    return _current.get()
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class RouteStats:
+    """Rolling per-route samples: (wall, db, llm, http, app) in ms."""
+
+    def __init__(self, window: int = REQUEST_PROFILE_WINDOW):
+        self._samples: Dict[str, Deque[Tuple[float, float, float, float, float]]] = {}
+        self._counts: Counter = Counter()
+        self._errors: Counter = Counter()
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record(self, route: str, wall_ms: float, breakdown: Dict[str, float], status: int) -> None:
+        sample = (wall_ms, breakdown['db'], breakdown['llm'], breakdown['http'], breakdown['app'])
+        with self._lock:
+            samples = self._samples.get(route)
+            if samples is None:
+                samples = self._samples[route] = deque(maxlen=self._window)
+            samples.append(sample)
+            self._counts[route] += 1
+            if status >= 500:
+                self._errors[route] += 1
+
+    def snapshot(self, sort: str = 'p95_ms', limit: int = 50) -> List[Dict]:
+        with self._lock:
+            items = [(route, list(samples), self._counts[route], self._errors[route])
+                     for route, samples in self._samples.items()]
+        rows = []
+        for route, samples, count, errors in items:
+            walls = sorted(s[0] for s in samples)
+            n = len(samples)
+            mean = {name: sum(s[i + 1] for s in samples) / n for i, name in enumerate(COMPONENTS)}
+            total = sum(mean.values()) or 1.0
+            rows.append({
+                'route': route,
+                'requests': count,
+                'errors': errors,
+                'window': n,
+                'p50_ms': round(_percentile(walls, 0.50), 1),
+                'p95_ms': round(_percentile(walls, 0.95), 1),
+                'p99_ms': round(_percentile(walls, 0.99), 1),
+                'max_ms': round(walls[-1], 1),
+                'mean_ms': {name: round(value, 1) for name, value in mean.items()},
+                'share': {name: round(value / total, 3) for name, value in mean.items()},
+            })
+        rows.sort(key=lambda r: -r[sort])
+        return rows[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._errors.clear()
+
+
+route_stats = RouteStats()
+
+
+def route_template(scope) -> str:
+    route = scope.get('route')
+    path = getattr(route, 'path', None)
+    if path:
+        return f"{scope.get('method', 'GET')} {path}"
+    return 'unmatched'
+
+
+class StackSampler:
+    """Samples the stacks of threads running project code into folded-stack counts."""
+
+    def __init__(self, interval: float = REQUEST_PROFILE_INTERVAL_MS / 1000,
+                 max_seconds: float = REQUEST_PROFILE_MAX_SECONDS, prefix: str = 'src.'):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.prefix = prefix
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _stack(self, frame) -> Optional[str]:
+        names = []
+        relevant = False
+        while frame is not None:
+            module = frame.f_globals.get('__name__', '?')
+            if module.startswith(self.prefix) and module != __name__:
+                relevant = True
+            names.append(f"{module}:{frame.f_code.co_name}")
+            frame = frame.f_back
+        if not relevant or names[0] == 'threading:wait':
+            return None
+        names.reverse()
+        return ';'.join(names)
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = self._stack(frame)
+                if stack is None:
+                    continue
+                if thread_id not in names:
+                    names[thread_id] = next((t.name for t in threading.enumerate() if t.ident == thread_id),
+                                            str(thread_id))
+                self.stacks[f"{names[thread_id]};{stack}"] += 1
+            self.samples += 1
+
+    def __enter__(self) -> 'StackSampler':
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def folded(self) -> str:
+        """Brendan Gregg's collapsed format: 'frame;frame;frame count' per line."""
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + '\n'
+
+
+def _observe_query(sql, params, seconds, rowcount=-1, error=False) -> None:
+    timing = _current.get()
+    if timing is not None:
+        timing.db_ms += seconds * 1000
+        timing.db_calls += 1
+
+
+def _timed_send(original):
+    def send(self, request, *args, **kwargs):
+        timing = _current.get()
+        if timing is None:
+            return original(self, request, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return original(self, request, *args, **kwargs)
+        finally:
+            timing.add_http(urlsplit(str(request.url)).hostname, (time.perf_counter() - started) * 1000)
+    send._request_profiler = True
+    return send
+
+
+def _timed_async_send(original):
+    async def send(self, request, *args, **kwargs):
+        timing = _current.get()
+        if timing is None:
+            return await original(self, request, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return await original(self, request, *args, **kwargs)
+        finally:
+            timing.add_http(urlsplit(str(request.url)).hostname, (time.perf_counter() - started) * 1000)
+    send._request_profiler = True
+    return send
+
+
+_installed = False
+
+
+def install_instrumentation() -> None:
+    """Hook the DB helpers and the HTTP client libraries that are installed. Idempotent."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    from src.db.db import add_query_observer
+    add_query_observer(_observe_query)
+
+    try:
+        import requests
+        if not getattr(requests.Session.send, '_request_profiler', False):
+            requests.Session.send = _timed_send(requests.Session.send)
+    except ImportError:
+        pass
+    try:
+        import httpx
+        if not getattr(httpx.Client.send, '_request_profiler', False):
+            httpx.Client.send = _timed_send(httpx.Client.send)
+            httpx.AsyncClient.send = _timed_async_send(httpx.AsyncClient.send)
+    except ImportError:
+        pass
+
+
+def _wants_profile(query_string: str) -> bool:
+    return '__profile=1' in query_string.split('&')
+
+
+async def _is_admin(request) -> bool:
+    token = request.headers.get('x-admin-token')
+    if not token:
+        return False
+    from src.api.admin_routes import verify_admin_token
+    from src.db.async_db import run_db
+    try:
+        return await run_db(verify_admin_token, token)
+    except Exception:
+        return False
+
+
+class RequestProfilerMiddleware:
+    """Pure ASGI middleware so the body stream is timed too and nothing is buffered."""
+
+    def __init__(self, app):
+        self.app = app
+        install_instrumentation()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        if _wants_profile(scope.get('query_string', b'').decode('latin-1')):
+            from starlette.requests import Request
+            if await _is_admin(Request(scope)):
+                await self._profile(scope, receive, send)
+                return
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        status = 500
+
+        async def timed_send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                if REQUEST_SERVER_TIMING:
+                    wall_ms = (time.perf_counter() - timing.started) * 1000
+                    headers = list(message.get('headers', []))
+                    headers.append((b'server-timing', timing.server_timing(wall_ms).encode('latin-1')))
+                    message = {**message, 'headers': headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            _current.reset(token)
+            wall_ms = (time.perf_counter() - timing.started) * 1000
+            route_stats.record(route_template(scope), wall_ms, timing.breakdown(wall_ms), status)
+
+    async def _profile(self, scope, receive, send):
+        from starlette.responses import PlainTextResponse
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        status = 500
+
+        async def discard(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+
+        try:
+            with StackSampler() as sampler:
+                await self.app(scope, receive, discard)
+        finally:
+            _current.reset(token)
+        wall_ms = (time.perf_counter() - timing.started) * 1000
+        logger.info(f"Profiled {route_template(scope)}: {wall_ms:.0f}ms, {sampler.samples} samples")
+        response = PlainTextResponse(sampler.folded(), headers={
+            'Server-Timing': timing.server_timing(wall_ms),
+            'X-Profile-Samples': str(sampler.samples),
+            'X-Profile-Route': route_template(scope),
+            'X-Profile-Status': str(status),
+            'Cache-Control': 'no-store',
+        })
+        await response(scope, receive, send)
@@ -12,7 +12,7 @@ Serves SEO-optimized pages:
 import os
 import json
 from datetime import datetime, date, timedelta, timezone
-from typing import Optional, List
+from typing import Optional
 from calendar import month_name
 
 from fastapi import APIRouter, Request, HTTPException
@@ -28,10 +28,7 @@ from src.seo.seo_generator import (
     get_monthly_pages,
     get_available_months,
     generate_sitemap_entries,
-    generate_sitemap_core_entries,
-    generate_sitemap_alerts_entries,
     generate_sitemap_indices_entries,
-    generate_sitemap_digest_entries,
     get_yesterday_date,
     generate_daily_page_model,
     get_regional_daily_page,
@@ -58,6 +55,9 @@ from src.geri.geri_history_service import (
     get_weekly_snapshot
 )
 from calendar import month_name as calendar_month_name
+from src.seo.snapshot_store import serve_snapshot
+from src.db.async_db import run_db, submit_db
+from src.seo.sitemap_generator import render_sitemap_file, SITEMAP_FAMILIES
 from src.utils.contextual_linking import (
     ContextualLinkBuilder,
     get_risk_context_styles,
@@ -187,7 +187,11 @@ def generate_why_matters_text(model: dict) -> str:
 
 
 def track_page_view(page_type: str, page_path: str):
-    """Track page view (privacy-safe, no cookies)."""
+    """Track page view (privacy-safe, no cookies) without delaying the response."""
+    submit_db(_record_page_view, page_type, page_path)
+
+
+def _record_page_view(page_type: str, page_path: str):
     try:
         with get_cursor() as cursor:
             cursor.execute("""
@@ -650,6 +654,12 @@ def render_gated_nav() -> str:
 
 GATED_ALERTS_HEADERS = {"Cache-Control": "private, no-store"}
 
+DAILY_ALERTS_HEADERS = {
+    "Cache-Control": "private, no-store",
+    "X-Robots-Tag": "noindex, nofollow, noarchive",
+    "X-Content-Type-Options": "nosniff",
+}
+
 
 def _alerts_paywall_response(page_title: str) -> HTMLResponse:
     """Locked shell served to anonymous visitors on gated alerts pages.
@@ -861,7 +871,7 @@ def _indices_paywall_response(page_title: str) -> HTMLResponse:
 @router.get("/alerts", response_class=HTMLResponse)
 async def alerts_hub(request: Request):
     """Alerts hub page — subscriber-only (Alerts Archive, €4.99/mo)."""
-    if not _alerts_access_user(request):
+    if not await run_db(_alerts_access_user, request):
         return _alerts_paywall_response("Geopolitical & Energy Risk Alerts Archive")
     track_page_view("hub", "/alerts")
     
@@ -1230,7 +1240,7 @@ async def alerts_by_category(category_slug: str, request: Request):
     """
     Category-specific alerts page — subscriber-only (Alerts Archive, €4.99/mo).
     """
-    if not _alerts_access_user(request):
+    if not await run_db(_alerts_access_user, request):
         return _alerts_paywall_response("Category Risk Alerts")
     # Map slug back to display name
     category_display_map = {
@@ -1308,7 +1318,7 @@ async def alerts_by_category(category_slug: str, request: Request):
 @router.get("/alerts/daily/{date_str}", response_class=HTMLResponse)
 async def daily_alerts_page(date_str: str, request: Request):
     """Daily alerts page — subscriber-only (Alerts Archive, €4.99/mo)."""
-    if not _alerts_access_user(request):
+    if not await run_db(_alerts_access_user, request):
         return _alerts_paywall_response("Daily Risk Alerts")
     
     try:
@@ -1322,6 +1332,16 @@ async def daily_alerts_page(date_str: str, request: Request):
     
     track_page_view("daily", f"/alerts/daily/{date_str}")
     
+    cached = await serve_snapshot(request, f"/alerts/daily/{target_date.isoformat()}", DAILY_ALERTS_HEADERS)
+    if cached:
+        return cached
+    
+    return HTMLResponse(content=await run_db(render_daily_alerts_html, target_date), headers=DAILY_ALERTS_HEADERS)
+
+
+def render_daily_alerts_html(target_date: date) -> str:
+    """Build the daily alerts page HTML (no gating or tracking)."""
+    date_str = target_date.isoformat()
     page_data = get_daily_page(target_date)
     
     if page_data and page_data.get('model'):
@@ -1548,24 +1568,28 @@ async def daily_alerts_page(date_str: str, request: Request):
     </html>
     """
     
-    headers = {
-        "Cache-Control": "private, no-store",
-        "X-Robots-Tag": "noindex, nofollow, noarchive",
-        "X-Content-Type-Options": "nosniff",
-    }
-    return HTMLResponse(content=html, headers=headers)
+    return html
 
 
 @router.get("/alerts/{year}/{month}", response_class=HTMLResponse)
 async def monthly_archive_page(year: int, month: int, request: Request):
     """Monthly archive page — subscriber-only (Alerts Archive, €4.99/mo)."""
-    if not _alerts_access_user(request):
+    if not await run_db(_alerts_access_user, request):
         return _alerts_paywall_response("Monthly Risk Alerts Archive")
     if month < 1 or month > 12 or year < 2020 or year > 2030:
         raise HTTPException(status_code=404, detail="Invalid month/year")
     
     track_page_view("monthly", f"/alerts/{year}/{month:02d}")
     
+    cached = await serve_snapshot(request, f"/alerts/{year}/{month:02d}", GATED_ALERTS_HEADERS)
+    if cached:
+        return cached
+    
+    return HTMLResponse(content=await run_db(render_alerts_monthly_html, year, month), headers=GATED_ALERTS_HEADERS)
+
+
+def render_alerts_monthly_html(year: int, month: int) -> str:
+    """Build the monthly alerts archive HTML (no gating or tracking)."""
     pages = get_monthly_pages(year, month)
     month_display = f"{month_name[month]} {year}"
     
@@ -1641,7 +1665,7 @@ async def monthly_archive_page(year: int, month: int, request: Request):
     </html>
     """
     
-    return HTMLResponse(content=html, headers=GATED_ALERTS_HEADERS)
+    return html
 
 
 @router.get("/robots.txt", response_class=PlainTextResponse)
@@ -1761,170 +1785,84 @@ async def ads_txt():
     return PlainTextResponse(content=ads_content, headers={"Cache-Control": "public, max-age=86400"})
 
 
-def _render_urlset_xml(entries: List[dict]) -> str:
-    xml_entries = ""
-    for e in entries:
-        lastmod_tag = f"\n        <lastmod>{e['lastmod']}</lastmod>" if e.get('lastmod') else ""
-        priority_tag = f"\n        <priority>{e['priority']}</priority>" if e.get('priority') else ""
-        changefreq_tag = f"\n        <changefreq>{e['changefreq']}</changefreq>" if e.get('changefreq') else ""
-        xml_entries += f"""
-    <url>
-        <loc>{BASE_URL}{e['loc']}</loc>{lastmod_tag}{priority_tag}{changefreq_tag}
-    </url>"""
-    return f"""<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-{xml_entries}
-</urlset>"""
+SITEMAP_HEADERS = {"Cache-Control": "public, max-age=3600"}
 
 
-@router.get("/sitemap-index.xml", response_class=Response)
-async def sitemap_index_xml():
-    """Sitemap index file linking to individual sitemaps."""
-    from datetime import date as _date
-    today = _date.today().isoformat()
+async def _sitemap_response(request: Request, path: str) -> Response:
+    """Serve a generated sitemap file from the store, building it live on a miss."""
+    cached = await serve_snapshot(request, path, SITEMAP_HEADERS, media_type="application/xml")
+    if cached:
+        return cached
+    xml = await run_db(render_sitemap_file, path, BASE_URL)
+    if xml is None:
+        raise HTTPException(status_code=404, detail="Sitemap not found")
+    return Response(content=xml, media_type="application/xml", headers=SITEMAP_HEADERS)
 
-    sitemaps = [
-        ('sitemap-core.xml', today),
-        ('sitemap-indices.xml', today),
-        ('sitemap-digest.xml', today),
-        ('sitemap-data.xml', today),
-    ]
 
-    sitemap_entries = ""
-    for name, lastmod in sitemaps:
-        sitemap_entries += f"""
-    <sitemap>
-        <loc>{BASE_URL}/{name}</loc>
-        <lastmod>{lastmod}</lastmod>
-    </sitemap>"""
-
-    xml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-{sitemap_entries}
-</sitemapindex>"""
-    return Response(content=xml, media_type="application/xml", headers={"Cache-Control": "public, max-age=3600"})
+@router.get("/sitemap-index.xml", response_class=Response)
+async def sitemap_index_xml(request: Request):
+    """Sitemap index file linking to individual sitemaps."""
+    return await _sitemap_response(request, "/sitemap-index.xml")
 
 
 @router.get("/sitemap-core.xml", response_class=Response)
-async def sitemap_core_xml():
+async def sitemap_core_xml(request: Request):
     """Core authority pages sitemap (~10-30 URLs)."""
-    entries = generate_sitemap_core_entries()
-    return Response(content=_render_urlset_xml(entries), media_type="application/xml", headers={"Cache-Control": "public, max-age=3600"})
+    return await _sitemap_response(request, "/sitemap-core.xml")
 
 
 @router.get("/sitemap-alerts.xml", response_class=Response)
-async def sitemap_alerts_xml():
-    """Daily alert pages sitemap (last 60 days + monthly archives)."""
-    entries = generate_sitemap_alerts_entries(limit=60)
-    return Response(content=_render_urlset_xml(entries), media_type="application/xml", headers={"Cache-Control": "public, max-age=3600"})
+async def sitemap_alerts_xml(request: Request):
+    """Daily alert pages sitemap (empty: alerts archive is subscriber-only)."""
+    return await _sitemap_response(request, "/sitemap-alerts.xml")
 
 
 @router.get("/sitemap-indices.xml", response_class=Response)
-async def sitemap_indices_xml():
+async def sitemap_indices_xml(request: Request):
     """Indices authority pages sitemap."""
-    from datetime import date as _date
-    today = _date.today().isoformat()
-
-    pages = [
-        ("https://energyriskiq.com/indices",                         "weekly", "0.9"),
-        ("https://energyriskiq.com/indices/global-energy-risk-index","daily",  "0.9"),
-        ("https://energyriskiq.com/indices/european-energy-risk-index","daily", "0.9"),
-        ("https://energyriskiq.com/indices/europe-gas-stress-index",  "daily",  "0.9"),
-    ]
-
-    entries = ""
-    for loc, freq, pri in pages:
-        entries += f"""
-<url>
-<loc>{loc}</loc>
-<lastmod>{today}</lastmod>
-<changefreq>{freq}</changefreq>
-<priority>{pri}</priority>
-</url>
-"""
-
-    xml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-{entries}</urlset>"""
-    return Response(content=xml, media_type="application/xml", headers={"Cache-Control": "public, max-age=3600"})
+    return await _sitemap_response(request, "/sitemap-indices.xml")
 
 
 @router.get("/sitemap-digest.xml", response_class=Response)
-async def sitemap_digest_xml():
+async def sitemap_digest_xml(request: Request):
     """Daily digest pages sitemap (last 60 days)."""
-    entries = generate_sitemap_digest_entries(limit=60)
-    return Response(content=_render_urlset_xml(entries), media_type="application/xml", headers={"Cache-Control": "public, max-age=3600"})
+    return await _sitemap_response(request, "/sitemap-digest.xml")
 
 
 @router.get("/sitemap-research.xml", response_class=Response)
-async def sitemap_research_xml():
+async def sitemap_research_xml(request: Request):
     """Research pages sitemap."""
-    from datetime import date as _date
-    today = _date.today().isoformat()
-
-    pages = [
-        ("https://energyriskiq.com/research/what-drives-lng-prices", "daily",   "0.9"),
-        ("https://energyriskiq.com/research/global-energy-risk-index",   "monthly", "0.8"),
-        ("https://energyriskiq.com/research/global-energy-risk-timeline", "monthly", "0.8"),
-        ("https://energyriskiq.com/data/energy-risk-snapshot", "daily", "0.9"),
-        ("https://energyriskiq.com/data/global-energy-risk-forecast", "daily", "0.9"),
-        ("https://energyriskiq.com/data/europe-lng-supply-demand", "daily", "0.9"),
-        ("https://energyriskiq.com/data/jkm-lng-spot-price", "daily", "0.9"),
-        ("https://energyriskiq.com/data/ttf-gas-price-today", "daily", "0.9"),
-        ("https://energyriskiq.com/gas-storage-levels-in-europe", "daily", "0.9"),
-        ("https://energyriskiq.com/gas-storage-levels-germany", "daily", "0.9"),
-        ("https://energyriskiq.com/data-license", "monthly", "0.5"),
-    ]
+    return await _sitemap_response(request, "/sitemap-research.xml")
 
-    entries = ""
-    for loc, freq, pri in pages:
-        entries += f"""
-<url>
-<loc>{loc}</loc>
-<lastmod>{today}</lastmod>
-<changefreq>{freq}</changefreq>
-<priority>{pri}</priority>
-</url>
-"""
 
-    xml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-{entries}</urlset>"""
-    return Response(content=xml, media_type="application/xml", headers={"Cache-Control": "public, max-age=3600"})
+@router.get("/sitemap-{family}-{shard:int}.xml", response_class=Response)
+async def sitemap_shard_xml(request: Request, family: str, shard: int):
+    """Additional shards of a sitemap family once it passes 50k URLs."""
+    if family not in SITEMAP_FAMILIES or shard < 2:
+        raise HTTPException(status_code=404, detail="Sitemap not found")
+    return await _sitemap_response(request, f"/sitemap-{family}-{shard}.xml")
 
 
 @router.get("/sitemap.xml", response_class=Response)
-async def sitemap_xml():
+async def sitemap_xml(request: Request):
     """Sitemap index served directly at /sitemap.xml."""
-    from datetime import date as _date
-    today = _date.today().isoformat()
-
-    sitemaps = [
-        ('sitemap-core.xml',     today),
-        ('sitemap-indices.xml',  today),
-        ('sitemap-digest.xml',   today),
-        ('sitemap-research.xml', today),
-    ]
-
-    sitemap_entries = ""
-    for name, lastmod in sitemaps:
-        sitemap_entries += f"""<sitemap>
-<loc>{BASE_URL}/{name}</loc>
-<lastmod>{lastmod}</lastmod>
-</sitemap>
-"""
-
-    xml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-{sitemap_entries}</sitemapindex>"""
-    return Response(content=xml, media_type="application/xml", headers={"Cache-Control": "public, max-age=3600"})
+    return await _sitemap_response(request, "/sitemap.xml")
 
 
 @router.get("/sitemap.html", response_class=HTMLResponse)
-async def sitemap_html():
+async def sitemap_html(request: Request):
     """Human-readable HTML sitemap."""
     track_page_view("sitemap", "/sitemap.html")
     
+    cached = await serve_snapshot(request, "/sitemap.html")
+    if cached:
+        return cached
+    
+    return HTMLResponse(content=await run_db(render_sitemap_html))
+
+
+def render_sitemap_html() -> str:
+    """Build the HTML sitemap page."""
     recent_pages = get_recent_daily_pages(limit=90)
     months = get_available_months()
     
@@ -2002,7 +1940,7 @@ async def sitemap_html():
     </html>
     """
     
-    return HTMLResponse(content=html)
+    return html
 
 
 @router.get("/geri")
@@ -2027,16 +1965,19 @@ async def geri_page(request: Request):
     
     track_page_view("geri", "/indices/global-energy-risk-index")
     
-    user_id = None
     x_user_token = request.headers.get('x-user-token')
     if x_user_token:
         try:
             from src.api.user_routes import verify_user_session
-            session = verify_user_session(x_user_token)
-            user_id = session.get('user_id')
+            await run_db(verify_user_session, x_user_token)
         except:
             pass
     
+    return HTMLResponse(content=await run_db(render_geri_index_html), headers={"Cache-Control": "public, max-age=300"})
+
+
+def render_geri_index_html() -> str:
+    """Build the GERI index page HTML (no gating or tracking)."""
     geri = get_geri_latest()
     
     score_card = ""
@@ -3073,7 +3014,7 @@ async def geri_page(request: Request):
     </html>
     """
     
-    return HTMLResponse(content=html, headers={"Cache-Control": "public, max-age=300"})
+    return html
 
 
 def get_geri_common_styles():
@@ -3119,7 +3060,7 @@ async def geri_history_page(request: Request):
     # Apply anti-scraping protection
     await apply_anti_scraping(request)
 
-    if not _indices_access_user(request):
+    if not await run_db(_indices_access_user, request):
         return _indices_paywall_response("GERI History Archive")
 
     track_page_view("geri_history", "/geri/history")
@@ -4135,6 +4076,44 @@ async def geri_methodology_page():
     return HTMLResponse(content=html, headers={"Cache-Control": "public, max-age=86400"})
 
 
+def _geri_not_found_response(title: str, heading: str, message: str) -> HTMLResponse:
+    """404 page for GERI archive dates/months with no snapshot."""
+    html = f"""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+<!-- Google tag (gtag.js) -->
+<script async src="https://www.googletagmanager.com/gtag/js?id=G-CZQZYP5138"></script>
+<script>
+  window.dataLayer = window.dataLayer || [];
+  function gtag(){{dataLayer.push(arguments);}}
+  gtag('js', new Date());
+  gtag('config', 'G-CZQZYP5138');
+</script>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>{title} | EnergyRiskIQ</title>
+        <link rel="icon" type="image/png" href="/static/favicon.png">
+        {get_common_styles()}
+    <script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client=ca-pub-4464205455860668"
+ crossorigin="anonymous"></script>
+</head>
+    <body>
+        {render_indices_gated_nav()}
+        <main>
+            <div class="container" style="text-align: center; padding: 4rem 0;">
+                <h1>{heading}</h1>
+                <p style="color: #9ca3af;">{message}</p>
+                <p><a href="/geri/history" style="color: #60a5fa;">Browse History</a></p>
+            </div>
+        </main>
+        {render_footer()}
+    </body>
+    </html>
+    """
+    return HTMLResponse(content=html, status_code=404)
+
+
 @router.get("/geri/{date:path}", response_class=HTMLResponse)
 async def geri_daily_page(request: Request, date: str):
     """
@@ -4152,7 +4131,7 @@ async def geri_daily_page(request: Request, date: str):
     if not month_match and not date_match:
         raise HTTPException(status_code=404, detail="Invalid date format. Use YYYY-MM-DD.")
 
-    if not _indices_access_user(request):
+    if not await run_db(_indices_access_user, request):
         return _indices_paywall_response("GERI Daily Snapshot")
 
     if month_match:
@@ -4162,43 +4141,26 @@ async def geri_daily_page(request: Request, date: str):
     
     track_page_view("geri_daily", f"/geri/{date}")
     
+    cached = await serve_snapshot(request, f"/geri/{date}", GATED_ALERTS_HEADERS)
+    if cached:
+        return cached
+    
+    html = await run_db(render_geri_daily_html, date)
+    if html is None:
+        return _geri_not_found_response(
+            f"GERI {date} Not Found",
+            "Snapshot Not Found",
+            f"No GERI data available for {date}.",
+        )
+    return HTMLResponse(content=html, headers=GATED_ALERTS_HEADERS)
+
+
+def render_geri_daily_html(date: str) -> Optional[str]:
+    """Build the GERI daily snapshot HTML, or None if the date has no snapshot."""
     snapshot = get_snapshot_by_date(date)
     
     if not snapshot:
-        html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-    <!-- Google tag (gtag.js) -->
-    <script async src="https://www.googletagmanager.com/gtag/js?id=G-CZQZYP5138"></script>
-    <script>
-      window.dataLayer = window.dataLayer || [];
-      function gtag(){{dataLayer.push(arguments);}}
-      gtag('js', new Date());
-      gtag('config', 'G-CZQZYP5138');
-    </script>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>GERI {date} Not Found | EnergyRiskIQ</title>
-            <link rel="icon" type="image/png" href="/static/favicon.png">
-            {get_common_styles()}
-        <script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client=ca-pub-4464205455860668"
-     crossorigin="anonymous"></script>
-</head>
-        <body>
-            {render_indices_gated_nav()}
-            <main>
-                <div class="container" style="text-align: center; padding: 4rem 0;">
-                    <h1>Snapshot Not Found</h1>
-                    <p style="color: #9ca3af;">No GERI data available for {date}.</p>
-                    <p><a href="/geri/history" style="color: #60a5fa;">Browse History</a></p>
-                </div>
-            </main>
-            {render_footer()}
-        </body>
-        </html>
-        """
-        return HTMLResponse(content=html, status_code=404)
+        return None
     
     adjacent = get_adjacent_dates(date)
     
@@ -4440,7 +4402,7 @@ async def geri_daily_page(request: Request, date: str):
     </html>
     """
     
-    return HTMLResponse(content=html, headers=GATED_ALERTS_HEADERS)
+    return html
 
 
 async def geri_monthly_page(request: Request, year: int, month: int):
@@ -4453,44 +4415,27 @@ async def geri_monthly_page(request: Request, year: int, month: int):
     
     track_page_view("geri_monthly", f"/geri/{year}/{month:02d}")
     
+    cached = await serve_snapshot(request, f"/geri/{year}/{month:02d}", GATED_ALERTS_HEADERS)
+    if cached:
+        return cached
+    
+    html = await run_db(render_geri_monthly_html, year, month)
+    if html is None:
+        return _geri_not_found_response(
+            f"GERI {calendar_month_name[month]} {year} Not Found",
+            "No Data Available",
+            f"No GERI data available for {calendar_month_name[month]} {year}.",
+        )
+    return HTMLResponse(content=html, headers=GATED_ALERTS_HEADERS)
+
+
+def render_geri_monthly_html(year: int, month: int) -> Optional[str]:
+    """Build the GERI monthly archive HTML, or None if the month has no snapshots."""
     snapshots = list_monthly(year, month)
     stats = get_monthly_stats(year, month)
     
     if not snapshots:
-        html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-    <!-- Google tag (gtag.js) -->
-    <script async src="https://www.googletagmanager.com/gtag/js?id=G-CZQZYP5138"></script>
-    <script>
-      window.dataLayer = window.dataLayer || [];
-      function gtag(){{dataLayer.push(arguments);}}
-      gtag('js', new Date());
-      gtag('config', 'G-CZQZYP5138');
-    </script>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>GERI {calendar_month_name[month]} {year} Not Found | EnergyRiskIQ</title>
-            <link rel="icon" type="image/png" href="/static/favicon.png">
-            {get_common_styles()}
-        <script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client=ca-pub-4464205455860668"
-     crossorigin="anonymous"></script>
-</head>
-        <body>
-            {render_indices_gated_nav()}
-            <main>
-                <div class="container" style="text-align: center; padding: 4rem 0;">
-                    <h1>No Data Available</h1>
-                    <p style="color: #9ca3af;">No GERI data available for {calendar_month_name[month]} {year}.</p>
-                    <p><a href="/geri/history" style="color: #60a5fa;">Browse History</a></p>
-                </div>
-            </main>
-            {render_footer()}
-        </body>
-        </html>
-        """
-        return HTMLResponse(content=html, status_code=404)
+        return None
     
     adjacent = get_adjacent_months(year, month)
     
@@ -4613,7 +4558,7 @@ async def geri_monthly_page(request: Request, year: int, month: int):
     </html>
     """
     
-    return HTMLResponse(content=html, headers=GATED_ALERTS_HEADERS)
+    return html
 
 
 def get_digest_dark_styles() -> str:
@@ -5125,11 +5070,23 @@ def _get_indices_latest_values() -> dict:
     return result
 
 
+INDICES_HUB_HEADERS = {"Cache-Control": "public, max-age=3600"}
+
+
 @router.get("/indices", response_class=HTMLResponse)
 async def indices_hub_page(request: Request):
     await apply_anti_scraping(request)
     track_page_view("indices", "/indices")
 
+    cached = await serve_snapshot(request, "/indices", INDICES_HUB_HEADERS)
+    if cached:
+        return cached
+
+    return HTMLResponse(content=await run_db(render_indices_hub_html), headers=INDICES_HUB_HEADERS)
+
+
+def render_indices_hub_html() -> str:
+    """Build the /indices hub HTML from the latest published index values."""
     data = _get_indices_latest_values()
 
     band_colors = {
@@ -5757,7 +5714,7 @@ async def indices_hub_page(request: Request):
     </body>
     </html>
     """
-    return HTMLResponse(content=html, headers={"Cache-Control": "public, max-age=3600"})
+    return html
 
 
 def render_digest_footer() -> str:
@@ -6183,36 +6140,29 @@ async def geri_research_page(request: Request):
     GERI Research Page - Deep-dive asset page for the Global Energy Risk Index.
     Built incrementally section by section.
     """
+    cached = await serve_snapshot(request, "/research/global-energy-risk-index")
+    if cached:
+        return cached
+
+    return HTMLResponse(content=await run_db(render_geri_research_html))
+
+
+def render_geri_research_html() -> str:
+    """Build the GERI research page HTML."""
     import json as _json
     from datetime import date as _date
 
-    # ── GERI daily: production intel_indices_daily via PRODUCTION_DATABASE_URL ─
-    _geri_rows = execute_production_query("""
-        SELECT date, value, band
-        FROM intel_indices_daily
-        WHERE index_id = 'global:geo_energy_risk'
-          AND date BETWEEN '2026-02-25' AND '2026-03-04'
-        ORDER BY date
-    """)
-    _geri_by_date = {str(r['date']): int(r['value']) for r in _geri_rows} if _geri_rows else {}
-
-    # ── Brent: production oil_price_snapshots ─────────────────────────────────
-    _brent_rows = execute_production_query("""
-        SELECT date, brent_price
-        FROM oil_price_snapshots
-        WHERE date BETWEEN '2026-02-25' AND '2026-03-04'
-        ORDER BY date
-    """)
-    _brent_by_date = {str(r['date']): float(r['brent_price']) for r in _brent_rows} if _brent_rows else {}
-
-    # ── VIX: production vix_snapshots (market days only) ──────────────────────
-    _vix_rows = execute_production_query("""
-        SELECT date, vix_close
-        FROM vix_snapshots
-        WHERE date BETWEEN '2026-02-25' AND '2026-03-04'
-        ORDER BY date
-    """)
-    _vix_by_date = {str(r['date']): float(r['vix_close']) for r in _vix_rows} if _vix_rows else {}
+    # ── GERI / Brent / VIX for the event window, from the shared series store ─
+    from src.market.series_store import get_series_store
+    _store = get_series_store()
+    _window = (_date(2026, 2, 25), _date(2026, 3, 4))
+
+    def _by_date(name):
+        return {r['date']: r['value'] for r in _store.series(name, *_window).to_rows(date_format='iso')}
+
+    _geri_by_date = {d: int(v) for d, v in _by_date('geri').items()}
+    _brent_by_date = _by_date('brent')
+    _vix_by_date = _by_date('vix')  # market days only
 
     # ── Build GERI chart arrays (all 8 dates, null for any missing) ───────────
     _all_dates  = ['2026-02-25','2026-02-26','2026-02-27','2026-02-28',
@@ -6273,37 +6223,19 @@ async def geri_research_page(request: Request):
     _vix_max   = int(max(_vix_data_py) + 2) if _vix_data_py else 26
 
     # ── Section 8: GERI vs Market Assets — last 30 days dual-axis charts ────────
-    _ov_geri_rows  = execute_production_query(
-        "SELECT date::text, value FROM intel_indices_daily "
-        "WHERE index_id='global:geo_energy_risk' AND date >= CURRENT_DATE - INTERVAL '30 days' ORDER BY date ASC"
-    )
-    _ov_brent_rows = execute_production_query(
-        "SELECT date::text, brent_price FROM oil_price_snapshots "
-        "WHERE date >= CURRENT_DATE - INTERVAL '30 days' ORDER BY date ASC"
-    )
-    _ov_vix_rows   = execute_production_query(
-        "SELECT date::text, vix_close FROM vix_snapshots "
-        "WHERE date >= CURRENT_DATE - INTERVAL '30 days' ORDER BY date ASC"
-    )
-    _ov_ttf_rows   = execute_production_query(
-        "SELECT t.date::text, t.ttf_price FROM ttf_gas_snapshots t "
-        "WHERE t.date >= CURRENT_DATE - INTERVAL '30 days' ORDER BY t.date ASC"
-    )
-    _ov_fx_rows    = execute_production_query(
-        "SELECT e.date::text, e.rate FROM eurusd_snapshots e "
-        "WHERE e.date >= CURRENT_DATE - INTERVAL '30 days' ORDER BY e.date ASC"
-    )
-    _ov_lng_rows   = execute_production_query(
-        "SELECT l.date::text, l.jkm_price FROM lng_price_snapshots l "
-        "WHERE l.date >= CURRENT_DATE - INTERVAL '30 days' ORDER BY l.date ASC"
-    )
+    from datetime import timedelta as _timedelta
+    _ov_store = _store
+    _ov_since = _date.today() - _timedelta(days=30)
+
+    def _ov_series(name):
+        return {r['date']: r['value'] for r in _ov_store.series(name, start=_ov_since).to_rows(date_format='iso')}
 
-    _ov_geri  = {str(r['date']): float(r['value'])       for r in (_ov_geri_rows  or [])}
-    _ov_brent = {str(r['date']): float(r['brent_price']) for r in (_ov_brent_rows or [])}
-    _ov_vix   = {str(r['date']): float(r['vix_close'])   for r in (_ov_vix_rows   or [])}
-    _ov_ttf   = {str(r['date']): float(r['ttf_price'])   for r in (_ov_ttf_rows   or [])}
-    _ov_fx    = {str(r['date']): float(r['rate'])         for r in (_ov_fx_rows    or [])}
-    _ov_lng   = {str(r['date']): float(r['jkm_price'])   for r in (_ov_lng_rows   or [])}
+    _ov_geri  = _ov_series('geri')
+    _ov_brent = _ov_series('brent')
+    _ov_vix   = _ov_series('vix')
+    _ov_ttf   = _ov_series('ttf')
+    _ov_fx    = _ov_series('eurusd')
+    _ov_lng   = _ov_series('jkm')
 
     _ov_all_dates = sorted(
         set(_ov_geri) | set(_ov_brent) | set(_ov_vix) | set(_ov_ttf) | set(_ov_fx) | set(_ov_lng)
@@ -9166,7 +9098,7 @@ async def geri_research_page(request: Request):
     </html>
     """
 
-    return HTMLResponse(content=html)
+    return html
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -9180,6 +9112,15 @@ async def global_energy_risk_timeline_page(request: Request):
     Covers 18 major energy disruption events from 2014–2026.
     Live index cards use 24h-delayed production values (OFFSET 1 rule).
     """
+    cached = await serve_snapshot(request, "/research/global-energy-risk-timeline")
+    if cached:
+        return cached
+
+    return HTMLResponse(content=await run_db(render_energy_risk_timeline_html))
+
+
+def render_energy_risk_timeline_html() -> str:
+    """Build the Global Energy Risk Timeline page HTML."""
 
     # ── 24h-delayed GERI ─────────────────────────────────────────────────────
     _geri_d = None
@@ -11312,7 +11253,7 @@ async def global_energy_risk_timeline_page(request: Request):
 </html>
 """
 
-    return HTMLResponse(content=html)
+    return html
 
 
 # ── Data License Page ─────────────────────────────────────────────────────────
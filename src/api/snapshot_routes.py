@@ -12,39 +12,40 @@ import asyncio
 import logging
 import html as _html
 from datetime import datetime, timezone
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse, StreamingResponse
 
 from src.db.db import execute_production_one, execute_production_query
+from src.db.async_db import AsyncDB, get_async_production_db
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
 @router.get("/api/hero-snapshot")
-async def hero_snapshot_api():
+async def hero_snapshot_api(db: AsyncDB = Depends(get_async_production_db)):
     """Fast JSON endpoint powering the hero panel on the landing page."""
     from fastapi.responses import JSONResponse
     try:
-        geri = execute_production_one(
+        geri = await db.fetch_one(
             "SELECT value, band, trend_7d FROM intel_indices_daily "
             "WHERE index_id='global:geo_energy_risk' ORDER BY date DESC LIMIT 1"
         )
-        eeri = execute_production_one(
+        eeri = await db.fetch_one(
             "SELECT value, band, trend_7d FROM reri_indices_daily "
             "WHERE index_id='europe:eeri' ORDER BY date DESC LIMIT 1"
         )
-        egsi = execute_production_one(
+        egsi = await db.fetch_one(
             "SELECT index_value AS value, band, trend_7d FROM egsi_m_daily "
             "WHERE region='Europe' ORDER BY index_date DESC LIMIT 1"
         )
-        brent = execute_production_one(
+        brent = await db.fetch_one(
             "SELECT brent_price FROM oil_price_snapshots ORDER BY date DESC LIMIT 1"
         )
-        ttf = execute_production_one(
+        ttf = await db.fetch_one(
             "SELECT ttf_price FROM ttf_gas_snapshots ORDER BY date DESC LIMIT 1"
         )
-        storage = execute_production_one(
+        storage = await db.fetch_one(
             "SELECT eu_storage_percent FROM gas_storage_snapshots ORDER BY date DESC LIMIT 1"
         )
         def _trend(row, key="trend_7d"):
@@ -64,22 +65,22 @@ async def hero_snapshot_api():
         return JSONResponse({"error": str(exc)}, status_code=500)
 
 @router.get("/api/ceri-sparklines")
-async def ceri_sparklines_api():
+async def ceri_sparklines_api(db: AsyncDB = Depends(get_async_production_db)):
     """30-day sparkline data for GERI, EERI, EGSI — used by Core Energy Risk Indices cards."""
     from fastapi.responses import JSONResponse
     try:
         def _vals(rows, col="value"):
             return [round(float(r[col]), 2) for r in (rows or [])]
 
-        geri_rows = execute_production_query(
+        geri_rows = await db.fetch_all(
             "SELECT value FROM (SELECT date, value FROM intel_indices_daily "
             "WHERE index_id='global:geo_energy_risk' ORDER BY date DESC LIMIT 30) t ORDER BY date ASC"
         )
-        eeri_rows = execute_production_query(
+        eeri_rows = await db.fetch_all(
             "SELECT value FROM (SELECT date, value FROM reri_indices_daily "
             "WHERE index_id='europe:eeri' ORDER BY date DESC LIMIT 30) t ORDER BY date ASC"
         )
-        egsi_rows = execute_production_query(
+        egsi_rows = await db.fetch_all(
             "SELECT index_value AS value FROM (SELECT index_date, index_value FROM egsi_m_daily "
             "WHERE region='Europe' ORDER BY index_date DESC LIMIT 30) t ORDER BY index_date ASC"
         )
@@ -0,0 +1,67 @@
+"""
+Unit tests for the Parquet/Arrow bulk data encodings.
+"""
+import io
+from datetime import date, datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.api import columnar
+
+GERI = columnar.DATASETS['geri']
+
+ROWS = [
+    {'date': date(2026, 1, d), 'value': 40.0 + d, 'band': 'ELEVATED' if d % 2 else 'MODERATE',
+     'trend_1d': None if d == 1 else 1.0, 'trend_7d': 2.5, 'computed_at': datetime(2026, 1, d, 6, 30)}
+    for d in range(1, 11)
+]
+
+
+def test_projection_keeps_date_and_rejects_unknown_columns():
+    assert [c.name for c in columnar.project(GERI, 'band, value')] == ['date', 'value', 'band']
+    assert columnar.project(GERI, None) == list(GERI.columns)
+    with pytest.raises(ValueError, match='components'):
+        columnar.project(GERI, 'value,components')
+
+
+def test_queries_alias_columns_and_bind_the_date_range():
+    egsi = columnar.DATASETS['egsi_m']
+    sql, params = columnar.select_query(egsi, columnar.project(egsi, 'value'), date(2025, 1, 1), None)
+    assert sql.startswith('SELECT index_date AS date, index_value::float8 AS value FROM egsi_m_daily')
+    assert "region = 'Europe'" in sql and 'index_date >= %s' in sql and sql.endswith('ORDER BY index_date')
+    assert params == (date(2025, 1, 1),)
+    sql, params = columnar.version_query(GERI, None, date(2026, 1, 5))
+    assert 'max(date) AS max_date' in sql and "md5(string_agg(t::text, ',' ORDER BY t.date))" in sql
+    assert 'FROM intel_indices_daily t WHERE' in sql
+    assert params == (date(2026, 1, 5),)
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+def test_encode_round_trips_typed_columns(fmt):
+    columns = columnar.project(GERI, None)
+    body = columnar.encode(columnar.to_table(columns, ROWS), fmt)
+    if fmt == 'parquet':
+        table = pq.read_table(io.BytesIO(body))
+    else:
+        table = pa.ipc.open_file(body).read_all()
+    assert table.column_names == GERI.column_names
+    assert table.schema.field('date').type == pa.date32()
+    assert table.schema.field('computed_at').type == pa.timestamp('us')
+    assert table.column('value').to_pylist() == [r['value'] for r in ROWS]
+    assert table.column('trend_1d').null_count == 1
+    assert table.column('band').to_pylist()[:2] == ['ELEVATED', 'MODERATE']
+
+
+def test_etag_changes_with_version_projection_and_format():
+    columns = columnar.project(GERI, None)
+    version = {'max_date': date(2026, 1, 10), 'row_count': 10, 'content_md5': 'a3f1'}
+    tag = columnar.etag(GERI, columns, 'parquet', None, None, version)
+    assert tag == columnar.etag(GERI, columns, 'parquet', None, None, dict(version))
+    assert tag != columnar.etag(GERI, columns, 'arrow', None, None, version)
+    assert tag != columnar.etag(GERI, columns[:2], 'parquet', None, None, version)
+    assert tag != columnar.etag(GERI, columns, 'parquet', None, None, dict(version, row_count=11))
+    assert tag != columnar.etag(GERI, columns, 'parquet', None, None, dict(version, max_date=date(2026, 1, 11)))
+    # a same-day correction leaves date and count alone but changes the digest
+    assert tag != columnar.etag(GERI, columns, 'parquet', None, None, dict(version, content_md5='9b07'))
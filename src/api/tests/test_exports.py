@@ -0,0 +1,76 @@
+"""
+Unit tests for the streaming CSV/XLSX export helpers.
+"""
+import csv
+import io
+
+import pytest
+from openpyxl import load_workbook
+
+from src.api import exports
+
+
+class Rows:
+    """Row source that records whether the export closed it (as it must a cursor)."""
+
+    def __init__(self, n):
+        self.it = ([i, f'name {i}', i * 1.5] for i in range(n))
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.it)
+
+    def close(self):
+        self.closed = True
+
+
+def test_csv_stream_chunks_rows_and_closes_the_source():
+    rows = Rows(25)
+    chunks = list(exports.csv_stream(['id', 'name', 'value'], rows, chunk_rows=10))
+    assert len(chunks) == 3
+    parsed = list(csv.reader(io.StringIO(''.join(chunks))))
+    assert parsed[0] == ['id', 'name', 'value']
+    assert parsed[-1] == ['24', 'name 24', '36.0']
+    assert len(parsed) == 26
+    assert rows.closed
+
+
+def test_csv_stream_closed_early_closes_the_source():
+    rows = Rows(100)
+    stream = exports.csv_stream(['id'], rows, chunk_rows=10)
+    next(stream)
+    stream.close()
+    assert rows.closed
+
+
+def test_xlsx_stream_writes_styled_header_fills_and_widths():
+    rows = [['2026-01-01', 42.0, 'ELEVATED'], ['2026-01-02', 12.5, 'LOW'], ['2026-01-03', None, '']]
+    fills = {'ELEVATED': 'FED7AA', 'LOW': 'D1FAE5'}
+    data = b''.join(exports.xlsx_stream(
+        'GERI History', ['Date', 'Value', 'Band'], iter(rows), widths=[14, 10, 12],
+        cell_fills=lambda r: {2: fills[r[2]]} if r[2] in fills else None,
+    ))
+    ws = load_workbook(io.BytesIO(data)).active
+    assert ws.title == 'GERI History'
+    assert [c.value for c in ws[1]] == ['Date', 'Value', 'Band']
+    assert ws['A1'].font.bold and ws['A1'].fill.start_color.rgb.endswith('1E293B')
+    assert ws['B2'].value == 42.0 and ws['C2'].value == 'ELEVATED'
+    assert ws['C2'].fill.start_color.rgb.endswith('FED7AA')
+    assert ws['C4'].fill.fill_type is None
+    assert ws.column_dimensions['A'].width == 14
+    assert ws.max_row == 4
+
+
+def test_primed_surfaces_first_chunk_errors_and_replays_the_chunk():
+    def failing():
+        raise RuntimeError('connection refused')
+        yield ''
+
+    with pytest.raises(RuntimeError):
+        exports._primed(failing())
+
+    primed = exports._primed(exports.csv_stream(['a'], iter([[1], [2]]), chunk_rows=1))
+    assert ''.join(primed) == 'a\r\n1\r\n2\r\n'
@@ -0,0 +1,80 @@
+"""
+Unit tests for lazy router registration and the import profiler.
+"""
+import pytest
+
+from src.api.import_profiler import package_totals, parse_importtime
+from src.api.lazy_routers import (ManifestError, build_manifest, discover_route_modules,
+                                  extract_routes, load_manifest)
+
+SOURCE = '''
+from fastapi import APIRouter
+
+router = APIRouter(prefix="/api/v1/things", tags=["things"])
+
+
+@router.on_event("startup")
+async def warm():
+    pass
+
+
+@router.get("/{thing_id}")
+def get_thing(thing_id: int):
+    return {}
+
+
+@router.api_route("/search", methods=["get", "post"])
+def search():
+    return []
+
+
+@router.post("/b")
+@router.put("/a")
+def stacked():
+    return None
+
+
+router.add_api_route("/extra", search, methods=["DELETE"])
+'''
+
+
+def test_extract_routes_in_registration_order():
+    entry = extract_routes(SOURCE)
+    assert entry['lifecycle'] is True
+    assert entry['routes'] == [
+        ['/api/v1/things/{thing_id}', ['GET']],
+        ['/api/v1/things/search', ['GET', 'POST']],
+        ['/api/v1/things/a', ['PUT']],
+        ['/api/v1/things/b', ['POST']],
+        ['/api/v1/things/extra', ['DELETE']],
+    ]
+
+
+@pytest.mark.parametrize('snippet', [
+    'PATH = "/x"\n@router.get(PATH)\ndef f():\n    pass\n',
+    'router.include_router(other)\n',
+    '@router.websocket("/ws")\nasync def ws(socket):\n    pass\n',
+    'if True:\n    @router.get("/x")\n    def f():\n        pass\n',
+])
+def test_unresolvable_routers_are_rejected(snippet):
+    with pytest.raises(ManifestError):
+        extract_routes('from fastapi import APIRouter\nrouter = APIRouter()\n' + snippet)
+
+
+def test_checked_in_manifest_is_current():
+    manifest, _ = build_manifest(discover_route_modules())
+    assert load_manifest() == manifest, 'run `python -m src.api.lazy_routers --write`'
+
+
+def test_parse_importtime():
+    timings = parse_importtime(
+        'import time: self [us] | cumulative | imported package\n'
+        'import time:       120 |        120 |     stripe._util\n'
+        'import time:       300 |        420 |   stripe\n'
+        'import time:        80 |        500 | src.billing.billing_routes\n'
+        'unrelated stderr line\n'
+    )
+    assert [(t.module, t.depth) for t in timings] == [
+        ('stripe._util', 2), ('stripe', 1), ('src.billing.billing_routes', 0)]
+    assert timings[2].cumulative_us == 500
+    assert package_totals(timings) == {'stripe': 420, 'src': 80}
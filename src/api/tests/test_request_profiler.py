@@ -0,0 +1,106 @@
+"""
+Unit tests for the request profiler.
+"""
+import asyncio
+import threading
+import time
+
+from src.api import request_profiler
+from src.api.request_profiler import (RequestProfilerMiddleware, RequestTiming, RouteStats, StackSampler,
+                                      current_timing, route_template)
+
+
+class FakeRoute:
+    path = '/geri/research'
+
+
+def test_breakdown_and_server_timing():
+    timing = RequestTiming()
+    timing.db_ms, timing.db_calls = 30.0, 3
+    timing.add_http('api.openai.com', 50.0)
+    timing.add_http('agsi.gie.eu', 10.0)
+
+    assert timing.breakdown(100.0) == {'db': 30.0, 'llm': 50.0, 'http': 10.0, 'app': 10.0}
+    assert timing.breakdown(50.0)['app'] == 0.0
+    header = timing.server_timing(100.0)
+    assert 'db;dur=30.0;desc="3 calls"' in header
+    assert 'llm;dur=50.0;desc="1 calls"' in header
+    assert header.endswith('total;dur=100.0')
+
+
+def test_route_stats_percentiles_and_shares():
+    stats = RouteStats(window=100)
+    for ms in range(1, 102):
+        stats.record('GET /x', float(ms), {'db': ms / 2, 'llm': 0.0, 'http': 0.0, 'app': ms / 2}, 200)
+    stats.record('GET /y', 5.0, {'db': 0.0, 'llm': 0.0, 'http': 0.0, 'app': 5.0}, 503)
+
+    rows = stats.snapshot()
+    assert [r['route'] for r in rows] == ['GET /x', 'GET /y']
+    x = rows[0]
+    assert x['requests'] == 101 and x['window'] == 100
+    assert x['p50_ms'] == 52.0
+    assert x['p99_ms'] >= 99.0
+    assert x['share']['db'] == 0.5
+    assert rows[1]['errors'] == 1
+
+    stats.reset()
+    assert stats.snapshot() == []
+
+
+def test_route_template():
+    assert route_template({'method': 'GET', 'route': FakeRoute()}) == 'GET /geri/research'
+    assert route_template({'method': 'GET'}) == 'unmatched'
+
+
+def test_middleware_records_route_timing(monkeypatch):
+    monkeypatch.setattr(request_profiler, '_installed', True)
+    stats = RouteStats()
+    monkeypatch.setattr(request_profiler, 'route_stats', stats)
+    seen = {}
+
+    async def app(scope, receive, send):
+        scope['route'] = FakeRoute()
+        timing = current_timing()
+        timing.db_ms += 4.0
+        seen['timing'] = timing
+        await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b'ok'})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': 'GET', 'path': '/geri/research', 'query_string': b''}
+    asyncio.run(RequestProfilerMiddleware(app)(scope, None, send))
+
+    assert [m['type'] for m in sent] == ['http.response.start', 'http.response.body']
+    assert current_timing() is None
+    row = stats.snapshot()[0]
+    assert row['route'] == 'GET /geri/research'
+    assert row['mean_ms']['db'] == 4.0
+
+
+def _busy(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_stack_sampler_collects_project_frames():
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy, args=(stop,), name='busy-worker')
+    worker.start()
+    try:
+        with StackSampler(interval=0.001, prefix='src.api.tests') as sampler:
+            time.sleep(0.1)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert sampler.samples > 0
+    folded = sampler.folded().strip().splitlines()
+    assert folded
+    stack, count = folded[0].rsplit(' ', 1)
+    assert stack.startswith('busy-worker;')
+    assert 'src.api.tests.test_request_profiler:_busy' in stack
+    assert int(count) > 0
@@ -16,9 +16,7 @@ Design notes:
 - The ingestion endpoint always returns 204 and never raises, by design.
 """
 
-import csv
 import hashlib
-import io
 import json
 import logging
 import random
@@ -28,7 +26,8 @@ from typing import Optional
 from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
 from fastapi.concurrency import run_in_threadpool
 
-from src.db.db import get_cursor
+from src.api.exports import EXPORT_MAX_ROWS, csv_stream, export_response
+from src.db.db import get_cursor, stream_query
 
 logger = logging.getLogger(__name__)
 
@@ -797,7 +796,32 @@ def admin_activity_user_detail(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-_CSV_MAX_ROWS = 50_000
+_CSV_MAX_ROWS = EXPORT_MAX_ROWS
+
+_CSV_EXPORT_QUERY = """
+    SELECT created_at, user_id, email, event_type, page_path,
+           section, duration_ms, device, browser, referrer
+    FROM user_activity_events
+    WHERE created_at >= %s AND created_at < %s
+      AND COALESCE(LOWER(email),'') NOT IN ('emilconstantin22@gmail.com','promptvaulthub@gmail.com')
+    ORDER BY id DESC
+    LIMIT %s
+"""
+
+
+def _csv_export_row(r) -> list:
+    return [
+        r["created_at"].isoformat() if r["created_at"] else "",
+        r["user_id"] if r["user_id"] is not None else "",
+        r["email"] or "",
+        r["event_type"] or "",
+        r["page_path"] or "",
+        r["section"] or "",
+        r["duration_ms"] if r["duration_ms"] is not None else "",
+        r["device"] or "",
+        r["browser"] or "",
+        r["referrer"] or "",
+    ]
 
 
 @router.get("/admin/activity/export.csv")
@@ -807,51 +831,18 @@ def admin_activity_export_csv(
     date_to: Optional[str] = Query(None, alias="to"),
 ):
     """Export raw activity events within a date range as CSV (admin only).
-    Capped at _CSV_MAX_ROWS most-recent rows. Session tokens are never exported."""
+    Capped at _CSV_MAX_ROWS most-recent rows, streamed from a server-side
+    cursor. Session tokens are never exported."""
     _require_admin(x_admin_token)
     start, end = _date_bounds(date_from, date_to)
+    rows = (_csv_export_row(r) for r in stream_query(_CSV_EXPORT_QUERY, (start, end, _CSV_MAX_ROWS)))
+    chunks = csv_stream([
+        "created_at", "user_id", "email", "event_type", "page_path",
+        "section", "duration_ms", "device", "browser", "referrer",
+    ], rows)
+    fname = f"user-activity_{start.strftime('%Y%m%d')}_{(end - timedelta(days=1)).strftime('%Y%m%d')}.csv"
     try:
-        with get_cursor(commit=False) as cur:
-            cur.execute(
-                """
-                SELECT created_at, user_id, email, event_type, page_path,
-                       section, duration_ms, device, browser, referrer
-                FROM user_activity_events
-                WHERE created_at >= %s AND created_at < %s
-                  AND COALESCE(LOWER(email),'') NOT IN ('emilconstantin22@gmail.com','promptvaulthub@gmail.com')
-                ORDER BY id DESC
-                LIMIT %s
-                """,
-                (start, end, _CSV_MAX_ROWS),
-            )
-            rows = cur.fetchall()
-
-        buf = io.StringIO()
-        writer = csv.writer(buf)
-        writer.writerow([
-            "created_at", "user_id", "email", "event_type", "page_path",
-            "section", "duration_ms", "device", "browser", "referrer",
-        ])
-        for r in rows:
-            writer.writerow([
-                r["created_at"].isoformat() if r["created_at"] else "",
-                r["user_id"] if r["user_id"] is not None else "",
-                r["email"] or "",
-                r["event_type"] or "",
-                r["page_path"] or "",
-                r["section"] or "",
-                r["duration_ms"] if r["duration_ms"] is not None else "",
-                r["device"] or "",
-                r["browser"] or "",
-                r["referrer"] or "",
-            ])
-
-        fname = f"user-activity_{start.strftime('%Y%m%d')}_{(end - timedelta(days=1)).strftime('%Y%m%d')}.csv"
-        return Response(
-            content=buf.getvalue(),
-            media_type="text/csv",
-            headers={"Content-Disposition": f'attachment; filename="{fname}"'},
-        )
+        return export_response(chunks, fname)
     except Exception as e:
         logger.error(f"activity export failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
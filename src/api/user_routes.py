@@ -8,6 +8,7 @@ from typing import Optional
 from pydantic import BaseModel, EmailStr
 
 from src.db.db import get_cursor
+from src.billing.entitlements import get_session, invalidate_session, invalidate_user_sessions
 from src.plans.plan_helpers import get_plan_settings, create_user_plan, ALL_ALERT_TYPES
 
 AVAILABLE_REGIONS = ['Europe', 'Middle East', 'Asia', 'North America', 'Black Sea', 'North Africa', 'Global']
@@ -468,21 +469,17 @@ def verify_user_session(x_user_token: Optional[str] = Header(None)):
     if not x_user_token:
         raise HTTPException(status_code=401, detail="Authentication required")
     
-    with get_cursor(commit=False) as cursor:
-        cursor.execute("""
-            SELECT user_id, expires_at FROM sessions WHERE token = %s
-        """, (x_user_token,))
-        session = cursor.fetchone()
-        
-        if not session:
-            raise HTTPException(status_code=401, detail="Invalid or expired session")
-        
-        if session["expires_at"] < datetime.utcnow():
-            with get_cursor() as del_cursor:
-                del_cursor.execute("DELETE FROM sessions WHERE token = %s", (x_user_token,))
-            raise HTTPException(status_code=401, detail="Session expired")
-        
-        return {"user_id": session["user_id"], "expires": session["expires_at"].timestamp()}
+    session = get_session(x_user_token)
+    if not session:
+        raise HTTPException(status_code=401, detail="Invalid or expired session")
+    
+    if session.expired:
+        with get_cursor() as del_cursor:
+            del_cursor.execute("DELETE FROM sessions WHERE token = %s", (x_user_token,))
+        invalidate_session(x_user_token)
+        raise HTTPException(status_code=401, detail="Session expired")
+    
+    return {"user_id": session.user_id, "expires": session.expires_at.timestamp()}
 
 
 @router.post("/signup")
@@ -732,6 +729,7 @@ def signout(x_user_token: Optional[str] = Header(None)):
     if x_user_token:
         with get_cursor() as cursor:
             cursor.execute("DELETE FROM sessions WHERE token = %s", (x_user_token,))
+        invalidate_session(x_user_token)
     return {"success": True}
 
 
@@ -1136,6 +1134,7 @@ def reset_password(body: ResetPasswordRequest):
         )
         cursor.execute("DELETE FROM sessions WHERE user_id = %s", (row["user_id"],))
         cursor.execute("DELETE FROM email_login_tokens WHERE user_id = %s", (row["user_id"],))
+    invalidate_user_sessions(row["user_id"])
 
     logger.info(f"Password & PIN reset completed for user {row['user_id']}")
     return {"success": True, "message": "Your password and PIN have been updated. Please sign in."}
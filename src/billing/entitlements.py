@@ -0,0 +1,459 @@
+"""
+Entitlements
+
+user_entitlements holds one denormalized row per user: their plan and a
+JSON object of active features (feature -> {status, expires_at}) built from
+user_plans, the standalone subscription tables (Daily Report, Alerts
+Archive, Indices History, GERI Live), user_pro_widgets and, matched by
+email, paid_brent_forecast_users. get_entitlements(user_id) reads it with
+one primary-key lookup.
+
+The subscription tables stay the source of truth. The row is rebuilt by
+entitlements_changed(user_id), which every write path calls: the Stripe
+webhook (process_webhook_event, after the handler commits), the
+confirm/cancel endpoints, apply_plan_settings_to_user and Brent Forecast
+activation. A feature whose expires_at has passed counts as inactive. A
+row is rebuilt on read when it is missing, older than
+ENTITLEMENTS_MAX_AGE_SECONDS, or was built before one of its features
+expired (so a renewal whose webhook was missed is picked up);
+`python -m src.billing.entitlements --rebuild` rebuilds every row.
+
+Sessions: get_session(token) resolves an X-User-Token to the user and
+their entitlements in one query and keeps the result in a bounded TTL/LRU
+map (SESSION_CACHE_TTL_SECONDS, SESSION_CACHE_SIZE). Sign-out, password
+reset and entitlements_changed drop entries on this instance; other
+instances pick the change up when the TTL expires, so keep the TTL short.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+SESSION_CACHE_TTL_SECONDS = float(os.environ.get('SESSION_CACHE_TTL_SECONDS', '60'))
+SESSION_CACHE_SIZE = int(os.environ.get('SESSION_CACHE_SIZE', '10000'))
+ENTITLEMENTS_MAX_AGE_SECONDS = float(os.environ.get('ENTITLEMENTS_MAX_AGE_SECONDS', '86400'))
+
+ACTIVE_STATUSES = ('active', 'trialing', 'canceling')
+
+# Standalone subscription feature -> table with one row per user.
+SUBSCRIPTION_TABLES = {
+    'daily_report': 'user_daily_report_subs',
+    'alerts_access': 'user_alerts_access_subs',
+    'indices_history': 'user_index_history_subs',
+    'geri_live': 'user_geri_live_subs',
+}
+
+# user_pro_widgets.widget_code -> feature
+WIDGET_FEATURES = {
+    'wti-pro': 'wti_pro_widget',
+    'lng-pro': 'lng_pro_widget',
+    'gas-storage-pro': 'gas_storage_pro_widget',
+}
+
+# GERI Live launch offer: an active GERI Live subscription also unlocks these.
+GRANTED_BY = {
+    'daily_report': ('geri_live',),
+    'indices_history': ('geri_live',),
+    'wti_pro_widget': ('geri_live',),
+    'lng_pro_widget': ('geri_live',),
+    'gas_storage_pro_widget': ('geri_live',),
+}
+
+_FEATURE_OBJECT = "jsonb_build_object('status', {a}.status, 'expires_at', {a}.current_period_end)"
+
+_SUB_FEATURES = ',\n'.join(
+    f"            '{feature}', CASE WHEN s{i}.status IN %(active)s THEN {_FEATURE_OBJECT.format(a=f's{i}')} END"
+    for i, feature in enumerate(SUBSCRIPTION_TABLES)
+)
+_SUB_JOINS = '\n'.join(
+    f"    LEFT JOIN {table} s{i} ON s{i}.user_id = u.id"
+    for i, table in enumerate(SUBSCRIPTION_TABLES.values())
+)
+_WIDGET_CASE = ' '.join(f"WHEN '{code}' THEN '{feature}'" for code, feature in WIDGET_FEATURES.items())
+
+BUILD_SQL = f"""
+    INSERT INTO user_entitlements (user_id, plan, features, updated_at)
+    SELECT u.id, COALESCE(up.plan, 'free'),
+        jsonb_strip_nulls(jsonb_build_object(
+{_SUB_FEATURES},
+            'brent_forecast', (
+                SELECT jsonb_build_object('status', b.status) FROM paid_brent_forecast_users b
+                WHERE LOWER(b.email) = LOWER(u.email) AND b.status IN %(active)s
+                LIMIT 1
+            )
+        )) || COALESCE((
+            SELECT jsonb_object_agg(CASE w.widget_code {_WIDGET_CASE} END,
+                                    jsonb_strip_nulls({_FEATURE_OBJECT.format(a='w')}))
+            FROM user_pro_widgets w
+            WHERE w.user_id = u.id AND w.status IN %(active)s AND w.widget_code IN %(widgets)s
+        ), '{{{{}}}}'::jsonb),
+        NOW()
+    FROM users u
+    LEFT JOIN user_plans up ON up.user_id = u.id
+{_SUB_JOINS}
+    WHERE {{where}}
+    ON CONFLICT (user_id) DO UPDATE SET
+        plan = EXCLUDED.plan,
+        features = EXCLUDED.features,
+        updated_at = EXCLUDED.updated_at
+    RETURNING user_id, plan, features, updated_at
+"""
+
+SESSION_QUERY = """
+    SELECT s.user_id, s.expires_at, u.email, u.stripe_customer_id,
+           e.plan, e.features, e.updated_at
+    FROM sessions s
+    JOIN users u ON u.id = s.user_id
+    LEFT JOIN user_entitlements e ON e.user_id = s.user_id
+    WHERE s.token = %(token)s
+"""
+
+# Users touched by a Stripe customer or subscription, including Brent
+# Forecast accounts that share an email with a main account.
+EVENT_USERS_QUERY = ' UNION '.join(
+    ["SELECT id AS user_id FROM users WHERE stripe_customer_id = %(customer)s"]
+    + [f"SELECT user_id FROM {table} WHERE stripe_subscription_id = %(subscription)s"
+       for table in list(SUBSCRIPTION_TABLES.values()) + ['user_pro_widgets']]
+    + ["SELECT u.id FROM paid_brent_forecast_users b JOIN users u ON LOWER(u.email) = LOWER(b.email) "
+       "WHERE b.stripe_customer_id = %(customer)s OR b.stripe_subscription_id = %(subscription)s"]
+)
+
+
+def run_entitlements_migration():
+    from src.db.db import get_cursor
+
+    logger.info("Running user_entitlements migration...")
+    with get_cursor() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS user_entitlements (
+                user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+                plan TEXT NOT NULL DEFAULT 'free',
+                features JSONB NOT NULL DEFAULT '{}'::jsonb,
+                updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+            )
+        """)
+    count = rebuild_entitlements()
+    logger.info(f"user_entitlements migration complete ({count} users).")
+
+
+def _utc(value) -> Optional[datetime]:
+    """A naive UTC datetime from a datetime or the ISO string JSONB holds."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@dataclass(frozen=True)
+class Entitlements:
+    user_id: int
+    plan: str = 'free'
+    features: Dict[str, Dict] = field(default_factory=dict)
+    updated_at: Optional[datetime] = None
+
+    def active(self, feature: str) -> bool:
+        """The user holds this subscription themselves and it has not expired."""
+        if feature not in self.features:
+            return False
+        expires = _utc(self.expires_at(feature))
+        return expires is None or expires > datetime.utcnow()
+
+    def has(self, feature: str) -> bool:
+        """The feature is unlocked, by its own subscription or a bundle (GRANTED_BY)."""
+        return self.active(feature) or any(self.active(f) for f in GRANTED_BY.get(feature, ()))
+
+    def expires_at(self, feature: str) -> Optional[str]:
+        return (self.features.get(feature) or {}).get('expires_at')
+
+    def active_features(self) -> FrozenSet[str]:
+        return frozenset(f for f in self.features if self.active(f))
+
+    def stale(self, max_age: float = ENTITLEMENTS_MAX_AGE_SECONDS) -> bool:
+        """
+        The row should be rebuilt: never built, older than max_age, or built
+        before one of its features expired.
+        """
+        updated = _utc(self.updated_at)
+        if updated is None:
+            return True
+        now = datetime.utcnow()
+        if (now - updated).total_seconds() > max_age:
+            return True
+        for feature in self.features:
+            expires = _utc(self.expires_at(feature))
+            if expires is not None and updated < expires <= now:
+                return True
+        return False
+
+    def to_dict(self) -> Dict:
+        return {'user_id': self.user_id, 'plan': self.plan, 'features': self.features,
+                'updated_at': self.updated_at.isoformat() if self.updated_at else None}
+
+
+def entitlements_from_row(row) -> Entitlements:
+    features = row.get('features') or {}
+    if isinstance(features, str):
+        features = json.loads(features)
+    return Entitlements(row['user_id'], row.get('plan') or 'free', features, row.get('updated_at'))
+
+
+def _build(where: str, params: Dict) -> List[Entitlements]:
+    from src.db.db import get_cursor
+
+    params = dict(params, active=ACTIVE_STATUSES, widgets=tuple(WIDGET_FEATURES))
+    with get_cursor() as cursor:
+        cursor.execute(BUILD_SQL.format(where=where), params)
+        return [entitlements_from_row(row) for row in cursor.fetchall()]
+
+
+def refresh_entitlements(user_id: int) -> Entitlements:
+    """Rebuild one user's row from the subscription tables."""
+    rows = _build('u.id = %(user_id)s', {'user_id': int(user_id)})
+    return rows[0] if rows else Entitlements(int(user_id))
+
+
+def rebuild_entitlements() -> int:
+    return len(_build('TRUE', {}))
+
+
+def get_entitlements(user_id: int) -> Entitlements:
+    from src.db.db import execute_one
+
+    row = execute_one("SELECT user_id, plan, features, updated_at FROM user_entitlements WHERE user_id = %s",
+                      (int(user_id),))
+    entitlements = entitlements_from_row(row) if row else None
+    if entitlements is None or entitlements.stale():
+        return refresh_entitlements(user_id)
+    return entitlements
+
+
+def user_ids_for_billing_event(customer_id: Optional[str], subscription_id: Optional[str]) -> Set[int]:
+    from src.db.db import execute_query
+
+    if not customer_id and not subscription_id:
+        return set()
+    rows = execute_query(EVENT_USERS_QUERY, {'customer': customer_id, 'subscription': subscription_id})
+    return {row['user_id'] for row in rows or []}
+
+
+@dataclass(frozen=True)
+class SessionInfo:
+    token: str
+    user_id: int
+    email: Optional[str]
+    stripe_customer_id: Optional[str]
+    expires_at: datetime
+    entitlements: Entitlements
+    loaded_at: float
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at < datetime.utcnow()
+
+    @property
+    def plan(self) -> str:
+        return self.entitlements.plan
+
+    @property
+    def features(self) -> FrozenSet[str]:
+        return self.entitlements.active_features()
+
+    @property
+    def user(self) -> Dict:
+        """The user dict the subscription route modules pass around."""
+        return {'id': self.user_id, 'email': self.email, 'stripe_customer_id': self.stripe_customer_id}
+
+    def has(self, feature: str) -> bool:
+        return self.entitlements.has(feature)
+
+
+def session_from_row(token: str, row, entitlements: Optional[Entitlements] = None) -> SessionInfo:
+    return SessionInfo(
+        token=token,
+        user_id=row['user_id'],
+        email=row.get('email'),
+        stripe_customer_id=row.get('stripe_customer_id'),
+        expires_at=row['expires_at'],
+        entitlements=entitlements or entitlements_from_row(row),
+        loaded_at=time.monotonic(),
+    )
+
+
+class SessionCache:
+    """Bounded LRU of token -> SessionInfo with a TTL, indexed by user for invalidation."""
+
+    def __init__(self, ttl: float = SESSION_CACHE_TTL_SECONDS, size: int = SESSION_CACHE_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self._entries: 'OrderedDict[str, SessionInfo]' = OrderedDict()
+        self._by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[SessionInfo]:
+        with self._lock:
+            info = self._entries.get(token)
+            if info is None or time.monotonic() - info.loaded_at > self.ttl:
+                if info is not None:
+                    self._discard(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return info
+
+    def put(self, info: SessionInfo) -> None:
+        if self.ttl <= 0 or self.size <= 0:
+            return
+        with self._lock:
+            self._discard(info.token)
+            self._entries[info.token] = info
+            self._by_user.setdefault(info.user_id, set()).add(info.token)
+            while len(self._entries) > self.size:
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, token: str) -> None:
+        info = self._entries.pop(token, None)
+        if info is not None:
+            tokens = self._by_user.get(info.user_id)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._by_user[info.user_id]
+
+    def invalidate_token(self, token: str) -> None:
+        with self._lock:
+            self._discard(token)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for token in list(self._by_user.get(user_id, ())):
+                self._discard(token)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                    'ttl_seconds': self.ttl, 'size': self.size}
+
+
+_cache = SessionCache()
+
+
+def load_session(token: str) -> Optional[SessionInfo]:
+    from src.db.db import execute_one
+
+    row = execute_one(SESSION_QUERY, {'token': token})
+    if not row:
+        return None
+    entitlements = entitlements_from_row(row)
+    if entitlements.stale():
+        entitlements = refresh_entitlements(row['user_id'])
+    return session_from_row(token, row, entitlements)
+
+
+def get_session(token: Optional[str]) -> Optional[SessionInfo]:
+    """
+    Session and entitlements for a user token, from the cache when fresh.
+    Returns None for an unknown token. Expired sessions are returned (check
+    .expired) but never cached.
+    """
+    if not token:
+        return None
+    info = _cache.get(token)
+    if info is not None and not info.expired:
+        return info
+    info = load_session(token)
+    if info is not None and not info.expired:
+        _cache.put(info)
+    return info
+
+
+def get_active_session(token: Optional[str]) -> Optional[SessionInfo]:
+    info = get_session(token)
+    return info if info is not None and not info.expired else None
+
+
+def invalidate_session(token: Optional[str]) -> None:
+    if token:
+        _cache.invalidate_token(token)
+
+
+def invalidate_user_sessions(user_id) -> None:
+    if user_id is not None:
+        _cache.invalidate_user(int(user_id))
+
+
+def entitlements_changed(user_ids) -> None:
+    """
+    Call after anything that changes a user's plan or subscriptions, once the
+    change is committed. Accepts one user id or several. Rebuild failures are
+    logged, not raised: the billing write has already succeeded.
+    """
+    if user_ids is None:
+        return
+    if not isinstance(user_ids, (set, list, tuple, frozenset)):
+        user_ids = (user_ids,)
+    for user_id in user_ids:
+        try:
+            refresh_entitlements(int(user_id))
+        except Exception as e:
+            logger.error(f"Could not rebuild entitlements for user {user_id}: {e}")
+        invalidate_user_sessions(user_id)
+
+
+def email_entitlements_changed(email: Optional[str]) -> None:
+    """Brent Forecast accounts are keyed by email; refresh the matching main account."""
+    if not email:
+        return
+    from src.db.db import execute_query
+
+    rows = execute_query("SELECT id FROM users WHERE LOWER(email) = LOWER(%s)", (email,))
+    entitlements_changed({row['id'] for row in rows or []})
+
+
+def clear_session_cache() -> None:
+    _cache.clear()
+
+
+def session_cache_stats() -> Dict:
+    return _cache.stats()
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or rebuild user_entitlements")
+    parser.add_argument('user_ids', nargs='*', type=int, help="show (and with --rebuild, rebuild) these users")
+    parser.add_argument('--rebuild', action='store_true', help="rebuild rows from the subscription tables")
+    args = parser.parse_args(argv)
+
+    if args.rebuild and not args.user_ids:
+        print(f"rebuilt {rebuild_entitlements()} users")
+        return 0
+    for user_id in args.user_ids:
+        ent = refresh_entitlements(user_id) if args.rebuild else get_entitlements(user_id)
+        print(json.dumps(ent.to_dict(), default=str))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
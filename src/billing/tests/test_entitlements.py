@@ -0,0 +1,137 @@
+"""
+Unit tests for entitlements and the session cache.
+"""
+from datetime import datetime, timedelta
+
+from src.billing import entitlements
+from src.billing.entitlements import (BUILD_SQL, Entitlements, SessionCache, entitlements_from_row,
+                                      session_from_row)
+
+
+def _row(user_id=1, minutes=60, **extra):
+    row = {'user_id': user_id, 'expires_at': datetime.utcnow() + timedelta(minutes=minutes),
+           'email': f'u{user_id}@example.com', 'stripe_customer_id': None, 'plan': 'trader',
+           'features': {'alerts_access': {'status': 'active'}}, 'updated_at': datetime.utcnow()}
+    row.update(extra)
+    return row
+
+
+def test_entitlements_bundles_and_json_rows():
+    period_end = (datetime.utcnow() + timedelta(days=30)).isoformat()
+    ent = entitlements_from_row({'user_id': 7, 'plan': None,
+                                 'features': '{"geri_live": {"status": "trialing", "expires_at": "%s"}}' % period_end})
+    assert ent.plan == 'free'
+    assert ent.active('geri_live') and ent.expires_at('geri_live') == period_end
+    assert ent.has('indices_history') and ent.has('wti_pro_widget')
+    assert not ent.active('indices_history')
+    assert not ent.has('alerts_access')
+    assert not Entitlements(8).has('daily_report')
+
+
+def test_expired_features_are_inactive_and_make_the_row_stale():
+    now = datetime.utcnow()
+    features = {'geri_live': {'status': 'active', 'expires_at': (now - timedelta(hours=1)).isoformat()},
+                'alerts_access': {'status': 'active', 'expires_at': (now + timedelta(days=3)).isoformat() + '+00:00'},
+                'brent_forecast': {'status': 'active'}}
+    ent = Entitlements(1, 'free', features, updated_at=now - timedelta(days=2))
+    assert not ent.active('geri_live') and not ent.has('daily_report')
+    assert ent.active('alerts_access') and ent.has('brent_forecast')
+    assert ent.active_features() == {'alerts_access', 'brent_forecast'}
+    assert session_from_row('t', _row(features=features)).features == {'alerts_access', 'brent_forecast'}
+
+    # built before geri_live lapsed: rebuild to pick up a renewal
+    assert ent.stale(max_age=7 * 86400)
+    # rebuilt after it lapsed: only the age limit applies
+    rebuilt = Entitlements(1, 'free', features, updated_at=now - timedelta(minutes=5))
+    assert not rebuilt.stale(max_age=3600)
+    assert Entitlements(1, 'free', {}, updated_at=now - timedelta(hours=2)).stale(max_age=3600)
+    assert Entitlements(1).stale()
+
+
+def test_build_sql_covers_every_feature_source():
+    sql = BUILD_SQL.format(where='u.id = %(user_id)s')
+    for table in entitlements.SUBSCRIPTION_TABLES.values():
+        assert f'LEFT JOIN {table}' in sql
+    for code, feature in entitlements.WIDGET_FEATURES.items():
+        assert f"WHEN '{code}' THEN '{feature}'" in sql
+    assert 'paid_brent_forecast_users' in sql
+    assert "'{}'::jsonb" in sql
+
+
+def test_session_from_row():
+    info = session_from_row('t1', _row())
+    assert info.features == {'alerts_access'}
+    assert info.plan == 'trader'
+    assert info.has('alerts_access') and not info.has('geri_live')
+    assert info.user == {'id': 1, 'email': 'u1@example.com', 'stripe_customer_id': None}
+    assert not info.expired
+    assert session_from_row('t2', _row(minutes=-1)).expired
+
+
+def test_cache_ttl_and_lru_eviction(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(entitlements.time, 'monotonic', lambda: now[0])
+    cache = SessionCache(ttl=60, size=2)
+    for token, user_id in (('a', 1), ('b', 2)):
+        cache.put(session_from_row(token, _row(user_id)))
+    assert cache.get('a').user_id == 1
+    cache.put(session_from_row('c', _row(3)))
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+
+    now[0] += 61
+    assert cache.get('a') is None
+    assert cache.stats()['hits'] == 2
+
+
+def test_invalidate_user_drops_all_their_tokens():
+    cache = SessionCache(ttl=60, size=10)
+    for token in ('a', 'b'):
+        cache.put(session_from_row(token, _row(1)))
+    cache.put(session_from_row('c', _row(2)))
+    cache.invalidate_user(1)
+    assert cache.get('a') is None and cache.get('b') is None
+    assert cache.get('c') is not None
+    cache.invalidate_token('c')
+    assert cache.stats()['entries'] == 0
+
+
+def test_get_session_loads_once_and_skips_expired(monkeypatch):
+    loads = []
+
+    def load(token):
+        loads.append(token)
+        return session_from_row(token, _row(minutes=-1 if token == 'old' else 60))
+
+    monkeypatch.setattr(entitlements, '_cache', SessionCache(ttl=60, size=10))
+    monkeypatch.setattr(entitlements, 'load_session', load)
+    assert entitlements.get_session('t').user_id == 1
+    assert entitlements.get_session('t').user_id == 1
+    assert loads == ['t']
+
+    assert entitlements.get_session('old').expired
+    assert entitlements.get_active_session('old') is None
+    assert loads == ['t', 'old', 'old']
+    assert entitlements.get_session(None) is None
+
+
+def test_entitlements_changed_rebuilds_and_invalidates(monkeypatch):
+    rebuilt = []
+
+    def refresh(user_id):
+        rebuilt.append(user_id)
+        if user_id == 2:
+            raise RuntimeError('db down')
+        return Entitlements(user_id)
+
+    cache = SessionCache(ttl=60, size=10)
+    cache.put(session_from_row('a', _row(1)))
+    cache.put(session_from_row('b', _row(2)))
+    monkeypatch.setattr(entitlements, '_cache', cache)
+    monkeypatch.setattr(entitlements, 'refresh_entitlements', refresh)
+
+    entitlements.entitlements_changed({1, 2})
+    assert sorted(rebuilt) == [1, 2]
+    assert cache.stats()['entries'] == 0
+    entitlements.entitlements_changed(None)
+    assert sorted(rebuilt) == [1, 2]
@@ -2,6 +2,7 @@ import logging
 import stripe
 from typing import Optional
 from src.db.db import get_cursor
+from src.billing.entitlements import entitlements_changed, user_ids_for_billing_event
 from src.plans.plan_helpers import apply_plan_settings_to_user
 
 logger = logging.getLogger(__name__)
@@ -468,5 +469,25 @@ async def process_webhook_event(event: stripe.Event):
     handler = handlers.get(event_type)
     if handler:
         await handler(data)
+        _refresh_entitlements(data)
     else:
         logger.debug(f"Unhandled event type: {event_type}")
+
+
+def _refresh_entitlements(data: dict):
+    """Any handled event may have changed a plan or standalone subscription;
+    rebuild user_entitlements for every user the event's customer or
+    subscription belongs to."""
+    user_ids = set()
+    metadata = data.get("metadata") or {}
+    if str(metadata.get("user_id") or "").isdigit() and metadata.get("type") != "brent_forecast":
+        user_ids.add(int(metadata["user_id"]))
+    subscription_id = data["id"] if data.get("object") == "subscription" else data.get("subscription")
+    try:
+        user_ids |= user_ids_for_billing_event(data.get("customer"), subscription_id)
+    except Exception as e:
+        logger.error(f"Could not resolve users for entitlement refresh: {e}")
+    if user_ids:
+        entitlements_changed(user_ids)
+    else:
+        logger.debug("Webhook event not linked to a user; no entitlements to refresh")
@@ -0,0 +1,285 @@
+"""
+Async Database Access
+
+Non-blocking counterpart to src/db/db.py for async route handlers.
+
+psycopg2 calls run on a dedicated DB thread pool against pooled
+connections, so a slow query occupies one DB worker thread instead of the
+event loop. SQL, %s placeholders and RealDictCursor rows are the same as in
+db.py, so queries move over unchanged.
+
+Request-scoped connection (one pooled connection per request, returned
+when the response is sent):
+
+    from fastapi import Depends
+    from src.db.async_db import AsyncDB, get_async_production_db
+
+    @router.get("/api/thing")
+    async def thing(db: AsyncDB = Depends(get_async_production_db)):
+        row = await db.fetch_one("SELECT ... WHERE id = %s", (thing_id,))
+
+Existing sync helpers (repo functions built on db.py) can be moved off the
+loop without rewriting them:
+
+    snapshot = await run_db(get_snapshot_by_date, date)
+
+Pool connections run in autocommit mode so a request never sits idle in a
+transaction between awaits; use AsyncDB.transaction() for multi-statement
+writes.
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import psycopg2
+
+from src.db.db import ObservedCursor, get_database_url, get_production_database_url
+
+logger = logging.getLogger(__name__)
+
+DB_POOL_MIN = int(os.environ.get('DB_POOL_MIN', '1'))
+DB_POOL_MAX = int(os.environ.get('DB_POOL_MAX', '10'))
+DB_ACQUIRE_TIMEOUT_SECONDS = float(os.environ.get('DB_ACQUIRE_TIMEOUT_SECONDS', '10'))
+
+# Connections can be held by requests that are awaiting something else, so
+# the executor gets a few threads beyond the pool size for run_db() work.
+DB_EXECUTOR_THREADS = int(os.environ.get('DB_EXECUTOR_THREADS', str(DB_POOL_MAX + 4)))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class PoolTimeout(Exception):
+    """No pooled connection became free within DB_ACQUIRE_TIMEOUT_SECONDS."""
+
+
+class ConnectionPool:
+    """
+    Bounded psycopg2 connection pool.
+
+    Unlike psycopg2.pool.ThreadedConnectionPool, acquire() waits for a free
+    connection (up to a timeout) instead of failing as soon as the pool is
+    exhausted, and broken connections are dropped rather than reused.
+    """
+
+    def __init__(self, dsn_factory: Callable[[], str], min_size: int, max_size: int):
+        self._dsn_factory = dsn_factory
+        self._min_size = min_size
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle: List[Any] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self):
+        conn = psycopg2.connect(self._dsn_factory())
+        conn.autocommit = True
+        return conn
+
+    def acquire(self, timeout: float = DB_ACQUIRE_TIMEOUT_SECONDS):
+        if not self._slots.acquire(timeout=timeout):
+            raise PoolTimeout(f"No database connection available within {timeout}s")
+        try:
+            with self._lock:
+                while self._idle:
+                    conn = self._idle.pop()
+                    if not conn.closed:
+                        return conn
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn, discard: bool = False) -> None:
+        try:
+            if discard or self._closed or conn.closed:
+                conn.close()
+                return
+            if not conn.autocommit:
+                conn.rollback()
+                conn.autocommit = True
+            with self._lock:
+                if len(self._idle) < max(self._min_size, 1) * 4:
+                    self._idle.append(conn)
+                    return
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Dropping pooled connection after release error: {e}")
+            try:
+                conn.close()
+            except Exception:
+                pass
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(name: str) -> ConnectionPool:
+    pool = _pools.get(name)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                dsn_factory = get_production_database_url if name == 'production' else get_database_url
+                pool = _pools[name] = ConnectionPool(dsn_factory, DB_POOL_MIN, DB_POOL_MAX)
+    return pool
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_THREADS, thread_name_prefix='db')
+    return _executor
+
+
+async def run_db(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Run a blocking DB function on the DB thread pool and await its result.
+
+    Context variables are copied like asyncio.to_thread does, so request
+    context set by middleware is visible inside fn.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    return await loop.run_in_executor(_get_executor(), call)
+
+
+def submit_db(fn: Callable, *args, **kwargs) -> None:
+    """Fire-and-forget a blocking DB function (view counters, audit rows)."""
+    def _call():
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            logger.warning(f"Background DB call {getattr(fn, '__name__', fn)} failed: {e}")
+
+    ctx = contextvars.copy_context()
+    _get_executor().submit(ctx.run, _call)
+
+
+class AsyncDB:
+    """
+    One pooled connection for the lifetime of a request.
+
+    The connection is acquired lazily on the first query, so handlers that
+    return early (paywall, 404) never touch the pool.
+    """
+
+    def __init__(self, pool: ConnectionPool):
+        self._pool = pool
+        self._conn = None
+        self._broken = False
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = self._pool.acquire()
+        return self._conn
+
+    def _execute(self, query: str, params: Optional[tuple], fetch: Optional[str]):
+        conn = self._connection()
+        cursor = conn.cursor(cursor_factory=ObservedCursor)
+        try:
+            cursor.execute(query, params)
+            if fetch == 'all':
+                return cursor.fetchall()
+            if fetch == 'one':
+                return cursor.fetchone()
+            return None
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            self._broken = True
+            raise
+        finally:
+            cursor.close()
+
+    def _transaction(self, fn: Callable):
+        conn = self._connection()
+        conn.autocommit = False
+        cursor = conn.cursor(cursor_factory=ObservedCursor)
+        try:
+            result = fn(cursor)
+            conn.commit()
+            return result
+        except Exception as e:
+            if isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+                self._broken = True
+            else:
+                conn.rollback()
+            logger.error(f"Database error: {e}")
+            raise
+        finally:
+            cursor.close()
+            if not self._broken:
+                conn.autocommit = True
+
+    async def fetch_all(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
+        return await run_db(self._execute, query, params, 'all')
+
+    async def fetch_one(self, query: str, params: tuple = None) -> Optional[Dict[str, Any]]:
+        return await run_db(self._execute, query, params, 'one')
+
+    async def execute(self, query: str, params: tuple = None) -> None:
+        await run_db(self._execute, query, params, None)
+
+    async def transaction(self, fn: Callable) -> Any:
+        """Run fn(cursor) in one transaction on this request's connection."""
+        return await run_db(self._transaction, fn)
+
+    def release(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn, discard=self._broken)
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await run_db(self.release)
+
+
+async def get_async_db() -> AsyncIterator[AsyncDB]:
+    """FastAPI dependency: request-scoped connection to the primary database."""
+    db = AsyncDB(_get_pool('primary'))
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def get_async_production_db() -> AsyncIterator[AsyncDB]:
+    """FastAPI dependency: request-scoped connection to the production database."""
+    db = AsyncDB(_get_pool('production'))
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+def close_pools() -> None:
+    """Close idle pooled connections and stop the DB thread pool (app shutdown)."""
+    global _executor
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
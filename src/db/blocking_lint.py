@@ -0,0 +1,154 @@
+"""
+Blocking DB call lint
+
+Static companion to the runtime guard in src/db/db.py: reports direct calls
+to the blocking psycopg2 helpers from inside `async def` bodies, including
+calls through sync functions of the same module that themselves reach a
+helper. Passing a helper to asyncio.to_thread / run_in_threadpool / run_db
+is not a call and is not reported.
+
+Usage:
+    python -m src.db.blocking_lint src/api src/geri
+    python -m src.db.blocking_lint --summary src
+"""
+import argparse
+import ast
+import os
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+BLOCKING_DB_FUNCTIONS = {
+    'get_connection',
+    'get_cursor',
+    'execute_query',
+    'execute_one',
+    'get_production_connection',
+    'get_production_cursor',
+    'execute_production_query',
+    'execute_production_one',
+    'advisory_lock',
+}
+
+
+@dataclass
+class BlockingCall:
+    filename: str
+    lineno: int
+    handler: str
+    callee: str
+    via: str = ''
+
+    def __str__(self) -> str:
+        via = f" (via {self.via})" if self.via else ''
+        return f"{self.filename}:{self.lineno}: {self.handler}() calls {self.callee}{via} on the event loop"
+
+
+def _call_name(node: ast.Call) -> str:
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return ''
+
+
+def _own_calls(func: ast.AST) -> Iterable[ast.Call]:
+    """Calls made by func itself, skipping nested function and lambda bodies."""
+    stack = list(ast.iter_child_nodes(func))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+            continue
+        if isinstance(node, ast.Call):
+            yield node
+        stack.extend(ast.iter_child_nodes(node))
+
+
+def _blocking_wrappers(tree: ast.Module) -> Dict[str, str]:
+    """
+    Module-level sync functions that reach a blocking helper, mapped to the
+    helper they reach. Resolved to a fixpoint so chains of wrappers count.
+    """
+    sync_funcs = {
+        node.name: node for node in tree.body if isinstance(node, ast.FunctionDef)
+    }
+    wrappers: Dict[str, str] = {}
+    changed = True
+    while changed:
+        changed = False
+        for name, func in sync_funcs.items():
+            if name in wrappers:
+                continue
+            for call in _own_calls(func):
+                callee = _call_name(call)
+                if callee in BLOCKING_DB_FUNCTIONS:
+                    wrappers[name] = callee
+                elif callee in wrappers and callee != name:
+                    wrappers[name] = wrappers[callee]
+                else:
+                    continue
+                changed = True
+                break
+    return wrappers
+
+
+def find_blocking_calls(source: str, filename: str = '<string>') -> List[BlockingCall]:
+    tree = ast.parse(source, filename=filename)
+    wrappers = _blocking_wrappers(tree)
+    found: List[BlockingCall] = []
+
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.AsyncFunctionDef):
+            continue
+        for call in _own_calls(node):
+            callee = _call_name(call)
+            if callee in BLOCKING_DB_FUNCTIONS:
+                found.append(BlockingCall(filename, call.lineno, node.name, callee))
+            elif callee in wrappers:
+                found.append(BlockingCall(filename, call.lineno, node.name, wrappers[callee], via=callee))
+
+    return sorted(found, key=lambda c: c.lineno)
+
+
+def _python_files(paths: List[str]) -> Iterable[str]:
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [d for d in dirs if d not in ('__pycache__', 'tests')]
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    yield os.path.join(root, name)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report blocking DB calls inside async handlers")
+    parser.add_argument('paths', nargs='*', default=['src'])
+    parser.add_argument('--summary', action='store_true', help='Print per-file counts only')
+    args = parser.parse_args(argv)
+
+    findings: List[BlockingCall] = []
+    for filename in _python_files(args.paths):
+        with open(filename, encoding='utf-8') as f:
+            try:
+                findings.extend(find_blocking_calls(f.read(), filename))
+            except SyntaxError as e:
+                print(f"{filename}: skipped ({e})", file=sys.stderr)
+
+    if args.summary:
+        for filename, count in Counter(c.filename for c in findings).most_common():
+            handlers = {c.handler for c in findings if c.filename == filename}
+            print(f"{count:5d}  {filename} ({len(handlers)} handlers)")
+    else:
+        for call in findings:
+            print(call)
+
+    print(f"{len(findings)} blocking DB call(s) in async functions", file=sys.stderr)
+    return 1 if findings else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,92 @@
 import os
+import time
+import asyncio
 import logging
+import traceback
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Blocking-call guard: opening a connection from the event loop thread stalls
+# every in-flight request for the duration of the query. 'warn' logs each
+# offending call site once, 'raise' fails the call (for tests/staging), 'off'
+# disables the check. Armed by app startup once migrations have run, so the
+# startup hook itself is not reported. Async handlers should use
+# src/db/async_db.py instead.
+DB_BLOCKING_GUARD = os.environ.get("DB_BLOCKING_GUARD", "warn").lower()
+
+_guard_armed = False
+_reported_call_sites = set()
+
+
+class BlockingDBCallError(RuntimeError):
+    """Raised by the blocking-call guard in 'raise' mode."""
+
+
+def arm_blocking_guard():
+    global _guard_armed
+    _guard_armed = DB_BLOCKING_GUARD in ("warn", "raise")
+
+
+def _check_blocking(kind: str):
+    if not _guard_armed:
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    stack = traceback.extract_stack(limit=12)[:-1]
+    caller = next(
+        (f for f in reversed(stack) if f.filename != __file__ and not f.filename.endswith("contextlib.py")),
+        None,
+    )
+    site = f"{caller.filename}:{caller.lineno} in {caller.name}" if caller else "unknown"
+    message = f"Blocking {kind} on the event loop from {site}; use src.db.async_db"
+    if DB_BLOCKING_GUARD == "raise":
+        raise BlockingDBCallError(message)
+    if site not in _reported_call_sites:
+        _reported_call_sites.add(site)
+        logger.warning(message)
+
+# Query observers: observer(sql, params, seconds, rowcount, error) is called
+# after every statement executed on a cursor from this module or
+# src/db/async_db.py. src/db/query_metrics.py and src/db/query_audit.py
+# register them; with none registered ObservedCursor costs one list check
+# per execute.
+_query_observers = []
+
+
+def add_query_observer(observer):
+    _query_observers.append(observer)
+
+
+def remove_query_observer(observer):
+    if observer in _query_observers:
+        _query_observers.remove(observer)
+
+
+class ObservedCursor(RealDictCursor):
+    def execute(self, query, vars=None):
+        if not _query_observers:
+            return super().execute(query, vars)
+        started = time.perf_counter()
+        error = True
+        try:
+            result = super().execute(query, vars)
+            error = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            sql = query if isinstance(query, str) else (
+                query.decode() if isinstance(query, bytes) else query.as_string(self))
+            for observer in list(_query_observers):
+                try:
+                    observer(sql, vars, elapsed, self.rowcount, error)
+                except Exception as e:
+                    logger.debug(f"Query observer failed: {e}")
+
 def get_database_url() -> str:
     url = os.environ.get("PRODUCTION_DATABASE_URL") or os.environ.get("DATABASE_URL")
     if not url:
@@ -14,6 +95,7 @@ def get_database_url() -> str:
 
 @contextmanager
 def get_connection():
+    _check_blocking("database connection")
     conn = None
     try:
         conn = psycopg2.connect(get_database_url())
@@ -28,7 +110,7 @@ def get_connection():
 @contextmanager
 def get_cursor(commit=True):
     with get_connection() as conn:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor(cursor_factory=ObservedCursor)
         try:
             yield cursor
             if commit:
@@ -61,6 +143,7 @@ def get_production_database_url() -> str:
 
 @contextmanager
 def get_production_connection():
+    _check_blocking("production database connection")
     conn = None
     try:
         conn = psycopg2.connect(get_production_database_url())
@@ -75,7 +158,7 @@ def get_production_connection():
 @contextmanager
 def get_production_cursor(commit=False):
     with get_production_connection() as conn:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor(cursor_factory=ObservedCursor)
         try:
             yield cursor
             if commit:
@@ -90,7 +173,7 @@ def get_production_cursor(commit=False):
 
 def execute_production_query(query: str, params: tuple = None):
     with get_production_connection() as conn:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor(cursor_factory=ObservedCursor)
         try:
             cursor.execute(query, params)
             return cursor.fetchall()
@@ -99,7 +182,7 @@ def execute_production_query(query: str, params: tuple = None):
 
 def execute_production_one(query: str, params: tuple = None):
     with get_production_connection() as conn:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor(cursor_factory=ObservedCursor)
         try:
             cursor.execute(query, params)
             return cursor.fetchone()
@@ -107,8 +190,31 @@ def execute_production_one(query: str, params: tuple = None):
             cursor.close()
 
 
+def stream_query(query: str, params: tuple = None, itersize: int = 2000, production: bool = False):
+    """Yield rows from a named (server-side) cursor, fetching `itersize` rows per round trip.
+
+    Memory stays at one batch however many rows the query returns. The
+    connection is opened on the first next() and held until the generator
+    is exhausted or closed, so consume it off the event loop (StreamingResponse
+    iterates sync generators in the threadpool) and close it when stopping early.
+    Uses its own connection rather than the async_db pool, so a slow download
+    never holds a pooled connection.
+    """
+    connection = get_production_connection if production else get_connection
+    with connection() as conn:
+        cursor = conn.cursor(name=f"stream_{os.getpid()}_{id(conn):x}", cursor_factory=ObservedCursor)
+        cursor.itersize = itersize
+        try:
+            cursor.execute(query, params)
+            yield from cursor
+        finally:
+            cursor.close()
+            conn.rollback()
+
+
 @contextmanager
 def advisory_lock(lock_id: int):
+    _check_blocking("advisory lock")
     conn = None
     acquired = False
     try:
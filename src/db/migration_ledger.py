@@ -0,0 +1,351 @@
+"""
+Migration Ledger
+
+Versioned, checksummed record of the schema migrations the API depends on.
+Every migration is an existing idempotent run_*_migration() function; the
+ledger table schema_migrations stores the version, name and a checksum of
+the function's source when it was last applied. Checksums are read from the
+source files without importing them, so checking the ledger does not pull
+in route modules the API loads lazily (src/api/lazy_routers.py).
+
+API startup calls ensure_schema(): one query reads the ledger, and only
+migrations that are missing or whose source changed since they were
+applied are run. On a warm schema a cold start does no DDL at all. Many
+migration functions catch and log their own errors, so a migration that
+logs a warning or error while it runs is not recorded and is retried on
+the next start.
+
+Pending migrations can be applied ahead of a deploy from the CLI:
+
+    python -m src.db.migration_ledger status
+    python -m src.db.migration_ledger apply
+    python -m src.db.migration_ledger apply --rerun 12
+    python src/main.py --mode migrate
+
+MIGRATIONS_ON_STARTUP controls what startup does with pending migrations:
+'apply' (default) runs them under an advisory lock, 'check' only logs them
+so a separate migrate step owns DDL.
+
+New migrations are appended with the next version number; versions are
+never reused or reordered.
+"""
+import argparse
+import ast
+import hashlib
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MIGRATIONS_ON_STARTUP = os.environ.get('MIGRATIONS_ON_STARTUP', 'apply').lower()
+
+MIGRATION_LOCK_ID = 7001
+
+LEDGER_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    checksum TEXT NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    duration_ms INTEGER
+)
+"""
+
+
+def _always() -> bool:
+    return True
+
+
+def _geri_enabled() -> bool:
+    from src.geri import ENABLE_GERI
+    return ENABLE_GERI
+
+
+def _eriq_enabled() -> bool:
+    from src.eriq import ENABLE_ERIQ
+    return ENABLE_ERIQ
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    target: str
+    enabled: Callable[[], bool] = _always
+
+    def load(self) -> Callable[[], None]:
+        module_name, _, func_name = self.target.partition(':')
+        return getattr(importlib.import_module(module_name), func_name)
+
+    def checksum(self) -> str:
+        source = function_source(self.target)
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+
+
+def _module_file(module_name: str) -> str:
+    return os.path.join(_ROOT_DIR, *module_name.split('.')) + '.py'
+
+
+def function_source(target: str) -> str:
+    """
+    Source of a module-level function, decorators included, read with ast
+    instead of importing the module. Matches inspect.getsource().
+    """
+    module_name, _, func_name = target.partition(':')
+    with open(_module_file(module_name), encoding='utf-8') as f:
+        source = f.read()
+    for node in ast.parse(source).body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == func_name:
+            first = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            lines = source.splitlines(keepends=True)
+            return ''.join(lines[first - 1:node.end_lineno])
+    raise AttributeError(f"{module_name} has no function {func_name}")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'core_tables', 'src.db.migrations:run_migrations'),
+    Migration(2, 'seo_tables', 'src.db.migrations:run_seo_tables_migration'),
+    Migration(3, 'sources', 'src.db.migrations:run_sources_migration'),
+    Migration(4, 'geri', 'src.db.migrations:run_geri_migration'),
+    Migration(5, 'pro_delivery', 'src.db.migrations:run_pro_delivery_migration'),
+    Migration(6, 'fix_skipped_alerts', 'src.db.migrations:run_fix_skipped_alerts'),
+    Migration(7, 'lng_price', 'src.db.migrations:run_lng_price_migration'),
+    Migration(8, 'lng_import_sources', 'src.db.migrations:run_lng_import_sources_migration'),
+    Migration(9, 'gas_storage_country', 'src.db.migrations:run_gas_storage_country_migration'),
+    Migration(10, 'signal_quality', 'src.db.migrations:run_signal_quality_migration'),
+    Migration(11, 'recalculate_stale_bands', 'src.db.migrations:_recalculate_stale_bands'),
+    Migration(12, 'stripe_mode', 'src.db.migrations:run_stripe_mode_migration'),
+    Migration(13, 'eriq', 'src.db.migrations:run_eriq_migration', _eriq_enabled),
+    Migration(14, 'tickets', 'src.tickets.db:run_tickets_migration'),
+    Migration(15, 'blog', 'src.blog.db:run_blog_migrations'),
+    Migration(16, 'admin_sessions', 'src.api.admin_routes:_init_admin_sessions_table'),
+    Migration(17, 'bulk_email', 'src.api.admin_routes:_init_bulk_email_table'),
+    Migration(18, 'email_login_tokens', 'src.api.user_routes:_init_email_login_tokens_table'),
+    Migration(19, 'password_reset_tokens', 'src.api.user_routes:_init_password_reset_tokens_table'),
+    Migration(20, 'last_login_column', 'src.api.user_routes:_init_last_login_column'),
+    Migration(21, 'intraday_prices', 'src.ingest.intraday_prices:run_intraday_migration'),
+    Migration(22, 'geri_live', 'src.geri.live:run_geri_live_migration', _geri_enabled),
+    Migration(23, 'geri_live_history', 'src.geri.live:run_geri_live_history_migration', _geri_enabled),
+    Migration(24, 'contact_confirmation', 'src.api.contact_routes:run_contact_confirmation_migration'),
+    Migration(25, 'brent_forecast', 'src.api.brent_forecast_routes:run_brent_forecast_migration'),
+    Migration(26, 'wti_pro_widget', 'src.api.wti_pro_widget_routes:run_wti_pro_widget_migration'),
+    Migration(27, 'lng_pro_widget', 'src.api.lng_pro_widget_routes:run_lng_pro_widget_migration'),
+    Migration(28, 'gas_storage_pro_widget', 'src.api.gas_storage_pro_widget_routes:run_gas_storage_pro_widget_migration'),
+    Migration(29, 'indices_history', 'src.api.indices_history_routes:run_indices_history_migration'),
+    Migration(30, 'daily_report', 'src.api.daily_report_routes:run_daily_report_migration'),
+    Migration(31, 'alerts_access', 'src.api.alerts_access_routes:run_alerts_access_migration'),
+    Migration(32, 'geri_live_sub', 'src.api.geri_live_sub_routes:run_geri_live_sub_migration'),
+    Migration(33, 'widget_embed_tracking', 'src.api.widget_embed_tracking_routes:run_widget_embed_tracking_migration'),
+    Migration(34, 'user_activity', 'src.api.user_activity_tracking_routes:run_user_activity_migration'),
+    Migration(35, 'internal_jobs', 'src.jobs.db:run_jobs_migration'),
+    Migration(36, 'query_indexes', 'src.db.migrations:run_query_index_migration'),
+    Migration(37, 'user_entitlements', 'src.billing.entitlements:run_entitlements_migration'),
+    Migration(38, 'eeri_weekly_snapshots', 'src.db.migrations:run_eeri_weekly_snapshot_migration'),
+    Migration(39, 'brent_scenario_artifacts', 'src.market.brent_scenario:run_brent_scenario_artifacts_migration'),
+]
+
+_schema_confirmed = False
+
+
+def schema_confirmed() -> bool:
+    """True once this process has verified or brought the schema up to date."""
+    return _schema_confirmed
+
+
+def pending_migrations(applied: Dict[int, str], migrations: List[Migration] = None) -> List[Migration]:
+    """Enabled migrations that are missing from the ledger or changed since."""
+    pending = []
+    for migration in migrations if migrations is not None else MIGRATIONS:
+        if not migration.enabled():
+            continue
+        if applied.get(migration.version) != migration.checksum():
+            pending.append(migration)
+    return pending
+
+
+def read_ledger() -> Dict[int, str]:
+    """{version: checksum} of applied migrations; empty if the ledger is new."""
+    from psycopg2 import errors
+    from src.db.db import execute_query
+
+    try:
+        rows = execute_query("SELECT version, checksum FROM schema_migrations")
+    except errors.UndefinedTable:
+        return {}
+    return {row['version']: row['checksum'] for row in rows or []}
+
+
+def _record(cursor, migration: Migration, checksum: str, duration_ms: int) -> None:
+    cursor.execute("""
+        INSERT INTO schema_migrations (version, name, checksum, applied_at, duration_ms)
+        VALUES (%s, %s, %s, NOW(), %s)
+        ON CONFLICT (version) DO UPDATE SET
+            name = EXCLUDED.name,
+            checksum = EXCLUDED.checksum,
+            applied_at = NOW(),
+            duration_ms = EXCLUDED.duration_ms
+    """, (migration.version, migration.name, checksum, duration_ms))
+
+
+class _FailureLog(logging.Handler):
+    """Collects WARNING+ records logged on this thread while a migration runs."""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.thread = threading.get_ident()
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.thread == self.thread:
+            self.messages.append(f"{record.name}: {record.getMessage()}")
+
+
+def run_migration(migration: Migration) -> List[str]:
+    """
+    Run one migration and return the warnings and errors it logged. Many
+    migration functions catch their own DDL errors and only log them, so
+    a non-empty result means the migration may not have fully applied.
+    """
+    watch = _FailureLog()
+    root = logging.getLogger()
+    root.addHandler(watch)
+    try:
+        migration.load()()
+    finally:
+        root.removeHandler(watch)
+    return watch.messages
+
+
+def _record_applied(migration: Migration, duration_ms: int) -> None:
+    from src.db.db import get_cursor
+
+    with get_cursor() as cursor:
+        _record(cursor, migration, migration.checksum(), duration_ms)
+
+
+def apply_migrations(migrations: List[Migration],
+                     record: Optional[Callable[[Migration, int], None]] = None) -> List[str]:
+    """
+    Run migrations in version order and record each in the ledger. A
+    migration that logged a warning or error is left unrecorded so the
+    next start retries it.
+    """
+    if record is None:
+        from src.db.db import get_cursor
+
+        with get_cursor() as cursor:
+            cursor.execute(LEDGER_TABLE_SQL)
+        record = _record_applied
+
+    applied = []
+    for migration in sorted(migrations, key=lambda m: m.version):
+        started = time.monotonic()
+        logger.info(f"Applying migration {migration.version} {migration.name}")
+        failures = run_migration(migration)
+        if failures:
+            logger.error(f"Migration {migration.version} {migration.name} reported {len(failures)} "
+                         f"failure(s); left pending: {failures[0]}")
+            continue
+        record(migration, int((time.monotonic() - started) * 1000))
+        applied.append(f"{migration.version}:{migration.name}")
+    return applied
+
+
+def apply_pending() -> List[str]:
+    """
+    Apply pending migrations under an advisory lock so instances starting
+    together don't run DDL concurrently. The ledger is re-read after the
+    lock is taken; whatever another instance finished is skipped, and
+    whatever it left pending (a migration that reported a failure) is
+    retried.
+    """
+    from src.db.db import advisory_lock
+
+    for attempt in range(120):
+        with advisory_lock(MIGRATION_LOCK_ID) as acquired:
+            if acquired:
+                return apply_migrations(pending_migrations(read_ledger()))
+        if attempt == 0:
+            logger.info("Another process is applying migrations; waiting for it")
+        time.sleep(1)
+    raise RuntimeError("Timed out waiting for another process to apply migrations")
+
+
+def ensure_schema() -> List[str]:
+    """
+    Startup check: one ledger query on a current schema. Returns the
+    migrations applied (empty when the schema was already current).
+    """
+    global _schema_confirmed
+
+    started = time.monotonic()
+    pending = pending_migrations(read_ledger())
+    if not pending:
+        _schema_confirmed = True
+        logger.info(f"Schema is current ({(time.monotonic() - started) * 1000:.0f}ms)")
+        return []
+
+    names = ', '.join(f"{m.version}:{m.name}" for m in pending)
+    if MIGRATIONS_ON_STARTUP != 'apply':
+        logger.warning(f"{len(pending)} pending migrations not applied (MIGRATIONS_ON_STARTUP="
+                       f"{MIGRATIONS_ON_STARTUP}): {names}. Run `python src/main.py --mode migrate`.")
+        return []
+
+    applied = apply_pending()
+    _schema_confirmed = True
+    logger.info(f"Applied {len(applied)} migrations in {time.monotonic() - started:.1f}s")
+    return applied
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="EnergyRiskIQ schema migration ledger")
+    parser.add_argument('command', nargs='?', choices=['status', 'apply'], default='apply')
+    parser.add_argument('--rerun', type=int, action='append', default=[],
+                        help='Re-apply a migration version even if it is current (repeatable)')
+    args = parser.parse_args(argv)
+
+    applied = read_ledger()
+    pending = pending_migrations(applied)
+
+    if args.command == 'status':
+        pending_versions = {m.version for m in pending}
+        for migration in MIGRATIONS:
+            if not migration.enabled():
+                state = 'disabled'
+            elif migration.version in pending_versions:
+                state = 'changed' if migration.version in applied else 'pending'
+            else:
+                state = 'applied'
+            print(f"{migration.version:4d}  {state:9s} {migration.name}")
+        return 1 if pending else 0
+
+    if args.rerun:
+        by_version = {m.version: m for m in MIGRATIONS}
+        unknown = [v for v in args.rerun if v not in by_version]
+        if unknown:
+            parser.error(f"Unknown migration versions: {unknown}")
+        extra = [by_version[v] for v in args.rerun if by_version[v] not in pending]
+        done = apply_migrations(pending + extra)
+    else:
+        done = apply_pending()
+    print(f"Applied {len(done)} migrations" + (f": {', '.join(done)}" if done else ''))
+    left = pending_migrations(read_ledger())
+    if left:
+        print(f"Still pending after failures: {', '.join(f'{m.version}:{m.name}' for m in left)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO'),
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(main())
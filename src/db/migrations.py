@@ -311,12 +311,20 @@ def run_migrations():
         ) THEN
             ALTER TABLE events ADD COLUMN ai_attempts INT NOT NULL DEFAULT 0;
         END IF;
+        
+        IF NOT EXISTS (
+            SELECT 1 FROM information_schema.columns 
+            WHERE table_name = 'events' AND column_name = 'ai_claimed_at'
+        ) THEN
+            ALTER TABLE events ADD COLUMN ai_claimed_at TIMESTAMP NULL;
+        END IF;
     END $$;
     """
     
     create_ai_indexes = [
         "CREATE INDEX IF NOT EXISTS idx_events_processed ON events (processed);",
-        "CREATE INDEX IF NOT EXISTS idx_events_ai_processed_at ON events (ai_processed_at);"
+        "CREATE INDEX IF NOT EXISTS idx_events_ai_processed_at ON events (ai_processed_at);",
+        "CREATE INDEX IF NOT EXISTS idx_events_ai_pending ON events (inserted_at) WHERE processed = FALSE;"
     ]
     
     create_risk_events_table = """
@@ -1260,6 +1268,20 @@ def run_seo_tables_migration():
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_seo_regional_daily_pages_region ON seo_regional_daily_pages(region_slug);")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_seo_regional_daily_pages_date ON seo_regional_daily_pages(page_date DESC);")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_seo_regional_daily_pages_region_date ON seo_regional_daily_pages(region_slug, page_date DESC);")
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS seo_page_snapshots (
+                path TEXT PRIMARY KEY,
+                page_type TEXT NOT NULL,
+                body BYTEA NOT NULL,
+                etag TEXT NOT NULL,
+                render_version TEXT NOT NULL,
+                source_date DATE NULL,
+                generated_at TIMESTAMP NOT NULL DEFAULT NOW()
+            );
+        """)
+        
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_seo_page_snapshots_type ON seo_page_snapshots(page_type, render_version);")
     
     logger.info("SEO tables migration complete.")
 
@@ -1717,6 +1739,57 @@ def run_signal_quality_migration():
     logger.info("Signal quality migration complete.")
 
 
+def run_query_index_migration():
+    """
+    Composite and functional indexes for the hot region lookups found by
+    src/db/query_audit.py. Region filters are written as
+    LOWER(region) = LOWER(%s), which the plain (region) indexes can't serve,
+    and every lookup wants the newest rows first.
+    """
+    logger.info("Running query index migration...")
+    indexes = [
+        # alerts engines get_risk_summary, digest get_risk_indices, /risk/regions/{region}
+        "CREATE INDEX IF NOT EXISTS idx_risk_indices_lower_region_calculated ON risk_indices (LOWER(region), calculated_at DESC);",
+        "CREATE INDEX IF NOT EXISTS idx_risk_indices_lower_region_window ON risk_indices (LOWER(region), window_days, calculated_at DESC);",
+        # /risk/regions (DISTINCT ON region, window_days) and trader intel index series
+        "CREATE INDEX IF NOT EXISTS idx_risk_indices_region_window_calculated ON risk_indices (region, window_days, calculated_at DESC);",
+        # latest score per asset for a region (DISTINCT ON asset)
+        "CREATE INDEX IF NOT EXISTS idx_asset_risk_lower_region_window_asset ON asset_risk (LOWER(region), window_days, asset, calculated_at DESC);",
+        # /risk/assets (DISTINCT ON asset, region, window_days)
+        "CREATE INDEX IF NOT EXISTS idx_asset_risk_asset_region_window ON asset_risk (asset, region, window_days, calculated_at DESC);",
+        "CREATE INDEX IF NOT EXISTS idx_alert_state_lower_region_window ON alert_state (LOWER(region), window_days);",
+    ]
+    with get_cursor() as cursor:
+        for index_sql in indexes:
+            cursor.execute(index_sql)
+        cursor.execute("ANALYZE risk_indices")
+        cursor.execute("ANALYZE asset_risk")
+        cursor.execute("ANALYZE alert_state")
+    logger.info("Query index migration complete.")
+
+
+def run_eeri_weekly_snapshot_migration():
+    """Stored EERI weekly snapshot (src/reri/eeri_weekly_snapshot.py), one row per week."""
+    logger.info("Running EERI weekly snapshot migration...")
+    with get_cursor() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS eeri_weekly_snapshots (
+                week_start DATE PRIMARY KEY,
+                week_end DATE NOT NULL,
+                version INT NOT NULL,
+                anchor_week DATE NOT NULL,
+                eeri_through DATE,
+                snapshot JSONB NOT NULL,
+                computed_at TIMESTAMP NOT NULL DEFAULT NOW()
+            );
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_eeri_weekly_snapshots_computed
+            ON eeri_weekly_snapshots(version, computed_at DESC);
+        """)
+    logger.info("EERI weekly snapshot migration complete.")
+
+
 def run_public_digest_migration():
     logger.info("Running public digest pages migration...")
     with get_cursor() as cursor:
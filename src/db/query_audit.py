@@ -0,0 +1,262 @@
+"""
+Query Audit
+
+Runs a set of read helpers (workloads) while capturing every statement
+they send through the cursors in src/db/db.py, then EXPLAINs each distinct
+statement with the parameters it was first called with and flags plan
+shapes that don't scale: sequential scans with a filter, explicit sorts
+and rows thrown away by filters.
+
+Usage:
+    python -m src.db.query_audit                       # all workloads
+    python -m src.db.query_audit alerts_risk_summary digest_risk_indices
+    python -m src.db.query_audit --no-analyze --json audit.json
+
+EXPLAIN ANALYZE executes the statement; it runs in a transaction that is
+rolled back, and only SELECT/WITH statements are explained.
+
+scripts/bench_query_indexes.py uses the same capture to time the hot
+statements against a seeded scratch schema before and after the indexes
+from run_query_index_migration().
+"""
+import argparse
+import importlib
+import json
+import logging
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@dataclass(frozen=True)
+class Workload:
+    name: str
+    target: str
+    args: Tuple = ()
+    tables: Tuple[str, ...] = ()
+
+    def load(self) -> Callable:
+        module_name, _, func_name = self.target.partition(':')
+        return getattr(importlib.import_module(module_name), func_name)
+
+
+WORKLOADS: List[Workload] = [
+    Workload('alerts_risk_summary', 'src.alerts.alerts_engine_v2:get_risk_summary', ('Europe',),
+             ('risk_indices', 'asset_risk')),
+    Workload('alerts_previous_score', 'src.alerts.alerts_engine_v2:get_previous_risk_score', ('Europe',),
+             ('alert_state',)),
+    Workload('alerts_v1_risk_summary', 'src.alerts.alerts_engine:get_risk_summary', ('Europe',),
+             ('risk_indices', 'asset_risk')),
+    Workload('digest_risk_indices', 'src.alerts.digest_worker:get_risk_indices', ('Europe',),
+             ('risk_indices',)),
+    Workload('digest_asset_snapshot', 'src.alerts.digest_worker:get_asset_snapshot', ('Europe',),
+             ('asset_risk',)),
+    Workload('api_risk_regions', 'src.api.risk_routes:get_risk_regions', (),
+             ('risk_indices',)),
+    Workload('api_region_history', 'src.api.risk_routes:get_region_history', ('Europe', 30),
+             ('risk_indices',)),
+    Workload('api_asset_risks', 'src.api.risk_routes:get_asset_risks', (),
+             ('asset_risk',)),
+    Workload('api_risk_summary', 'src.api.risk_routes:get_risk_summary', ('Europe',),
+             ('risk_indices', 'asset_risk')),
+    Workload('trader_intel_spillover', 'src.egsi.trader_intel:compute_cross_index_spillover', (90,),
+             ('egsi_m_daily', 'risk_indices')),
+]
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace so the same statement from different call sites groups together."""
+    return _WHITESPACE_RE.sub(' ', sql).strip()
+
+
+def is_explainable(sql: str) -> bool:
+    head = normalize_sql(sql).split(' ', 1)[0].upper()
+    return head in ('SELECT', 'WITH')
+
+
+@dataclass
+class CapturedQuery:
+    sql: str
+    params: Any
+    workloads: List[str] = field(default_factory=list)
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, workload: Optional[str], seconds: float) -> None:
+        self.calls += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if workload and workload not in self.workloads:
+            self.workloads.append(workload)
+
+
+class QueryCapture:
+    """Collects statements executed while active, grouped by normalized SQL."""
+
+    def __init__(self):
+        self.queries: Dict[str, CapturedQuery] = {}
+        self.workload: Optional[str] = None
+
+    def observe(self, sql: str, params, seconds: float, rowcount: int = -1, error: bool = False) -> None:
+        key = normalize_sql(sql)
+        captured = self.queries.get(key)
+        if captured is None:
+            captured = self.queries[key] = CapturedQuery(key, params)
+        captured.record(self.workload, seconds)
+
+    def __enter__(self) -> 'QueryCapture':
+        from src.db.db import add_query_observer
+        add_query_observer(self.observe)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        from src.db.db import remove_query_observer
+        remove_query_observer(self.observe)
+
+
+def run_workloads(workloads: Sequence[Workload], capture: QueryCapture) -> Dict[str, Optional[str]]:
+    """Run each workload under `capture`; returns workload name -> error (None if it ran)."""
+    errors: Dict[str, Optional[str]] = {}
+    for workload in workloads:
+        capture.workload = workload.name
+        try:
+            workload.load()(*workload.args)
+            errors[workload.name] = None
+        except Exception as e:
+            errors[workload.name] = f"{type(e).__name__}: {e}"
+            logger.warning(f"Workload {workload.name} failed: {e}")
+        finally:
+            capture.workload = None
+    return errors
+
+
+def explain(sql: str, params=None, analyze: bool = True) -> Dict:
+    """EXPLAIN (FORMAT JSON) plan of a statement, in a rolled-back transaction."""
+    from src.db.db import get_cursor
+
+    options = 'ANALYZE, BUFFERS, FORMAT JSON' if analyze else 'FORMAT JSON'
+    with get_cursor(commit=False) as cursor:
+        cursor.execute(f"EXPLAIN ({options}) {sql}", params)
+        row = cursor.fetchone()
+        cursor.connection.rollback()
+    plan = row['QUERY PLAN'] if isinstance(row, dict) else row[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+def _walk(node: Dict) -> Iterator[Dict]:
+    yield node
+    for child in node.get('Plans', []):
+        yield from _walk(child)
+
+
+def summarize_plan(plan: Dict) -> Dict:
+    """Flatten an EXPLAIN JSON plan into the facts the report and benchmark need."""
+    nodes = []
+    issues = []
+    for node in _walk(plan['Plan']):
+        node_type = node['Node Type']
+        relation = node.get('Relation Name')
+        index = node.get('Index Name')
+        label = node_type + (f" using {index}" if index else '') + (f" on {relation}" if relation else '')
+        nodes.append(label)
+
+        removed = node.get('Rows Removed by Filter', 0)
+        if node_type == 'Seq Scan' and node.get('Filter'):
+            issues.append(f"Seq Scan on {relation} filtering {node['Filter']}"
+                          + (f" ({removed} rows removed)" if removed else ''))
+        elif removed and removed > 10 * max(node.get('Actual Rows', 0), 1):
+            issues.append(f"{label} removed {removed} rows by filter {node.get('Filter')}")
+        if node_type in ('Sort', 'Incremental Sort'):
+            method = node.get('Sort Method')
+            issues.append(f"{node_type} on {', '.join(node.get('Sort Key', []))}"
+                          + (f" ({method})" if method else ''))
+
+    return {
+        'nodes': nodes,
+        'issues': issues,
+        'total_cost': plan['Plan'].get('Total Cost'),
+        'execution_ms': plan.get('Execution Time'),
+        'planning_ms': plan.get('Planning Time'),
+    }
+
+
+def audit(workloads: Sequence[Workload] = WORKLOADS, analyze: bool = True) -> Dict:
+    capture = QueryCapture()
+    with capture:
+        errors = run_workloads(workloads, capture)
+
+    queries = []
+    for captured in capture.queries.values():
+        entry = {
+            'sql': captured.sql,
+            'workloads': captured.workloads,
+            'calls': captured.calls,
+            'total_ms': round(captured.total_seconds * 1000, 2),
+            'max_ms': round(captured.max_seconds * 1000, 2),
+        }
+        if is_explainable(captured.sql):
+            try:
+                entry['plan'] = summarize_plan(explain(captured.sql, captured.params, analyze))
+            except Exception as e:
+                entry['explain_error'] = str(e)
+        queries.append(entry)
+    queries.sort(key=lambda q: -q['total_ms'])
+    return {'workloads': errors, 'queries': queries}
+
+
+def format_report(result: Dict) -> str:
+    lines = []
+    failed = {name: error for name, error in result['workloads'].items() if error}
+    lines.append(f"Query audit: {len(result['workloads'])} workloads, {len(result['queries'])} distinct statements")
+    for name, error in failed.items():
+        lines.append(f"  workload {name} failed: {error}")
+
+    for query in result['queries']:
+        sql = query['sql'] if len(query['sql']) <= 160 else query['sql'][:157] + '...'
+        lines.append('')
+        lines.append(f"{query['total_ms']:8.1f}ms  {query['calls']} call(s)  [{', '.join(query['workloads'])}]")
+        lines.append(f"  {sql}")
+        plan = query.get('plan')
+        if plan:
+            timing = f", executed in {plan['execution_ms']:.2f}ms" if plan.get('execution_ms') is not None else ''
+            lines.append(f"  plan: {' -> '.join(plan['nodes'])}{timing}")
+            for issue in plan['issues']:
+                lines.append(f"  ! {issue}")
+        elif query.get('explain_error'):
+            lines.append(f"  explain failed: {query['explain_error']}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Capture and EXPLAIN the SQL issued by hot read helpers")
+    parser.add_argument('workloads', nargs='*', help=f"default: all ({', '.join(w.name for w in WORKLOADS)})")
+    parser.add_argument('--no-analyze', action='store_true', help="EXPLAIN without executing")
+    parser.add_argument('--json', help="also write the full result to this file")
+    args = parser.parse_args(argv)
+
+    selected = [w for w in WORKLOADS if not args.workloads or w.name in args.workloads]
+    unknown = set(args.workloads) - {w.name for w in WORKLOADS}
+    if unknown:
+        parser.error(f"unknown workload(s): {', '.join(sorted(unknown))}")
+
+    started = time.perf_counter()
+    result = audit(selected, analyze=not args.no_analyze)
+    print(format_report(result))
+    print(f"\naudit took {time.perf_counter() - started:.1f}s")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2, default=str)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
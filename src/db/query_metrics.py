@@ -0,0 +1,231 @@
+"""
+Per-query DB metrics
+
+When DB_QUERY_METRICS=true, every statement executed through src/db/db.py
+and src/db/async_db.py is recorded under its fingerprint (SQL with literals
+and whitespace normalized, so the same inline query with different values
+groups together): call and error counts, a latency histogram with
+p50/p95/p99, rows returned, and the modules that issue it. Statements
+slower than DB_SLOW_QUERY_MS are logged with their caller.
+
+The slow-query log works on its own: with DB_QUERY_METRICS=false slow
+statements are still logged, and nothing else is kept. With both off
+(DB_SLOW_QUERY_MS=0) no observer is registered and the DB helpers pay one
+list check per statement.
+
+Exposed at GET /ops/db-metrics (internal token).
+"""
+import hashlib
+import logging
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DB_QUERY_METRICS = os.environ.get('DB_QUERY_METRICS', 'false').lower() == 'true'
+DB_SLOW_QUERY_MS = float(os.environ.get('DB_SLOW_QUERY_MS', '500'))
+DB_QUERY_METRICS_MAX_FINGERPRINTS = int(os.environ.get('DB_QUERY_METRICS_MAX_FINGERPRINTS', '1000'))
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended.
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DB_DIR = os.path.dirname(os.path.abspath(__file__))
+_ROOT_DIR = os.path.dirname(_SRC_DIR)
+
+_COMMENT_RE = re.compile(r'--[^\n]*|/\*.*?\*/', re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'(?<![\w$.])-?\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\bIN\s*\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)', re.I)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_statement(sql: str) -> str:
+    """SQL with comments dropped, literals replaced by ? and whitespace collapsed."""
+    sql = _COMMENT_RE.sub(' ', sql)
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _WHITESPACE_RE.sub(' ', sql).strip()
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:12]
+
+
+def bucket_index(ms: float) -> int:
+    for i, bound in enumerate(BUCKETS_MS):
+        if ms <= bound:
+            return i
+    return len(BUCKETS_MS)
+
+
+def percentile(buckets: List[int], q: float, max_ms: float) -> float:
+    """Estimate a percentile from histogram counts (upper bound of the bucket it falls in)."""
+    total = sum(buckets)
+    if not total:
+        return 0.0
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(buckets):
+        seen += count
+        if seen >= rank:
+            return min(float(BUCKETS_MS[i]), max_ms) if i < len(BUCKETS_MS) else max_ms
+    return max_ms
+
+
+def _caller() -> str:
+    """module:function of the first frame in src/ outside the src/db helpers."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_SRC_DIR) and os.path.dirname(filename) != _DB_DIR:
+            module = os.path.relpath(filename, _ROOT_DIR)[:-3].replace(os.sep, '.')
+            return f"{module}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+class QueryStats:
+    __slots__ = ('fingerprint', 'statement', 'calls', 'errors', 'total_ms', 'max_ms', 'rows',
+                 'buckets', 'callers')
+
+    def __init__(self, fp: str, statement: str):
+        self.fingerprint = fp
+        self.statement = statement
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.callers: Counter = Counter()
+
+    def to_dict(self, top_callers: int = 5) -> Dict:
+        return {
+            'fingerprint': self.fingerprint,
+            'statement': self.statement,
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_ms': round(self.total_ms, 2),
+            'mean_ms': round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+            'p50_ms': percentile(self.buckets, 0.50, self.max_ms),
+            'p95_ms': percentile(self.buckets, 0.95, self.max_ms),
+            'p99_ms': percentile(self.buckets, 0.99, self.max_ms),
+            'max_ms': round(self.max_ms, 2),
+            'rows': self.rows,
+            'rows_per_call': round(self.rows / self.calls, 1) if self.calls else 0.0,
+            'histogram': dict(zip([f"<={b}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"], self.buckets)),
+            'callers': dict(self.callers.most_common(top_callers)),
+        }
+
+
+class QueryMetrics:
+    """Thread-safe per-fingerprint statistics; observe() is a src.db.db query observer."""
+
+    def __init__(self, slow_query_ms: float = DB_SLOW_QUERY_MS, record: bool = True,
+                 max_fingerprints: int = DB_QUERY_METRICS_MAX_FINGERPRINTS):
+        self.slow_query_ms = slow_query_ms
+        self.record = record
+        self.max_fingerprints = max_fingerprints
+        self._stats: Dict[str, QueryStats] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def observe(self, sql: str, params, seconds: float, rowcount: int = -1, error: bool = False) -> None:
+        ms = seconds * 1000
+        slow = self.slow_query_ms > 0 and ms >= self.slow_query_ms
+        if not self.record and not slow:
+            return
+        caller = _caller()
+        if slow:
+            logger.warning(f"Slow query {ms:.0f}ms rows={rowcount} caller={caller}: "
+                           f"{_WHITESPACE_RE.sub(' ', sql).strip()[:300]}")
+        if not self.record:
+            return
+
+        fp = self._fingerprints.get(sql)
+        if fp is None:
+            statement = normalize_statement(sql)
+            fp = fingerprint(statement)
+        else:
+            statement = None
+        with self._lock:
+            stats = self._stats.get(fp)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    self.dropped += 1
+                    return
+                stats = self._stats[fp] = QueryStats(fp, statement or normalize_statement(sql))
+            if len(self._fingerprints) < self.max_fingerprints * 4:
+                self._fingerprints[sql] = fp
+            stats.calls += 1
+            stats.total_ms += ms
+            stats.max_ms = max(stats.max_ms, ms)
+            stats.buckets[bucket_index(ms)] += 1
+            if error:
+                stats.errors += 1
+            elif rowcount > 0:
+                stats.rows += rowcount
+            stats.callers[caller] += 1
+
+    def snapshot(self, sort: str = 'total_ms', limit: int = 50, module: Optional[str] = None) -> Dict:
+        with self._lock:
+            rows = [stats.to_dict() for stats in self._stats.values()]
+            dropped = self.dropped
+        if module:
+            rows = [r for r in rows if any(c.startswith(module) for c in r['callers'])]
+        rows.sort(key=lambda r: -r.get(sort, 0))
+        return {
+            'fingerprints': len(rows),
+            'calls': sum(r['calls'] for r in rows),
+            'total_ms': round(sum(r['total_ms'] for r in rows), 2),
+            'dropped_fingerprints': dropped,
+            'slow_query_ms': self.slow_query_ms,
+            'queries': rows[:limit],
+        }
+
+    def by_module(self) -> Dict[str, Dict]:
+        """DB time and calls per calling module."""
+        totals: Dict[str, Dict] = {}
+        with self._lock:
+            for stats in self._stats.values():
+                mean = stats.total_ms / stats.calls if stats.calls else 0.0
+                for caller, calls in stats.callers.items():
+                    module = caller.split(':')[0]
+                    entry = totals.setdefault(module, {'calls': 0, 'total_ms': 0.0})
+                    entry['calls'] += calls
+                    entry['total_ms'] += mean * calls
+        for entry in totals.values():
+            entry['total_ms'] = round(entry['total_ms'], 2)
+        return dict(sorted(totals.items(), key=lambda item: -item[1]['total_ms']))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._fingerprints.clear()
+            self.dropped = 0
+
+
+_metrics: Optional[QueryMetrics] = None
+
+
+def get_query_metrics() -> Optional[QueryMetrics]:
+    return _metrics
+
+
+def enable_query_metrics(record: bool = DB_QUERY_METRICS, slow_query_ms: float = DB_SLOW_QUERY_MS) -> Optional[QueryMetrics]:
+    """Register the metrics observer with the DB helpers. No-op if neither metrics nor the slow log is on."""
+    global _metrics
+    if _metrics is not None or (not record and slow_query_ms <= 0):
+        return _metrics
+    from src.db.db import add_query_observer
+    _metrics = QueryMetrics(slow_query_ms=slow_query_ms, record=record)
+    add_query_observer(_metrics.observe)
+    logger.info(f"DB query {'metrics' if record else 'slow-query log'} enabled (slow >= {slow_query_ms:.0f}ms)")
+    return _metrics
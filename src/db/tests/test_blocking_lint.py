@@ -0,0 +1,53 @@
+"""
+Unit tests for the blocking DB call lint.
+"""
+from src.db.blocking_lint import find_blocking_calls
+
+SOURCE = '''
+import asyncio
+from src.db.db import execute_one, get_cursor
+from src.db.async_db import run_db
+
+
+def load_row(row_id):
+    return execute_one("SELECT 1 WHERE id = %s", (row_id,))
+
+
+def load_view(row_id):
+    return load_row(row_id)
+
+
+def pure(x):
+    return x + 1
+
+
+async def blocking_handler():
+    row = execute_one("SELECT 1")
+    with get_cursor() as cursor:
+        cursor.execute("SELECT 1")
+    return load_view(1)
+
+
+async def offloaded_handler():
+    row = await run_db(load_view, 1)
+    other = await asyncio.to_thread(execute_one, "SELECT 1")
+
+    def nested():
+        return execute_one("SELECT 1")
+
+    return pure(row)
+'''
+
+
+def test_reports_direct_and_wrapped_calls():
+    calls = find_blocking_calls(SOURCE)
+    assert [(c.handler, c.callee, c.via) for c in calls] == [
+        ('blocking_handler', 'execute_one', ''),
+        ('blocking_handler', 'get_cursor', ''),
+        ('blocking_handler', 'execute_one', 'load_view'),
+    ]
+
+
+def test_offloaded_calls_are_not_reported():
+    calls = find_blocking_calls(SOURCE)
+    assert not [c for c in calls if c.handler == 'offloaded_handler']
@@ -0,0 +1,84 @@
+"""
+Unit tests for the migration ledger.
+"""
+import inspect
+import logging
+
+from src.db.migration_ledger import (MIGRATIONS, Migration, apply_migrations, function_source,
+                                     pending_migrations, run_migration)
+
+TARGET = 'src.db.tests.test_migration_ledger'
+
+
+def _first_migration():
+    pass
+
+
+def _second_migration():
+    pass
+
+
+def _disabled():
+    return False
+
+
+def _swallowing_migration():
+    try:
+        raise RuntimeError('relation "users" does not exist')
+    except Exception as e:
+        logging.getLogger('src.api.example_routes').error(f"example migration failed: {e}")
+
+
+FAKE = [
+    Migration(1, 'first', f'{TARGET}:_first_migration'),
+    Migration(2, 'second', f'{TARGET}:_second_migration'),
+    Migration(3, 'optional', f'{TARGET}:_second_migration', _disabled),
+]
+
+
+def test_versions_are_unique_and_ordered():
+    versions = [m.version for m in MIGRATIONS]
+    assert versions == sorted(versions)
+    assert len(set(versions)) == len(versions)
+    assert len({m.name for m in MIGRATIONS}) == len(MIGRATIONS)
+
+
+def test_checksum_is_stable_and_source_specific():
+    assert FAKE[0].checksum() == FAKE[0].checksum()
+    assert FAKE[0].checksum() != FAKE[1].checksum()
+
+
+def test_pending_lists_missing_and_changed_migrations():
+    assert [m.version for m in pending_migrations({}, FAKE)] == [1, 2]
+
+    current = {1: FAKE[0].checksum(), 2: FAKE[1].checksum()}
+    assert pending_migrations(current, FAKE) == []
+
+    changed = {1: FAKE[0].checksum(), 2: 'stale'}
+    assert [m.version for m in pending_migrations(changed, FAKE)] == [2]
+
+
+def test_function_source_matches_inspect_without_importing():
+    assert function_source(f'{TARGET}:_first_migration') == inspect.getsource(_first_migration)
+    for migration in MIGRATIONS:
+        assert function_source(migration.target).lstrip().startswith(('def ', 'async def ', '@'))
+
+
+def test_artifact_tables_are_created_by_their_own_migration():
+    sources = {m.name: function_source(m.target) for m in MIGRATIONS}
+    for table in ('eeri_weekly_snapshots', 'brent_scenario_artifacts'):
+        assert f'CREATE TABLE IF NOT EXISTS {table}' in sources[table]
+        assert [name for name, source in sources.items() if table in source] == [table]
+
+
+def test_migration_that_swallows_an_error_stays_pending():
+    swallowing = Migration(4, 'swallowing', f'{TARGET}:_swallowing_migration')
+    assert run_migration(swallowing) == [
+        'src.api.example_routes: example migration failed: relation "users" does not exist']
+    assert run_migration(FAKE[0]) == []
+
+    ledger = {}
+    applied = apply_migrations([swallowing, FAKE[0]],
+                               record=lambda m, duration_ms: ledger.__setitem__(m.version, m.checksum()))
+    assert applied == ['1:first']
+    assert [m.version for m in pending_migrations(ledger, [FAKE[0], swallowing])] == [4]
@@ -0,0 +1,65 @@
+"""
+Unit tests for the query audit.
+"""
+from src.db.migration_ledger import function_source
+from src.db.query_audit import WORKLOADS, QueryCapture, is_explainable, normalize_sql, summarize_plan
+
+
+def test_workload_targets_exist():
+    for workload in WORKLOADS:
+        assert function_source(workload.target)
+
+
+def test_normalize_sql_groups_call_sites():
+    capture = QueryCapture()
+    capture.workload = 'a'
+    capture.observe("\n    SELECT 1\n    FROM risk_indices\n", ('Europe',), 0.002)
+    capture.workload = 'b'
+    capture.observe("SELECT 1 FROM risk_indices", ('Asia',), 0.004)
+
+    assert list(capture.queries) == ['SELECT 1 FROM risk_indices']
+    captured = capture.queries['SELECT 1 FROM risk_indices']
+    assert captured.calls == 2
+    assert captured.params == ('Europe',)
+    assert captured.workloads == ['a', 'b']
+    assert abs(captured.max_seconds - 0.004) < 1e-9
+    assert normalize_sql(' a \n\t b ') == 'a b'
+
+
+def test_is_explainable():
+    assert is_explainable("\n  select * from events")
+    assert is_explainable("WITH x AS (SELECT 1) SELECT * FROM x")
+    assert not is_explainable("INSERT INTO alert_state (region) VALUES ('Europe')")
+
+
+def test_summarize_plan_flags_seq_scan_and_sort():
+    plan = {
+        'Plan': {
+            'Node Type': 'Limit', 'Total Cost': 1520.4, 'Actual Rows': 2,
+            'Plans': [{
+                'Node Type': 'Sort', 'Sort Key': ['calculated_at DESC'], 'Sort Method': 'top-N heapsort',
+                'Actual Rows': 2,
+                'Plans': [{
+                    'Node Type': 'Seq Scan', 'Relation Name': 'risk_indices', 'Actual Rows': 5840,
+                    'Filter': "(lower(region) = 'europe'::text)", 'Rows Removed by Filter': 64240,
+                }],
+            }],
+        },
+        'Execution Time': 12.5,
+    }
+    summary = summarize_plan(plan)
+    assert summary['nodes'] == ['Limit', 'Sort', 'Seq Scan on risk_indices']
+    assert summary['execution_ms'] == 12.5
+    assert len(summary['issues']) == 2
+    assert summary['issues'][0].startswith('Sort on calculated_at DESC')
+    assert 'Seq Scan on risk_indices' in summary['issues'][1]
+
+
+def test_summarize_plan_index_scan_is_clean():
+    plan = {'Plan': {
+        'Node Type': 'Index Scan', 'Relation Name': 'risk_indices', 'Actual Rows': 2,
+        'Index Name': 'idx_risk_indices_lower_region_calculated', 'Total Cost': 8.3,
+    }}
+    summary = summarize_plan(plan)
+    assert summary['nodes'] == ['Index Scan using idx_risk_indices_lower_region_calculated on risk_indices']
+    assert summary['issues'] == []
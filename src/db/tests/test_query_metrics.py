@@ -0,0 +1,67 @@
+"""
+Unit tests for per-query DB metrics.
+"""
+import logging
+
+from src.db.query_metrics import (BUCKETS_MS, QueryMetrics, bucket_index, fingerprint,
+                                  normalize_statement, percentile)
+
+
+def test_normalize_statement_replaces_literals():
+    a = normalize_statement("SELECT * FROM risk_indices -- latest\nWHERE region = 'Europe' AND window_days = 7")
+    b = normalize_statement("SELECT *   FROM risk_indices WHERE region = 'Asia' AND window_days = 30")
+    assert a == b == "SELECT * FROM risk_indices WHERE region = ? AND window_days = ?"
+    assert fingerprint(a) == fingerprint(b)
+
+
+def test_normalize_statement_keeps_identifiers_and_collapses_in_lists():
+    sql = normalize_statement("SELECT col1, t2.x FROM t2 WHERE id IN (1, 2, 3) AND v = %s LIMIT 10")
+    assert sql == "SELECT col1, t2.x FROM t2 WHERE id IN (...) AND v = %s LIMIT ?"
+
+
+def test_histogram_percentiles():
+    buckets = [0] * (len(BUCKETS_MS) + 1)
+    for ms in [0.5] * 90 + [40] * 9 + [20000]:
+        buckets[bucket_index(ms)] += 1
+    assert percentile(buckets, 0.50, 20000) == 1.0
+    assert percentile(buckets, 0.95, 20000) == 50.0
+    assert percentile(buckets, 1.0, 20000) == 20000
+    assert percentile([0] * len(buckets), 0.5, 0) == 0.0
+
+
+def test_observe_groups_by_fingerprint_and_records_caller():
+    metrics = QueryMetrics(slow_query_ms=0)
+    metrics.observe("SELECT * FROM events WHERE id = 1", None, 0.002, rowcount=1)
+    metrics.observe("SELECT * FROM events WHERE id = 2", None, 0.004, rowcount=1)
+    metrics.observe("SELECT * FROM events WHERE id = 3", None, 0.001, error=True)
+
+    snapshot = metrics.snapshot()
+    assert snapshot['fingerprints'] == 1
+    query = snapshot['queries'][0]
+    assert query['calls'] == 3
+    assert query['errors'] == 1
+    assert query['rows'] == 2
+    assert query['max_ms'] == 4.0
+    assert list(query['callers']) == ['src.db.tests.test_query_metrics:test_observe_groups_by_fingerprint_and_records_caller']
+    assert 'src.db.tests.test_query_metrics' in metrics.by_module()
+
+    metrics.reset()
+    assert metrics.snapshot()['fingerprints'] == 0
+
+
+def test_fingerprint_limit_counts_dropped():
+    metrics = QueryMetrics(slow_query_ms=0, max_fingerprints=2)
+    for table in ('a', 'b', 'c'):
+        metrics.observe(f"SELECT 1 FROM {table}", None, 0.001)
+    assert metrics.snapshot()['fingerprints'] == 2
+    assert metrics.dropped == 1
+
+
+def test_slow_query_log_without_recording(caplog):
+    metrics = QueryMetrics(slow_query_ms=100, record=False)
+    with caplog.at_level(logging.WARNING, logger='src.db.query_metrics'):
+        metrics.observe("SELECT pg_sleep(0.2)", None, 0.2)
+        metrics.observe("SELECT 1", None, 0.001)
+    assert len(caplog.records) == 1
+    assert 'Slow query 200ms' in caplog.records[0].getMessage()
+    assert metrics.snapshot()['fingerprints'] == 0
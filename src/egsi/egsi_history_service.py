@@ -2,6 +2,9 @@
 EGSI History Service
 
 Provides functions for retrieving historical EGSI-M data for SEO pages.
+
+Date lists, month lists, adjacency and monthly stats come from the
+in-memory date index (src/seo/history_index.py).
 """
 import logging
 from datetime import date, datetime, timedelta
@@ -10,6 +13,7 @@ import json
 
 from src.db.db import get_production_cursor
 from src.egsi.types import EGSI_M_INDEX_ID
+from src.seo.history_index import avg_numeric, get_history_index
 
 logger = logging.getLogger(__name__)
 
@@ -19,16 +23,8 @@ def get_all_egsi_m_dates() -> List[str]:
     Get all dates that have EGSI-M snapshots.
     Returns list of ISO date strings in descending order.
     """
-    query = """
-        SELECT DISTINCT index_date
-        FROM egsi_m_daily
-        ORDER BY index_date DESC
-    """
     try:
-        with get_production_cursor() as cursor:
-            cursor.execute(query)
-            rows = cursor.fetchall()
-        return [row['index_date'].isoformat() if hasattr(row['index_date'], 'isoformat') else str(row['index_date']) for row in rows]
+        return [d.isoformat() for d in get_history_index(EGSI_M_INDEX_ID).dates_desc()]
     except Exception as e:
         logger.error(f"Error fetching EGSI-M dates: {e}")
         return []
@@ -39,32 +35,16 @@ def get_egsi_m_available_months() -> List[Dict[str, Any]]:
     Get all available months that have EGSI-M data.
     Returns list of {year, month, count, max_date} dicts.
     """
-    query = """
-        SELECT 
-            EXTRACT(YEAR FROM index_date)::int as year,
-            EXTRACT(MONTH FROM index_date)::int as month,
-            COUNT(*) as count,
-            MAX(index_date) as max_date
-        FROM egsi_m_daily
-        GROUP BY EXTRACT(YEAR FROM index_date), EXTRACT(MONTH FROM index_date)
-        ORDER BY year DESC, month DESC
-    """
     try:
-        with get_production_cursor() as cursor:
-            cursor.execute(query)
-            rows = cursor.fetchall()
-        result = []
-        for row in rows:
-            max_date = row['max_date']
-            if hasattr(max_date, 'isoformat'):
-                max_date = max_date.isoformat()
-            result.append({
-                'year': row['year'],
-                'month': row['month'],
-                'count': row['count'],
-                'max_date': max_date,
-            })
-        return result
+        return [
+            {
+                'year': m['year'],
+                'month': m['month'],
+                'count': m['count'],
+                'max_date': m['max_date'].isoformat(),
+            }
+            for m in get_history_index(EGSI_M_INDEX_ID).month_summaries()
+        ]
     except Exception as e:
         logger.error(f"Error fetching EGSI-M months: {e}")
         return []
@@ -220,31 +200,12 @@ def get_egsi_m_adjacent_dates(target_date: date) -> Dict[str, Optional[str]]:
     Get previous and next dates with EGSI-M data relative to target_date.
     Returns dict with 'prev' and 'next' date strings.
     """
-    prev_query = """
-        SELECT MAX(index_date) as prev_date
-        FROM egsi_m_daily
-        WHERE index_date < %s
-    """
-    next_query = """
-        SELECT MIN(index_date) as next_date
-        FROM egsi_m_daily
-        WHERE index_date > %s
-    """
     result = {'prev': None, 'next': None}
     
     try:
-        with get_production_cursor() as cursor:
-            cursor.execute(prev_query, (target_date,))
-            row = cursor.fetchone()
-            if row and row['prev_date']:
-                prev_date = row['prev_date']
-                result['prev'] = prev_date.isoformat() if hasattr(prev_date, 'isoformat') else str(prev_date)
-            
-            cursor.execute(next_query, (target_date,))
-            row = cursor.fetchone()
-            if row and row['next_date']:
-                next_date = row['next_date']
-                result['next'] = next_date.isoformat() if hasattr(next_date, 'isoformat') else str(next_date)
+        prev_date, next_date = get_history_index(EGSI_M_INDEX_ID).adjacent(target_date)
+        result['prev'] = prev_date.isoformat() if prev_date else None
+        result['next'] = next_date.isoformat() if next_date else None
     except Exception as e:
         logger.error(f"Error fetching EGSI-M adjacent dates: {e}")
     
@@ -255,32 +216,21 @@ def get_egsi_m_monthly_stats() -> List[Dict[str, Any]]:
     """
     Get monthly statistics for EGSI-M (avg, max, min values per month).
     """
-    query = """
-        SELECT 
-            EXTRACT(YEAR FROM index_date)::int as year,
-            EXTRACT(MONTH FROM index_date)::int as month,
-            COUNT(*) as count,
-            AVG(index_value)::numeric(5,2) as avg_value,
-            MAX(index_value) as max_value,
-            MIN(index_value) as min_value
-        FROM egsi_m_daily
-        GROUP BY EXTRACT(YEAR FROM index_date), EXTRACT(MONTH FROM index_date)
-        ORDER BY year DESC, month DESC
-    """
     try:
-        with get_production_cursor() as cursor:
-            cursor.execute(query)
-            rows = cursor.fetchall()
-        
+        index = get_history_index(EGSI_M_INDEX_ID)
         result = []
-        for row in rows:
+        for m in index.month_summaries():
+            values = [v for v in index.month_values(m['year'], m['month']) if v is not None]
+            avg_value = avg_numeric(values)
+            max_value = max(values) if values else None
+            min_value = min(values) if values else None
             result.append({
-                'year': row['year'],
-                'month': row['month'],
-                'count': row['count'],
-                'avg_value': float(row['avg_value']) if row['avg_value'] else 0,
-                'max_value': float(row['max_value']) if row['max_value'] else 0,
-                'min_value': float(row['min_value']) if row['min_value'] else 0,
+                'year': m['year'],
+                'month': m['month'],
+                'count': m['count'],
+                'avg_value': float(avg_value) if avg_value else 0,
+                'max_value': float(max_value) if max_value else 0,
+                'min_value': float(min_value) if min_value else 0,
             })
         return result
     except Exception as e:
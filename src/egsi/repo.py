@@ -21,6 +21,7 @@ from src.egsi.types import (
     MODEL_VERSION,
     EGSI_S_MODEL_VERSION,
 )
+from src.seo.history_index import invalidate_history_index
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +58,7 @@ def save_egsi_m_result(result: EGSIMResult) -> bool:
                 result.computed_at or datetime.utcnow(),
             ))
         
+        invalidate_history_index(EGSI_M_INDEX_ID)
         logger.info(f"Saved EGSI-M for {result.index_date}: {result.value:.1f} ({result.band.value})")
         return True
     
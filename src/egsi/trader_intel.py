@@ -52,75 +52,33 @@ def _pearson(xs, ys):
 
 
 def compute_asset_overlay(days: int = 90) -> Dict[str, Any]:
-    egsi = execute_production_query("""
-        SELECT index_date as date, index_value as value
-        FROM egsi_m_daily
-        WHERE index_date >= CURRENT_DATE - %s
-        ORDER BY index_date ASC
-    """, (days,))
-
-    ttf = execute_production_query("""
-        SELECT date, ttf_price as value
-        FROM ttf_gas_snapshots
-        WHERE date >= CURRENT_DATE - %s
-        ORDER BY date ASC
-    """, (days,))
-
-    brent = execute_production_query("""
-        SELECT date, brent_price as value
-        FROM oil_price_snapshots
-        WHERE date >= CURRENT_DATE - %s
-        ORDER BY date ASC
-    """, (days,))
+    from src.market.series_store import get_series_store
+    store = get_series_store()
+    since = date.today() - timedelta(days=days)
 
-    vix = execute_production_query("""
-        SELECT date, vix_close as value
-        FROM vix_snapshots
-        WHERE date >= CURRENT_DATE - %s
-        ORDER BY date ASC
-    """, (days,))
-
-    eurusd = execute_production_query("""
-        SELECT date, rate as value
-        FROM eurusd_snapshots
-        WHERE date >= CURRENT_DATE - %s
-        ORDER BY date ASC
-    """, (days,))
-
-    storage = execute_production_query("""
-        SELECT date, eu_storage_percent as value
-        FROM gas_storage_snapshots
-        WHERE date >= CURRENT_DATE - %s
-        ORDER BY date ASC
-    """, (days,))
-
-    def fmt(rows):
-        return [{'date': _safe_date(r['date']), 'value': _to_float(r['value'])} for r in (rows or [])]
+    def fmt(name):
+        return store.series(name, start=since).to_rows(date_format='iso')
 
     return {
-        'egsi_m': fmt(egsi),
-        'ttf': fmt(ttf),
-        'brent': fmt(brent),
-        'vix': fmt(vix),
-        'eurusd': fmt(eurusd),
-        'storage': fmt(storage),
+        'egsi_m': fmt('egsi_m'),
+        'ttf': fmt('ttf'),
+        'brent': fmt('brent'),
+        'vix': fmt('vix'),
+        'eurusd': fmt('eurusd'),
+        'storage': fmt('gas_storage'),
     }
 
 
 def compute_ttf_divergence() -> Dict[str, Any]:
-    rows = execute_production_query("""
-        SELECT e.index_date as date, e.index_value as egsi_value, t.ttf_price
-        FROM egsi_m_daily e
-        JOIN ttf_gas_snapshots t ON e.index_date = t.date
-        WHERE e.index_date >= CURRENT_DATE - 90
-        ORDER BY e.index_date ASC
-    """)
+    from src.market.series_store import get_series_store
+    frame = get_series_store().align(['egsi_m', 'ttf'], start=date.today() - timedelta(days=90))
+    rows = frame.iso_dates()
 
     if not rows or len(rows) < 5:
         return {'signal': 'INSUFFICIENT_DATA', 'z_score': None, 'description': 'Not enough aligned data points'}
 
-    egsi_vals = [_to_float(r['egsi_value']) for r in rows]
-    ttf_vals = [_to_float(r['ttf_price']) for r in rows]
+    egsi_vals = frame['egsi_m'].values.tolist()
+    ttf_vals = frame['ttf'].values.tolist()
 
     e_mean = sum(egsi_vals) / len(egsi_vals)
     e_std = math.sqrt(sum((v - e_mean) ** 2 for v in egsi_vals) / len(egsi_vals)) or 1e-9
@@ -690,8 +648,8 @@ def compute_cross_index_spillover(days: int = 90) -> List[Dict[str, Any]]:
     egsi_dates = [_safe_date(r['date']) for r in egsi]
 
     index_queries = {
-        'GERI': "SELECT calculated_at::date as date, risk_score as value FROM risk_indices WHERE region = 'global' AND window_days = 7 AND calculated_at::date >= CURRENT_DATE - %s ORDER BY calculated_at::date ASC",
-        'EERI': "SELECT calculated_at::date as date, risk_score as value FROM risk_indices WHERE region = 'europe' AND window_days = 7 AND calculated_at::date >= CURRENT_DATE - %s ORDER BY calculated_at::date ASC",
+        'GERI': "SELECT calculated_at::date as date, risk_score as value FROM risk_indices WHERE region = 'global' AND window_days = 7 AND calculated_at >= CURRENT_DATE - %s ORDER BY calculated_at ASC",
+        'EERI': "SELECT calculated_at::date as date, risk_score as value FROM risk_indices WHERE region = 'europe' AND window_days = 7 AND calculated_at >= CURRENT_DATE - %s ORDER BY calculated_at ASC",
     }
 
     results = []
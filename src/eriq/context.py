@@ -518,17 +518,11 @@ def _get_asset_context(config: dict) -> dict:
         "SELECT date, brent_price, brent_change_pct, wti_price, brent_wti_spread FROM oil_price_snapshots ORDER BY date DESC LIMIT %s",
         (days,)
     )
-    ttf = execute_production_query(
-        "SELECT date, ttf_price FROM ttf_gas_snapshots ORDER BY date DESC LIMIT %s",
-        (days,)
-    )
-    vix = execute_production_query(
-        "SELECT date, vix_close FROM vix_snapshots ORDER BY date DESC LIMIT %s",
-        (days,)
-    )
-    eurusd = execute_production_query(
-        "SELECT date, rate FROM eurusd_snapshots ORDER BY date DESC LIMIT %s",
-        (days,)
+    from src.market.series_store import get_series_store
+    store = get_series_store()
+    ttf, vix, eurusd = (
+        store.series(name).tail(days).to_rows(key)[::-1]
+        for name, key in (("ttf", "ttf_price"), ("vix", "vix_close"), ("eurusd", "rate"))
     )
     storage = execute_production_query(
         "SELECT date, eu_storage_percent, risk_band FROM gas_storage_snapshots ORDER BY date DESC LIMIT %s",
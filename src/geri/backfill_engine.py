@@ -0,0 +1,302 @@
+"""
+GERI v1 Bulk Backfill Engine
+
+Single-pass, multi-date backfill. Instead of re-querying alerts, the 90-day
+baseline and the 7-row trend history for every day, the engine loads all
+alerts and stored index rows for the range once, then walks forward keeping
+the rolling baseline min/max and trend window in memory. Results are written
+in batches.
+
+Output is identical to the per-day path (service.compute_geri_for_date):
+each day sees exactly the rows that would be in intel_indices_daily at that
+point of a day-by-day run, including rows written earlier in the same run.
+"""
+import logging
+from collections import deque
+from datetime import date, timedelta
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from src.geri.types import AlertRecord, GERIResult, HistoricalBaseline
+from src.geri.compute import compute_components
+from src.geri.normalize import (
+    normalize_components,
+    calculate_geri_value,
+    calculate_trends,
+    build_result,
+    get_band,
+)
+
+logger = logging.getLogger(__name__)
+
+BASELINE_LOOKBACK_DAYS = 90
+TREND_WINDOW = 7
+DEFAULT_BATCH_SIZE = 50
+
+
+def compute_day_result(
+    target_date: date,
+    alerts: List[AlertRecord],
+    baseline: HistoricalBaseline,
+    previous_values: List[int],
+) -> GERIResult:
+    """
+    Build the GERI result for one day from already-loaded inputs.
+    Shared by the per-day and bulk paths so both produce the same output.
+    """
+    from src.geri.interpretation import generate_interpretation
+
+    components = compute_components(alerts)
+    components = normalize_components(components, baseline)
+
+    value = calculate_geri_value(components)
+    trend_1d, trend_7d = calculate_trends(value, previous_values)
+
+    band = get_band(value)
+    top_regions = [r.get('region', '') for r in components.top_regions[:3] if r.get('region')]
+    components.interpretation = generate_interpretation(
+        value=value,
+        band=band.value,
+        top_drivers=components.top_drivers,
+        top_regions=top_regions,
+        index_date=target_date.isoformat()
+    )
+
+    return build_result(target_date, value, components, trend_1d, trend_7d)
+
+
+class RollingMinMax:
+    """
+    Min/max over a date-keyed sliding window using monotonic deques.
+    Values must be pushed in ascending date order; each push and evict is
+    amortized O(1).
+    """
+
+    def __init__(self):
+        self._min: Deque[Tuple[date, float]] = deque()
+        self._max: Deque[Tuple[date, float]] = deque()
+
+    def push(self, day: date, value: float) -> None:
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((day, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((day, value))
+
+    def evict_before(self, cutoff: date) -> None:
+        while self._min and self._min[0][0] < cutoff:
+            self._min.popleft()
+        while self._max and self._max[0][0] < cutoff:
+            self._max.popleft()
+
+    @property
+    def min(self) -> float:
+        return self._min[0][1]
+
+    @property
+    def max(self) -> float:
+        return self._max[0][1]
+
+
+class BaselineWindow:
+    """
+    Incremental equivalent of repo.get_historical_baseline: rolling min/max of
+    the four raw component scores over rows with date in [D - lookback, D).
+    """
+
+    def __init__(self, lookback_days: int = BASELINE_LOOKBACK_DAYS):
+        self.lookback_days = lookback_days
+        self._dates: Deque[date] = deque()
+        self._high_impact = RollingMinMax()
+        self._regional_spike = RollingMinMax()
+        self._asset_risk = RollingMinMax()
+        self._region_concentration = RollingMinMax()
+
+    def push(self, day: date, scores: Tuple[float, float, float, float]) -> None:
+        hi, rs, ar, rc = scores
+        self._dates.append(day)
+        self._high_impact.push(day, hi)
+        self._regional_spike.push(day, rs)
+        self._asset_risk.push(day, ar)
+        self._region_concentration.push(day, rc)
+
+    def baseline_for(self, target_date: date) -> HistoricalBaseline:
+        cutoff = target_date - timedelta(days=self.lookback_days)
+        while self._dates and self._dates[0] < cutoff:
+            self._dates.popleft()
+        for series in (self._high_impact, self._regional_spike,
+                       self._asset_risk, self._region_concentration):
+            series.evict_before(cutoff)
+
+        baseline = HistoricalBaseline()
+        baseline.days_count = len(self._dates)
+
+        if baseline.days_count > 0:
+            baseline.high_impact_min = self._high_impact.min
+            baseline.high_impact_max = self._high_impact.max
+            baseline.regional_spike_min = self._regional_spike.min
+            baseline.regional_spike_max = self._regional_spike.max
+            baseline.asset_risk_min = self._asset_risk.min
+            baseline.asset_risk_max = self._asset_risk.max
+            baseline.region_concentration_min = self._region_concentration.min
+            baseline.region_concentration_max = self._region_concentration.max
+
+        return baseline
+
+
+def _result_scores(result: GERIResult) -> Tuple[float, float, float, float]:
+    """Baseline scores as they read back from the stored components JSON."""
+    stored = result.components.to_dict()
+    return (
+        stored['high_impact_score'],
+        stored['regional_spike_score'],
+        stored['asset_risk_score'],
+        stored['region_concentration_score_raw'],
+    )
+
+
+def walk_backfill(
+    from_date: date,
+    to_date: date,
+    alerts_by_date: Dict[date, List[AlertRecord]],
+    stored_rows: Dict[date, Tuple[int, Tuple[float, float, float, float]]],
+    seed_previous_values: List[int],
+    force: bool = False,
+    compute_fn: Callable[..., GERIResult] = compute_day_result,
+) -> Iterator[Tuple[date, Optional[GERIResult], Optional[Exception]]]:
+    """
+    Walk the range one day at a time without touching the database.
+
+    Args:
+        alerts_by_date: Alerts per UTC day for the range
+        stored_rows: {date: (value, baseline_scores)} for rows already in
+            intel_indices_daily from (from_date - 90d) through to_date
+        seed_previous_values: Last 7 stored values before from_date, newest
+            first (as returned by repo.get_previous_values)
+        force: Recompute days that already have a stored row
+
+    Yields:
+        (day, result, error) - result is None when the day was skipped or
+        failed; error is set only on failure.
+    """
+    window = BaselineWindow()
+    for day in sorted(d for d in stored_rows if d < from_date):
+        window.push(day, stored_rows[day][1])
+
+    trend: Deque[int] = deque(reversed(seed_previous_values[:TREND_WINDOW]), maxlen=TREND_WINDOW)
+
+    current_date = from_date
+    while current_date <= to_date:
+        existing = stored_rows.get(current_date)
+        result = None
+        error = None
+
+        if existing is None or force:
+            try:
+                result = compute_fn(
+                    current_date,
+                    alerts_by_date.get(current_date, []),
+                    window.baseline_for(current_date),
+                    list(reversed(trend)),
+                )
+            except Exception as e:
+                error = e
+
+        if result is not None:
+            window.push(current_date, _result_scores(result))
+            trend.append(result.value)
+        elif existing is not None:
+            window.push(current_date, existing[1])
+            trend.append(existing[0])
+
+        yield current_date, result, error
+        current_date += timedelta(days=1)
+
+
+def bulk_backfill(
+    from_date: date,
+    to_date: date,
+    force: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Backfill GERI indices for a date range in a single pass.
+
+    Issues a constant number of reads (alerts, stored rows, trend seed) plus
+    one write per batch, regardless of range length.
+
+    Returns:
+        Summary dict with the same shape as service.backfill
+    """
+    from src.geri.repo import (
+        baseline_scores,
+        get_alerts_for_range,
+        get_index_rows_for_range,
+        get_previous_values,
+        save_indices_batch,
+    )
+
+    logger.info(f"Starting bulk GERI backfill from {from_date} to {to_date} "
+                f"(force={force}, batch_size={batch_size})")
+
+    alerts_by_date = get_alerts_for_range(from_date, to_date)
+    stored_rows = {
+        row['date']: (row['value'], baseline_scores(row['components']))
+        for row in get_index_rows_for_range(
+            from_date - timedelta(days=BASELINE_LOOKBACK_DAYS), to_date
+        )
+    }
+    seed_previous_values = get_previous_values(from_date, days=TREND_WINDOW)
+
+    computed = 0
+    skipped = 0
+    failed = 0
+    results = []
+    pending: List[GERIResult] = []
+
+    def flush() -> None:
+        nonlocal computed, failed
+        if not pending:
+            return
+        try:
+            save_indices_batch(pending, force=force)
+            computed += len(pending)
+            results.extend({
+                'date': r.index_date.isoformat(),
+                'value': r.value,
+                'band': r.band.value,
+            } for r in pending)
+        except Exception as e:
+            logger.error(f"Failed to save GERI batch "
+                         f"{pending[0].index_date} to {pending[-1].index_date}: {e}")
+            failed += len(pending)
+        pending.clear()
+
+    for day, result, error in walk_backfill(
+        from_date, to_date, alerts_by_date, stored_rows, seed_previous_values, force=force
+    ):
+        if error is not None:
+            logger.error(f"Failed to compute GERI for {day}: {error}")
+            failed += 1
+        elif result is None:
+            skipped += 1
+        else:
+            pending.append(result)
+            if len(pending) >= batch_size:
+                flush()
+
+    flush()
+
+    summary = {
+        'from_date': from_date.isoformat(),
+        'to_date': to_date.isoformat(),
+        'computed': computed,
+        'skipped': skipped,
+        'failed': failed,
+        'total_days': (to_date - from_date).days + 1,
+        'results': results,
+    }
+
+    logger.info(f"Bulk backfill complete: computed={computed}, skipped={skipped}, failed={failed}")
+
+    return summary
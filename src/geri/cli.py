@@ -3,8 +3,8 @@ GERI v1 CLI Commands
 
 Usage:
     python -m src.geri.cli compute --date YYYY-MM-DD [--force]
-    python -m src.geri.cli backfill --from YYYY-MM-DD --to YYYY-MM-DD [--force]
-    python -m src.geri.cli backfill-auto [--force]
+    python -m src.geri.cli backfill --from YYYY-MM-DD --to YYYY-MM-DD [--force] [--per-day]
+    python -m src.geri.cli backfill-auto [--force] [--per-day]
 """
 import argparse
 import sys
@@ -84,7 +84,7 @@ def cmd_backfill(args):
     
     run_migrations()
     
-    summary = backfill(from_date, to_date, force=args.force)
+    summary = backfill(from_date, to_date, force=args.force, bulk=not args.per_day)
     
     print(f"\nBackfill Complete:")
     print(f"  Date Range: {summary['from_date']} to {summary['to_date']}")
@@ -104,7 +104,7 @@ def cmd_backfill_auto(args):
     
     run_migrations()
     
-    summary = auto_backfill(force=args.force)
+    summary = auto_backfill(force=args.force, bulk=not args.per_day)
     
     if 'error' in summary:
         print(f"ERROR: {summary['error']}")
@@ -134,9 +134,11 @@ def main():
     backfill_parser.add_argument('--from', dest='from_date', required=True, help='Start date (YYYY-MM-DD)')
     backfill_parser.add_argument('--to', dest='to_date', required=True, help='End date (YYYY-MM-DD)')
     backfill_parser.add_argument('--force', action='store_true', help='Overwrite existing values')
+    backfill_parser.add_argument('--per-day', action='store_true', help='Compute day by day instead of the bulk engine')
     
     auto_parser = subparsers.add_parser('backfill-auto', help='Auto-backfill all historical alerts')
     auto_parser.add_argument('--force', action='store_true', help='Overwrite existing values')
+    auto_parser.add_argument('--per-day', action='store_true', help='Compute day by day instead of the bulk engine')
     
     args = parser.parse_args()
     
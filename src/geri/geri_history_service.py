@@ -3,6 +3,10 @@ GERI History Service Layer
 
 Data access layer for GERI history pages using intel_indices_daily table.
 This is the single source of truth for all GERI snapshots.
+
+Date navigation, month lists and monthly stats are answered from the
+in-memory date index (src/seo/history_index.py); snapshots are memoized
+per date and fetched in one query for whatever is not cached.
 """
 
 import json
@@ -12,6 +16,13 @@ from dataclasses import dataclass
 
 from src.db.db import get_production_cursor
 from src.geri.types import INDEX_ID
+from src.seo.history_index import (
+    as_date, avg_numeric, cached_snapshot, get_history_index, public_cutoff,
+    remember_snapshot, snapshot_generation,
+)
+
+SNAPSHOT_COLUMNS = """id, index_id, date, value, band, trend_1d, trend_7d,
+           components, model_version, computed_at, interpretation"""
 
 
 @dataclass
@@ -102,6 +113,38 @@ def _row_to_snapshot(row: Dict[str, Any]) -> GERISnapshot:
     )
 
 
+def _fetch_snapshots(dates: List[date]) -> Dict[str, GERISnapshot]:
+    """Snapshots for dates, keyed by ISO date: memoized ones plus one query for the rest."""
+    found: Dict[str, GERISnapshot] = {}
+    missing = []
+    for d in dates:
+        snapshot = cached_snapshot(INDEX_ID, d)
+        if snapshot is None:
+            missing.append(d)
+        else:
+            found[snapshot.date] = snapshot
+    
+    if missing:
+        generation = snapshot_generation(INDEX_ID)
+        sql = f"""
+        SELECT {SNAPSHOT_COLUMNS}
+        FROM intel_indices_daily
+        WHERE index_id = %s AND date = ANY(%s)
+        """
+        with get_production_cursor() as cursor:
+            cursor.execute(sql, (INDEX_ID, missing))
+            for row in cursor.fetchall():
+                snapshot = _row_to_snapshot(dict(row))
+                found[snapshot.date] = remember_snapshot(INDEX_ID, snapshot.date, snapshot, generation)
+    
+    return found
+
+
+def _snapshots_in_order(dates: List[date]) -> List[GERISnapshot]:
+    found = _fetch_snapshots(dates)
+    return [found[d.isoformat()] for d in dates if d.isoformat() in found]
+
+
 def get_snapshot_by_date(snapshot_date: str) -> Optional[GERISnapshot]:
     """
     Get a specific GERI snapshot by date.
@@ -112,21 +155,11 @@ def get_snapshot_by_date(snapshot_date: str) -> Optional[GERISnapshot]:
     Returns:
         GERISnapshot or None if not found
     """
-    sql = """
-    SELECT id, index_id, date, value, band, trend_1d, trend_7d,
-           components, model_version, computed_at, interpretation
-    FROM intel_indices_daily
-    WHERE index_id = %s AND date = %s
-    LIMIT 1
-    """
-    
-    with get_production_cursor() as cursor:
-        cursor.execute(sql, (INDEX_ID, snapshot_date))
-        row = cursor.fetchone()
-        if row:
-            return _row_to_snapshot(dict(row))
-    
-    return None
+    try:
+        day = as_date(snapshot_date)
+    except ValueError:
+        return None
+    return _fetch_snapshots([day]).get(day.isoformat())
 
 
 def list_snapshots(
@@ -147,37 +180,8 @@ def list_snapshots(
     Returns:
         List of GERISnapshot ordered by date descending
     """
-    conditions = ["index_id = %s"]
-    params = [INDEX_ID]
-    
-    if from_date:
-        conditions.append("date >= %s")
-        params.append(from_date)
-    
-    if to_date:
-        conditions.append("date <= %s")
-        params.append(to_date)
-    
-    where_clause = " AND ".join(conditions)
-    
-    sql = f"""
-    SELECT id, index_id, date, value, band, trend_1d, trend_7d,
-           components, model_version, computed_at, interpretation
-    FROM intel_indices_daily
-    WHERE {where_clause}
-    ORDER BY date DESC
-    LIMIT %s OFFSET %s
-    """
-    params.extend([limit, offset])
-    
-    snapshots = []
-    with get_production_cursor() as cursor:
-        cursor.execute(sql, tuple(params))
-        rows = cursor.fetchall()
-        for row in rows:
-            snapshots.append(_row_to_snapshot(dict(row)))
-    
-    return snapshots
+    dates = get_history_index(INDEX_ID).between(from_date, to_date)[::-1]
+    return _snapshots_in_order(dates[offset:offset + limit])
 
 
 def list_monthly(year: int, month: int) -> List[GERISnapshot]:
@@ -191,24 +195,7 @@ def list_monthly(year: int, month: int) -> List[GERISnapshot]:
     Returns:
         List of GERISnapshot ordered by date ascending
     """
-    sql = """
-    SELECT id, index_id, date, value, band, trend_1d, trend_7d,
-           components, model_version, computed_at, interpretation
-    FROM intel_indices_daily
-    WHERE index_id = %s
-      AND EXTRACT(YEAR FROM date) = %s
-      AND EXTRACT(MONTH FROM date) = %s
-    ORDER BY date ASC
-    """
-    
-    snapshots = []
-    with get_production_cursor() as cursor:
-        cursor.execute(sql, (INDEX_ID, year, month))
-        rows = cursor.fetchall()
-        for row in rows:
-            snapshots.append(_row_to_snapshot(dict(row)))
-    
-    return snapshots
+    return _snapshots_in_order(get_history_index(INDEX_ID).month_dates(year, month))
 
 
 def get_latest_snapshot() -> Optional[GERISnapshot]:
@@ -218,9 +205,8 @@ def get_latest_snapshot() -> Optional[GERISnapshot]:
     Returns:
         The latest GERISnapshot or None
     """
-    sql = """
-    SELECT id, index_id, date, value, band, trend_1d, trend_7d,
-           components, model_version, computed_at, interpretation
+    sql = f"""
+    SELECT {SNAPSHOT_COLUMNS}
     FROM intel_indices_daily
     WHERE index_id = %s
     ORDER BY computed_at DESC
@@ -243,24 +229,10 @@ def get_latest_published_snapshot() -> Optional[GERISnapshot]:
     Returns:
         The latest snapshot where date <= yesterday
     """
-    yesterday = (date.today() - timedelta(days=1)).isoformat()
-    
-    sql = """
-    SELECT id, index_id, date, value, band, trend_1d, trend_7d,
-           components, model_version, computed_at, interpretation
-    FROM intel_indices_daily
-    WHERE index_id = %s AND date <= %s
-    ORDER BY date DESC
-    LIMIT 1
-    """
-    
-    with get_production_cursor() as cursor:
-        cursor.execute(sql, (INDEX_ID, yesterday))
-        row = cursor.fetchone()
-        if row:
-            return _row_to_snapshot(dict(row))
-    
-    return None
+    latest = get_history_index(INDEX_ID).latest(until=public_cutoff())
+    if latest is None:
+        return None
+    return _fetch_snapshots([latest]).get(latest.isoformat())
 
 
 def get_available_months(public_only: bool = False) -> List[Dict[str, Any]]:
@@ -273,35 +245,17 @@ def get_available_months(public_only: bool = False) -> List[Dict[str, Any]]:
     Returns:
         List of dicts with year, month, snapshot_count, min_date, max_date
     """
-    yesterday = (date.today() - timedelta(days=1)).isoformat()
-    date_filter = f"AND date <= '{yesterday}'" if public_only else ""
-    
-    sql = f"""
-    SELECT 
-        EXTRACT(YEAR FROM date)::int as year,
-        EXTRACT(MONTH FROM date)::int as month,
-        COUNT(*) as snapshot_count,
-        MIN(date) as min_date,
-        MAX(date) as max_date
-    FROM intel_indices_daily
-    WHERE index_id = %s {date_filter}
-    GROUP BY EXTRACT(YEAR FROM date), EXTRACT(MONTH FROM date)
-    ORDER BY year DESC, month DESC
-    """
-    
-    results = []
-    with get_production_cursor() as cursor:
-        cursor.execute(sql, (INDEX_ID,))
-        rows = cursor.fetchall()
-        for row in rows:
-            row_dict = dict(row)
-            if row_dict.get('max_date') and hasattr(row_dict['max_date'], 'isoformat'):
-                row_dict['max_date'] = row_dict['max_date'].isoformat()
-            if row_dict.get('min_date') and hasattr(row_dict['min_date'], 'isoformat'):
-                row_dict['min_date'] = row_dict['min_date'].isoformat()
-            results.append(row_dict)
-    
-    return results
+    index = get_history_index(INDEX_ID)
+    return [
+        {
+            'year': m['year'],
+            'month': m['month'],
+            'snapshot_count': m['count'],
+            'min_date': m['min_date'].isoformat(),
+            'max_date': m['max_date'].isoformat(),
+        }
+        for m in index.month_summaries(until=public_cutoff() if public_only else None)
+    ]
 
 
 def get_monthly_stats(year: int, month: int) -> Optional[Dict[str, Any]]:
@@ -311,25 +265,17 @@ def get_monthly_stats(year: int, month: int) -> Optional[Dict[str, Any]]:
     Returns:
         Dict with avg, min, max, first, last values or None if no data
     """
-    sql = """
-    SELECT 
-        AVG(value)::numeric(6,2) as avg_value,
-        MIN(value) as min_value,
-        MAX(value) as max_value,
-        COUNT(*) as snapshot_count
-    FROM intel_indices_daily
-    WHERE index_id = %s
-      AND EXTRACT(YEAR FROM date) = %s
-      AND EXTRACT(MONTH FROM date) = %s
-    """
-    
-    with get_production_cursor() as cursor:
-        cursor.execute(sql, (INDEX_ID, year, month))
-        row = cursor.fetchone()
-        if row and row['snapshot_count'] > 0:
-            return dict(row)
+    rows = get_history_index(INDEX_ID).month_values(year, month)
+    if not rows:
+        return None
     
-    return None
+    values = [v for v in rows if v is not None]
+    return {
+        'avg_value': avg_numeric(values),
+        'min_value': min(values) if values else None,
+        'max_value': max(values) if values else None,
+        'snapshot_count': len(rows),
+    }
 
 
 def get_adjacent_dates(current_date: str) -> Dict[str, Optional[str]]:
@@ -342,34 +288,11 @@ def get_adjacent_dates(current_date: str) -> Dict[str, Optional[str]]:
     Returns:
         Dict with 'prev' and 'next' date strings or None
     """
-    prev_sql = """
-    SELECT date FROM intel_indices_daily
-    WHERE index_id = %s AND date < %s
-    ORDER BY date DESC LIMIT 1
-    """
-    
-    next_sql = """
-    SELECT date FROM intel_indices_daily
-    WHERE index_id = %s AND date > %s
-    ORDER BY date ASC LIMIT 1
-    """
-    
-    result = {'prev': None, 'next': None}
-    
-    with get_production_cursor() as cursor:
-        cursor.execute(prev_sql, (INDEX_ID, current_date))
-        row = cursor.fetchone()
-        if row:
-            d = row['date']
-            result['prev'] = d.isoformat() if hasattr(d, 'isoformat') else str(d)
-        
-        cursor.execute(next_sql, (INDEX_ID, current_date))
-        row = cursor.fetchone()
-        if row:
-            d = row['date']
-            result['next'] = d.isoformat() if hasattr(d, 'isoformat') else str(d)
-    
-    return result
+    prev_date, next_date = get_history_index(INDEX_ID).adjacent(current_date)
+    return {
+        'prev': prev_date.isoformat() if prev_date else None,
+        'next': next_date.isoformat() if next_date else None,
+    }
 
 
 def get_adjacent_months(year: int, month: int) -> Dict[str, Optional[Dict[str, int]]]:
@@ -379,44 +302,11 @@ def get_adjacent_months(year: int, month: int) -> Dict[str, Optional[Dict[str, i
     Returns:
         Dict with 'prev' and 'next' containing year/month or None
     """
-    prev_sql = """
-    SELECT DISTINCT 
-        EXTRACT(YEAR FROM date)::int as year,
-        EXTRACT(MONTH FROM date)::int as month
-    FROM intel_indices_daily
-    WHERE index_id = %s
-      AND (EXTRACT(YEAR FROM date) < %s 
-           OR (EXTRACT(YEAR FROM date) = %s AND EXTRACT(MONTH FROM date) < %s))
-    ORDER BY year DESC, month DESC
-    LIMIT 1
-    """
-    
-    next_sql = """
-    SELECT DISTINCT 
-        EXTRACT(YEAR FROM date)::int as year,
-        EXTRACT(MONTH FROM date)::int as month
-    FROM intel_indices_daily
-    WHERE index_id = %s
-      AND (EXTRACT(YEAR FROM date) > %s 
-           OR (EXTRACT(YEAR FROM date) = %s AND EXTRACT(MONTH FROM date) > %s))
-    ORDER BY year ASC, month ASC
-    LIMIT 1
-    """
-    
-    result = {'prev': None, 'next': None}
-    
-    with get_production_cursor() as cursor:
-        cursor.execute(prev_sql, (INDEX_ID, year, year, month))
-        row = cursor.fetchone()
-        if row:
-            result['prev'] = {'year': row['year'], 'month': row['month']}
-        
-        cursor.execute(next_sql, (INDEX_ID, year, year, month))
-        row = cursor.fetchone()
-        if row:
-            result['next'] = {'year': row['year'], 'month': row['month']}
-    
-    return result
+    prev_month, next_month = get_history_index(INDEX_ID).adjacent_months(year, month)
+    return {
+        'prev': {'year': prev_month[0], 'month': prev_month[1]} if prev_month else None,
+        'next': {'year': next_month[0], 'month': next_month[1]} if next_month else None,
+    }
 
 
 def get_all_snapshot_dates() -> List[str]:
@@ -426,21 +316,7 @@ def get_all_snapshot_dates() -> List[str]:
     Returns:
         List of date strings in YYYY-MM-DD format
     """
-    sql = """
-    SELECT date FROM intel_indices_daily
-    WHERE index_id = %s
-    ORDER BY date DESC
-    """
-    
-    dates = []
-    with get_production_cursor() as cursor:
-        cursor.execute(sql, (INDEX_ID,))
-        rows = cursor.fetchall()
-        for row in rows:
-            d = row['date']
-            dates.append(d.isoformat() if hasattr(d, 'isoformat') else str(d))
-    
-    return dates
+    return [d.isoformat() for d in get_history_index(INDEX_ID).dates_desc()]
 
 
 def get_weekly_snapshot() -> Optional[Dict[str, Any]]:
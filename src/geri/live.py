@@ -27,6 +27,7 @@ from datetime import date, datetime, timedelta, timezone
 from typing import Optional, Dict, Any, List
 
 from src.db.db import get_cursor, execute_query, execute_one
+from src.db.async_db import run_db
 from src.geri.types import (
     AlertRecord,
     VALID_ALERT_TYPES,
@@ -687,7 +688,9 @@ _value_raw_available = None
 def _check_value_raw() -> bool:
     global _value_raw_available
     if _value_raw_available is None:
-        _value_raw_available = _has_value_raw_column()
+        from src.db.migration_ledger import schema_confirmed
+        # A confirmed ledger includes run_geri_live_migration, which adds value_raw.
+        _value_raw_available = schema_confirmed() or _has_value_raw_column()
     return _value_raw_available
 
 
@@ -975,7 +978,7 @@ async def periodic_geri_live_recompute():
     while True:
         await asyncio.sleep(PERIODIC_RECOMPUTE_INTERVAL)
         try:
-            result = compute_live_geri(force=True)
+            result = await run_db(compute_live_geri, force=True)
             if result:
                 logger.info(
                     "GERI Live periodic recompute: value=%s (raw=%.2f), band=%s, alerts=%d",
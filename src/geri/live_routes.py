@@ -14,9 +14,11 @@ import logging
 import time
 from typing import Optional
 
-from fastapi import APIRouter, Header, Query, HTTPException
+from fastapi import APIRouter, Depends, Header, Query, HTTPException
 from fastapi.responses import StreamingResponse, JSONResponse
 
+from src.db.async_db import AsyncDB, get_async_db, run_db
+
 from src.geri.live import (
     compute_live_geri,
     get_latest_live_geri,
@@ -33,16 +35,16 @@ router = APIRouter(prefix="/api/v1/indices/geri/live", tags=["GERI Live"])
 def _get_user_plan(token: str) -> dict:
     try:
         from src.api.user_routes import verify_user_session
+        from src.billing.entitlements import get_active_session
         session = verify_user_session(token)
         if not session:
             raise HTTPException(status_code=401, detail="Invalid session")
-        user_id = session.get('user_id')
-        from src.db.db import execute_one
-        row = execute_one(
-            "SELECT plan FROM user_plans WHERE user_id = %s", (user_id,)
-        )
-        plan = row['plan'] if row else 'free'
-        return {'user_id': user_id, 'plan': plan}
+        # verify_user_session just loaded (or reused) the cached session,
+        # which carries the plan and standalone subscriptions.
+        cached = get_active_session(token)
+        if not cached:
+            raise HTTPException(status_code=401, detail="Invalid session")
+        return {'user_id': cached.user_id, 'plan': cached.plan, 'features': cached.features}
     except HTTPException:
         raise
     except Exception as e:
@@ -56,12 +58,8 @@ def _require_geri_live_access(token: str) -> dict:
     info = _get_user_plan(token)
     if info.get('plan') in ('pro', 'enterprise'):
         return info
-    try:
-        from src.api.geri_live_sub_routes import user_has_geri_live
-        if user_has_geri_live(info.get('user_id')):
-            return info
-    except Exception as e:
-        logger.error(f"GERI Live entitlement check failed: {e}")
+    if 'geri_live' in info.get('features', ()):
+        return info
     raise HTTPException(status_code=402, detail="GERI Live subscription required")
 
 
@@ -70,8 +68,11 @@ async def get_live_latest(x_user_token: Optional[str] = Header(None)):
     if not x_user_token:
         raise HTTPException(status_code=401, detail="Authentication required")
 
-    _require_geri_live_access(x_user_token)
+    await run_db(_require_geri_live_access, x_user_token)
+    return JSONResponse(content=await run_db(_build_latest_payload))
 
+
+def _build_latest_payload() -> dict:
     try:
         result = compute_live_geri(force=False)
     except Exception as e:
@@ -83,7 +84,7 @@ async def get_live_latest(x_user_token: Optional[str] = Header(None)):
     if not latest:
         from src.geri.live import _get_anchor_value
         anchor = _get_anchor_value()
-        return JSONResponse(content={
+        return {
             'success': True,
             'data': {
                 'value': anchor['value'],
@@ -100,7 +101,7 @@ async def get_live_latest(x_user_token: Optional[str] = Header(None)):
                 'anchor_value': anchor['value'],
                 'anchor_source': anchor['source'],
             }
-        })
+        }
 
     from src.geri.live import _get_previous_close, _compute_velocity, _compute_band_proximity, _compute_peak_low
     yesterday_val = _get_previous_close()
@@ -109,7 +110,7 @@ async def get_live_latest(x_user_token: Optional[str] = Header(None)):
     band_proximity = latest.get('band_proximity') or _compute_band_proximity(value)
     peak_low = latest.get('peak_low') or _compute_peak_low(timeline, value)
 
-    return JSONResponse(content={
+    return {
         'success': True,
         'data': {
             'value': value,
@@ -132,7 +133,7 @@ async def get_live_latest(x_user_token: Optional[str] = Header(None)):
             'band_proximity': band_proximity,
             'peak_low': peak_low,
         }
-    })
+    }
 
 
 @router.get("/trader-intel")
@@ -140,8 +141,11 @@ async def get_trader_intel(x_user_token: Optional[str] = Header(None)):
     if not x_user_token:
         raise HTTPException(status_code=401, detail="Authentication required")
 
-    _require_geri_live_access(x_user_token)
+    await run_db(_require_geri_live_access, x_user_token)
+    return JSONResponse(content={'success': True, 'data': await run_db(_build_trader_intel)})
 
+
+def _build_trader_intel() -> dict:
     latest = get_latest_live_geri()
     value = latest['value'] if latest else 0
     band = latest['band'] if latest else 'LOW'
@@ -153,12 +157,11 @@ async def get_trader_intel(x_user_token: Optional[str] = Header(None)):
     band_proximity = _compute_band_proximity(value) if latest else None
 
     from src.geri.live_trader_intel import get_full_trader_intelligence
-    data = get_full_trader_intelligence(
+    return get_full_trader_intelligence(
         geri_value=value, geri_band=band,
         velocity=velocity, band_proximity=band_proximity,
         top_drivers=top_drivers,
     )
-    return JSONResponse(content={'success': True, 'data': data})
 
 
 @router.get("/timeline")
@@ -166,89 +169,85 @@ async def get_timeline(x_user_token: Optional[str] = Header(None)):
     if not x_user_token:
         raise HTTPException(status_code=401, detail="Authentication required")
 
-    _require_geri_live_access(x_user_token)
+    await run_db(_require_geri_live_access, x_user_token)
 
     return JSONResponse(content={
         'success': True,
-        'data': get_live_geri_timeline()
+        'data': await run_db(get_live_geri_timeline)
     })
 
 
-@router.get("/energy-prices")
-async def get_energy_prices(x_user_token: Optional[str] = Header(None)):
-    if not x_user_token:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
-    _require_geri_live_access(x_user_token)
+INTRADAY_PRICE_TABLES = {
+    'brent': 'intraday_brent',
+    'wti': 'intraday_wti',
+    'natgas': 'intraday_natgas',
+}
 
-    from datetime import date as _date, timedelta
-    from src.db.db import execute_query
 
-    today = _date.today()
-    brent_rows = execute_query(
-        "SELECT hour, price, change_pct, captured_at FROM intraday_brent WHERE date = %s ORDER BY hour ASC",
-        (today,)
-    ) or []
-    brent = []
-    for r in brent_rows:
+def _intraday_points(rows) -> list:
+    points = []
+    for r in rows or []:
         ca = r['captured_at']
         if hasattr(ca, 'isoformat'):
             ca = ca.isoformat()
-        brent.append({
+        points.append({
             'hour': r['hour'],
             'price': float(r['price']),
             'change_pct': float(r['change_pct']) if r.get('change_pct') is not None else None,
             'time': ca,
         })
+    return points
 
-    wti_rows = execute_query(
-        "SELECT hour, price, change_pct, captured_at FROM intraday_wti WHERE date = %s ORDER BY hour ASC",
-        (today,)
-    ) or []
-    wti = []
-    for r in wti_rows:
-        ca = r['captured_at']
-        if hasattr(ca, 'isoformat'):
-            ca = ca.isoformat()
-        wti.append({
-            'hour': r['hour'],
-            'price': float(r['price']),
-            'change_pct': float(r['change_pct']) if r.get('change_pct') is not None else None,
-            'time': ca,
-        })
 
-    natgas_rows = execute_query(
-        "SELECT hour, price, change_pct, captured_at FROM intraday_natgas WHERE date = %s ORDER BY hour ASC",
-        (today,)
-    ) or []
-    natgas = []
-    for r in natgas_rows:
-        ca = r['captured_at']
-        if hasattr(ca, 'isoformat'):
-            ca = ca.isoformat()
-        natgas.append({
-            'hour': r['hour'],
-            'price': float(r['price']),
-            'change_pct': float(r['change_pct']) if r.get('change_pct') is not None else None,
-            'time': ca,
-        })
+@router.get("/energy-prices")
+async def get_energy_prices(
+    x_user_token: Optional[str] = Header(None),
+    db: AsyncDB = Depends(get_async_db),
+):
+    if not x_user_token:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    await run_db(_require_geri_live_access, x_user_token)
+
+    from datetime import date as _date
+
+    today = _date.today()
+    prices = {}
+    for key, table in INTRADAY_PRICE_TABLES.items():
+        rows = await db.fetch_all(
+            f"SELECT hour, price, change_pct, captured_at FROM {table} WHERE date = %s ORDER BY hour ASC",
+            (today,)
+        )
+        prices[key] = _intraday_points(rows)
 
     return JSONResponse(content={
         'success': True,
         'data': {
-            'brent': {'label': 'Brent Crude', 'unit': 'USD/barrel', 'prices': brent},
-            'wti': {'label': 'WTI Crude', 'unit': 'USD/barrel', 'prices': wti},
-            'natgas': {'label': 'Natural Gas (US)', 'unit': 'USD/MMBtu', 'prices': natgas},
+            'brent': {'label': 'Brent Crude', 'unit': 'USD/barrel', 'prices': prices['brent']},
+            'wti': {'label': 'WTI Crude', 'unit': 'USD/barrel', 'prices': prices['wti']},
+            'natgas': {'label': 'Natural Gas (US)', 'unit': 'USD/MMBtu', 'prices': prices['natgas']},
         }
     })
 
 
+def _initial_stream_payload() -> Optional[dict]:
+    latest = get_latest_live_geri()
+    if latest:
+        from src.geri.live import _get_yesterday_geri_value, _compute_velocity, _compute_band_proximity, _compute_peak_low
+        latest['yesterday_value'] = _get_yesterday_geri_value()
+        tl = get_live_geri_timeline()
+        latest['velocity'] = latest.get('velocity') or _compute_velocity(tl, latest['value'])
+        latest['band_proximity'] = latest.get('band_proximity') or _compute_band_proximity(latest['value'])
+        latest['peak_low'] = latest.get('peak_low') or _compute_peak_low(tl, latest['value'])
+    return latest
+
+
 @router.get("/stream")
 async def live_stream(token: Optional[str] = Query(None)):
     if not token:
         raise HTTPException(status_code=401, detail="Authentication required (pass token as query param)")
 
-    _require_geri_live_access(token)
+    await run_db(_require_geri_live_access, token)
 
     queue: asyncio.Queue = asyncio.Queue(maxsize=50)
     await register_live_client(queue)
@@ -256,14 +255,8 @@ async def live_stream(token: Optional[str] = Query(None)):
     async def event_generator():
         try:
             try:
-                latest = get_latest_live_geri()
+                latest = await run_db(_initial_stream_payload)
                 if latest:
-                    from src.geri.live import _get_yesterday_geri_value, _compute_velocity, _compute_band_proximity, _compute_peak_low
-                    latest['yesterday_value'] = _get_yesterday_geri_value()
-                    tl = get_live_geri_timeline()
-                    latest['velocity'] = latest.get('velocity') or _compute_velocity(tl, latest['value'])
-                    latest['band_proximity'] = latest.get('band_proximity') or _compute_band_proximity(latest['value'])
-                    latest['peak_low'] = latest.get('peak_low') or _compute_peak_low(tl, latest['value'])
                     yield f"data: {json.dumps({'type': 'initial', **latest})}\n\n"
             except Exception as e:
                 logger.error(f"GERI Live SSE initial data error: {e}")
@@ -299,7 +292,7 @@ async def trigger_compute(x_admin_token: Optional[str] = Header(None)):
     from src.api.admin_routes import verify_admin_token
     verify_admin_token(x_admin_token)
     try:
-        result = compute_live_geri(force=False)
+        result = await run_db(compute_live_geri, force=False)
         if result:
             broadcast_data = {
                 'value': result['value'],
@@ -10,12 +10,12 @@ Five professional intelligence features for energy commodity traders:
 """
 
 import logging
-import math
 from datetime import date, datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional
 from decimal import Decimal
 
 from src.db.db import execute_query, execute_one
+from src.market.stats import pearson
 
 logger = logging.getLogger(__name__)
 
@@ -47,18 +47,6 @@ def _sf(val, default=None):
         return default
 
 
-def _pearson(xs, ys):
-    n = len(xs)
-    if n < 3:
-        return None
-    mx = sum(xs) / n
-    my = sum(ys) / n
-    num = sum((xs[i] - mx) * (ys[i] - my) for i in range(n))
-    dx = math.sqrt(sum((x - mx) ** 2 for x in xs)) or 1e-9
-    dy = math.sqrt(sum((y - my) ** 2 for y in ys)) or 1e-9
-    return num / (dx * dy)
-
-
 def get_price_risk_correlation() -> Dict[str, Any]:
     oil_rows = execute_query(
         "SELECT date, brent_price, wti_price FROM oil_price_snapshots ORDER BY date DESC LIMIT 14"
@@ -180,7 +168,7 @@ def _compute_7d_correlation(oil_rows, geri_daily):
     if len(common) < 5:
         return None
     common = common[-7:]
-    corr = _pearson([oil_by_date[d] for d in common], [geri_by_date[d] for d in common])
+    corr = pearson([oil_by_date[d] for d in common], [geri_by_date[d] for d in common])
     if corr is None:
         return None
     strength = 'Strong' if abs(corr) > 0.7 else 'Moderate' if abs(corr) > 0.4 else 'Weak'
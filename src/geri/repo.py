@@ -9,6 +9,8 @@ import json
 from datetime import date, datetime, timedelta
 from typing import List, Optional, Dict, Any
 
+from psycopg2.extras import execute_values
+
 from src.db.db import get_cursor, execute_one, get_production_cursor, execute_production_one
 from src.geri.types import (
     AlertRecord,
@@ -21,20 +23,55 @@ from src.geri.types import (
     VALID_ALERT_TYPES,
     HistoricalBaseline,
 )
+from src.seo.history_index import invalidate_history_index
 
 logger = logging.getLogger(__name__)
 
 
-def get_alerts_for_date(target_date: date) -> List[AlertRecord]:
+def _row_to_alert(row: Dict[str, Any]) -> AlertRecord:
     """
-    Read alerts from alert_events for a specific UTC day.
-    INPUT ONLY - does not modify alert_events.
+    Build an AlertRecord from an alert_events row.
     Extracts event category from raw_input JSON (driver_events[0].category).
     """
-    start_of_day = datetime.combine(target_date, datetime.min.time())
-    end_of_day = datetime.combine(target_date + timedelta(days=1), datetime.min.time())
+    risk_score_val = row['risk_score']
+    if risk_score_val is not None:
+        risk_score_val = float(risk_score_val)
     
-    sql = """
+    # Extract event category from raw_input JSON
+    # For HIGH_IMPACT_EVENT: raw_input.category (flat)
+    # For REGIONAL_RISK_SPIKE: raw_input.driver_events[0].category (nested)
+    event_category = None
+    raw_input = row.get('raw_input')
+    if raw_input:
+        if isinstance(raw_input, str):
+            try:
+                raw_input = json.loads(raw_input)
+            except:
+                raw_input = {}
+        # Try flat category first (HIGH_IMPACT_EVENT)
+        if raw_input.get('category'):
+            event_category = raw_input.get('category')
+        # Fall back to driver_events (REGIONAL_RISK_SPIKE)
+        elif raw_input.get('driver_events'):
+            driver_events = raw_input.get('driver_events', [])
+            if driver_events and len(driver_events) > 0:
+                event_category = driver_events[0].get('category')
+    
+    return AlertRecord(
+        id=row['id'],
+        alert_type=row['alert_type'],
+        severity=row['severity'],
+        risk_score=risk_score_val,
+        region=row['region'],
+        weight=float(row['weight']) if row['weight'] else 1.0,
+        created_at=row['created_at'],
+        headline=row['headline'],
+        body=row.get('body'),
+        category=event_category,
+    )
+
+
+ALERTS_SQL = """
     SELECT 
         id,
         alert_type,
@@ -51,55 +88,53 @@ def get_alerts_for_date(target_date: date) -> List[AlertRecord]:
       AND created_at >= %s
       AND created_at < %s
     ORDER BY created_at
+"""
+
+
+def get_alerts_for_date(target_date: date) -> List[AlertRecord]:
+    """
+    Read alerts from alert_events for a specific UTC day.
+    INPUT ONLY - does not modify alert_events.
     """
+    start_of_day = datetime.combine(target_date, datetime.min.time())
+    end_of_day = datetime.combine(target_date + timedelta(days=1), datetime.min.time())
     
     alerts = []
     with get_cursor() as cursor:
-        cursor.execute(sql, (VALID_ALERT_TYPES, start_of_day, end_of_day))
+        cursor.execute(ALERTS_SQL, (VALID_ALERT_TYPES, start_of_day, end_of_day))
         rows = cursor.fetchall()
         
         for row in rows:
-            risk_score_val = row['risk_score']
-            if risk_score_val is not None:
-                risk_score_val = float(risk_score_val)
-            
-            # Extract event category from raw_input JSON
-            # For HIGH_IMPACT_EVENT: raw_input.category (flat)
-            # For REGIONAL_RISK_SPIKE: raw_input.driver_events[0].category (nested)
-            event_category = None
-            raw_input = row.get('raw_input')
-            if raw_input:
-                if isinstance(raw_input, str):
-                    try:
-                        raw_input = json.loads(raw_input)
-                    except:
-                        raw_input = {}
-                # Try flat category first (HIGH_IMPACT_EVENT)
-                if raw_input.get('category'):
-                    event_category = raw_input.get('category')
-                # Fall back to driver_events (REGIONAL_RISK_SPIKE)
-                elif raw_input.get('driver_events'):
-                    driver_events = raw_input.get('driver_events', [])
-                    if driver_events and len(driver_events) > 0:
-                        event_category = driver_events[0].get('category')
-            
-            alerts.append(AlertRecord(
-                id=row['id'],
-                alert_type=row['alert_type'],
-                severity=row['severity'],
-                risk_score=risk_score_val,
-                region=row['region'],
-                weight=float(row['weight']) if row['weight'] else 1.0,
-                created_at=row['created_at'],
-                headline=row['headline'],
-                body=row.get('body'),
-                category=event_category,
-            ))
+            alerts.append(_row_to_alert(row))
     
     logger.info(f"Retrieved {len(alerts)} alerts for date {target_date}")
     return alerts
 
 
+def get_alerts_for_range(from_date: date, to_date: date) -> Dict[date, List[AlertRecord]]:
+    """
+    Read alerts for every UTC day in [from_date, to_date] with a single query.
+    Returns alerts grouped by day, each list in created_at order (same as
+    get_alerts_for_date). INPUT ONLY - does not modify alert_events.
+    """
+    start = datetime.combine(from_date, datetime.min.time())
+    end = datetime.combine(to_date + timedelta(days=1), datetime.min.time())
+    
+    alerts_by_date: Dict[date, List[AlertRecord]] = {}
+    total = 0
+    with get_cursor() as cursor:
+        cursor.execute(ALERTS_SQL, (VALID_ALERT_TYPES, start, end))
+        rows = cursor.fetchall()
+        
+        for row in rows:
+            alert = _row_to_alert(row)
+            alerts_by_date.setdefault(alert.created_at.date(), []).append(alert)
+            total += 1
+    
+    logger.info(f"Retrieved {total} alerts for {from_date} to {to_date}")
+    return alerts_by_date
+
+
 def _recalc_band(row_dict: Dict[str, Any]) -> Dict[str, Any]:
     """Recalculate band from value to prevent stale label mismatches."""
     if row_dict and row_dict.get('value') is not None:
@@ -217,6 +252,43 @@ def get_previous_values(target_date: date, days: int = 7) -> List[int]:
     return values
 
 
+def baseline_scores(components: Any) -> tuple:
+    """
+    Extract the four raw scores used for baseline normalization from a stored
+    components payload (JSON string or dict).
+    
+    Returns:
+        (high_impact_score, regional_spike_score, asset_risk_score,
+         region_concentration_score_raw)
+    """
+    if isinstance(components, str):
+        components = json.loads(components)
+    
+    return (
+        components.get('high_impact_score', 0),
+        components.get('regional_spike_score', 0),
+        components.get('asset_risk_score', 0),
+        components.get('region_concentration_score_raw', 0),
+    )
+
+
+def get_index_rows_for_range(from_date: date, to_date: date) -> List[Dict[str, Any]]:
+    """
+    Get stored date/value/components for a date range (ascending) in one query.
+    Used by the bulk backfill engine to seed its rolling windows.
+    """
+    sql = """
+    SELECT date, value, components
+    FROM intel_indices_daily
+    WHERE index_id = %s AND date >= %s AND date <= %s
+    ORDER BY date ASC
+    """
+    
+    with get_cursor() as cursor:
+        cursor.execute(sql, (INDEX_ID, from_date, to_date))
+        return [dict(row) for row in cursor.fetchall()]
+
+
 def get_historical_baseline(target_date: date, lookback_days: int = 90) -> HistoricalBaseline:
     """
     Get rolling baseline stats from past intel_indices_daily rows.
@@ -243,14 +315,11 @@ def get_historical_baseline(target_date: date, lookback_days: int = 90) -> Histo
         rows = cursor.fetchall()
         
         for row in rows:
-            components = row['components']
-            if isinstance(components, str):
-                components = json.loads(components)
-            
-            high_impact_scores.append(components.get('high_impact_score', 0))
-            regional_spike_scores.append(components.get('regional_spike_score', 0))
-            asset_risk_scores.append(components.get('asset_risk_score', 0))
-            region_concentration_scores.append(components.get('region_concentration_score_raw', 0))
+            hi, rs, ar, rc = baseline_scores(row['components'])
+            high_impact_scores.append(hi)
+            regional_spike_scores.append(rs)
+            asset_risk_scores.append(ar)
+            region_concentration_scores.append(rc)
     
     baseline.days_count = len(high_impact_scores)
     
@@ -314,13 +383,80 @@ def save_index(result: GERIResult, force: bool = False) -> bool:
             result.model_version,
         ))
         row = cursor.fetchone()
-        
-        if row:
-            logger.info(f"Saved GERI index for {result.index_date}: value={result.value}, band={result.band.value}")
-            return True
-        else:
-            logger.info(f"GERI index for {result.index_date} already exists (skipped)")
-            return False
+    
+    if row:
+        invalidate_history_index(INDEX_ID)
+        logger.info(f"Saved GERI index for {result.index_date}: value={result.value}, band={result.band.value}")
+        return True
+    logger.info(f"GERI index for {result.index_date} already exists (skipped)")
+    return False
+
+
+def save_indices_batch(results: List[GERIResult], force: bool = False) -> int:
+    """
+    Save many GERI results to intel_indices_daily in one statement.
+    Same conflict semantics as save_index. OUTPUT ONLY.
+    
+    Returns:
+        Number of rows inserted or updated
+    """
+    if not results:
+        return 0
+    
+    if force:
+        sql = """
+        INSERT INTO intel_indices_daily 
+            (index_id, date, value, band, trend_1d, trend_7d, components, interpretation, model_version, computed_at)
+        VALUES %s
+        ON CONFLICT (index_id, date) 
+        DO UPDATE SET 
+            value = EXCLUDED.value,
+            band = EXCLUDED.band,
+            trend_1d = EXCLUDED.trend_1d,
+            trend_7d = EXCLUDED.trend_7d,
+            components = EXCLUDED.components,
+            interpretation = EXCLUDED.interpretation,
+            model_version = EXCLUDED.model_version,
+            computed_at = NOW()
+        RETURNING id
+        """
+    else:
+        sql = """
+        INSERT INTO intel_indices_daily 
+            (index_id, date, value, band, trend_1d, trend_7d, components, interpretation, model_version, computed_at)
+        VALUES %s
+        ON CONFLICT (index_id, date) DO NOTHING
+        RETURNING id
+        """
+    
+    values = [
+        (
+            result.index_id,
+            result.index_date,
+            result.value,
+            result.band.value,
+            result.trend_1d,
+            result.trend_7d,
+            json.dumps(result.components.to_dict()),
+            getattr(result.components, 'interpretation', None) or '',
+            result.model_version,
+        )
+        for result in results
+    ]
+    
+    with get_cursor() as cursor:
+        rows = execute_values(
+            cursor, sql, values,
+            template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())",
+            page_size=len(values),
+            fetch=True,
+        )
+    
+    if rows:
+        invalidate_history_index(INDEX_ID)
+    logger.info(f"Saved {len(rows)}/{len(results)} GERI indices "
+                f"({results[0].index_date} to {results[-1].index_date})")
+    return len(rows)
 
 
 def get_date_range_with_alerts() -> tuple:
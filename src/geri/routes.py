@@ -3,15 +3,13 @@ GERI v1 API Routes
 
 Mounted under /api/v1/indices
 """
-import csv
-import io
 import logging
 from datetime import date, datetime, timedelta
 from typing import Optional
 from fastapi import APIRouter, Header, HTTPException, Query
-from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from src.api.exports import EXPORT_MAX_ROWS, csv_stream, export_response_async, xlsx_stream
 from src.geri import ENABLE_GERI
 from src.geri.repo import get_latest_index, get_index_history, get_index_for_date, get_delayed_index
 from src.geri.service import compute_geri_for_date, compute_yesterday, backfill, auto_backfill
@@ -449,24 +447,20 @@ async def get_geri_market_overlays(
     """
     check_enabled()
     
-    from src.db.db import get_production_cursor
+    from src.db.async_db import run_db
+    from src.market.series_store import get_series_store
+    store = get_series_store()
     
-    with get_production_cursor() as cur:
-        cur.execute("""
-            SELECT MIN(date) as first_date, MAX(date) as last_date
-            FROM intel_indices_daily
-        """)
-        geri_range = cur.fetchone()
-        
-        if not geri_range or not geri_range['first_date']:
-            return {
-                'success': False,
-                'message': 'No GERI data available',
-                'overlays': {}
-            }
-        
-        geri_first = geri_range['first_date']
-        geri_last = geri_range['last_date']
+    geri = await run_db(store.series, 'geri')
+    if not len(geri):
+        return {
+            'success': False,
+            'message': 'No GERI data available',
+            'overlays': {}
+        }
+    
+    geri_first = geri.dates[0].astype(date)
+    geri_last = geri.dates[-1].astype(date)
     
     try:
         if from_date:
@@ -486,88 +480,22 @@ async def get_geri_market_overlays(
             detail="Invalid date format. Use YYYY-MM-DD."
         )
     
-    with get_production_cursor() as cur:
-        cur.execute("""
-            SELECT date, brent_price, wti_price
-            FROM oil_price_snapshots
-            WHERE date >= %s AND date <= %s
-            ORDER BY date ASC
-        """, (start, end))
-        oil_rows = cur.fetchall()
-        
-        cur.execute("""
-            SELECT date, eu_storage_percent, risk_score
-            FROM gas_storage_snapshots
-            WHERE date >= %s AND date <= %s
-            ORDER BY date ASC
-        """, (start, end))
-        gas_rows = cur.fetchall()
-        
-        cur.execute("""
-            SELECT date, vix_close
-            FROM vix_snapshots
-            WHERE date >= %s AND date <= %s
-            ORDER BY date ASC
-        """, (start, end))
-        vix_rows = cur.fetchall()
-        
-        cur.execute("""
-            SELECT date, ttf_price
-            FROM ttf_gas_snapshots
-            WHERE date >= %s AND date <= %s
-            ORDER BY date ASC
-        """, (start, end))
-        ttf_rows = cur.fetchall()
-        
-        cur.execute("""
-            SELECT date, rate
-            FROM eurusd_snapshots
-            WHERE date >= %s AND date <= %s
-            ORDER BY date ASC
-        """, (start, end))
-        eurusd_rows = cur.fetchall()
-    
-    brent_data = []
-    for row in oil_rows:
-        row_date = row['date']
-        brent_data.append({
-            'date': row_date.isoformat() if isinstance(row_date, date) else row_date,
-            'value': float(row['brent_price']) if row['brent_price'] else None,
-            'wti': float(row['wti_price']) if row['wti_price'] else None
-        })
-    
-    gas_storage_data = []
-    for row in gas_rows:
-        row_date = row['date']
-        gas_storage_data.append({
-            'date': row_date.isoformat() if isinstance(row_date, date) else row_date,
-            'value': float(row['eu_storage_percent']) if row['eu_storage_percent'] else None,
-            'risk_score': int(row['risk_score']) if row['risk_score'] else None
-        })
-    
-    vix_data = []
-    for row in vix_rows:
-        row_date = row['date']
-        vix_data.append({
-            'date': row_date.isoformat() if isinstance(row_date, date) else row_date,
-            'value': float(row['vix_close']) if row['vix_close'] else None
-        })
-    
-    ttf_data = []
-    for row in ttf_rows:
-        row_date = row['date']
-        ttf_data.append({
-            'date': row_date.isoformat() if isinstance(row_date, date) else row_date,
-            'value': float(row['ttf_price']) if row['ttf_price'] else None
-        })
-    
-    eurusd_data = []
-    for row in eurusd_rows:
-        row_date = row['date']
-        eurusd_data.append({
-            'date': row_date.isoformat() if isinstance(row_date, date) else row_date,
-            'value': float(row['rate']) if row['rate'] else None
-        })
+    oil = await run_db(store.align, ['brent', 'wti'], start, end, how='outer')
+    brent_data = [
+        {'date': d, 'value': b, 'wti': w}
+        for d, b, w in zip(oil.iso_dates(), oil.values_or_none('brent'), oil.values_or_none('wti'))
+    ]
+
+    storage = await run_db(store.align, ['gas_storage', 'gas_storage_risk'], start, end, how='outer')
+    gas_storage_data = [
+        {'date': d, 'value': v, 'risk_score': int(r) if r is not None else None}
+        for d, v, r in zip(storage.iso_dates(), storage.values_or_none('gas_storage'),
+                           storage.values_or_none('gas_storage_risk'))
+    ]
+
+    vix_data = (await run_db(store.series, 'vix', start, end)).to_rows(date_format='iso')
+    ttf_data = (await run_db(store.series, 'ttf', start, end)).to_rows(date_format='iso')
+    eurusd_data = (await run_db(store.series, 'eurusd', start, end)).to_rows(date_format='iso')
     
     available = ['brent', 'gas_storage']
     if vix_data:
@@ -698,107 +626,19 @@ async def eeri_history_table(
 @router.get("/eeri/history-table/download/csv")
 async def eeri_history_download_csv(
     x_user_token: Optional[str] = Header(None),
-    limit: int = Query(default=1000, ge=1, le=1000),
+    limit: int = Query(default=1000, ge=1, le=EXPORT_MAX_ROWS),
 ):
     """Download full EERI history as CSV."""
-    check_enabled()
-    try:
-        from src.api.user_routes import verify_user_session
-        verify_user_session(x_user_token)
-    except HTTPException:
-        raise
-    except Exception:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
-    rows = _fetch_eeri_history_rows(limit)
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['Date', 'Value', 'Band', 'Trend 1D', 'Trend 7D', 'Computed At'])
-    for r in rows:
-        writer.writerow([
-            _fmt_date(r['date']),
-            _fmt_num(r['value']),
-            r['band'] or '',
-            _fmt_num(r['trend_1d']),
-            _fmt_num(r['trend_7d']),
-            _fmt_date(r['computed_at']),
-        ])
-    output.seek(0)
-    today = date.today().isoformat()
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type='text/csv',
-        headers={'Content-Disposition': f'attachment; filename="EERI_History_{today}.csv"'},
-    )
+    return await _history_download(x_user_token, _EERI_HISTORY_QUERY, 'date', 'value', limit, 'csv', 'EERI History', 'EERI_History')
 
 
 @router.get("/eeri/history-table/download/xlsx")
 async def eeri_history_download_xlsx(
     x_user_token: Optional[str] = Header(None),
-    limit: int = Query(default=1000, ge=1, le=1000),
+    limit: int = Query(default=1000, ge=1, le=EXPORT_MAX_ROWS),
 ):
     """Download full EERI history as Excel (.xlsx)."""
-    check_enabled()
-    try:
-        from src.api.user_routes import verify_user_session
-        verify_user_session(x_user_token)
-    except HTTPException:
-        raise
-    except Exception:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
-    import openpyxl
-    from openpyxl.styles import Font, PatternFill, Alignment
-    from openpyxl.utils import get_column_letter
-
-    rows = _fetch_eeri_history_rows(limit)
-
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = 'EERI History'
-
-    headers = ['Date', 'Value', 'Band', 'Trend 1D', 'Trend 7D', 'Computed At']
-    header_fill = PatternFill(start_color='1E293B', end_color='1E293B', fill_type='solid')
-    header_font = Font(bold=True, color='F1F5F9')
-
-    for col_idx, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center')
-
-    band_colors = {
-        'LOW': 'D1FAE5',
-        'MODERATE': 'FEF9C3',
-        'ELEVATED': 'FED7AA',
-        'HIGH': 'FECACA',
-        'CRITICAL': 'F3D5FF',
-    }
-
-    for row_idx, r in enumerate(rows, 2):
-        band = r['band'] or ''
-        ws.cell(row=row_idx, column=1, value=_fmt_date(r['date']))
-        ws.cell(row=row_idx, column=2, value=float(r['value']) if r['value'] is not None else None)
-        bc = ws.cell(row=row_idx, column=3, value=band)
-        if band.upper() in band_colors:
-            bc.fill = PatternFill(start_color=band_colors[band.upper()], end_color=band_colors[band.upper()], fill_type='solid')
-        ws.cell(row=row_idx, column=4, value=float(r['trend_1d']) if r['trend_1d'] is not None else None)
-        ws.cell(row=row_idx, column=5, value=float(r['trend_7d']) if r['trend_7d'] is not None else None)
-        ws.cell(row=row_idx, column=6, value=_fmt_date(r['computed_at']))
-
-    col_widths = [14, 10, 12, 12, 12, 28]
-    for col_idx, width in enumerate(col_widths, 1):
-        ws.column_dimensions[get_column_letter(col_idx)].width = width
-
-    buf = io.BytesIO()
-    wb.save(buf)
-    buf.seek(0)
-    today = date.today().isoformat()
-    return StreamingResponse(
-        iter([buf.getvalue()]),
-        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        headers={'Content-Disposition': f'attachment; filename="EERI_History_{today}.xlsx"'},
-    )
+    return await _history_download(x_user_token, _EERI_HISTORY_QUERY, 'date', 'value', limit, 'xlsx', 'EERI History', 'EERI_History')
 
 
 # ── EGSI-M History Table (dashboard) ─────────────────────────────────────────
@@ -852,104 +692,19 @@ async def egsi_m_history_table(
 @router.get("/egsi-m/history-table/download/csv")
 async def egsi_m_history_download_csv(
     x_user_token: Optional[str] = Header(None),
-    limit: int = Query(default=1000, ge=1, le=1000),
+    limit: int = Query(default=1000, ge=1, le=EXPORT_MAX_ROWS),
 ):
     """Download full EGSI-M history as CSV."""
-    check_enabled()
-    try:
-        from src.api.user_routes import verify_user_session
-        verify_user_session(x_user_token)
-    except HTTPException:
-        raise
-    except Exception:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
-    rows = _fetch_egsi_m_history_rows(limit)
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['Date', 'Value', 'Band', 'Trend 1D', 'Trend 7D', 'Computed At'])
-    for r in rows:
-        writer.writerow([
-            _fmt_date(r['index_date']),
-            _fmt_num(r['index_value']),
-            r['band'] or '',
-            _fmt_num(r['trend_1d']),
-            _fmt_num(r['trend_7d']),
-            _fmt_date(r['computed_at']),
-        ])
-    output.seek(0)
-    today = date.today().isoformat()
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type='text/csv',
-        headers={'Content-Disposition': f'attachment; filename="EGSI_M_History_{today}.csv"'},
-    )
+    return await _history_download(x_user_token, _EGSI_M_HISTORY_QUERY, 'index_date', 'index_value', limit, 'csv', 'EGSI-M History', 'EGSI_M_History')
 
 
 @router.get("/egsi-m/history-table/download/xlsx")
 async def egsi_m_history_download_xlsx(
     x_user_token: Optional[str] = Header(None),
-    limit: int = Query(default=1000, ge=1, le=1000),
+    limit: int = Query(default=1000, ge=1, le=EXPORT_MAX_ROWS),
 ):
     """Download full EGSI-M history as Excel (.xlsx)."""
-    check_enabled()
-    try:
-        from src.api.user_routes import verify_user_session
-        verify_user_session(x_user_token)
-    except HTTPException:
-        raise
-    except Exception:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
-    import openpyxl
-    from openpyxl.styles import Font, PatternFill, Alignment
-    from openpyxl.utils import get_column_letter
-
-    rows = _fetch_egsi_m_history_rows(limit)
-
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = 'EGSI-M History'
-
-    headers = ['Date', 'Value', 'Band', 'Trend 1D', 'Trend 7D', 'Computed At']
-    header_fill = PatternFill(start_color='1E293B', end_color='1E293B', fill_type='solid')
-    header_font = Font(bold=True, color='F1F5F9')
-
-    for col_idx, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center')
-
-    band_colors = {
-        'LOW': 'D1FAE5', 'MODERATE': 'FEF9C3', 'ELEVATED': 'FED7AA',
-        'HIGH': 'FECACA', 'CRITICAL': 'F3D5FF',
-    }
-
-    for row_idx, r in enumerate(rows, 2):
-        band = r['band'] or ''
-        ws.cell(row=row_idx, column=1, value=_fmt_date(r['index_date']))
-        ws.cell(row=row_idx, column=2, value=float(r['index_value']) if r['index_value'] is not None else None)
-        bc = ws.cell(row=row_idx, column=3, value=band)
-        if band.upper() in band_colors:
-            bc.fill = PatternFill(start_color=band_colors[band.upper()], end_color=band_colors[band.upper()], fill_type='solid')
-        ws.cell(row=row_idx, column=4, value=float(r['trend_1d']) if r['trend_1d'] is not None else None)
-        ws.cell(row=row_idx, column=5, value=float(r['trend_7d']) if r['trend_7d'] is not None else None)
-        ws.cell(row=row_idx, column=6, value=_fmt_date(r['computed_at']))
-
-    col_widths = [14, 10, 12, 12, 12, 28]
-    for col_idx, width in enumerate(col_widths, 1):
-        ws.column_dimensions[get_column_letter(col_idx)].width = width
-
-    buf = io.BytesIO()
-    wb.save(buf)
-    buf.seek(0)
-    today = date.today().isoformat()
-    return StreamingResponse(
-        iter([buf.getvalue()]),
-        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        headers={'Content-Disposition': f'attachment; filename="EGSI_M_History_{today}.xlsx"'},
-    )
+    return await _history_download(x_user_token, _EGSI_M_HISTORY_QUERY, 'index_date', 'index_value', limit, 'xlsx', 'EGSI-M History', 'EGSI_M_History')
 
 
 # ── EGSI-S History Table (dashboard) ─────────────────────────────────────────
@@ -1003,104 +758,19 @@ async def egsi_s_history_table(
 @router.get("/egsi-s/history-table/download/csv")
 async def egsi_s_history_download_csv(
     x_user_token: Optional[str] = Header(None),
-    limit: int = Query(default=1000, ge=1, le=1000),
+    limit: int = Query(default=1000, ge=1, le=EXPORT_MAX_ROWS),
 ):
     """Download full EGSI-S history as CSV."""
-    check_enabled()
-    try:
-        from src.api.user_routes import verify_user_session
-        verify_user_session(x_user_token)
-    except HTTPException:
-        raise
-    except Exception:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
-    rows = _fetch_egsi_s_history_rows(limit)
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['Date', 'Value', 'Band', 'Trend 1D', 'Trend 7D', 'Computed At'])
-    for r in rows:
-        writer.writerow([
-            _fmt_date(r['index_date']),
-            _fmt_num(r['index_value']),
-            r['band'] or '',
-            _fmt_num(r['trend_1d']),
-            _fmt_num(r['trend_7d']),
-            _fmt_date(r['computed_at']),
-        ])
-    output.seek(0)
-    today = date.today().isoformat()
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type='text/csv',
-        headers={'Content-Disposition': f'attachment; filename="EGSI_S_History_{today}.csv"'},
-    )
+    return await _history_download(x_user_token, _EGSI_S_HISTORY_QUERY, 'index_date', 'index_value', limit, 'csv', 'EGSI-S History', 'EGSI_S_History')
 
 
 @router.get("/egsi-s/history-table/download/xlsx")
 async def egsi_s_history_download_xlsx(
     x_user_token: Optional[str] = Header(None),
-    limit: int = Query(default=1000, ge=1, le=1000),
+    limit: int = Query(default=1000, ge=1, le=EXPORT_MAX_ROWS),
 ):
     """Download full EGSI-S history as Excel (.xlsx)."""
-    check_enabled()
-    try:
-        from src.api.user_routes import verify_user_session
-        verify_user_session(x_user_token)
-    except HTTPException:
-        raise
-    except Exception:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
-    import openpyxl
-    from openpyxl.styles import Font, PatternFill, Alignment
-    from openpyxl.utils import get_column_letter
-
-    rows = _fetch_egsi_s_history_rows(limit)
-
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = 'EGSI-S History'
-
-    headers = ['Date', 'Value', 'Band', 'Trend 1D', 'Trend 7D', 'Computed At']
-    header_fill = PatternFill(start_color='1E293B', end_color='1E293B', fill_type='solid')
-    header_font = Font(bold=True, color='F1F5F9')
-
-    for col_idx, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center')
-
-    band_colors = {
-        'LOW': 'D1FAE5', 'MODERATE': 'FEF9C3', 'ELEVATED': 'FED7AA',
-        'HIGH': 'FECACA', 'CRITICAL': 'F3D5FF',
-    }
-
-    for row_idx, r in enumerate(rows, 2):
-        band = r['band'] or ''
-        ws.cell(row=row_idx, column=1, value=_fmt_date(r['index_date']))
-        ws.cell(row=row_idx, column=2, value=float(r['index_value']) if r['index_value'] is not None else None)
-        bc = ws.cell(row=row_idx, column=3, value=band)
-        if band.upper() in band_colors:
-            bc.fill = PatternFill(start_color=band_colors[band.upper()], end_color=band_colors[band.upper()], fill_type='solid')
-        ws.cell(row=row_idx, column=4, value=float(r['trend_1d']) if r['trend_1d'] is not None else None)
-        ws.cell(row=row_idx, column=5, value=float(r['trend_7d']) if r['trend_7d'] is not None else None)
-        ws.cell(row=row_idx, column=6, value=_fmt_date(r['computed_at']))
-
-    col_widths = [14, 10, 12, 12, 12, 28]
-    for col_idx, width in enumerate(col_widths, 1):
-        ws.column_dimensions[get_column_letter(col_idx)].width = width
-
-    buf = io.BytesIO()
-    wb.save(buf)
-    buf.seek(0)
-    today = date.today().isoformat()
-    return StreamingResponse(
-        iter([buf.getvalue()]),
-        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        headers={'Content-Disposition': f'attachment; filename="EGSI_S_History_{today}.xlsx"'},
-    )
+    return await _history_download(x_user_token, _EGSI_S_HISTORY_QUERY, 'index_date', 'index_value', limit, 'xlsx', 'EGSI-S History', 'EGSI_S_History')
 
 
 def _fmt_date(v):
@@ -1120,6 +790,63 @@ def _fmt_num(v):
         return str(v)
 
 
+def _float_or_none(v):
+    return float(v) if v is not None else None
+
+
+_HISTORY_EXPORT_HEADERS = ['Date', 'Value', 'Band', 'Trend 1D', 'Trend 7D', 'Computed At']
+_HISTORY_EXPORT_WIDTHS = [14, 10, 12, 12, 12, 28]
+_BAND_COLORS = {
+    'LOW': 'D1FAE5',
+    'MODERATE': 'FEF9C3',
+    'ELEVATED': 'FED7AA',
+    'HIGH': 'FECACA',
+    'CRITICAL': 'F3D5FF',
+}
+
+
+def _history_export_rows(query: str, date_key: str, value_key: str, limit: int, fmt: str):
+    """Export rows streamed from a server-side cursor: text cells for CSV, numbers for Excel."""
+    from src.db.db import stream_query
+    num = _fmt_num if fmt == 'csv' else _float_or_none
+    for r in stream_query(query, (limit,), production=True):
+        yield [
+            _fmt_date(r[date_key]),
+            num(r[value_key]),
+            r['band'] or '',
+            num(r['trend_1d']),
+            num(r['trend_7d']),
+            _fmt_date(r['computed_at']),
+        ]
+
+
+def _band_fill(row):
+    color = _BAND_COLORS.get(row[2].upper())
+    return {2: color} if color else None
+
+
+async def _history_download(x_user_token: Optional[str], query: str, date_key: str, value_key: str,
+                            limit: int, fmt: str, title: str, file_prefix: str):
+    """Shared body of the */history-table/download/{csv,xlsx} endpoints."""
+    check_enabled()
+    try:
+        from src.api.user_routes import verify_user_session
+        verify_user_session(x_user_token)
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    rows = _history_export_rows(query, date_key, value_key, limit, fmt)
+    if fmt == 'csv':
+        chunks = csv_stream(_HISTORY_EXPORT_HEADERS, rows)
+    else:
+        chunks = xlsx_stream(title, _HISTORY_EXPORT_HEADERS, rows,
+                             widths=_HISTORY_EXPORT_WIDTHS, cell_fills=_band_fill)
+    today = date.today().isoformat()
+    return await export_response_async(chunks, f'{file_prefix}_{today}.{fmt}')
+
+
 @router.get("/geri/history-table")
 async def geri_history_table(
     x_user_token: Optional[str] = Header(None),
@@ -1153,104 +880,16 @@ async def geri_history_table(
 @router.get("/geri/history-table/download/csv")
 async def geri_history_download_csv(
     x_user_token: Optional[str] = Header(None),
-    limit: int = Query(default=1000, ge=1, le=1000),
+    limit: int = Query(default=1000, ge=1, le=EXPORT_MAX_ROWS),
 ):
     """Download full GERI history as CSV."""
-    check_enabled()
-    try:
-        from src.api.user_routes import verify_user_session
-        verify_user_session(x_user_token)
-    except HTTPException:
-        raise
-    except Exception:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
-    rows = _fetch_geri_history_rows(limit)
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['Date', 'Value', 'Band', 'Trend 1D', 'Trend 7D', 'Computed At'])
-    for r in rows:
-        writer.writerow([
-            _fmt_date(r['date']),
-            _fmt_num(r['value']),
-            r['band'] or '',
-            _fmt_num(r['trend_1d']),
-            _fmt_num(r['trend_7d']),
-            _fmt_date(r['computed_at']),
-        ])
-    output.seek(0)
-    today = date.today().isoformat()
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type='text/csv',
-        headers={'Content-Disposition': f'attachment; filename="GERI_History_{today}.csv"'},
-    )
+    return await _history_download(x_user_token, _GERI_HISTORY_QUERY, 'date', 'value', limit, 'csv', 'GERI History', 'GERI_History')
 
 
 @router.get("/geri/history-table/download/xlsx")
 async def geri_history_download_xlsx(
     x_user_token: Optional[str] = Header(None),
-    limit: int = Query(default=1000, ge=1, le=1000),
+    limit: int = Query(default=1000, ge=1, le=EXPORT_MAX_ROWS),
 ):
     """Download full GERI history as Excel (.xlsx)."""
-    check_enabled()
-    try:
-        from src.api.user_routes import verify_user_session
-        verify_user_session(x_user_token)
-    except HTTPException:
-        raise
-    except Exception:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
-    import openpyxl
-    from openpyxl.styles import Font, PatternFill, Alignment
-    from openpyxl.utils import get_column_letter
-
-    rows = _fetch_geri_history_rows(limit)
-
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = 'GERI History'
-
-    headers = ['Date', 'Value', 'Band', 'Trend 1D', 'Trend 7D', 'Computed At']
-    header_fill = PatternFill(start_color='1E293B', end_color='1E293B', fill_type='solid')
-    header_font = Font(bold=True, color='F1F5F9')
-
-    for col_idx, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center')
-
-    band_colors = {
-        'LOW': 'D1FAE5',
-        'MODERATE': 'FEF9C3',
-        'ELEVATED': 'FED7AA',
-        'HIGH': 'FECACA',
-        'CRITICAL': 'F3D5FF',
-    }
-
-    for row_idx, r in enumerate(rows, 2):
-        band = r['band'] or ''
-        ws.cell(row=row_idx, column=1, value=_fmt_date(r['date']))
-        ws.cell(row=row_idx, column=2, value=float(r['value']) if r['value'] is not None else None)
-        bc = ws.cell(row=row_idx, column=3, value=band)
-        if band.upper() in band_colors:
-            bc.fill = PatternFill(start_color=band_colors[band.upper()], end_color=band_colors[band.upper()], fill_type='solid')
-        ws.cell(row=row_idx, column=4, value=float(r['trend_1d']) if r['trend_1d'] is not None else None)
-        ws.cell(row=row_idx, column=5, value=float(r['trend_7d']) if r['trend_7d'] is not None else None)
-        ws.cell(row=row_idx, column=6, value=_fmt_date(r['computed_at']))
-
-    col_widths = [14, 10, 12, 12, 12, 28]
-    for col_idx, width in enumerate(col_widths, 1):
-        ws.column_dimensions[get_column_letter(col_idx)].width = width
-
-    buf = io.BytesIO()
-    wb.save(buf)
-    buf.seek(0)
-    today = date.today().isoformat()
-    return StreamingResponse(
-        iter([buf.getvalue()]),
-        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        headers={'Content-Disposition': f'attachment; filename="GERI_History_{today}.xlsx"'},
-    )
+    return await _history_download(x_user_token, _GERI_HISTORY_QUERY, 'date', 'value', limit, 'xlsx', 'GERI History', 'GERI_History')
@@ -17,13 +17,7 @@ from src.geri.repo import (
     save_index,
     get_date_range_with_alerts,
 )
-from src.geri.compute import compute_components
-from src.geri.normalize import (
-    normalize_components,
-    calculate_geri_value,
-    calculate_trends,
-    build_result,
-)
+from src.geri.backfill_engine import compute_day_result, bulk_backfill
 
 logger = logging.getLogger(__name__)
 
@@ -53,31 +47,13 @@ def compute_geri_for_date(target_date: date, force: bool = False) -> Optional[GE
     alerts = get_alerts_for_date(target_date)
     logger.info(f"Found {len(alerts)} alerts for {target_date}")
     
-    components = compute_components(alerts)
-    
     baseline = get_historical_baseline(target_date)
     logger.info(f"Historical baseline: {baseline.days_count} days of history")
     
-    components = normalize_components(components, baseline)
-    
-    value = calculate_geri_value(components)
-    
     previous_values = get_previous_values(target_date, days=7)
-    trend_1d, trend_7d = calculate_trends(value, previous_values)
-    
-    from src.geri.interpretation import generate_interpretation
-    from src.geri.normalize import get_band
-    band = get_band(value)
-    top_regions = [r.get('region', '') for r in components.top_regions[:3] if r.get('region')]
-    components.interpretation = generate_interpretation(
-        value=value,
-        band=band.value,
-        top_drivers=components.top_drivers,
-        top_regions=top_regions,
-        index_date=target_date.isoformat()
-    )
-    
-    result = build_result(target_date, value, components, trend_1d, trend_7d)
+    
+    result = compute_day_result(target_date, alerts, baseline, previous_values)
+    value = result.value
     
     saved = save_index(result, force=force)
     
@@ -96,7 +72,8 @@ def compute_yesterday() -> Optional[GERIResult]:
 def backfill(
     from_date: date,
     to_date: date,
-    force: bool = False
+    force: bool = False,
+    bulk: bool = True
 ) -> Dict[str, Any]:
     """
     Backfill GERI indices for a date range.
@@ -105,6 +82,8 @@ def backfill(
         from_date: Start date (inclusive)
         to_date: End date (inclusive)
         force: If True, overwrite existing values
+        bulk: If True, use the single-pass bulk engine; if False, compute
+              day by day through compute_geri_for_date (same output)
     
     Returns:
         Summary dict with counts
@@ -113,6 +92,9 @@ def backfill(
         logger.warning("GERI module is disabled (ENABLE_GERI=false)")
         return {'error': 'GERI module disabled', 'computed': 0, 'skipped': 0}
     
+    if bulk:
+        return bulk_backfill(from_date, to_date, force=force)
+    
     logger.info(f"Starting GERI backfill from {from_date} to {to_date} (force={force})")
     
     computed = 0
@@ -154,7 +136,7 @@ def backfill(
     return summary
 
 
-def auto_backfill(force: bool = False) -> Dict[str, Any]:
+def auto_backfill(force: bool = False, bulk: bool = True) -> Dict[str, Any]:
     """
     Automatically backfill all historical alerts.
     Determines date range from alert_events.
@@ -173,4 +155,4 @@ def auto_backfill(force: bool = False) -> Dict[str, Any]:
     
     logger.info(f"Auto-backfill: alert range is {min_date} to {max_date}, processing up to {to_date}")
     
-    return backfill(min_date, to_date, force=force)
+    return backfill(min_date, to_date, force=force, bulk=bulk)
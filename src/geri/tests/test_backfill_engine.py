@@ -0,0 +1,171 @@
+"""
+Unit tests for the GERI bulk backfill engine.
+
+The reference below replays the per-day path (compute_geri_for_date) against
+an in-memory intel_indices_daily, so the bulk walk can be checked for
+identical output without a database.
+"""
+import json
+import random
+import unittest
+from datetime import date, datetime, timedelta
+
+from src.geri.types import AlertRecord, HistoricalBaseline, VALID_ALERT_TYPES
+from src.geri.backfill_engine import (
+    RollingMinMax,
+    BaselineWindow,
+    compute_day_result,
+    walk_backfill,
+)
+
+REGIONS = ['Europe', 'Middle East', 'Black Sea', 'Asia', 'North America', 'Global']
+
+
+def _make_alerts(day: date, rng: random.Random, start_id: int):
+    alerts = []
+    for i in range(rng.randint(0, 12)):
+        alerts.append(AlertRecord(
+            id=start_id + i,
+            alert_type=rng.choice(VALID_ALERT_TYPES),
+            severity=rng.choice([None, 1, 2, 3, 4, 5]),
+            risk_score=rng.choice([None, rng.uniform(0, 100)]),
+            region=rng.choice(REGIONS),
+            weight=1.0,
+            created_at=datetime.combine(day, datetime.min.time()) + timedelta(minutes=i),
+            headline=f"Headline {rng.randint(0, 30)}",
+        ))
+    return alerts
+
+
+def _stored(result):
+    components = json.loads(json.dumps(result.components.to_dict()))
+    return {'value': result.value, 'components': components}
+
+
+def _reference_backfill(from_date, to_date, alerts_by_date, table, force):
+    """Per-day path semantics over a dict standing in for intel_indices_daily."""
+    outputs = []
+    current = from_date
+    while current <= to_date:
+        if current in table and not force:
+            outputs.append((current, None))
+        else:
+            rows = [table[d] for d in sorted(table)
+                    if current - timedelta(days=90) <= d < current]
+            baseline = HistoricalBaseline(days_count=len(rows))
+            if rows:
+                keys = [('high_impact', 'high_impact_score'),
+                        ('regional_spike', 'regional_spike_score'),
+                        ('asset_risk', 'asset_risk_score'),
+                        ('region_concentration', 'region_concentration_score_raw')]
+                for attr, key in keys:
+                    scores = [r['components'].get(key, 0) for r in rows]
+                    setattr(baseline, f'{attr}_min', min(scores))
+                    setattr(baseline, f'{attr}_max', max(scores))
+            previous = [table[d]['value'] for d in sorted(table, reverse=True) if d < current][:7]
+            result = compute_day_result(current, alerts_by_date.get(current, []), baseline, previous)
+            table[current] = _stored(result)
+            outputs.append((current, result))
+        current += timedelta(days=1)
+    return outputs
+
+
+class TestRollingMinMax(unittest.TestCase):
+    """Test monotonic-deque window against brute force."""
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        window = RollingMinMax()
+        start = date(2025, 1, 1)
+        history = []
+        for offset in range(200):
+            day = start + timedelta(days=offset)
+            cutoff = day - timedelta(days=30)
+            window.evict_before(cutoff)
+            live = [v for d, v in history if d >= cutoff]
+            if live:
+                self.assertEqual(window.min, min(live))
+                self.assertEqual(window.max, max(live))
+            if rng.random() < 0.8:
+                value = rng.choice([0.0, rng.uniform(0, 50)])
+                window.push(day, value)
+                history.append((day, value))
+
+    def test_baseline_window_empty(self):
+        baseline = BaselineWindow().baseline_for(date(2025, 1, 1))
+        self.assertEqual(baseline.days_count, 0)
+        self.assertEqual(baseline.high_impact_max, 0.0)
+
+
+class TestWalkBackfillParity(unittest.TestCase):
+    """Bulk walk must reproduce the per-day path exactly."""
+
+    def _run(self, force: bool):
+        rng = random.Random(42 if force else 43)
+        from_date = date(2025, 3, 1)
+        to_date = date(2025, 7, 31)
+
+        alerts_by_date = {}
+        next_id = 1
+        current = from_date - timedelta(days=120)
+        while current <= to_date:
+            alerts_by_date[current] = _make_alerts(current, rng, next_id)
+            next_id += 100
+            current += timedelta(days=1)
+
+        # Pre-existing rows: a sparse history before the range plus some
+        # already-computed days inside it.
+        table = {}
+        seed_day = from_date - timedelta(days=120)
+        while seed_day <= to_date:
+            if rng.random() < (0.7 if seed_day < from_date else 0.2):
+                result = compute_day_result(seed_day, alerts_by_date[seed_day], HistoricalBaseline(), [])
+                table[seed_day] = _stored(result)
+            seed_day += timedelta(days=1)
+
+        stored_rows = {
+            d: (row['value'], (
+                row['components'].get('high_impact_score', 0),
+                row['components'].get('regional_spike_score', 0),
+                row['components'].get('asset_risk_score', 0),
+                row['components'].get('region_concentration_score_raw', 0),
+            ))
+            for d, row in table.items() if d >= from_date - timedelta(days=90)
+        }
+        seed_previous = [table[d]['value'] for d in sorted(table, reverse=True) if d < from_date][:7]
+
+        bulk = list(walk_backfill(
+            from_date, to_date, alerts_by_date, stored_rows, seed_previous, force=force
+        ))
+        reference = _reference_backfill(from_date, to_date, alerts_by_date, dict(table), force)
+
+        self.assertEqual(len(bulk), len(reference))
+        for (day, result, error), (ref_day, ref_result) in zip(bulk, reference):
+            self.assertIsNone(error)
+            self.assertEqual(day, ref_day)
+            if ref_result is None:
+                self.assertIsNone(result)
+            else:
+                self.assertEqual(result.to_dict(), ref_result.to_dict())
+
+    def test_parity_without_force(self):
+        self._run(force=False)
+
+    def test_parity_with_force(self):
+        self._run(force=True)
+
+    def test_failed_day_keeps_existing_row(self):
+        day = date(2025, 1, 10)
+        stored_rows = {day: (55, (1.0, 2.0, 3.0, 4.0))}
+
+        def failing(*args):
+            raise RuntimeError("boom")
+
+        walked = list(walk_backfill(day, day + timedelta(days=1), {}, stored_rows, [],
+                                    force=True, compute_fn=failing))
+        self.assertIsInstance(walked[0][2], RuntimeError)
+        self.assertIsNone(walked[0][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
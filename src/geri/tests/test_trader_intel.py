@@ -0,0 +1,202 @@
+"""
+Unit tests for GERI trader intel: the vectorized modules against the
+per-asset loops they replaced.
+"""
+import math
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.geri import trader_intel
+from src.geri.trader_intel import (
+    compute_confirmation_score,
+    compute_divergence,
+    compute_lead_lag,
+    compute_rolling_correlations,
+    compute_spillover_analysis,
+)
+
+D0 = date(2025, 6, 1)
+LABELS = trader_intel.ASSET_LABELS
+
+
+def _by_date(rows):
+    return {r['date']: float(r['value']) for r in rows if r.get('value') is not None}
+
+
+def _corr(xs, ys):
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    num = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    dx = math.sqrt(sum((x - mx) ** 2 for x in xs)) or 1e-9
+    dy = math.sqrt(sum((y - my) ** 2 for y in ys)) or 1e-9
+    return num / (dx * dy)
+
+
+def legacy_lead_lag(geri_series, asset_series, max_lag=7):
+    # The loop version started from best_corr = -2, so no lag ever beat it;
+    # this reference keeps the loop but tracks the real best |corr|.
+    g, a = _by_date(geri_series), _by_date(asset_series)
+    common = sorted(set(g) & set(a))
+    if len(common) < 10:
+        return {'lag': None, 'direction': None, 'sample_size': len(common)}
+    gc = [g[common[i]] - g[common[i - 1]] for i in range(1, len(common))]
+    ac = [a[common[i]] - a[common[i - 1]] for i in range(1, len(common))]
+    n = len(gc)
+    best_corr, best_lag = None, 0
+    for lag in range(-max_lag, max_lag + 1):
+        pairs = [(gc[i], ac[i + lag]) for i in range(n) if 0 <= i + lag < n]
+        if len(pairs) < 5:
+            continue
+        corr = _corr([p[0] for p in pairs], [p[1] for p in pairs])
+        if best_corr is None or abs(corr) > abs(best_corr):
+            best_corr, best_lag = corr, lag
+    return {'lag': best_lag, 'correlation': round(best_corr, 3), 'sample_size': n}
+
+
+def legacy_divergence(geri_series, asset_series, window=7):
+    g, a = _by_date(geri_series), _by_date(asset_series)
+    common = sorted(set(g) & set(a))
+    if len(common) < window:
+        return 'insufficient data'
+    recent = common[-window:]
+    gs, ge, as_, ae = g[recent[0]], g[recent[-1]], a[recent[0]], a[recent[-1]]
+    geri_dir = 1 if ge > gs else (-1 if ge < gs else 0)
+    asset_pct = ((ae - as_) / abs(as_)) * 100 if as_ != 0 else 0
+    asset_dir = 1 if asset_pct > 1 else (-1 if asset_pct < -1 else 0)
+    if geri_dir == asset_dir or geri_dir == 0 or asset_dir == 0:
+        return 'Aligned'
+    if abs(ge - gs) > 15 or abs(asset_pct) > 5:
+        return 'Strong divergence'
+    return 'Moderate divergence'
+
+
+def legacy_confirmation_moves(geri_series, assets, window=7):
+    g = _by_date(geri_series)
+    recent = sorted(g)[-window:]
+    moves = {}
+    for key, rows in assets.items():
+        a = _by_date(rows)
+        common = sorted(set(recent) & set(a))
+        if len(common) >= 3:
+            s, e = a[common[0]], a[common[-1]]
+            moves[key] = round(((e - s) / abs(s)) * 100 if s != 0 else 0, 2)
+    return moves
+
+
+def legacy_rolling_correlations(geri_series, assets, window=30):
+    g = _by_date(geri_series)
+    out = []
+    for key, rows in assets.items():
+        a = _by_date(rows)
+        common = sorted(set(g) & set(a))
+        if len(common) < max(7, window // 2):
+            out.append((LABELS.get(key, key), None, len(common)))
+            continue
+        recent = common[-window:]
+        out.append((LABELS.get(key, key), round(_corr([g[d] for d in recent], [a[d] for d in recent]), 3), len(recent)))
+    return out
+
+
+def legacy_spillover(geri_rows, asset_map):
+    g = _by_date(geri_rows)
+    if len(g) < 14:
+        return []
+    dates = sorted(g)
+    changes = [g[dates[i]] - g[dates[i - 1]] for i in range(1, len(dates))]
+    spikes = [dates[i + 1] for i, c in enumerate(changes) if abs(c) >= 3.0]
+    out = {}
+    for key, rows in asset_map.items():
+        a = _by_date(rows)
+        reactions = []
+        for sd in spikes:
+            d_idx = dates.index(sd)
+            for lag in range(0, 4):
+                ci = d_idx + lag
+                if ci < len(dates):
+                    cd, pd = dates[ci], dates[ci - 1]
+                    if cd in a and pd in a:
+                        if abs(a[pd]) > 0:
+                            reactions.append((lag, (a[cd] - a[pd]) / abs(a[pd]) * 100))
+                        break
+        if reactions:
+            out[LABELS.get(key, key)] = (sum(r[1] for r in reactions) / len(reactions),
+                                         sum(r[0] for r in reactions) / len(reactions), len(reactions))
+        else:
+            out[LABELS.get(key, key)] = (0, 0, 0)
+    return out
+
+
+def _history(seed, days=240):
+    rng = random.Random(seed)
+    geri, level = [], 50.0
+    for i in range(days):
+        level = min(100, max(0, level + rng.gauss(0, 3)))
+        geri.append({'date': D0 + timedelta(i), 'value': round(level, 1) if rng.random() > 0.03 else None})
+    assets = {}
+    for key, base in [('brent', 75), ('ttf', 35), ('vix', 18), ('eurusd', 1.1), ('gas_storage', 60)]:
+        rows, price = [], base
+        for i in range(days):
+            price *= math.exp(rng.gauss(0, 0.015))
+            d = D0 + timedelta(i + rng.choice([0, 0, 0, 1]))
+            if d.weekday() < 5 or key == 'gas_storage':
+                rows.append({'date': d, 'value': round(price, 4)})
+        assets[key] = rows
+    return geri, assets
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_lead_lag_matches_reference(seed):
+    geri, assets = _history(seed)
+    for key in ('brent', 'ttf', 'vix', 'eurusd'):
+        got, ref = compute_lead_lag(geri, assets[key]), legacy_lead_lag(geri, assets[key])
+        assert got['lag'] == ref['lag']
+        assert got['correlation'] == pytest.approx(ref['correlation'], abs=1e-3)
+        assert got['sample_size'] == ref['sample_size']
+
+
+def test_lead_lag_finds_a_shifted_series():
+    geri, _ = _history(7)
+    values = {r['date']: r['value'] for r in geri if r['value'] is not None}
+    lagged = [{'date': d + timedelta(2), 'value': v * 2 + 10} for d, v in values.items()]
+    result = compute_lead_lag(geri, lagged)
+    assert result['lag'] == 2
+    assert result['direction'] == 'Risk leads asset'
+    assert result['correlation'] > 0.8
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_divergence_confirmation_and_correlations_match_reference(seed):
+    geri, assets = _history(seed)
+    for key, rows in assets.items():
+        assert compute_divergence(geri, rows) == legacy_divergence(geri, rows)
+
+    details = {d['asset']: d['move_pct'] for d in compute_confirmation_score(geri, assets)['details']}
+    assert details == pytest.approx(legacy_confirmation_moves(geri, assets), abs=0.011)
+
+    got = [(r['asset'], r['correlation'], r['sample_size']) for r in compute_rolling_correlations(geri, assets)]
+    for (label, corr, n), (ref_label, ref_corr, ref_n) in zip(got, legacy_rolling_correlations(geri, assets)):
+        assert (label, n) == (ref_label, ref_n)
+        assert corr == pytest.approx(ref_corr, abs=1e-3)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_spillover_matches_reference(seed):
+    geri, assets = _history(seed)
+    ref = legacy_spillover(geri, assets)
+    got = compute_spillover_analysis(geri, assets)
+    assert [r['asset'] for r in got] == sorted(ref, key=lambda k: abs(round(ref[k][0], 2)), reverse=True)
+    for r in got:
+        pct, lag, events = ref[r['asset']]
+        assert r['spike_events'] == events
+        assert r['avg_reaction_pct'] == pytest.approx(pct, abs=0.006)
+        assert r['avg_reaction_lag_days'] == pytest.approx(lag, abs=0.06)
+
+
+def test_short_history_is_reported_not_raised():
+    geri, assets = _history(1, days=6)
+    assert compute_lead_lag(geri, assets['brent'])['lag'] is None
+    assert compute_divergence([], assets['brent']) == 'insufficient data'
+    assert compute_confirmation_score(geri, assets)['score'] is None
+    assert all(r['correlation'] is None for r in compute_rolling_correlations([], assets))
+    assert compute_spillover_analysis(geri, assets) == []
@@ -9,14 +9,18 @@ Computes tactical intelligence modules for Trader-tier GERI dashboard:
 5. Asset Reaction Summary — interpretive text about asset-risk dynamics
 6. Regime Transition Indicator — transition direction from recent band changes
 7. Alert Preview — 3 most recent alerts as upgrade teaser
+
+The cross-asset modules share one AssetPanel per request and the
+vectorized kernel in src/market/stats.
 """
 import logging
-import math
 from datetime import date, timedelta
 from decimal import Decimal
 from typing import Dict, Any, List, Optional, Tuple
 
-from src.db.db import get_cursor, execute_production_query
+import numpy as np
+
+from src.market import stats
 
 
 def _to_float(v):
@@ -29,110 +33,134 @@ def _to_float(v):
 logger = logging.getLogger(__name__)
 
 
-def compute_lead_lag(geri_series: List[Dict], asset_series: List[Dict], max_lag: int = 7) -> Dict[str, Any]:
-    geri_by_date = {r['date']: _to_float(r['value']) for r in geri_series if r.get('value') is not None}
-    asset_by_date = {r['date']: _to_float(r['value']) for r in asset_series if r.get('value') is not None}
-
-    common_dates = sorted(set(geri_by_date.keys()) & set(asset_by_date.keys()))
-    if len(common_dates) < 10:
-        return {'lag': None, 'direction': None, 'sample_size': len(common_dates)}
-
-    geri_vals = [geri_by_date[d] for d in common_dates]
-    asset_vals = [asset_by_date[d] for d in common_dates]
-
-    geri_changes = [geri_vals[i] - geri_vals[i-1] for i in range(1, len(geri_vals))]
-    asset_changes = [asset_vals[i] - asset_vals[i-1] for i in range(1, len(asset_vals))]
-
-    n = len(geri_changes)
-    if n < 5:
-        return {'lag': None, 'direction': None, 'sample_size': n}
-
-    best_corr = -2
-    best_lag = 0
-
-    for lag in range(-max_lag, max_lag + 1):
-        pairs = []
-        for i in range(n):
-            j = i + lag
-            if 0 <= j < len(asset_changes):
-                pairs.append((geri_changes[i], asset_changes[j]))
-        if len(pairs) < 5:
+ASSET_LABELS = {
+    'brent': 'Brent Oil',
+    'ttf': 'TTF Gas',
+    'vix': 'VIX',
+    'eurusd': 'EUR/USD',
+    'gas_storage': 'EU Gas Storage',
+}
+
+
+class AssetPanel:
+    """GERI and each asset on the GERI date axis, NaN where an asset has no value that day.
+
+    Built once per request so every module below works on the same arrays
+    (one row per asset) through src/market/stats instead of re-joining
+    dicts per asset and per lag.
+    """
+
+    def __init__(self, dates: List[date], geri: np.ndarray, keys: List[str], assets: np.ndarray):
+        self.dates = dates
+        self.geri = geri
+        self.keys = keys
+        self.assets = assets
+
+    @staticmethod
+    def _geri_axis(geri_series: List[Dict]) -> Tuple[List[date], np.ndarray]:
+        geri_by_date = {r['date']: _to_float(r['value']) for r in geri_series if r.get('value') is not None}
+        dates = sorted(geri_by_date)
+        return dates, np.array([geri_by_date[d] for d in dates], dtype=float)
+
+    @classmethod
+    def from_rows(cls, geri_series: List[Dict], assets: Dict[str, List[Dict]]) -> 'AssetPanel':
+        dates, geri = cls._geri_axis(geri_series)
+        index = {d: i for i, d in enumerate(dates)}
+        matrix = np.full((len(assets), len(dates)), np.nan)
+        for row, series in enumerate(assets.values()):
+            for r in series:
+                i = index.get(r['date'])
+                if i is not None and r.get('value') is not None:
+                    matrix[row, i] = _to_float(r['value'])
+        return cls(dates, geri, list(assets), matrix)
+
+    @classmethod
+    def from_store(cls, geri_series: List[Dict], store, keys: List[str]) -> 'AssetPanel':
+        dates, geri = cls._geri_axis(geri_series)
+        axis = np.array(dates, dtype='datetime64[D]')
+        matrix = np.full((len(keys), len(dates)), np.nan)
+        for row, key in enumerate(keys):
+            s = store.series(key)
+            if not len(s) or not len(axis):
+                continue
+            pos = np.minimum(np.searchsorted(s.dates, axis), len(s) - 1)
+            hit = s.dates[pos] == axis
+            matrix[row, hit] = s.values[pos[hit]]
+        return cls(dates, geri, list(keys), matrix)
+
+
+def _lead_lags(panel: AssetPanel, max_lag: int = 7) -> Dict[str, Dict[str, Any]]:
+    geri, assets, common = stats.pack_pairs(panel.geri, panel.assets)
+    n = np.maximum(common - 1, 0)
+    corr = stats.lagged_correlations(np.diff(geri, axis=1), np.diff(assets, axis=1), n, max_lag, min_pairs=5)
+    lags, best = stats.best_lags(corr, max_lag)
+
+    results = {}
+    for row, key in enumerate(panel.keys):
+        if common[row] < 10:
+            results[key] = {'lag': None, 'direction': None, 'sample_size': int(common[row])}
             continue
+        best_lag = int(lags[row])
+        if best_lag > 0:
+            direction = 'Risk leads asset'
+            lag_text = f"Risk leads by {best_lag} day{'s' if best_lag > 1 else ''}"
+        elif best_lag < 0:
+            direction = 'Asset leads risk'
+            lag_text = f"Asset leads by {abs(best_lag)} day{'s' if abs(best_lag) > 1 else ''}"
+        else:
+            direction = 'Same-day'
+            lag_text = "Moves same-day"
+        results[key] = {
+            'lag': best_lag,
+            'lag_text': lag_text,
+            'direction': direction,
+            'correlation': round(float(best[row]), 3),
+            'sample_size': int(n[row])
+        }
+    return results
 
-        gx = [p[0] for p in pairs]
-        ax = [p[1] for p in pairs]
-        mg = sum(gx) / len(gx)
-        ma = sum(ax) / len(ax)
-
-        num = sum((g - mg) * (a - ma) for g, a in zip(gx, ax))
-        dg = math.sqrt(sum((g - mg)**2 for g in gx)) or 1e-9
-        da = math.sqrt(sum((a - ma)**2 for a in ax)) or 1e-9
-        corr = num / (dg * da)
-
-        if abs(corr) > abs(best_corr):
-            best_corr = corr
-            best_lag = lag
-
-    if best_lag > 0:
-        direction = 'Risk leads asset'
-        lag_text = f"Risk leads by {best_lag} day{'s' if best_lag > 1 else ''}"
-    elif best_lag < 0:
-        direction = 'Asset leads risk'
-        lag_text = f"Asset leads by {abs(best_lag)} day{'s' if abs(best_lag) > 1 else ''}"
-    else:
-        direction = 'Same-day'
-        lag_text = "Moves same-day"
-
-    return {
-        'lag': best_lag,
-        'lag_text': lag_text,
-        'direction': direction,
-        'correlation': round(best_corr, 3),
-        'sample_size': n
-    }
-
-
-def compute_divergence(geri_series: List[Dict], asset_series: List[Dict], window: int = 7) -> str:
-    geri_by_date = {r['date']: _to_float(r['value']) for r in geri_series if r.get('value') is not None}
-    asset_by_date = {r['date']: _to_float(r['value']) for r in asset_series if r.get('value') is not None}
-
-    common_dates = sorted(set(geri_by_date.keys()) & set(asset_by_date.keys()))
-    if len(common_dates) < window:
-        return 'insufficient data'
 
-    recent = common_dates[-window:]
-    geri_start = geri_by_date[recent[0]]
-    geri_end = geri_by_date[recent[-1]]
-    asset_start = asset_by_date[recent[0]]
-    asset_end = asset_by_date[recent[-1]]
+def _divergences(panel: AssetPanel, window: int = 7) -> Dict[str, str]:
+    if len(panel.dates) < window:
+        return {key: 'insufficient data' for key in panel.keys}
+    valid = ~np.isnan(panel.assets)
+    remaining = np.cumsum(valid[:, ::-1], axis=1)[:, ::-1]
+    starts = np.argmax(valid & (remaining == window), axis=1)
+    ends = valid.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
 
-    geri_dir = 1 if geri_end > geri_start else (-1 if geri_end < geri_start else 0)
-    asset_pct = ((asset_end - asset_start) / abs(asset_start)) * 100 if asset_start != 0 else 0
-    asset_dir = 1 if asset_pct > 1 else (-1 if asset_pct < -1 else 0)
+    results = {}
+    for row, key in enumerate(panel.keys):
+        if valid[row].sum() < window:
+            results[key] = 'insufficient data'
+            continue
+        geri_start, geri_end = panel.geri[starts[row]], panel.geri[ends[row]]
+        asset_start, asset_end = panel.assets[row, starts[row]], panel.assets[row, ends[row]]
 
-    if geri_dir == asset_dir or geri_dir == 0 or asset_dir == 0:
-        return 'Aligned'
+        geri_dir = 1 if geri_end > geri_start else (-1 if geri_end < geri_start else 0)
+        asset_pct = ((asset_end - asset_start) / abs(asset_start)) * 100 if asset_start != 0 else 0
+        asset_dir = 1 if asset_pct > 1 else (-1 if asset_pct < -1 else 0)
 
-    geri_mag = abs(geri_end - geri_start)
-    if geri_mag > 15 or abs(asset_pct) > 5:
-        return 'Strong divergence'
-    return 'Moderate divergence'
+        if geri_dir == asset_dir or geri_dir == 0 or asset_dir == 0:
+            results[key] = 'Aligned'
+        elif abs(geri_end - geri_start) > 15 or abs(asset_pct) > 5:
+            results[key] = 'Strong divergence'
+        else:
+            results[key] = 'Moderate divergence'
+    return results
 
 
-def compute_confirmation_score(geri_series: List[Dict], assets: Dict[str, List[Dict]], window: int = 7) -> Dict[str, Any]:
-    geri_by_date = {r['date']: _to_float(r['value']) for r in geri_series if r.get('value') is not None}
-    geri_dates = sorted(geri_by_date.keys())
-    if len(geri_dates) < window:
+def _confirmation(panel: AssetPanel, window: int = 7) -> Dict[str, Any]:
+    if len(panel.dates) < window:
         return {'score': None, 'label': 'Insufficient data', 'details': []}
 
-    recent_geri = geri_dates[-window:]
-    geri_start = geri_by_date[recent_geri[0]]
-    geri_end = geri_by_date[recent_geri[-1]]
+    geri_start = panel.geri[-window]
+    geri_end = panel.geri[-1]
     geri_dir = 1 if geri_end > geri_start else (-1 if geri_end < geri_start else 0)
 
-    confirming = 0
-    total = 0
-    details = []
+    block = panel.assets[:, -window:]
+    valid = ~np.isnan(block)
+    firsts = np.argmax(valid, axis=1)
+    lasts = window - 1 - np.argmax(valid[:, ::-1], axis=1)
 
     expect_dir_map = {
         'brent': 1,
@@ -142,19 +170,18 @@ def compute_confirmation_score(geri_series: List[Dict], assets: Dict[str, List[D
         'gas_storage': -1,
     }
 
-    for asset_key, asset_data in assets.items():
-        a_by_date = {r['date']: _to_float(r['value']) for r in asset_data if r.get('value') is not None}
-        common = sorted(set(recent_geri) & set(a_by_date.keys()))
-        if len(common) < 3:
+    confirming = 0
+    total = 0
+    details = []
+    for row, asset_key in enumerate(panel.keys):
+        if valid[row].sum() < 3:
             continue
-
-        a_start = a_by_date[common[0]]
-        a_end = a_by_date[common[-1]]
-        a_pct = ((a_end - a_start) / abs(a_start)) * 100 if a_start != 0 else 0
+        a_start = block[row, firsts[row]]
+        a_end = block[row, lasts[row]]
+        a_pct = float(((a_end - a_start) / abs(a_start)) * 100) if a_start != 0 else 0
         a_dir = 1 if a_pct > 0.5 else (-1 if a_pct < -0.5 else 0)
 
-        expected = expect_dir_map.get(asset_key, 1)
-        expected_actual = expected * geri_dir
+        expected_actual = expect_dir_map.get(asset_key, 1) * geri_dir
 
         total += 1
         is_confirming = (a_dir == expected_actual) or a_dir == 0
@@ -183,6 +210,86 @@ def compute_confirmation_score(geri_series: List[Dict], assets: Dict[str, List[D
     return {'score': score, 'label': label, 'details': details}
 
 
+def _rolling_correlations(panel: AssetPanel, window: int = 30) -> List[Dict[str, Any]]:
+    geri, assets, common = stats.pack_pairs(panel.geri, panel.assets, right=True)
+    if not len(panel.dates):
+        latest = np.full(len(panel.keys), np.nan)
+    else:
+        latest = stats.rolling_correlation(geri, assets, window, min_periods=1)[:, -1]
+
+    results = []
+    for row, key in enumerate(panel.keys):
+        label = ASSET_LABELS.get(key, key)
+        if common[row] < max(7, window // 2):
+            results.append({'asset': label, 'correlation': None, 'strength': 'Insufficient data', 'sample_size': int(common[row])})
+            continue
+        corr = round(float(latest[row]), 3)
+        if abs(corr) >= 0.7:
+            strength = 'Strong'
+        elif abs(corr) >= 0.4:
+            strength = 'Moderate'
+        else:
+            strength = 'Weak'
+        results.append({'asset': label, 'correlation': corr, 'strength': strength, 'sample_size': int(min(common[row], window))})
+    return results
+
+
+def _spillover(panel: AssetPanel, spike_threshold: float = 3.0, max_lag: int = 3) -> List[Dict[str, Any]]:
+    """Average asset move on the first day (0..max_lag after a GERI spike) it has two consecutive quotes."""
+    if len(panel.dates) < 14:
+        return []
+    m = len(panel.dates)
+    spikes = np.flatnonzero(np.abs(np.diff(panel.geri)) >= spike_threshold) + 1
+    checks = spikes[:, None] + np.arange(max_lag + 1)[None, :]
+    in_range = checks < m
+    checks = np.minimum(checks, m - 1)
+
+    a = panel.assets
+    quoted = np.zeros(a.shape, dtype=bool)
+    quoted[:, 1:] = ~np.isnan(a[:, 1:]) & ~np.isnan(a[:, :-1])
+    hits = quoted[:, checks] & in_range
+    reacted = hits.any(axis=2)
+    lag = np.argmax(hits, axis=2)
+    day = checks[np.arange(len(spikes))[None, :], lag]
+    rows = np.arange(len(a))[:, None]
+    prev, cur = a[rows, day - 1], a[rows, day]
+    counted = reacted & (prev != 0) & ~np.isnan(prev)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pct = np.where(counted, (cur - prev) / np.abs(prev) * 100, 0.0)
+    events = counted.sum(axis=1)
+
+    results = []
+    for row, key in enumerate(panel.keys):
+        if events[row]:
+            avg_pct = round(float(pct[row].sum() / events[row]), 2)
+            avg_lag = round(float(lag[row][counted[row]].sum() / events[row]), 1)
+            sensitivity = 'High' if abs(avg_pct) > 2 else ('Moderate' if abs(avg_pct) > 0.5 else 'Low')
+        else:
+            avg_pct = 0
+            avg_lag = 0
+            sensitivity = 'Insufficient data'
+        results.append({
+            'asset': ASSET_LABELS.get(key, key),
+            'avg_reaction_pct': avg_pct,
+            'avg_reaction_lag_days': avg_lag,
+            'sensitivity': sensitivity,
+            'spike_events': int(events[row])
+        })
+    return sorted(results, key=lambda x: abs(x['avg_reaction_pct']), reverse=True)
+
+
+def compute_lead_lag(geri_series: List[Dict], asset_series: List[Dict], max_lag: int = 7) -> Dict[str, Any]:
+    return _lead_lags(AssetPanel.from_rows(geri_series, {'asset': asset_series}), max_lag)['asset']
+
+
+def compute_divergence(geri_series: List[Dict], asset_series: List[Dict], window: int = 7) -> str:
+    return _divergences(AssetPanel.from_rows(geri_series, {'asset': asset_series}), window)['asset']
+
+
+def compute_confirmation_score(geri_series: List[Dict], assets: Dict[str, List[Dict]], window: int = 7) -> Dict[str, Any]:
+    return _confirmation(AssetPanel.from_rows(geri_series, assets), window)
+
+
 def compute_storage_context(storage_series: List[Dict]) -> Dict[str, Any]:
     if not storage_series:
         return {'current_pct': None, 'seasonal_avg': None, 'vs_seasonal': None, 'narrative': 'No storage data'}
@@ -327,32 +434,7 @@ def generate_reaction_summary(geri_series: List[Dict], divergences: Dict[str, st
 
 
 def compute_rolling_correlations(geri_series: List[Dict], assets: Dict[str, List[Dict]], window: int = 30) -> List[Dict[str, Any]]:
-    geri_by_date = {r['date']: _to_float(r['value']) for r in geri_series if r.get('value') is not None}
-    results = []
-    asset_labels = {'brent': 'Brent Oil', 'ttf': 'TTF Gas', 'vix': 'VIX', 'eurusd': 'EUR/USD', 'gas_storage': 'EU Gas Storage'}
-    for key, series in assets.items():
-        a_by_date = {r['date']: _to_float(r['value']) for r in series if r.get('value') is not None}
-        common = sorted(set(geri_by_date.keys()) & set(a_by_date.keys()))
-        if len(common) < max(7, window // 2):
-            results.append({'asset': asset_labels.get(key, key), 'correlation': None, 'strength': 'Insufficient data', 'sample_size': len(common)})
-            continue
-        recent = common[-window:] if len(common) >= window else common
-        g_vals = [geri_by_date[d] for d in recent]
-        a_vals = [a_by_date[d] for d in recent]
-        mg = sum(g_vals) / len(g_vals)
-        ma = sum(a_vals) / len(a_vals)
-        num = sum((g - mg) * (a - ma) for g, a in zip(g_vals, a_vals))
-        dg = math.sqrt(sum((g - mg)**2 for g in g_vals)) or 1e-9
-        da = math.sqrt(sum((a - ma)**2 for a in a_vals)) or 1e-9
-        corr = round(num / (dg * da), 3)
-        if abs(corr) >= 0.7:
-            strength = 'Strong'
-        elif abs(corr) >= 0.4:
-            strength = 'Moderate'
-        else:
-            strength = 'Weak'
-        results.append({'asset': asset_labels.get(key, key), 'correlation': corr, 'strength': strength, 'sample_size': len(recent)})
-    return results
+    return _rolling_correlations(AssetPanel.from_rows(geri_series, assets), window)
 
 
 def compute_risk_decomposition(geri_rows: List[Dict], alert_data: List[Dict]) -> Dict[str, Any]:
@@ -415,54 +497,7 @@ def compute_regime_probability(geri_rows: List[Dict]) -> Dict[str, Any]:
 
 
 def compute_spillover_analysis(geri_rows: List[Dict], asset_map: Dict[str, List[Dict]]) -> List[Dict[str, Any]]:
-    asset_labels = {'brent': 'Brent Oil', 'ttf': 'TTF Gas', 'vix': 'VIX', 'eurusd': 'EUR/USD', 'gas_storage': 'EU Gas Storage'}
-    geri_by_date = {r['date']: _to_float(r['value']) for r in geri_rows if r.get('value') is not None}
-    if len(geri_by_date) < 14:
-        return []
-    geri_dates = sorted(geri_by_date.keys())
-    geri_vals = [geri_by_date[d] for d in geri_dates]
-    geri_changes = [geri_vals[i] - geri_vals[i-1] for i in range(1, len(geri_vals))]
-    spike_threshold = 3.0
-    spike_dates = set()
-    for i, chg in enumerate(geri_changes):
-        if abs(chg) >= spike_threshold:
-            spike_dates.add(geri_dates[i+1])
-    results = []
-    for key, series in asset_map.items():
-        a_by_date = {r['date']: _to_float(r['value']) for r in series if r.get('value') is not None}
-        reactions = []
-        for sd in spike_dates:
-            d_idx = geri_dates.index(sd) if sd in geri_dates else -1
-            if d_idx < 0:
-                continue
-            geri_chg = geri_changes[d_idx - 1] if d_idx > 0 and d_idx - 1 < len(geri_changes) else 0
-            for lag in range(0, 4):
-                check_idx = d_idx + lag
-                if check_idx < len(geri_dates):
-                    check_date = geri_dates[check_idx]
-                    prev_date = geri_dates[check_idx - 1] if check_idx > 0 else None
-                    if check_date in a_by_date and prev_date and prev_date in a_by_date:
-                        a_chg = a_by_date[check_date] - a_by_date[prev_date]
-                        if abs(a_by_date[prev_date]) > 0:
-                            a_pct = (a_chg / abs(a_by_date[prev_date])) * 100
-                            reactions.append({'lag': lag, 'pct': a_pct})
-                        break
-        if reactions:
-            avg_pct = round(sum(r['pct'] for r in reactions) / len(reactions), 2)
-            avg_lag = round(sum(r['lag'] for r in reactions) / len(reactions), 1)
-            sensitivity = 'High' if abs(avg_pct) > 2 else ('Moderate' if abs(avg_pct) > 0.5 else 'Low')
-        else:
-            avg_pct = 0
-            avg_lag = 0
-            sensitivity = 'Insufficient data'
-        results.append({
-            'asset': asset_labels.get(key, key),
-            'avg_reaction_pct': avg_pct,
-            'avg_reaction_lag_days': avg_lag,
-            'sensitivity': sensitivity,
-            'spike_events': len(reactions)
-        })
-    return sorted(results, key=lambda x: abs(x['avg_reaction_pct']), reverse=True)
+    return _spillover(AssetPanel.from_rows(geri_rows, asset_map))
 
 
 def _normalize_row(row):
@@ -474,36 +509,17 @@ def _normalize_row(row):
 
 
 def get_geri_trader_intel(plan_level: int = 2) -> Dict[str, Any]:
+    from src.db.db import execute_production_query
+    from src.market.series_store import get_series_store
+
     geri_rows = [_normalize_row(r) for r in execute_production_query("""
         SELECT date, value, band, trend_1d, trend_7d
         FROM intel_indices_daily
         ORDER BY date ASC
     """)]
 
-    brent_rows = [_normalize_row(r) for r in execute_production_query("""
-        SELECT date, brent_price as value FROM oil_price_snapshots
-        WHERE brent_price IS NOT NULL ORDER BY date ASC
-    """)]
-
-    ttf_rows = [_normalize_row(r) for r in execute_production_query("""
-        SELECT date, ttf_price as value FROM ttf_gas_snapshots
-        WHERE ttf_price IS NOT NULL ORDER BY date ASC
-    """)]
-
-    vix_rows = [_normalize_row(r) for r in execute_production_query("""
-        SELECT date, vix_close as value FROM vix_snapshots
-        WHERE vix_close IS NOT NULL ORDER BY date ASC
-    """)]
-
-    eurusd_rows = [_normalize_row(r) for r in execute_production_query("""
-        SELECT date, rate as value FROM eurusd_snapshots
-        WHERE rate IS NOT NULL ORDER BY date ASC
-    """)]
-
-    storage_rows = [_normalize_row(r) for r in execute_production_query("""
-        SELECT date, eu_storage_percent as value FROM gas_storage_snapshots
-        WHERE eu_storage_percent IS NOT NULL ORDER BY date ASC
-    """)]
+    store = get_series_store()
+    storage_rows = store.series('gas_storage').tail(1).to_rows()
 
     recent_alerts = [_normalize_row(r) for r in execute_production_query("""
         SELECT headline, severity, scope_region, created_at
@@ -512,44 +528,24 @@ def get_geri_trader_intel(plan_level: int = 2) -> Dict[str, Any]:
         LIMIT 5
     """)]
 
-    asset_map = {
-        'brent': brent_rows,
-        'ttf': ttf_rows,
-        'vix': vix_rows,
-        'eurusd': eurusd_rows,
-        'gas_storage': storage_rows,
-    }
-    asset_labels = {
-        'brent': 'Brent Oil',
-        'ttf': 'TTF Gas',
-        'vix': 'VIX',
-        'eurusd': 'EUR/USD',
-        'gas_storage': 'EU Gas Storage',
-    }
+    panel = AssetPanel.from_store(geri_rows, store, list(ASSET_LABELS))
 
-    lead_lag = {}
-    for key, series in asset_map.items():
-        if key == 'gas_storage':
-            continue
-        ll = compute_lead_lag(geri_rows, series)
-        lead_lag[key] = {
-            'asset': asset_labels[key],
-            **ll
-        }
+    lead_lag = {
+        key: {'asset': ASSET_LABELS[key], **ll}
+        for key, ll in _lead_lags(panel).items()
+        if key != 'gas_storage'
+    }
 
-    divergences = {}
-    for key, series in asset_map.items():
-        div = compute_divergence(geri_rows, series)
-        divergences[key] = div
+    divergences = _divergences(panel)
 
     divergence_display = []
     for key in ['ttf', 'brent', 'vix', 'eurusd', 'gas_storage']:
         divergence_display.append({
-            'asset': asset_labels[key],
+            'asset': ASSET_LABELS[key],
             'status': divergences.get(key, 'insufficient data'),
         })
 
-    confirmation = compute_confirmation_score(geri_rows, asset_map)
+    confirmation = _confirmation(panel)
 
     storage_ctx = compute_storage_context(storage_rows)
 
@@ -589,11 +585,11 @@ def get_geri_trader_intel(plan_level: int = 2) -> Dict[str, Any]:
     }
 
     if plan_level >= 3:
-        result['rolling_correlations'] = compute_rolling_correlations(geri_rows, asset_map)
+        result['rolling_correlations'] = _rolling_correlations(panel)
         result['risk_decomposition'] = compute_risk_decomposition(geri_rows, recent_alerts)
         result['regime_probability'] = compute_regime_probability(geri_rows)
 
     if plan_level >= 4:
-        result['spillover_analysis'] = compute_spillover_analysis(geri_rows, asset_map)
+        result['spillover_analysis'] = _spillover(panel)
 
     return result
@@ -1,6 +1,8 @@
 import logging
 from typing import Tuple, Optional
 
+from src.ingest.keyword_matcher import Matches, scan_event
+
 logger = logging.getLogger(__name__)
 
 GEOPOLITICAL_KEYWORDS = [
@@ -76,20 +78,18 @@ THEMATIC_CATEGORY_KEYWORDS = {
     'diplomacy': ['diplomatic', 'negotiation', 'summit', 'talks', 'agreement', 'treaty', 'ceasefire'],
 }
 
-def classify_thematic_category(title: str, raw_text: str = "") -> str:
+def classify_thematic_category(title: str, raw_text: str = "", matches: Optional[Matches] = None) -> str:
     """
     Classify event into granular thematic category for EERI weighting.
     Returns one of: war, military, conflict, strike, supply_disruption, 
                     sanctions, energy, political, diplomacy, geopolitical
     """
-    combined_text = f"{title} {raw_text or ''}".lower()
+    if matches is None:
+        matches = scan_event(title, raw_text)
     
     scores = {}
-    for category, keywords in THEMATIC_CATEGORY_KEYWORDS.items():
-        score = 0
-        for keyword in keywords:
-            if keyword in combined_text:
-                score += 1
+    for category in THEMATIC_CATEGORY_KEYWORDS:
+        score = matches.count(f'thematic:{category}')
         if score > 0:
             scores[category] = score
     
@@ -119,13 +119,15 @@ def count_keyword_matches(text: str, keywords: list) -> int:
             count += 1
     return count
 
-def classify_category_with_reason(title: str, raw_text: str = "", category_hint: Optional[str] = None, signal_type: Optional[str] = None) -> Tuple[str, str, float]:
-    combined_text = f"{title} {raw_text or ''}"
+def classify_category_with_reason(title: str, raw_text: str = "", category_hint: Optional[str] = None, signal_type: Optional[str] = None,
+                                  matches: Optional[Matches] = None) -> Tuple[str, str, float]:
+    if matches is None:
+        matches = scan_event(title, raw_text)
     
-    geo_score = count_keyword_matches(combined_text, GEOPOLITICAL_KEYWORDS)
-    energy_score = count_keyword_matches(combined_text, ENERGY_KEYWORDS)
-    supply_score = count_keyword_matches(combined_text, SUPPLY_CHAIN_KEYWORDS)
-    reg_score = count_keyword_matches(combined_text, REGULATORY_KEYWORDS)
+    geo_score = matches.count('category:geopolitical')
+    energy_score = matches.count('category:energy')
+    supply_score = matches.count('category:supply_chain')
+    reg_score = matches.count('category:regulatory')
     
     if reg_score > 0:
         if signal_type in ['regulation', 'policy']:
@@ -178,8 +180,10 @@ def classify_category_with_reason(title: str, raw_text: str = "", category_hint:
     
     return chosen, reason, confidence
 
-def classify_region(title: str, raw_text: str = "", region_hint: Optional[str] = None) -> str:
-    combined_text = f"{title} {raw_text or ''}".lower()
+def classify_region(title: str, raw_text: str = "", region_hint: Optional[str] = None,
+                    matches: Optional[Matches] = None) -> str:
+    if matches is None:
+        matches = scan_event(title, raw_text)
     
     region_display_names = {
         'europe': 'Europe',
@@ -194,11 +198,8 @@ def classify_region(title: str, raw_text: str = "", region_hint: Optional[str] =
     valid_regions = set(region_display_names.values()) | {'Russia', 'Global'}
     
     region_scores = {}
-    for region, keywords in REGION_MAPPINGS.items():
-        score = 0
-        for keyword in keywords:
-            if keyword in combined_text:
-                score += 1
+    for region in REGION_MAPPINGS:
+        score = matches.count(f'region:{region}')
         if score > 0:
             region_scores[region] = score
     
@@ -229,34 +230,37 @@ def classify_region(title: str, raw_text: str = "", region_hint: Optional[str] =
     
     return 'Global'
 
-def calculate_severity(title: str, raw_text: str = "") -> int:
-    combined_text = f"{title} {raw_text or ''}".lower()
+def calculate_severity(title: str, raw_text: str = "", matches: Optional[Matches] = None) -> int:
+    if matches is None:
+        matches = scan_event(title, raw_text)
     
     score = 2
     
-    for keyword in HIGH_SEVERITY_KEYWORDS:
-        if keyword in combined_text:
-            score += 2
-            break
+    if matches.any('severity:high'):
+        score += 2
     
-    for keyword in MEDIUM_SEVERITY_KEYWORDS:
-        if keyword in combined_text:
-            score += 1
-            break
+    if matches.any('severity:medium'):
+        score += 1
     
-    for keyword in OPEC_KEYWORDS:
-        if keyword in combined_text:
-            score += 1
-            break
+    if matches.any('severity:opec'):
+        score += 1
     
     return max(1, min(5, score))
 
-def classify_event(title: str, raw_text: str = "", category_hint: Optional[str] = None, signal_type: Optional[str] = None, region_hint: Optional[str] = None) -> Tuple[str, str, int, str, float]:
-    category, classification_reason, confidence = classify_category_with_reason(title, raw_text, category_hint, signal_type)
-    region = classify_region(title, raw_text, region_hint)
-    severity = calculate_severity(title, raw_text)
+def classify_event(title: str, raw_text: str = "", category_hint: Optional[str] = None, signal_type: Optional[str] = None, region_hint: Optional[str] = None,
+                   matches: Optional[Matches] = None) -> Tuple[str, str, int, str, float]:
+    """
+    Classify an event from one keyword scan of its text. Pass matches (from
+    scan_event) to share that scan with compute_signal_quality().
+    """
+    if matches is None:
+        matches = scan_event(title, raw_text)
+    
+    category, classification_reason, confidence = classify_category_with_reason(title, raw_text, category_hint, signal_type, matches)
+    region = classify_region(title, raw_text, region_hint, matches)
+    severity = calculate_severity(title, raw_text, matches)
     
-    thematic_category = classify_thematic_category(title, raw_text)
+    thematic_category = classify_thematic_category(title, raw_text, matches)
     
     classification_reason = f"{classification_reason};thematic={thematic_category}"
     
@@ -140,46 +140,11 @@ def _fetch_eurusd_from_yahoo(from_date: date, to_date: date) -> List[EURUSDSnaps
             auto_adjust=False,
         )
 
-        if hist is None or hist.empty:
+        snapshots = eurusd_snapshots_from_history(hist)
+        if not snapshots:
             logger.warning("No EUR/USD data returned from Yahoo")
             return []
 
-        snapshots: List[EURUSDSnapshot] = []
-        for idx, row in hist.iterrows():
-            try:
-                candle_date = idx.date().isoformat()
-            except Exception:
-                candle_date = str(idx)[:10]
-
-            try:
-                close_price = float(row.get("Close"))
-            except (ValueError, TypeError):
-                continue
-
-            if not close_price or close_price <= 0 or pd.isna(close_price):
-                continue
-
-            def _f(key):
-                try:
-                    v = float(row.get(key))
-                    return None if pd.isna(v) else v
-                except (ValueError, TypeError):
-                    return None
-
-            snapshots.append(EURUSDSnapshot(
-                date=candle_date,
-                rate=close_price,
-                currency_pair="EUR/USD",
-                source="yahoo",
-                raw_data={
-                    "open": _f("Open"),
-                    "high": _f("High"),
-                    "low": _f("Low"),
-                    "close": close_price,
-                    "granularity": "D",
-                },
-            ))
-
         logger.info(f"Fetched {len(snapshots)} EUR/USD points from Yahoo")
         return snapshots
 
@@ -188,6 +153,49 @@ def _fetch_eurusd_from_yahoo(from_date: date, to_date: date) -> List[EURUSDSnaps
         return []
 
 
+def eurusd_snapshots_from_history(hist) -> List[EURUSDSnapshot]:
+    """Convert a yfinance EURUSD=X daily frame (Ticker.history or one ticker of yf.download) to snapshots."""
+    if hist is None or hist.empty:
+        return []
+
+    snapshots: List[EURUSDSnapshot] = []
+    for idx, row in hist.iterrows():
+        try:
+            candle_date = idx.date().isoformat()
+        except Exception:
+            candle_date = str(idx)[:10]
+
+        try:
+            close_price = float(row.get("Close"))
+        except (ValueError, TypeError):
+            continue
+
+        if not close_price or close_price <= 0 or pd.isna(close_price):
+            continue
+
+        def _f(key):
+            try:
+                v = float(row.get(key))
+                return None if pd.isna(v) else v
+            except (ValueError, TypeError):
+                return None
+
+        snapshots.append(EURUSDSnapshot(
+            date=candle_date,
+            rate=close_price,
+            currency_pair="EUR/USD",
+            source="yahoo",
+            raw_data={
+                "open": _f("Open"),
+                "high": _f("High"),
+                "low": _f("Low"),
+                "close": close_price,
+                "granularity": "D",
+            },
+        ))
+    return snapshots
+
+
 def _fetch_eurusd_range_merged(from_date: date, to_date: date) -> Dict[str, EURUSDSnapshot]:
     """
     Fetch a date range from FRED (primary) and fill any gaps with Yahoo
@@ -228,22 +236,7 @@ def save_eurusd_snapshot(snapshot: EURUSDSnapshot) -> bool:
     """
     try:
         with get_cursor() as cursor:
-            cursor.execute("""
-                INSERT INTO eurusd_snapshots
-                (date, rate, currency_pair, source, raw_data)
-                VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT (date) DO UPDATE SET
-                    rate = EXCLUDED.rate,
-                    currency_pair = EXCLUDED.currency_pair,
-                    source = EXCLUDED.source,
-                    raw_data = EXCLUDED.raw_data
-            """, (
-                snapshot.date,
-                snapshot.rate,
-                snapshot.currency_pair,
-                snapshot.source,
-                json.dumps(snapshot.raw_data),
-            ))
+            upsert_eurusd_snapshots(cursor, [snapshot])
         logger.info(f"Saved EUR/USD snapshot for {snapshot.date}: {snapshot.rate:.6f} ({snapshot.source})")
         return True
     except Exception as e:
@@ -251,34 +244,39 @@ def save_eurusd_snapshot(snapshot: EURUSDSnapshot) -> bool:
         return False
 
 
+def upsert_eurusd_snapshots(cursor, snapshots: List[EURUSDSnapshot]) -> int:
+    """Upsert EUR/USD snapshots on the caller's cursor (and transaction)."""
+    for snapshot in snapshots:
+        cursor.execute("""
+            INSERT INTO eurusd_snapshots
+            (date, rate, currency_pair, source, raw_data)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (date) DO UPDATE SET
+                rate = EXCLUDED.rate,
+                currency_pair = EXCLUDED.currency_pair,
+                source = EXCLUDED.source,
+                raw_data = EXCLUDED.raw_data
+        """, (
+            snapshot.date,
+            snapshot.rate,
+            snapshot.currency_pair,
+            snapshot.source,
+            json.dumps(snapshot.raw_data),
+        ))
+    return len(snapshots)
+
+
 def _save_snapshots(snapshots: List[EURUSDSnapshot]) -> Dict[str, Any]:
     """Bulk upsert a list of snapshots. Returns counts and date range."""
-    saved = 0
     by_source: Dict[str, int] = {}
     dates_saved: List[str] = []
 
     try:
         with get_cursor() as cursor:
-            for snapshot in snapshots:
-                cursor.execute("""
-                    INSERT INTO eurusd_snapshots
-                    (date, rate, currency_pair, source, raw_data)
-                    VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT (date) DO UPDATE SET
-                        rate = EXCLUDED.rate,
-                        currency_pair = EXCLUDED.currency_pair,
-                        source = EXCLUDED.source,
-                        raw_data = EXCLUDED.raw_data
-                """, (
-                    snapshot.date,
-                    snapshot.rate,
-                    snapshot.currency_pair,
-                    snapshot.source,
-                    json.dumps(snapshot.raw_data),
-                ))
-                saved += 1
-                by_source[snapshot.source] = by_source.get(snapshot.source, 0) + 1
-                dates_saved.append(snapshot.date)
+            saved = upsert_eurusd_snapshots(cursor, snapshots)
+        for snapshot in snapshots:
+            by_source[snapshot.source] = by_source.get(snapshot.source, 0) + 1
+            dates_saved.append(snapshot.date)
     except Exception as e:
         logger.error(f"Failed to persist EUR/USD snapshots: {e}")
         return {"status": "error", "message": str(e)}
@@ -13,9 +13,12 @@ Data Source: https://agsi.gie.eu/
 import os
 import json
 import logging
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -23,6 +26,19 @@ logger = logging.getLogger(__name__)
 GIE_API_BASE = "https://agsi.gie.eu/api"
 GIE_API_KEY = os.environ.get("GIE_API_KEY", "")
 
+# AGSI+ allows 60 requests per minute per API key. All calls in the process
+# share one keep-alive session and one token bucket: up to GIE_RATE_BURST
+# requests start immediately, then starts are spaced to GIE_RATE_PER_MINUTE
+# (headroom for other users of the key). Up to GIE_MAX_CONCURRENCY requests
+# are in flight at once; a 429 or 5xx pauses the bucket (Retry-After when
+# given) and is retried up to GIE_MAX_RETRIES times.
+GIE_RATE_PER_MINUTE = float(os.environ.get("GIE_RATE_PER_MINUTE", "50"))
+GIE_RATE_BURST = int(os.environ.get("GIE_RATE_BURST", "10"))
+GIE_MAX_CONCURRENCY = int(os.environ.get("GIE_MAX_CONCURRENCY", "4"))
+GIE_MAX_RETRIES = 3
+GIE_TIMEOUT_SECONDS = 30
+GIE_PAGE_SIZE = 300  # AGSI+ maximum page size
+
 EU_STORAGE_TARGET_NOV1 = 90.0
 EU_STORAGE_TARGET_FEB1 = 45.0
 
@@ -96,22 +112,121 @@ class StorageMetrics:
     interpretation: str = ""
 
 
+class RateLimiter:
+    """Thread-safe token bucket: `burst` immediate starts, refilled at `rate_per_minute`."""
+
+    def __init__(self, rate_per_minute: float, burst: int = 1,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.per_second = rate_per_minute / 60.0
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until it is due; returns the seconds waited."""
+        if self.per_second <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.per_second)
+            self._updated = now
+            self._tokens -= 1.0
+            wait = max(-self._tokens / self.per_second, self._paused_until - now, 0.0)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request that has not started yet for `seconds`."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+def _retry_after(response) -> Optional[float]:
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AgsiClient:
+    """AGSI+ client over one pooled HTTP session, paced by a shared RateLimiter."""
+
+    def __init__(self, api_key: str = GIE_API_KEY, max_concurrency: int = GIE_MAX_CONCURRENCY,
+                 limiter: Optional[RateLimiter] = None, session=None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.limiter = limiter or RateLimiter(GIE_RATE_PER_MINUTE, GIE_RATE_BURST)
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.max_concurrency)
+            session.mount("https://", adapter)
+        session.headers.update({"x-key": api_key, "Accept": "application/json"})
+        self.session = session
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
+        """GET one AGSI+ endpoint; raises requests exceptions once retries are spent."""
+        url = f"{GIE_API_BASE}/{endpoint}"
+        for attempt in range(GIE_MAX_RETRIES + 1):
+            self.limiter.acquire()
+            response = self.session.get(url, params=params, timeout=GIE_TIMEOUT_SECONDS)
+            retryable = response.status_code == 429 or response.status_code >= 500
+            if retryable and attempt < GIE_MAX_RETRIES:
+                delay = _retry_after(response) or 2.0 ** attempt
+                logger.warning(f"GIE API returned {response.status_code}; retrying in {delay:.1f}s")
+                self.limiter.pause(delay)
+                continue
+            response.raise_for_status()
+            return response.json()
+
+    def fetch_range(self, endpoint: str, params: Dict, start: str, end: str) -> List[Dict]:
+        """Every entry from start to end (inclusive), following AGSI+ pagination."""
+        entries = []
+        page = 1
+        while True:
+            data = self.get(endpoint, {**params, "from": start, "to": end, "size": GIE_PAGE_SIZE, "page": page})
+            entries.extend(data.get("data") or [])
+            if page >= int(data.get("last_page") or 1):
+                return entries
+            page += 1
+
+    def map(self, fn: Callable[[str], Any], codes: List[str]) -> Dict[str, Any]:
+        """Run fn(code) for every code, max_concurrency at a time; failures map to their exception."""
+        def call(code):
+            try:
+                return fn(code)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(codes) or 1),
+                                thread_name_prefix="agsi") as pool:
+            return dict(zip(codes, pool.map(call, codes)))
+
+
+_client: Optional[AgsiClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> AgsiClient:
+    """The process-wide AGSI+ client (one session and one rate budget per API key)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = AgsiClient()
+        return _client
+
+
 def _make_api_request(endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
     """Make authenticated request to GIE AGSI+ API."""
     if not GIE_API_KEY:
         logger.warning("GIE_API_KEY not configured - using public endpoint")
     
-    url = f"{GIE_API_BASE}/{endpoint}"
-    headers = {
-        "x-key": GIE_API_KEY,
-        "Accept": "application/json"
-    }
-    
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        return get_client().get(endpoint, params)
+    except (requests.exceptions.RequestException, ValueError) as e:
         logger.error(f"GIE API request failed: {e}")
         return None
 
@@ -155,28 +270,7 @@ def fetch_eu_storage_data(date_str: Optional[str] = None) -> Optional[Dict[str,
     }
 
 
-def fetch_country_storage_data(country_code: str, date_str: Optional[str] = None) -> Optional[Dict]:
-    """
-    Fetch storage data for a specific country.
-
-    Note: AGSI+ requires the country as a query parameter (?country=DE). The
-    path-style endpoint (/api/de) silently returns the EU aggregate instead, so
-    we always pass `country` as a query param here.
-    """
-    params = {"country": country_code.upper()}
-    if date_str:
-        params["date"] = date_str
-
-    data = _make_api_request("", params)
-    
-    if not data or "data" not in data:
-        return None
-    
-    entries = data.get("data", [])
-    if not entries:
-        return None
-    
-    entry = entries[0]
+def _country_record(country_code: str, entry: Dict, date_str: Optional[str] = None) -> Dict:
     return {
         "country": country_code.upper(),
         "date": entry.get("gasDayStart", date_str),
@@ -189,6 +283,38 @@ def fetch_country_storage_data(country_code: str, date_str: Optional[str] = None
     }
 
 
+def _fetch_country(country_code: str, date_str: Optional[str] = None,
+                   client: Optional[AgsiClient] = None) -> Optional[Dict]:
+    """fetch_country_storage_data without the error handling: request failures raise."""
+    params = {"country": country_code.upper()}
+    if date_str:
+        params["date"] = date_str
+    entries = (client or get_client()).get("", params).get("data") or []
+    return _country_record(country_code, entries[0], date_str) if entries else None
+
+
+def fetch_country_storage_data(country_code: str, date_str: Optional[str] = None) -> Optional[Dict]:
+    """
+    Fetch storage data for a specific country.
+
+    Note: AGSI+ requires the country as a query parameter (?country=DE). The
+    path-style endpoint (/api/de) silently returns the EU aggregate instead, so
+    we always pass `country` as a query param here.
+    """
+    try:
+        return _fetch_country(country_code, date_str)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"GIE API request failed: {e}")
+        return None
+
+
+def fetch_country_storage_range(country_code: str, start: str, end: str,
+                                client: Optional[AgsiClient] = None) -> List[Dict]:
+    """Daily records for one country from start to end (inclusive), newest first."""
+    entries = (client or get_client()).fetch_range("", {"country": country_code.upper()}, start, end)
+    return [_country_record(country_code, e) for e in entries if e.get("gasDayStart")]
+
+
 def fetch_historical_storage(days: int = 7) -> List[Dict]:
     """Fetch historical EU storage data for trend analysis."""
     results = []
@@ -442,14 +568,72 @@ def generate_storage_alert(metrics: StorageMetrics) -> Optional[Dict[str, Any]]:
     }
 
 
+COUNTRY_UPSERT_SQL = """
+    INSERT INTO gas_storage_country_snapshots
+    (date, level, country_code, country_name, operator_code, facility_code,
+     storage_percent, gas_in_storage_twh, working_gas_volume_twh,
+     injection_twh, withdrawal_twh, trend, raw_data)
+    VALUES %s
+    ON CONFLICT (date, level, country_code, operator_code, facility_code)
+    DO UPDATE SET
+        country_name = EXCLUDED.country_name,
+        storage_percent = EXCLUDED.storage_percent,
+        gas_in_storage_twh = EXCLUDED.gas_in_storage_twh,
+        working_gas_volume_twh = EXCLUDED.working_gas_volume_twh,
+        injection_twh = EXCLUDED.injection_twh,
+        withdrawal_twh = EXCLUDED.withdrawal_twh,
+        trend = EXCLUDED.trend,
+        raw_data = EXCLUDED.raw_data
+"""
+
+COUNTRY_ROW_TEMPLATE = "(%s, 'country', %s, %s, '', '', %s, %s, %s, %s, %s, %s, %s)"
+
+
+def country_upsert_values(records: List[Dict]) -> List[tuple]:
+    """execute_values rows for COUNTRY_UPSERT_SQL, one per (date, country).
+
+    A multi-row ON CONFLICT upsert cannot touch the same row twice, so a
+    repeated (date, country) keeps its last record.
+    """
+    latest = {(r["date"], r["country"]): r for r in records if r.get("date")}
+    return [
+        (
+            r["date"],
+            r["country"],
+            COUNTRY_NAMES.get(r["country"], r["country"]),
+            r.get("full_percent"),
+            r.get("gas_in_storage_twh"),
+            r.get("working_gas_volume_twh"),
+            r.get("injection_twh"),
+            r.get("withdrawal_twh"),
+            r.get("trend"),
+            json.dumps(r),
+        )
+        for r in latest.values()
+    ]
+
+
+def upsert_country_storage(records: List[Dict]) -> int:
+    """Upsert country records into gas_storage_country_snapshots in one transaction."""
+    from psycopg2.extras import execute_values
+    from src.db.db import get_cursor
+
+    values = country_upsert_values(records)
+    if values:
+        with get_cursor() as cursor:
+            execute_values(cursor, COUNTRY_UPSERT_SQL, values, template=COUNTRY_ROW_TEMPLATE, page_size=1000)
+    return len(values)
+
+
 def ingest_country_storage(date_str: Optional[str] = None, countries: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Fetch per-country EU gas storage from AGSI+ and upsert into
     gas_storage_country_snapshots.
 
-    Iterates the requested countries (defaults to MAJOR_EU_COUNTRIES), one AGSI+
-    request per country, and persists each as a 'country'-level row. Designed to
-    run daily alongside the EU-aggregate storage ingestion.
+    Fetches the requested countries (defaults to MAJOR_EU_COUNTRIES)
+    concurrently through the shared AGSI+ client and writes every
+    'country'-level row in one multi-row upsert. Designed to run daily
+    alongside the EU-aggregate storage ingestion.
 
     Args:
         date_str: Gas day in YYYY-MM-DD format. Defaults to AGSI+'s latest (T-1).
@@ -458,67 +642,38 @@ def ingest_country_storage(date_str: Optional[str] = None, countries: Optional[L
     Returns:
         Dict with success/failed/skipped counts and the resolved data date.
     """
-    import time as _time
-    from src.db.db import get_cursor
-
-    target_countries = countries or MAJOR_EU_COUNTRIES
+    target_countries = [code.upper() for code in (countries or MAJOR_EU_COUNTRIES)]
     results = {"success": 0, "failed": 0, "skipped": 0, "data_date": None, "countries": []}
 
     if not GIE_API_KEY:
         logger.info("GIE_API_KEY not configured - skipping per-country storage ingestion")
         return {**results, "error": "api_key_not_configured"}
 
-    for code in target_countries:
-        try:
-            data = fetch_country_storage_data(code, date_str)
-            if not data:
-                logger.warning(f"No per-country storage data for {code} ({date_str or 'latest'})")
-                results["skipped"] += 1
-                continue
+    client = get_client()
+    fetched = client.map(lambda code: _fetch_country(code, date_str, client), target_countries)
 
-            data_date = data.get("date")
-            if not data_date:
-                results["skipped"] += 1
-                continue
-            results["data_date"] = data_date
-
-            with get_cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO gas_storage_country_snapshots
-                    (date, level, country_code, country_name, operator_code, facility_code,
-                     storage_percent, gas_in_storage_twh, working_gas_volume_twh,
-                     injection_twh, withdrawal_twh, trend, raw_data)
-                    VALUES (%s, 'country', %s, %s, '', '', %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (date, level, country_code, operator_code, facility_code)
-                    DO UPDATE SET
-                        country_name = EXCLUDED.country_name,
-                        storage_percent = EXCLUDED.storage_percent,
-                        gas_in_storage_twh = EXCLUDED.gas_in_storage_twh,
-                        working_gas_volume_twh = EXCLUDED.working_gas_volume_twh,
-                        injection_twh = EXCLUDED.injection_twh,
-                        withdrawal_twh = EXCLUDED.withdrawal_twh,
-                        trend = EXCLUDED.trend,
-                        raw_data = EXCLUDED.raw_data
-                """, (
-                    data_date,
-                    code.upper(),
-                    COUNTRY_NAMES.get(code.upper(), code.upper()),
-                    data.get("full_percent"),
-                    data.get("gas_in_storage_twh"),
-                    data.get("working_gas_volume_twh"),
-                    data.get("injection_twh"),
-                    data.get("withdrawal_twh"),
-                    data.get("trend"),
-                    json.dumps(data),
-                ))
-
-            results["success"] += 1
-            results["countries"].append(code.upper())
+    records = []
+    for code in target_countries:
+        data = fetched[code]
+        if isinstance(data, Exception):
+            logger.error(f"Failed per-country storage ingest for {code}: {data}")
+            results["failed"] += 1
+        elif not data or not data.get("date"):
+            logger.warning(f"No per-country storage data for {code} ({date_str or 'latest'})")
+            results["skipped"] += 1
+        else:
+            records.append(data)
             logger.info(f"  {code}: {data.get('full_percent')}% full")
-            _time.sleep(0.3)
+
+    if records:
+        try:
+            upsert_country_storage(records)
+            results["success"] = len(records)
+            results["countries"] = [r["country"] for r in records]
+            results["data_date"] = max(r["date"] for r in records)
         except Exception as e:
-            logger.error(f"Failed per-country storage ingest for {code}: {e}")
-            results["failed"] += 1
+            logger.error(f"Failed per-country storage upsert: {e}")
+            results["failed"] += len(records)
 
     logger.info(
         f"Per-country storage ingestion: {results['success']} ok, "
@@ -527,6 +682,44 @@ def ingest_country_storage(date_str: Optional[str] = None, countries: Optional[L
     return results
 
 
+def backfill_country_storage(start: str, end: str, countries: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Backfill gas_storage_country_snapshots for an inclusive date range.
+
+    One paginated AGSI+ range query per country (GIE_PAGE_SIZE days per
+    page), fetched concurrently, then a single upsert of every day.
+
+    Returns:
+        Dict with days fetched per country, failed countries and rows upserted.
+    """
+    target_countries = [code.upper() for code in (countries or MAJOR_EU_COUNTRIES)]
+    results = {"rows": 0, "countries": {}, "failed": []}
+
+    if not GIE_API_KEY:
+        logger.info("GIE_API_KEY not configured - skipping per-country storage backfill")
+        return {**results, "error": "api_key_not_configured"}
+
+    client = get_client()
+    fetched = client.map(lambda code: fetch_country_storage_range(code, start, end, client), target_countries)
+
+    records = []
+    for code in target_countries:
+        data = fetched[code]
+        if isinstance(data, Exception):
+            logger.error(f"Per-country storage backfill failed for {code}: {data}")
+            results["failed"].append(code)
+            continue
+        results["countries"][code] = len(data)
+        records.extend(data)
+
+    results["rows"] = upsert_country_storage(records)
+    logger.info(
+        f"Per-country storage backfill {start} -> {end}: {results['rows']} rows, "
+        f"{len(results['failed'])} countries failed"
+    )
+    return results
+
+
 def run_storage_check() -> Optional[Dict[str, Any]]:
     """
     Main entry point: Fetch current storage data and generate alert if needed.
@@ -12,6 +12,7 @@ from src.db.db import get_cursor, execute_one
 from src.db.migrations import run_migrations, run_signal_quality_migration
 from src.ingest.rss_fetcher import fetch_all_feeds
 from src.ingest.classifier import classify_event
+from src.ingest.keyword_matcher import scan_event
 from src.ingest.signal_quality import compute_signal_quality
 
 logging.basicConfig(
@@ -131,16 +132,18 @@ def run_ingestion():
                     continue
                 seen_titles.add(normalized)
                 
+                matches = scan_event(event['title'], event.get('raw_text', ''))
                 category, region, severity, classification_reason, confidence = classify_event(
                     event['title'], 
                     event.get('raw_text', ''),
                     event.get('category_hint'),
                     event.get('signal_type'),
-                    event.get('region_hint')
+                    event.get('region_hint'),
+                    matches=matches,
                 )
                 
                 signal_quality = compute_signal_quality(
-                    event, category, region, severity, confidence
+                    event, category, region, severity, confidence, matches=matches
                 )
                 
                 classification_reason = f"{classification_reason};sq={signal_quality['signal_score']};band={signal_quality['quality_band']};geri={signal_quality['is_geri_driver']}"
@@ -5,7 +5,13 @@ Primary source: Yahoo Finance (yfinance) — reliable, no key required.
 Fallback source: OilPriceAPI (used only if yfinance fails).
 
 Stores one row per commodity per hour in dedicated intraday tables.
-Data is for the CURRENT UTC day only — at midnight UTC, old data is deleted.
+Readers only serve the CURRENT UTC day. Rows older than
+INTRADAY_RETENTION_DAYS (default 1, i.e. today only) are pruned by the
+first capture of each UTC day rather than on every run.
+
+All tickers are fetched in one batched yfinance download (see
+src/ingest/market_capture.py) and all three tables are written in one
+transaction.
 
 Tables:
   - intraday_brent    (hour 0-23, price, captured_at)
@@ -18,15 +24,17 @@ Used by GERI Live for real-time asset context.
 import os
 import logging
 import requests
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from typing import Dict, Any, Optional, List
 
 from src.db.db import get_production_cursor, execute_production_query
+from src.ingest.market_capture import CaptureReport, quote_from_frames, yahoo_batch
 
 logger = logging.getLogger(__name__)
 
 OIL_PRICE_API_KEY = os.environ.get("OIL_PRICE_API_KEY", "")
 OIL_PRICE_API_BASE = "https://api.oilpriceapi.com/v1"
+INTRADAY_RETENTION_DAYS = max(1, int(os.environ.get("INTRADAY_RETENTION_DAYS", "1")))
 
 ASSET_CONFIGS = {
     'brent': {
@@ -76,38 +84,19 @@ def run_intraday_migration():
     logger.info("Intraday price tables migration complete")
 
 
-def _fetch_via_yfinance(ticker: str, prev_close: Optional[float] = None) -> Optional[Dict[str, Any]]:
-    try:
-        import yfinance as yf
-        t = yf.Ticker(ticker)
-        hist = t.history(period='1d', interval='1h')
-        if hist.empty:
-            logger.warning(f"yfinance returned empty history for {ticker}")
-            return None
-        close_series = hist['Close'].dropna()
-        if close_series.empty:
-            return None
-        price = float(close_series.iloc[-1])
-
-        if prev_close is None:
-            info = t.info
-            prev_close = info.get('previousClose') or info.get('regularMarketPreviousClose')
-
-        change_24h = None
-        change_pct = None
-        if prev_close:
-            change_24h = round(price - float(prev_close), 4)
-            change_pct = round((change_24h / float(prev_close)) * 100, 4)
-
-        return {
-            'price': price,
-            'change_24h': change_24h,
-            'change_pct': change_pct,
-            'source': 'yfinance',
-        }
-    except Exception as e:
-        logger.error(f"yfinance fetch failed for {ticker}: {e}")
-        return None
+def _fetch_via_yfinance(tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Latest hourly price and 24h change for every ticker from two batched
+    downloads: today's 1h bars, and recent daily bars for the previous close.
+    """
+    hourly = yahoo_batch(tickers, period='1d', interval='1h')
+    daily = yahoo_batch(list(hourly), period='5d', interval='1d') if hourly else {}
+    quotes = {}
+    for ticker, frame in hourly.items():
+        quote = quote_from_frames(frame, daily.get(ticker))
+        if quote:
+            quotes[ticker] = quote
+    return quotes
 
 
 def _fetch_via_oilpriceapi(code: str) -> Optional[Dict[str, Any]]:
@@ -145,31 +134,45 @@ def _fetch_via_oilpriceapi(code: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def _cleanup_old_data(table: str, today: date):
-    with get_production_cursor(commit=True) as cursor:
-        cursor.execute(f"DELETE FROM {table} WHERE date < %s", (today,))
+_pruned_on: Optional[date] = None
+
+
+def _prune_expired(cursor, today: date) -> bool:
+    """TTL prune, once per UTC day per process (the per-run DELETE was a no-op 23 times a day)."""
+    if _pruned_on == today:
+        return False
+    cutoff = today - timedelta(days=INTRADAY_RETENTION_DAYS - 1)
+    for cfg in ASSET_CONFIGS.values():
+        cursor.execute(f"DELETE FROM {cfg['table']} WHERE date < %s", (cutoff,))
+    return True
 
 
-def _store_hourly_price(table: str, today: date, hour: int, price: float,
-                        change_24h: Optional[float], change_pct: Optional[float],
-                        source: str):
+def _store_hourly_prices(today: date, hour: int, prices: Dict[str, Dict[str, Any]]):
+    """Upsert this hour's price for every captured asset in one transaction."""
+    global _pruned_on
     with get_production_cursor(commit=True) as cursor:
-        cursor.execute(f"""
-            INSERT INTO {table} (date, hour, price, change_24h, change_pct, source, captured_at)
-            VALUES (%s, %s, %s, %s, %s, %s, NOW())
-            ON CONFLICT (date, hour) DO UPDATE SET
-                price = EXCLUDED.price,
-                change_24h = EXCLUDED.change_24h,
-                change_pct = EXCLUDED.change_pct,
-                source = EXCLUDED.source,
-                captured_at = NOW()
-        """, (today, hour, price, change_24h, change_pct, source))
+        pruned = _prune_expired(cursor, today)
+        for key, price_data in prices.items():
+            cursor.execute(f"""
+                INSERT INTO {ASSET_CONFIGS[key]['table']} (date, hour, price, change_24h, change_pct, source, captured_at)
+                VALUES (%s, %s, %s, %s, %s, %s, NOW())
+                ON CONFLICT (date, hour) DO UPDATE SET
+                    price = EXCLUDED.price,
+                    change_24h = EXCLUDED.change_24h,
+                    change_pct = EXCLUDED.change_pct,
+                    source = EXCLUDED.source,
+                    captured_at = NOW()
+            """, (today, hour, price_data['price'], price_data.get('change_24h'),
+                  price_data.get('change_pct'), price_data['source']))
+    if pruned:
+        _pruned_on = today
 
 
 def capture_intraday_prices() -> Dict[str, Any]:
     now_utc = datetime.utcnow()
     today = now_utc.date()
     current_hour = now_utc.hour
+    report = CaptureReport()
 
     results = {
         'date': today.isoformat(),
@@ -178,27 +181,34 @@ def capture_intraday_prices() -> Dict[str, Any]:
         'assets': {},
     }
 
-    for key, cfg in ASSET_CONFIGS.items():
-        table = cfg['table']
-        _cleanup_old_data(table, today)
+    tickers = {cfg['yf_ticker']: key for key, cfg in ASSET_CONFIGS.items()}
+    with report.timed('yfinance'):
+        quotes = _fetch_via_yfinance(list(tickers))
 
-        price_data = _fetch_via_yfinance(cfg['yf_ticker'])
+    prices: Dict[str, Dict[str, Any]] = {}
+    for key, cfg in ASSET_CONFIGS.items():
+        price_data = quotes.get(cfg['yf_ticker'])
         if not price_data:
             logger.warning(f"yfinance failed for {key}, trying OilPriceAPI fallback")
-            price_data = _fetch_via_oilpriceapi(cfg['oilapi_code'])
+            price_data = report.call('oilpriceapi', _fetch_via_oilpriceapi, cfg['oilapi_code'])
 
         if not price_data:
             results['assets'][key] = {'status': 'failed', 'error': 'all sources failed'}
             continue
-
-        _store_hourly_price(
-            table, today, current_hour,
-            price_data['price'],
-            price_data.get('change_24h'),
-            price_data.get('change_pct'),
-            price_data['source'],
-        )
-
+        prices[key] = price_data
+
+    if prices:
+        try:
+            with report.timed('db_write'):
+                _store_hourly_prices(today, current_hour, prices)
+        except Exception as e:
+            logger.error(f"Failed to store intraday prices: {e}")
+            for key in prices:
+                results['assets'][key] = {'status': 'failed', 'error': f"store failed: {e}"}
+            prices = {}
+
+    for key, price_data in prices.items():
+        cfg = ASSET_CONFIGS[key]
         results['assets'][key] = {
             'status': 'captured',
             'price': price_data['price'],
@@ -209,6 +219,8 @@ def capture_intraday_prices() -> Dict[str, Any]:
         }
         logger.info(f"Intraday {cfg['label']}: ${price_data['price']} at hour {current_hour} UTC (source={price_data['source']})")
 
+    results['latency'] = report.to_dict()
+    logger.info(f"Intraday capture: {report.summary()}")
     return results
 
 
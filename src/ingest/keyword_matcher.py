@@ -0,0 +1,141 @@
+"""
+Precompiled keyword matcher for event classification and signal quality.
+
+classifier.py and signal_quality.py score every ingested event against
+about 20 keyword families (category, region, severity and thematic
+keywords, named entities, noise and relevance terms) with `keyword in
+text`, i.e. one pass over the lowercased text per keyword.
+
+KeywordMatcher indexes all families up front and tokenizes the text
+once. A keyword without whitespace is a substring of the text exactly
+when it is a substring of one whitespace-delimited token, so each
+distinct token is resolved to the keywords it contains (cached across
+events, since news vocabulary repeats heavily); multi-word keywords are
+only checked against the text when all of their words were found.
+Matches answers every family's count/found query from that one scan.
+Semantics are those of the substring checks it replaces: case-insensitive,
+no word boundaries ('oil' still matches 'soil'), each keyword counted
+once however often it occurs, found keywords returned in their family's
+declared order.
+
+scan_event() is the shared entry point: ingest_runner scans each event
+once and passes the result to both classify_event() and
+compute_signal_quality().
+"""
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+
+class Matches:
+    """Keywords found by one KeywordMatcher.scan(), queryable per family."""
+
+    __slots__ = ('keywords', '_matcher', '_hits')
+
+    def __init__(self, matcher: 'KeywordMatcher', keywords: frozenset, hits: Dict[str, List[int]]):
+        self.keywords = keywords
+        self._matcher = matcher
+        self._hits = hits
+
+    def count(self, family: str) -> int:
+        """Number of the family's keywords present in the text."""
+        return len(self._hits.get(family, ()))
+
+    def found(self, family: str) -> List[str]:
+        """The family's keywords present in the text, in declared order."""
+        declared = self._matcher.families[family]
+        return [declared[i] for i in sorted(self._hits.get(family, ()))]
+
+    def any(self, family: str) -> bool:
+        return family in self._hits
+
+
+class KeywordMatcher:
+    """One tokenized scan for many named keyword lists."""
+
+    def __init__(self, families: Mapping[str, Sequence[str]], token_cache_size: int = 50000):
+        self.families: Dict[str, Tuple[str, ...]] = {
+            name: tuple(keyword.lower() for keyword in keywords) for name, keywords in families.items()
+        }
+        self._postings: Dict[str, List[Tuple[str, int]]] = {}
+        for name, keywords in self.families.items():
+            for i, keyword in enumerate(keywords):
+                self._postings.setdefault(keyword, []).append((name, i))
+
+        # Pieces are what a single token can contain: whole single-word
+        # keywords, and the words of multi-word keywords (phrases). Each
+        # phrase is keyed on its longest word, the most selective one.
+        self._words = frozenset(k for k in self._postings if len(k.split()) == 1 and k == k.strip())
+        self._phrases: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = {}
+        pieces = set(self._words)
+        for keyword in self._postings:
+            if keyword not in self._words:
+                words = tuple(keyword.split())
+                pieces.update(words)
+                self._phrases.setdefault(max(words, key=len), []).append((keyword, words))
+        self._pieces = frozenset(pieces)
+        self._min_len = min(map(len, pieces), default=1)
+        self._max_len = max(map(len, pieces), default=0)
+        self._token_cache: Dict[str, frozenset] = {}
+        self._token_cache_size = token_cache_size
+
+    def _token_pieces(self, token: str) -> frozenset:
+        hit = self._token_cache.get(token)
+        if hit is None:
+            pieces, n = self._pieces, len(token)
+            hit = frozenset(
+                token[i:j]
+                for i in range(n - self._min_len + 1)
+                for j in range(i + self._min_len, min(n, i + self._max_len) + 1)
+                if token[i:j] in pieces
+            )
+            if len(self._token_cache) >= self._token_cache_size:
+                self._token_cache.clear()
+            self._token_cache[token] = hit
+        return hit
+
+    def scan(self, text: Optional[str]) -> Matches:
+        lowered = (text or '').lower()
+        pieces = set()
+        for token in set(lowered.split()):
+            pieces |= self._token_pieces(token)
+
+        found = pieces & self._words
+        for key in pieces.intersection(self._phrases):
+            for phrase, words in self._phrases[key]:
+                if phrase not in found and pieces.issuperset(words) and phrase in lowered:
+                    found.add(phrase)
+
+        hits: Dict[str, List[int]] = {}
+        for keyword in found:
+            for family, i in self._postings[keyword]:
+                hits.setdefault(family, []).append(i)
+        return Matches(self, frozenset(found), hits)
+
+
+@lru_cache(maxsize=1)
+def event_matcher() -> KeywordMatcher:
+    """The matcher over every classifier and signal-quality keyword family."""
+    from src.ingest import classifier, signal_quality
+
+    families: Dict[str, Sequence[str]] = {
+        'category:geopolitical': classifier.GEOPOLITICAL_KEYWORDS,
+        'category:energy': classifier.ENERGY_KEYWORDS,
+        'category:supply_chain': classifier.SUPPLY_CHAIN_KEYWORDS,
+        'category:regulatory': classifier.REGULATORY_KEYWORDS,
+        'severity:high': classifier.HIGH_SEVERITY_KEYWORDS,
+        'severity:medium': classifier.MEDIUM_SEVERITY_KEYWORDS,
+        'severity:opec': classifier.OPEC_KEYWORDS,
+        'noise': signal_quality.NOISE_INDICATORS,
+        'energy_relevance': signal_quality.ENERGY_RELEVANCE_BOOSTERS,
+        'persistence:structural': signal_quality.STRUCTURAL_KEYWORDS,
+        'persistence:medium': signal_quality.MEDIUM_PERSISTENCE_KEYWORDS,
+    }
+    families.update({f'region:{k}': v for k, v in classifier.REGION_MAPPINGS.items()})
+    families.update({f'thematic:{k}': v for k, v in classifier.THEMATIC_CATEGORY_KEYWORDS.items()})
+    families.update({f'entity:{k}': v for k, v in signal_quality.NAMED_ENTITIES.items()})
+    return KeywordMatcher(families)
+
+
+def scan_event(title: Optional[str], raw_text: Optional[str] = "") -> Matches:
+    """Scan an event's title and body once for every keyword family."""
+    return event_matcher().scan(f"{title or ''} {raw_text or ''}")
@@ -0,0 +1,266 @@
+"""
+Market Data Capture Stage
+
+Batched capture for the Yahoo Finance market series, replacing one
+yf.Ticker().history() session per ticker:
+
+- yahoo_batch(): one yf.download() for every ticker a stage needs (yfinance
+  fetches them on its own threads over one session and crumb). Tickers that
+  come back empty are retried together, MARKET_CAPTURE_RETRIES times with
+  exponential backoff, before the caller falls back to its secondary source.
+- CaptureReport: per-source call count, error count and latency for one
+  run, returned with the job result and logged as a single line.
+- capture_daily_market_data(): the /run/market-data stage. Yahoo (VIX and
+  EUR/USD in one download), FRED EUR/USD and OilPriceAPI TTF are fetched
+  concurrently; FRED VIX is only called when Yahoo has no VIX. All three
+  tables are written in one transaction.
+
+The hourly Brent/WTI/NatGas capture (src/ingest/intraday_prices.py) uses
+the same helpers.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MARKET_CAPTURE_RETRIES = int(os.environ.get('MARKET_CAPTURE_RETRIES', '2'))
+MARKET_CAPTURE_BACKOFF_SECONDS = float(os.environ.get('MARKET_CAPTURE_BACKOFF_SECONDS', '2'))
+
+VIX_TICKER = '^VIX'
+DAILY_WINDOW_DAYS = 12
+
+
+class CaptureReport:
+    """Latency and outcome per source for one capture run (thread-safe)."""
+
+    def __init__(self):
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def timed(self, source: str):
+        started = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                entry = self.sources.setdefault(source, {'calls': 0, 'errors': 0, 'latency_ms': 0.0})
+                entry['calls'] += 1
+                entry['errors'] += int(failed)
+                entry['latency_ms'] = round(entry['latency_ms'] + elapsed_ms, 1)
+
+    def call(self, source: str, fn: Callable, *args, **kwargs):
+        with self.timed(source):
+            return fn(*args, **kwargs)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: dict(entry) for name, entry in self.sources.items()}
+
+    def summary(self) -> str:
+        return ', '.join(f"{name} {entry['latency_ms']:.0f}ms" + (f" ({entry['errors']} errors)" if entry['errors'] else '')
+                         for name, entry in self.to_dict().items())
+
+
+def ticker_frame(data, ticker: str):
+    """One ticker's OHLC rows (with a Close) from a yf.download(group_by='ticker') result, or None."""
+    if data is None or getattr(data, 'empty', True):
+        return None
+    columns = data.columns
+    if getattr(columns, 'nlevels', 1) > 1:
+        if ticker not in columns.get_level_values(0):
+            return None
+        frame = data[ticker]
+    else:
+        frame = data
+    if 'Close' not in frame.columns:
+        return None
+    frame = frame.dropna(subset=['Close'])
+    return None if frame.empty else frame
+
+
+def yahoo_batch(tickers: Iterable[str], retries: int = MARKET_CAPTURE_RETRIES,
+                backoff: float = MARKET_CAPTURE_BACKOFF_SECONDS, download: Optional[Callable] = None,
+                sleep: Callable[[float], None] = time.sleep, **params) -> Dict[str, Any]:
+    """
+    Download tickers in one yfinance request; returns {ticker: frame} for
+    those with data. Missing tickers are retried as one smaller batch.
+
+    params are passed to yf.download (period/interval or start/end).
+    """
+    if download is None:
+        import yfinance as yf
+        download = yf.download
+
+    frames: Dict[str, Any] = {}
+    pending = list(dict.fromkeys(tickers))
+    for attempt in range(retries + 1):
+        if attempt:
+            sleep(backoff * 2 ** (attempt - 1))
+        try:
+            data = download(pending, group_by='ticker', auto_adjust=False, progress=False,
+                            threads=True, multi_level_index=True, **params)
+        except Exception as e:
+            logger.warning(f"yfinance batch download failed for {', '.join(pending)}: {e}")
+            continue
+        for ticker in pending:
+            frame = ticker_frame(data, ticker)
+            if frame is not None:
+                frames[ticker] = frame
+        pending = [t for t in pending if t not in frames]
+        if not pending:
+            break
+    if pending:
+        logger.warning(f"yfinance returned no data for {', '.join(pending)}")
+    return frames
+
+
+def last_close(frame) -> Optional[float]:
+    closes = frame['Close'].dropna() if frame is not None else ()
+    return float(closes.iloc[-1]) if len(closes) else None
+
+
+def previous_close(daily_frame) -> Optional[float]:
+    """Close of the session before the latest daily bar (what Ticker.info's previousClose reports)."""
+    closes = daily_frame['Close'].dropna() if daily_frame is not None else ()
+    return float(closes.iloc[-2]) if len(closes) >= 2 else None
+
+
+def quote_from_frames(hourly_frame, daily_frame) -> Optional[Dict[str, Any]]:
+    """Latest hourly price with its change vs the previous session's close."""
+    price = last_close(hourly_frame)
+    if price is None:
+        return None
+    prev = previous_close(daily_frame)
+    change_24h = round(price - prev, 4) if prev else None
+    change_pct = round(change_24h / prev * 100, 4) if prev else None
+    return {'price': price, 'change_24h': change_24h, 'change_pct': change_pct, 'source': 'yfinance'}
+
+
+def _existing_dates(target_date: str) -> Dict[str, bool]:
+    from src.db.db import execute_one
+
+    row = execute_one("""
+        SELECT EXISTS (SELECT 1 FROM ttf_gas_snapshots WHERE date = %(d)s) AS ttf,
+               EXISTS (SELECT 1 FROM eurusd_snapshots WHERE date = %(d)s) AS eurusd
+    """, {'d': target_date})
+    return dict(row) if row else {'ttf': False, 'eurusd': False}
+
+
+def capture_daily_market_data() -> Dict[str, Any]:
+    """
+    Daily VIX, TTF gas and EUR/USD capture for the GERI chart overlays.
+
+    Same sources and fallbacks as the per-series capture functions, with
+    one Yahoo download, concurrent source fetches and one write transaction.
+    TTF and EUR/USD are skipped when yesterday's row already exists.
+    """
+    from src.db.db import get_cursor
+    from src.ingest import eurusd, market_data, ttf_gas
+
+    report = CaptureReport()
+    target_date = (datetime.utcnow() - timedelta(days=1)).strftime("%Y-%m-%d")
+    target = date.fromisoformat(target_date)
+    existing = _existing_dates(target_date)
+    window_start = target - timedelta(days=DAILY_WINDOW_DAYS)
+
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix='market') as pool:
+        yahoo_future = pool.submit(
+            report.call, 'yfinance', yahoo_batch, [VIX_TICKER, eurusd.YAHOO_TICKER],
+            start=window_start.isoformat(), end=(date.today() + timedelta(days=1)).isoformat(), interval='1d',
+        )
+        ttf_future = None if existing['ttf'] else pool.submit(report.call, 'oilpriceapi', ttf_gas.fetch_ttf_gas_price)
+        fred_future = None if existing['eurusd'] else pool.submit(
+            report.call, 'fred_eurusd', eurusd._fetch_eurusd_from_fred, window_start, target)
+        frames = yahoo_future.result()
+        ttf_snapshot = ttf_future.result() if ttf_future else None
+        fred_rates = fred_future.result() if fred_future else []
+
+    vix_snapshots = market_data.vix_snapshots_from_history(frames.get(VIX_TICKER))
+    vix_source = 'yfinance'
+    if not vix_snapshots:
+        logger.warning("yfinance failed, falling back to FRED for VIX data")
+        vix_source = 'fred'
+        vix_snapshots = report.call('fred_vix', market_data.fetch_vix_from_fred, 7)
+
+    eurusd_match = None
+    if not existing['eurusd']:
+        eurusd_match = next((s for s in fred_rates if s.date == target_date), None)
+        if eurusd_match is None:
+            yahoo_rates = eurusd.eurusd_snapshots_from_history(frames.get(eurusd.YAHOO_TICKER))
+            eurusd_match = next((s for s in yahoo_rates if s.date == target_date), None)
+
+    write_error = None
+    try:
+        with report.timed('db_write'), get_cursor() as cursor:
+            market_data.upsert_vix_snapshots(cursor, vix_snapshots)
+            if ttf_snapshot:
+                ttf_gas.upsert_ttf_gas_snapshot(cursor, ttf_snapshot)
+            if eurusd_match:
+                eurusd.upsert_eurusd_snapshots(cursor, [eurusd_match])
+    except Exception as e:
+        logger.error(f"Failed to write daily market data: {e}")
+        write_error = str(e)
+
+    results = {
+        'vix': _vix_result(vix_snapshots, vix_source, write_error),
+        'ttf': _ttf_result(target_date, existing['ttf'], ttf_snapshot, write_error),
+        'eurusd': _eurusd_result(target_date, existing['eurusd'], eurusd_match,
+                                 bool(fred_rates) or eurusd.YAHOO_TICKER in frames, write_error),
+    }
+    logger.info(f"Daily market capture: {report.summary()}")
+    return {
+        'sources': results,
+        'success_count': sum(1 for r in results.values() if r['status'] in ('success', 'skipped')),
+        'total_sources': len(results),
+        'latency': report.to_dict(),
+    }
+
+
+def _vix_result(snapshots: List, source: str, write_error: Optional[str]) -> Dict[str, Any]:
+    if not snapshots:
+        return {'status': 'error', 'message': 'Failed to fetch VIX data from both Yahoo Finance and FRED', 'count': 0}
+    if write_error:
+        return {'status': 'error', 'message': write_error, 'count': 0}
+    return {'status': 'success', 'message': f"Captured {len(snapshots)} VIX snapshots via {source}",
+            'count': len(snapshots)}
+
+
+def _ttf_result(target_date: str, existed: bool, snapshot, write_error: Optional[str]) -> Dict[str, Any]:
+    if existed:
+        return {'status': 'skipped', 'message': f"Snapshot already exists for {target_date}",
+                'date': target_date, 'price': None}
+    if not snapshot:
+        return {'status': 'error', 'message': 'Failed to fetch TTF gas price from API',
+                'date': target_date, 'price': None}
+    if write_error:
+        return {'status': 'error', 'message': write_error, 'date': target_date, 'price': None}
+    return {'status': 'success', 'message': f"Captured TTF gas price for {target_date}",
+            'date': target_date, 'price': snapshot.ttf_price}
+
+
+def _eurusd_result(target_date: str, existed: bool, match, fetched_any: bool,
+                   write_error: Optional[str]) -> Dict[str, Any]:
+    if existed:
+        return {'status': 'skipped', 'message': f"Snapshot already exists for {target_date}",
+                'date': target_date, 'rate': None}
+    if match is None:
+        if fetched_any:
+            return {'status': 'skipped', 'message': f"No EUR/USD observation for {target_date} (weekend/holiday)",
+                    'date': target_date, 'rate': None}
+        return {'status': 'error',
+                'message': f"Failed to fetch EUR/USD rate for {target_date} (FRED and Yahoo both failed)",
+                'date': target_date, 'rate': None}
+    if write_error:
+        return {'status': 'error', 'message': write_error, 'date': target_date, 'rate': None}
+    return {'status': 'success', 'message': f"Captured EUR/USD rate for {match.date}",
+            'date': match.date, 'rate': match.rate}
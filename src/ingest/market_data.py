@@ -65,21 +65,11 @@ def fetch_vix_data(days: int = 30) -> List[VIXSnapshot]:
         
         hist = vix.history(start=start_date, end=end_date)
         
-        if hist.empty:
+        snapshots = vix_snapshots_from_history(hist)
+        if not snapshots:
             logger.warning("No VIX data returned from yfinance")
             return []
         
-        snapshots = []
-        for idx, row in hist.iterrows():
-            date_str = pd.Timestamp(idx).strftime("%Y-%m-%d")
-            snapshots.append(VIXSnapshot(
-                date=date_str,
-                vix_close=float(row.get('Close') or 0),
-                vix_open=float(row.get('Open') or 0),
-                vix_high=float(row.get('High') or 0),
-                vix_low=float(row.get('Low') or 0)
-            ))
-        
         logger.info(f"Fetched {len(snapshots)} VIX data points")
         return snapshots
         
@@ -88,6 +78,24 @@ def fetch_vix_data(days: int = 30) -> List[VIXSnapshot]:
         return []
 
 
+def vix_snapshots_from_history(hist) -> List[VIXSnapshot]:
+    """Convert a yfinance ^VIX OHLC frame (Ticker.history or one ticker of yf.download) to snapshots."""
+    if hist is None or hist.empty:
+        return []
+    
+    snapshots = []
+    for idx, row in hist.iterrows():
+        date_str = pd.Timestamp(idx).strftime("%Y-%m-%d")
+        snapshots.append(VIXSnapshot(
+            date=date_str,
+            vix_close=float(row.get('Close') or 0),
+            vix_open=float(row.get('Open') or 0),
+            vix_high=float(row.get('High') or 0),
+            vix_low=float(row.get('Low') or 0)
+        ))
+    return snapshots
+
+
 def fetch_vix_from_fred(days: int = 30) -> List[VIXSnapshot]:
     """
     Fetch VIX closing data from FRED (Federal Reserve Bank of St. Louis).
@@ -257,36 +265,41 @@ def save_vix_snapshots(snapshots: List[VIXSnapshot]) -> int:
     if not snapshots:
         return 0
     
-    saved = 0
     try:
         with get_cursor() as cursor:
-            for snapshot in snapshots:
-                cursor.execute("""
-                    INSERT INTO vix_snapshots 
-                    (date, vix_close, vix_open, vix_high, vix_low, source)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (date) DO UPDATE SET
-                        vix_close = EXCLUDED.vix_close,
-                        vix_open = EXCLUDED.vix_open,
-                        vix_high = EXCLUDED.vix_high,
-                        vix_low = EXCLUDED.vix_low,
-                        source = EXCLUDED.source
-                """, (
-                    snapshot.date,
-                    snapshot.vix_close,
-                    snapshot.vix_open,
-                    snapshot.vix_high,
-                    snapshot.vix_low,
-                    snapshot.source
-                ))
-                saved += 1
+            saved = upsert_vix_snapshots(cursor, snapshots)
         logger.info(f"Saved {saved} VIX snapshots")
     except Exception as e:
         logger.error(f"Failed to save VIX snapshots: {e}")
+        saved = 0
     
     return saved
 
 
+def upsert_vix_snapshots(cursor, snapshots: List[VIXSnapshot]) -> int:
+    """Upsert VIX snapshots on the caller's cursor (and transaction)."""
+    for snapshot in snapshots:
+        cursor.execute("""
+            INSERT INTO vix_snapshots 
+            (date, vix_close, vix_open, vix_high, vix_low, source)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON CONFLICT (date) DO UPDATE SET
+                vix_close = EXCLUDED.vix_close,
+                vix_open = EXCLUDED.vix_open,
+                vix_high = EXCLUDED.vix_high,
+                vix_low = EXCLUDED.vix_low,
+                source = EXCLUDED.source
+        """, (
+            snapshot.date,
+            snapshot.vix_close,
+            snapshot.vix_open,
+            snapshot.vix_high,
+            snapshot.vix_low,
+            snapshot.source
+        ))
+    return len(snapshots)
+
+
 def save_freight_snapshots(snapshots: List[FreightSnapshot]) -> int:
     """
     DISABLED: Baltic Dry Index (BDI) requires paid subscription.
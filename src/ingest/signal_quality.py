@@ -4,6 +4,8 @@ import logging
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, Tuple
 
+from src.ingest.keyword_matcher import Matches, scan_event
+
 logger = logging.getLogger(__name__)
 
 SOURCE_CREDIBILITY = {
@@ -88,6 +90,9 @@ ENERGY_RELEVANCE_BOOSTERS = [
     "demand shock", "winter supply", "gas storage", "strategic reserve"
 ]
 
+STRUCTURAL_KEYWORDS = ["permanent", "structural", "long-term", "fundamental", "systemic", "irreversible"]
+MEDIUM_PERSISTENCE_KEYWORDS = ["ongoing", "continuing", "multi-day", "extended", "sustained", "prolonged"]
+
 TAXONOMY_BASE_SEVERITY = {
     "war": 1.0,
     "military": 0.9,
@@ -126,14 +131,12 @@ def _compute_freshness(event_time: Optional[datetime], half_life_hours: float =
     return math.exp(-delta_hours / half_life_hours)
 
 
-def _compute_entity_specificity(text: str) -> Tuple[float, list]:
-    text_lower = text.lower()
+def _compute_entity_specificity(matches: Matches) -> Tuple[float, list]:
     found_entities = []
 
-    for entity_type, entities in NAMED_ENTITIES.items():
-        for entity in entities:
-            if entity in text_lower:
-                found_entities.append({"type": entity_type, "entity": entity})
+    for entity_type in NAMED_ENTITIES:
+        for entity in matches.found(f"entity:{entity_type}"):
+            found_entities.append({"type": entity_type, "entity": entity})
 
     if not found_entities:
         return 0.2, found_entities
@@ -145,19 +148,17 @@ def _compute_entity_specificity(text: str) -> Tuple[float, list]:
     return score, found_entities
 
 
-def _compute_energy_relevance(text: str, category_hint: Optional[str] = None,
+def _compute_energy_relevance(matches: Matches, category_hint: Optional[str] = None,
                                signal_type: Optional[str] = None) -> float:
-    text_lower = text.lower()
-
-    matches = sum(1 for term in ENERGY_RELEVANCE_BOOSTERS if term in text_lower)
+    hits = matches.count("energy_relevance")
 
-    if matches == 0:
+    if hits == 0:
         base = 0.15
-    elif matches <= 2:
+    elif hits <= 2:
         base = 0.4
-    elif matches <= 5:
+    elif hits <= 5:
         base = 0.65
-    elif matches <= 10:
+    elif hits <= 10:
         base = 0.8
     else:
         base = 0.95
@@ -170,10 +171,8 @@ def _compute_energy_relevance(text: str, category_hint: Optional[str] = None,
     return round(base, 3)
 
 
-def _compute_noise_penalty(title: str, raw_text: str = "") -> float:
-    combined = f"{title} {raw_text or ''}".lower()
-
-    noise_hits = sum(1 for indicator in NOISE_INDICATORS if indicator in combined)
+def _compute_noise_penalty(matches: Matches) -> float:
+    noise_hits = matches.count("noise")
 
     if noise_hits == 0:
         return 0.0
@@ -186,7 +185,7 @@ def _compute_noise_penalty(title: str, raw_text: str = "") -> float:
 
 
 def _compute_severity(thematic_category: str, region: str,
-                       classifier_severity: int, text: str) -> float:
+                       classifier_severity: int, matches: Matches) -> float:
     base = TAXONOMY_BASE_SEVERITY.get(thematic_category, 0.50)
 
     exposure = REGION_ENERGY_EXPOSURE.get(region, 0.60)
@@ -194,13 +193,9 @@ def _compute_severity(thematic_category: str, region: str,
     classifier_factor = classifier_severity / 5.0
 
     persistence = 0.6
-    text_lower = text.lower()
-    structural_keywords = ["permanent", "structural", "long-term", "fundamental", "systemic", "irreversible"]
-    medium_keywords = ["ongoing", "continuing", "multi-day", "extended", "sustained", "prolonged"]
-
-    if any(kw in text_lower for kw in structural_keywords):
+    if matches.any("persistence:structural"):
         persistence = 1.0
-    elif any(kw in text_lower for kw in medium_keywords):
+    elif matches.any("persistence:medium"):
         persistence = 0.8
 
     severity = base * exposure * persistence * (0.4 + 0.6 * classifier_factor)
@@ -224,7 +219,12 @@ def compute_signal_quality(event: Dict[str, Any],
                             thematic_category: str,
                             region: str,
                             classifier_severity: int,
-                            classifier_confidence: float) -> Dict[str, Any]:
+                            classifier_confidence: float,
+                            matches: Optional[Matches] = None) -> Dict[str, Any]:
+    """
+    Score an event's signal quality. Pass matches (from scan_event) to reuse
+    the keyword scan classify_event() already made.
+    """
     title = event.get("title", "")
     raw_text = event.get("raw_text", "") or ""
     source_name = event.get("source_name", "")
@@ -233,19 +233,20 @@ def compute_signal_quality(event: Dict[str, Any],
     signal_type = event.get("signal_type")
     source_weight = event.get("weight", 0.5)
 
-    combined_text = f"{title} {raw_text}"
+    if matches is None:
+        matches = scan_event(title, raw_text)
 
     credibility = _get_source_credibility(source_name)
 
     freshness = _compute_freshness(event_time)
 
-    entity_specificity, entities_found = _compute_entity_specificity(combined_text)
+    entity_specificity, entities_found = _compute_entity_specificity(matches)
 
-    energy_relevance = _compute_energy_relevance(combined_text, category_hint, signal_type)
+    energy_relevance = _compute_energy_relevance(matches, category_hint, signal_type)
 
-    noise_penalty = _compute_noise_penalty(title, raw_text)
+    noise_penalty = _compute_noise_penalty(matches)
 
-    severity = _compute_severity(thematic_category, region, classifier_severity, combined_text)
+    severity = _compute_severity(thematic_category, region, classifier_severity, matches)
 
     market_relevance = _compute_market_relevance(
         severity, region, thematic_category, len(entities_found)
@@ -0,0 +1 @@
+"""Ingest Tests"""
@@ -0,0 +1,126 @@
+"""
+Unit tests for the concurrent AGSI+ client and per-country storage ingestion.
+"""
+import threading
+
+import pytest
+import requests
+
+from src.ingest import gie_agsi
+from src.ingest.gie_agsi import AgsiClient, RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} error")
+
+
+class FakeSession:
+    """Answers AGSI+ requests from handler(params) and records them."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.headers = {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        with self._lock:
+            self.calls.append(dict(params or {}))
+        return self.handler(params or {})
+
+
+def _entry(day, full=50.0):
+    return {"gasDayStart": day, "full": str(full), "gasInStorage": "100.5", "injection": "1.2",
+            "withdrawal": "0", "workingGasVolume": "200", "trend": "0.3"}
+
+
+def _client(handler):
+    return AgsiClient(api_key="k", max_concurrency=4, limiter=RateLimiter(0), session=FakeSession(handler))
+
+
+def test_rate_limiter_allows_a_burst_then_spaces_requests():
+    clock = FakeClock()
+    limiter = RateLimiter(60, burst=3, clock=clock, sleep=clock.sleep)
+    waits = [limiter.acquire() for _ in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(1.0) and clock.now == pytest.approx(2.0)
+    clock.now += 10
+    assert limiter.acquire() == 0.0
+    limiter.pause(5)
+    assert limiter.acquire() == pytest.approx(5.0)
+
+
+def test_fetch_range_follows_pagination():
+    pages = {1: [_entry("2026-03-03"), _entry("2026-03-02")], 2: [_entry("2026-03-01")]}
+    client = _client(lambda p: FakeResponse(payload={"last_page": 2, "data": pages[p["page"]]}))
+    records = gie_agsi.fetch_country_storage_range("de", "2026-03-01", "2026-03-03", client)
+    assert [r["date"] for r in records] == ["2026-03-03", "2026-03-02", "2026-03-01"]
+    assert records[0]["country"] == "DE" and records[0]["full_percent"] == 50.0
+    assert [c["page"] for c in client.session.calls] == [1, 2]
+    assert client.session.calls[0]["size"] == gie_agsi.GIE_PAGE_SIZE
+    assert client.session.calls[0]["from"] == "2026-03-01" and client.session.calls[0]["country"] == "DE"
+
+
+def test_get_retries_rate_limited_responses_with_retry_after():
+    responses = iter([FakeResponse(429, headers={"Retry-After": "7"}), FakeResponse(payload={"data": []})])
+    client = _client(lambda p: next(responses))
+    paused = []
+    client.limiter.pause = paused.append
+    assert client.get("", {"country": "DE"}) == {"data": []}
+    assert paused == [7.0]
+
+
+def test_ingest_fetches_concurrently_and_upserts_once(monkeypatch):
+    def handler(params):
+        code = params["country"]
+        if code == "IT":
+            return FakeResponse(500)
+        if code == "FR":
+            return FakeResponse(payload={"data": []})
+        return FakeResponse(payload={"data": [_entry("2026-03-03", full=61.5)]})
+
+    client = _client(handler)
+    upserts = []
+    monkeypatch.setattr(gie_agsi, "GIE_API_KEY", "k")
+    monkeypatch.setattr(gie_agsi, "get_client", lambda: client)
+    monkeypatch.setattr(gie_agsi, "upsert_country_storage", lambda records: upserts.append(records) or len(records))
+
+    result = gie_agsi.ingest_country_storage("2026-03-03", ["de", "it", "fr", "nl"])
+    assert result["success"] == 2 and result["failed"] == 1 and result["skipped"] == 1
+    assert result["countries"] == ["DE", "NL"] and result["data_date"] == "2026-03-03"
+    assert len(upserts) == 1 and [r["country"] for r in upserts[0]] == ["DE", "NL"]
+    assert sum(1 for c in client.session.calls if c["country"] == "IT") == gie_agsi.GIE_MAX_RETRIES + 1
+
+
+def test_upsert_values_keep_one_row_per_day_and_country():
+    records = [
+        gie_agsi._country_record("DE", _entry("2026-03-01", full=40)),
+        gie_agsi._country_record("DE", _entry("2026-03-01", full=41)),
+        gie_agsi._country_record("AT", _entry("2026-03-01", full=70)),
+    ]
+    values = gie_agsi.country_upsert_values(records)
+    assert [(v[0], v[1], v[2], v[3]) for v in values] == [
+        ("2026-03-01", "DE", "Germany", 41.0),
+        ("2026-03-01", "AT", "Austria", 70.0),
+    ]
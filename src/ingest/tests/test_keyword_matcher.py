@@ -0,0 +1,54 @@
+"""
+Unit tests for the precompiled keyword matcher behind classification and signal quality.
+"""
+import random
+
+from src.ingest.classifier import classify_event
+from src.ingest.keyword_matcher import KeywordMatcher, event_matcher, scan_event
+from src.ingest.signal_quality import compute_signal_quality
+
+
+def _naive(families, text):
+    lowered = text.lower()
+    return {name: [k for k in keywords if k in lowered] for name, keywords in families.items()}
+
+
+def test_matches_substrings_phrases_and_declared_order():
+    matcher = KeywordMatcher({
+        'energy': ['oil price', 'oil', 'gas'],
+        'chokepoints': ['strait of hormuz', 'red sea', 'suez'],
+        'orgs': ['opec+', 'opec', 'eu'],
+    })
+    matches = matcher.scan("OPEC+ says Soil-gas near the Strait of  Hormuz; EUROPE eyes Red Sea, oil price")
+    assert matches.found('energy') == ['oil price', 'oil', 'gas']
+    assert matches.found('chokepoints') == ['red sea']
+    assert matches.found('orgs') == ['opec+', 'opec', 'eu']
+    assert matches.count('chokepoints') == 1 and not matches.any('missing')
+    assert matcher.scan(None).count('energy') == 0
+
+
+def test_event_matcher_agrees_with_per_keyword_scans():
+    matcher = event_matcher()
+    rng = random.Random(3)
+    vocab = sorted({k for family in matcher.families.values() for k in family})
+    filler = ['the', 'soil', 'software', 'europe', 'said', 'of', 'Warning:', 'rail-disruption', '\n']
+    for _ in range(300):
+        text = ' '.join(rng.choice(vocab).upper() if rng.random() < 0.2 else rng.choice(vocab + filler)
+                        for _ in range(rng.randint(0, 40)))
+        matches = matcher.scan(text)
+        for name, expected in _naive(matcher.families, text).items():
+            assert matches.found(name) == expected, (name, text)
+
+
+def test_shared_scan_gives_the_same_classification_and_score():
+    event = {'title': 'Missile attack halts Druzhba pipeline flows as Russia extends outage',
+             'raw_text': 'Brent and TTF gas price spike; ongoing supply disruption hits EU refinery runs.',
+             'source_name': 'Reuters Energy', 'weight': 0.8}
+    alone = classify_event(event['title'], event['raw_text'])
+    matches = scan_event(event['title'], event['raw_text'])
+    shared = classify_event(event['title'], event['raw_text'], matches=matches)
+    assert shared == alone and alone[0] == 'supply_disruption' and alone[1] == 'Black Sea'
+
+    scored = compute_signal_quality(event, alone[0], alone[1], alone[2], alone[4], matches=matches)
+    assert scored == compute_signal_quality(event, alone[0], alone[1], alone[2], alone[4])
+    assert {'type': 'pipelines', 'entity': 'druzhba'} in scored['entities_found']
@@ -0,0 +1,74 @@
+"""
+Unit tests for the batched Yahoo Finance market data capture.
+"""
+import pandas as pd
+import pytest
+
+from src.ingest import market_capture
+from src.ingest.market_capture import CaptureReport, quote_from_frames, yahoo_batch
+
+
+def _bars(closes, freq='D'):
+    index = pd.date_range('2026-03-02', periods=len(closes), freq=freq)
+    return pd.DataFrame({'Open': closes, 'High': closes, 'Low': closes, 'Close': closes,
+                         'Adj Close': closes, 'Volume': 0}, index=index)
+
+
+def _download_result(frames):
+    """Shape of yf.download(group_by='ticker'): (ticker, field) columns, NaN for missing tickers."""
+    return pd.concat(frames, axis=1)
+
+
+class FakeDownload:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def __call__(self, tickers, **params):
+        self.calls.append((list(tickers), params))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def test_batch_splits_tickers_and_retries_only_the_missing_ones():
+    first = _download_result({'BZ=F': _bars([80.0, 81.0]), 'NG=F': _bars([float('nan')] * 2)})
+    download = FakeDownload(first, RuntimeError('rate limited'), _download_result({'NG=F': _bars([3.1])}))
+    sleeps = []
+    frames = yahoo_batch(['BZ=F', 'NG=F', 'BZ=F'], retries=2, backoff=1, download=download,
+                         sleep=sleeps.append, period='1d', interval='1h')
+    assert sorted(frames) == ['BZ=F', 'NG=F']
+    assert list(frames['BZ=F']['Close']) == [80.0, 81.0]
+    assert [c[0] for c in download.calls] == [['BZ=F', 'NG=F'], ['NG=F'], ['NG=F']]
+    assert download.calls[0][1]['group_by'] == 'ticker' and download.calls[0][1]['interval'] == '1h'
+    assert sleeps == [1, 2]
+
+
+def test_batch_gives_up_after_retries():
+    download = FakeDownload(pd.DataFrame(), pd.DataFrame())
+    assert yahoo_batch(['^VIX'], retries=1, download=download, sleep=lambda s: None) == {}
+    assert len(download.calls) == 2
+
+
+def test_quote_uses_previous_daily_close():
+    quote = quote_from_frames(_bars([70.0, 72.5], freq='h'), _bars([68.0, 70.0, 71.0]))
+    assert quote == {'price': 72.5, 'change_24h': 2.5, 'change_pct': pytest.approx(3.5714), 'source': 'yfinance'}
+    assert quote_from_frames(_bars([70.0], freq='h'), None)['change_pct'] is None
+    assert quote_from_frames(None, None) is None
+
+
+def test_report_accumulates_latency_and_errors():
+    report = CaptureReport()
+    assert report.call('fred', lambda x: x * 2, 21) == 42
+    with pytest.raises(ValueError):
+        with report.timed('fred'):
+            raise ValueError('boom')
+    entry = report.to_dict()['fred']
+    assert entry['calls'] == 2 and entry['errors'] == 1 and entry['latency_ms'] >= 0
+    assert report.summary().startswith('fred ') and '(1 errors)' in report.summary()
+
+
+def test_ticker_frame_accepts_flat_single_ticker_frames():
+    assert list(market_capture.ticker_frame(_bars([1.09]), 'EURUSD=X')['Close']) == [1.09]
+    assert market_capture.ticker_frame(_download_result({'^VIX': _bars([15.0])}), 'EURUSD=X') is None
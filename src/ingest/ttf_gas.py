@@ -170,24 +170,7 @@ def save_ttf_gas_snapshot(snapshot: TTFGasSnapshot) -> bool:
     """
     try:
         with get_cursor() as cursor:
-            cursor.execute("""
-                INSERT INTO ttf_gas_snapshots 
-                (date, ttf_price, currency, unit, source, raw_data)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                ON CONFLICT (date) DO UPDATE SET
-                    ttf_price = EXCLUDED.ttf_price,
-                    currency = EXCLUDED.currency,
-                    unit = EXCLUDED.unit,
-                    source = EXCLUDED.source,
-                    raw_data = EXCLUDED.raw_data
-            """, (
-                snapshot.date,
-                snapshot.ttf_price,
-                snapshot.currency,
-                snapshot.unit,
-                snapshot.source,
-                json.dumps(snapshot.raw_data)
-            ))
+            upsert_ttf_gas_snapshot(cursor, snapshot)
         logger.info(f"Saved TTF gas snapshot for {snapshot.date}")
         return True
     except Exception as e:
@@ -195,6 +178,28 @@ def save_ttf_gas_snapshot(snapshot: TTFGasSnapshot) -> bool:
         return False
 
 
+def upsert_ttf_gas_snapshot(cursor, snapshot: TTFGasSnapshot) -> None:
+    """Upsert one TTF snapshot on the caller's cursor (and transaction)."""
+    cursor.execute("""
+        INSERT INTO ttf_gas_snapshots 
+        (date, ttf_price, currency, unit, source, raw_data)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON CONFLICT (date) DO UPDATE SET
+            ttf_price = EXCLUDED.ttf_price,
+            currency = EXCLUDED.currency,
+            unit = EXCLUDED.unit,
+            source = EXCLUDED.source,
+            raw_data = EXCLUDED.raw_data
+    """, (
+        snapshot.date,
+        snapshot.ttf_price,
+        snapshot.currency,
+        snapshot.unit,
+        snapshot.source,
+        json.dumps(snapshot.raw_data)
+    ))
+
+
 def capture_ttf_gas_snapshot() -> Dict[str, Any]:
     """
     Main entry point: Fetch and store TTF gas price.
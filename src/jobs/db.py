@@ -0,0 +1,168 @@
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from src.db.db import get_cursor, execute_one, execute_query
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+# First key of the two-key advisory lock claim_job() takes per job name
+# (two-key locks never collide with the single-key job/migration locks).
+JOB_CLAIM_LOCK_NAMESPACE = 7301
+
+_JOB_COLUMNS = """
+    id, name, label, status, progress, result, error, instance,
+    created_at, started_at, finished_at, heartbeat_at
+"""
+
+
+def run_jobs_migration():
+    logger.info("Running internal jobs migration...")
+    with get_cursor() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS internal_jobs (
+                id UUID PRIMARY KEY,
+                name VARCHAR(64) NOT NULL,
+                label VARCHAR(128),
+                status VARCHAR(16) NOT NULL DEFAULT 'queued',
+                progress JSONB,
+                result JSONB,
+                error TEXT,
+                instance VARCHAR(128),
+                created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                started_at TIMESTAMP,
+                finished_at TIMESTAMP,
+                heartbeat_at TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_internal_jobs_name_created
+            ON internal_jobs (name, created_at DESC)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_internal_jobs_active
+            ON internal_jobs (name) WHERE status IN ('queued', 'running')
+        """)
+    logger.info("Internal jobs migration complete.")
+
+
+def _serialize(row) -> Optional[Dict]:
+    if not row:
+        return None
+    job = dict(row)
+    job['id'] = str(job['id'])
+    for key in ('created_at', 'started_at', 'finished_at', 'heartbeat_at'):
+        if job.get(key):
+            job[key] = job[key].isoformat()
+    return job
+
+
+def claim_job(job_id: str, name: str, label: Optional[str], instance: str,
+              stale_seconds: int) -> Tuple[Dict, bool]:
+    """
+    Create a queued job named `name` unless one is already active. Returns
+    (job, created); created is False when the active job is returned instead.
+
+    The check and the insert run in one transaction under a transaction-level
+    advisory lock on the job name, so concurrent submits (other workers or
+    instances) cannot both create a job. Active jobs whose owner stopped
+    heartbeating are marked 'lost' first so they don't block a new run.
+    """
+    with get_cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s, hashtext(%s))", (JOB_CLAIM_LOCK_NAMESPACE, name))
+        cursor.execute("""
+            UPDATE internal_jobs
+            SET status = 'lost', finished_at = NOW(),
+                error = 'Job owner stopped reporting (instance stopped or restarted)'
+            WHERE name = %s
+              AND status IN ('queued', 'running')
+              AND heartbeat_at < NOW() - make_interval(secs => %s)
+        """, (name, stale_seconds))
+        cursor.execute(f"""
+            SELECT {_JOB_COLUMNS}
+            FROM internal_jobs
+            WHERE name = %s AND status IN ('queued', 'running')
+            ORDER BY created_at DESC
+            LIMIT 1
+        """, (name,))
+        active = cursor.fetchone()
+        if active:
+            return _serialize(active), False
+        cursor.execute(f"""
+            INSERT INTO internal_jobs (id, name, label, status, instance, heartbeat_at)
+            VALUES (%s, %s, %s, 'queued', %s, NOW())
+            RETURNING {_JOB_COLUMNS}
+        """, (job_id, name, label, instance))
+        return _serialize(cursor.fetchone()), True
+
+
+def mark_running(job_id: str) -> None:
+    execute_query("""
+        UPDATE internal_jobs
+        SET status = 'running', started_at = NOW(), heartbeat_at = NOW()
+        WHERE id = %s
+    """, (job_id,), fetch=False)
+
+
+def heartbeat(job_ids: List[str]) -> None:
+    if not job_ids:
+        return
+    execute_query("""
+        UPDATE internal_jobs SET heartbeat_at = NOW()
+        WHERE id = ANY(%s::uuid[]) AND status IN ('queued', 'running')
+    """, (list(job_ids),), fetch=False)
+
+
+def update_progress(job_id: str, fields: Dict) -> None:
+    execute_query("""
+        UPDATE internal_jobs
+        SET progress = COALESCE(progress, '{}'::jsonb) || %s::jsonb, heartbeat_at = NOW()
+        WHERE id = %s
+    """, (json.dumps(fields, default=str), job_id), fetch=False)
+
+
+def finish_job(job_id: str, status: str, result: Optional[Dict], error: Optional[str] = None) -> None:
+    execute_query("""
+        UPDATE internal_jobs
+        SET status = %s, result = %s::jsonb, error = %s, finished_at = NOW(), heartbeat_at = NOW()
+        WHERE id = %s
+    """, (status, json.dumps(result, default=str) if result is not None else None, error, job_id), fetch=False)
+
+
+def get_job(job_id: str, stale_seconds: int) -> Optional[Dict]:
+    """
+    Fetch a job. An active job whose owner stopped heartbeating (the
+    instance was stopped or crashed mid-run) is marked 'lost' first.
+    """
+    execute_query("""
+        UPDATE internal_jobs
+        SET status = 'lost', finished_at = NOW(),
+            error = 'Job owner stopped reporting (instance stopped or restarted)'
+        WHERE id = %s
+          AND status IN ('queued', 'running')
+          AND heartbeat_at < NOW() - make_interval(secs => %s)
+    """, (job_id, stale_seconds), fetch=False)
+    row = execute_one(f"SELECT {_JOB_COLUMNS} FROM internal_jobs WHERE id = %s", (job_id,))
+    return _serialize(row)
+
+
+def list_jobs(limit: int = 50, name: Optional[str] = None, status: Optional[str] = None) -> List[Dict]:
+    conditions, params = [], []
+    if name:
+        conditions.append("name = %s")
+        params.append(name)
+    if status:
+        conditions.append("status = %s")
+        params.append(status)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    params.append(limit)
+    rows = execute_query(f"""
+        SELECT {_JOB_COLUMNS}
+        FROM internal_jobs
+        {where}
+        ORDER BY created_at DESC
+        LIMIT %s
+    """, tuple(params))
+    return [_serialize(row) for row in rows or []]
@@ -0,0 +1,189 @@
+"""
+Background job runner for the /internal/run/* endpoints.
+
+A POST to a run endpoint records a job in internal_jobs and hands it to a
+thread pool in the same process, then returns the job id straight away;
+the request thread is not held while the job runs. Callers follow the job
+at GET /internal/jobs/{id}, optionally long-polling with ?wait=N (the
+status endpoint is async, so a waiting caller holds no worker thread).
+
+Jobs keep the per-job advisory locks of run_job_with_lock(): the lock is
+taken by the worker thread for the duration of the run. Submitting a job
+whose name already has an active job returns that job instead of queueing
+a second one; the check and the insert are one locked transaction, so
+concurrent submits from several workers still queue a single job.
+
+Each process heartbeats the jobs it owns every JOB_HEARTBEAT_SECONDS. A
+job whose owner stops heartbeating for JOB_STALE_SECONDS (instance scaled
+down or restarted mid-run) is reported as 'lost' rather than running
+forever.
+
+Long-running jobs can publish progress with report_progress(done=3, total=10).
+"""
+import asyncio
+import contextvars
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '4'))
+JOB_HEARTBEAT_SECONDS = float(os.environ.get('JOB_HEARTBEAT_SECONDS', '30'))
+JOB_STALE_SECONDS = int(os.environ.get('JOB_STALE_SECONDS', '180'))
+JOB_MAX_WAIT_SECONDS = int(os.environ.get('JOB_MAX_WAIT_SECONDS', '900'))
+
+TERMINAL_STATUSES = ('ok', 'busy', 'error', 'lost')
+
+# Final job status -> HTTP status the synchronous endpoints used to return.
+HTTP_STATUS = {'ok': 200, 'busy': 409, 'error': 500, 'lost': 500}
+
+_current_job: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('current_job', default=None)
+
+
+def _default_store():
+    from src.jobs import db
+    return db
+
+
+def job_status(result) -> str:
+    """Map a job function's return value to a final job status."""
+    status = result.get('status') if isinstance(result, dict) else None
+    return status if status in ('busy', 'error') else 'ok'
+
+
+class JobRunner:
+    """Runs submitted jobs on a thread pool and records them in internal_jobs."""
+
+    def __init__(self, workers: int = JOB_WORKERS, store=None,
+                 heartbeat_seconds: float = JOB_HEARTBEAT_SECONDS,
+                 stale_seconds: int = JOB_STALE_SECONDS):
+        self.workers = workers
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_seconds = stale_seconds
+        self.instance = f"{socket.gethostname()}:{os.getpid()}"
+        self._store = store
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._owned: Set[str] = set()
+        self._lock = threading.Lock()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = _default_store()
+        return self._store
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job')
+            return self._executor
+
+    def submit(self, name: str, fn: Callable[[], Dict], label: Optional[str] = None) -> Tuple[Dict, bool]:
+        """
+        Queue fn() as job `name`. Returns (job, created); created is False
+        when an active job with the same name was returned instead.
+        """
+        job, created = self.store.claim_job(str(uuid.uuid4()), name, label, self.instance, self.stale_seconds)
+        if not created:
+            return job, False
+
+        with self._lock:
+            self._owned.add(job['id'])
+        self._ensure_heartbeat()
+        self._pool().submit(self._execute, job['id'], name, fn)
+        return job, True
+
+    def _execute(self, job_id: str, name: str, fn: Callable[[], Dict]) -> None:
+        token = _current_job.set(job_id)
+        started = time.monotonic()
+        try:
+            self.store.mark_running(job_id)
+            result = fn()
+            self.store.finish_job(job_id, job_status(result), result if isinstance(result, dict) else {})
+            logger.info(f"Job {name} {job_id} finished in {time.monotonic() - started:.1f}s")
+        except Exception as e:
+            logger.error(f"Job {name} {job_id} failed: {e}")
+            try:
+                self.store.finish_job(job_id, 'error', None, str(e))
+            except Exception as store_error:
+                logger.error(f"Could not record failure of job {job_id}: {store_error}")
+        finally:
+            _current_job.reset(token)
+            with self._lock:
+                self._owned.discard(job_id)
+
+    def _ensure_heartbeat(self) -> None:
+        with self._lock:
+            if self._heartbeat_thread is not None:
+                return
+            self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name='job-heartbeat', daemon=True)
+            self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stopped.wait(self.heartbeat_seconds):
+            with self._lock:
+                owned = list(self._owned)
+            if not owned:
+                continue
+            try:
+                self.store.heartbeat(owned)
+            except Exception as e:
+                logger.warning(f"Job heartbeat failed: {e}")
+
+    def report_progress(self, job_id: str, fields: Dict) -> None:
+        try:
+            self.store.update_progress(job_id, fields)
+        except Exception as e:
+            logger.debug(f"Progress update for job {job_id} failed: {e}")
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
+
+
+def shutdown_job_runner() -> None:
+    if _runner is not None:
+        _runner.shutdown()
+
+
+def report_progress(**fields) -> None:
+    """Publish progress for the job running on this thread; no-op elsewhere."""
+    job_id = _current_job.get()
+    if job_id and _runner is not None:
+        _runner.report_progress(job_id, fields)
+
+
+async def wait_for_job(job_id: str, wait: float, poll: float = 0.5) -> Optional[Dict]:
+    """Long-poll a job until it finishes or `wait` seconds pass."""
+    from src.db.async_db import run_db
+
+    runner = get_job_runner()
+    deadline = time.monotonic() + max(0.0, min(wait, JOB_MAX_WAIT_SECONDS))
+    while True:
+        job = await run_db(runner.store.get_job, job_id, runner.stale_seconds)
+        remaining = deadline - time.monotonic()
+        if job is None or job['status'] in TERMINAL_STATUSES or remaining <= 0:
+            return job
+        await asyncio.sleep(min(poll, remaining))
+        poll = min(poll * 1.5, 5.0)
@@ -0,0 +1 @@
+"""Job Runner Tests"""
@@ -0,0 +1,106 @@
+"""
+Unit tests for the background job runner.
+"""
+import threading
+
+from src.jobs import runner as runner_module
+from src.jobs.runner import HTTP_STATUS, TERMINAL_STATUSES, JobRunner, job_status, report_progress
+
+
+class FakeStore:
+    """In-memory stand-in for src.jobs.db."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.finished = threading.Event()
+
+    def claim_job(self, job_id, name, label, instance, stale_seconds):
+        for job in self.jobs.values():
+            if job['name'] == name and job['status'] in ('queued', 'running'):
+                return job, False
+        self.jobs[job_id] = {'id': job_id, 'name': name, 'label': label, 'status': 'queued',
+                             'instance': instance, 'progress': None, 'result': None, 'error': None}
+        return self.jobs[job_id], True
+
+    def mark_running(self, job_id):
+        self.jobs[job_id]['status'] = 'running'
+
+    def heartbeat(self, job_ids):
+        pass
+
+    def update_progress(self, job_id, fields):
+        self.jobs[job_id]['progress'] = {**(self.jobs[job_id]['progress'] or {}), **fields}
+
+    def finish_job(self, job_id, status, result, error=None):
+        self.jobs[job_id].update(status=status, result=result, error=error)
+        self.finished.set()
+
+
+def _runner():
+    store = FakeStore()
+    return JobRunner(workers=1, store=store, heartbeat_seconds=60), store
+
+
+def test_job_status_mapping():
+    assert job_status({'status': 'success'}) == 'ok'
+    assert job_status({'status': 'busy'}) == 'busy'
+    assert job_status({'status': 'error', 'error': 'boom'}) == 'error'
+    assert job_status(None) == 'ok'
+    assert set(HTTP_STATUS) == set(TERMINAL_STATUSES)
+
+
+def test_submit_runs_job_and_records_result():
+    runner, store = _runner()
+    job, created = runner.submit('geri', lambda: {'status': 'success', 'rows': 3}, label='GERI')
+    assert created
+    assert store.finished.wait(5)
+    runner.shutdown()
+
+    record = store.jobs[job['id']]
+    assert record['status'] == 'ok'
+    assert record['result'] == {'status': 'success', 'rows': 3}
+    assert record['label'] == 'GERI'
+
+
+def test_submit_returns_active_job_instead_of_queueing_another():
+    runner, store = _runner()
+    release = threading.Event()
+    first, created = runner.submit('eeri', lambda: release.wait(5) and {'status': 'success'})
+    second, created_again = runner.submit('eeri', lambda: {'status': 'success'})
+    release.set()
+    assert store.finished.wait(5)
+    runner.shutdown()
+
+    assert created and not created_again
+    assert second['id'] == first['id']
+    assert len(store.jobs) == 1
+
+
+def test_exception_is_recorded_as_error():
+    runner, store = _runner()
+
+    def failing():
+        raise RuntimeError('boom')
+
+    job, _ = runner.submit('egsi', failing)
+    assert store.finished.wait(5)
+    runner.shutdown()
+
+    assert store.jobs[job['id']]['status'] == 'error'
+    assert store.jobs[job['id']]['error'] == 'boom'
+
+
+def test_report_progress_targets_the_running_job(monkeypatch):
+    runner, store = _runner()
+    monkeypatch.setattr(runner_module, '_runner', runner)
+
+    def job():
+        report_progress(stage='pages', done=2, total=5)
+        return {'status': 'success'}
+
+    record, _ = runner.submit('seo', job)
+    assert store.finished.wait(5)
+    runner.shutdown()
+
+    assert store.jobs[record['id']]['progress'] == {'stage': 'pages', 'done': 2, 'total': 5}
+    report_progress(done=1)  # outside a job: no-op
@@ -13,11 +13,14 @@ logger = logging.getLogger(__name__)
 
 def main():
     parser = argparse.ArgumentParser(description='EnergyRiskIQ Pipeline')
-    parser.add_argument('--mode', choices=['api', 'ingest', 'ai', 'risk', 'alerts', 'digest', 'geri', 'migrate_plans'], default='api',
-                        help='Run mode: api (start server), ingest (run ingestion), ai (run AI processing), risk (run risk scoring), alerts (run alerts engine), digest (run daily digest), geri (compute daily GERI index), migrate_plans (migrate user plans)')
+    parser.add_argument('--mode', choices=['api', 'ingest', 'ai', 'risk', 'alerts', 'digest', 'geri', 'migrate', 'migrate_plans'], default='api',
+                        help='Run mode: api (start server), ingest (run ingestion), ai (run AI processing), risk (run risk scoring), alerts (run alerts engine), digest (run daily digest), geri (compute daily GERI index), migrate (apply pending schema migrations), migrate_plans (migrate user plans)')
     
     args = parser.parse_args()
     
+    from src.db.query_metrics import enable_query_metrics
+    enable_query_metrics()
+    
     if args.mode == 'api':
         import uvicorn
         from src.api.app import app
@@ -31,6 +34,8 @@ def main():
     
     elif args.mode == 'ai':
         from src.ai.ai_worker import run_ai_worker
+        from src.db.migrations import run_migrations
+        run_migrations()
         run_ai_worker()
     
     elif args.mode == 'risk':
@@ -70,6 +75,11 @@ def main():
             else:
                 logger.info("GERI computation skipped (already exists or no data)")
     
+    elif args.mode == 'migrate':
+        from src.db.migration_ledger import apply_pending
+        applied = apply_pending()
+        logger.info(f"Applied {len(applied)} migrations" + (f": {', '.join(applied)}" if applied else ""))
+    
     elif args.mode == 'migrate_plans':
         from src.db.migrations import ensure_user_plans_table
         from src.plans.plan_helpers import migrate_user_plans
@@ -0,0 +1,3 @@
+"""
+Market data helpers shared across the index, dashboard and research modules.
+"""
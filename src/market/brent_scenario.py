@@ -0,0 +1,459 @@
+"""
+Brent Scenario Engine
+
+The scenario model behind /api/brent-forecast/scenario, /scenario/advanced
+and the GERI Live Brent engine, plus the history-derived parts it serves
+with every slider move: the GERI/VIX -> Brent sensitivity regression, the
+GERI shift episodes mined from index history, and the analogs matched to
+a scenario.
+
+The history-derived parts only change when a new data day lands, so they
+are built once per data day into a ScenarioArtifact: the regression, the
+episodes and a grid of analog matches for every whole-point scenario
+shift the sliders can produce (GERI -50..+100 plus twice a supply
+preset's shock). The artifact is a compact .npz stored in
+brent_scenario_artifacts, so one worker builds it and the others load it;
+each worker then keeps it in memory until the data day moves.
+
+Scenario projections themselves (compute_scenario) are closed-form in
+Brent and the summed driver impacts, so they are computed exactly per
+request rather than tabulated. Off-grid analog requests (a fractional
+GERI change from the API) are matched exactly against the artifact's
+episodes.
+"""
+import io
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Elasticities: % Brent response per 100% driver change, dampened by horizon.
+GERI_ELASTICITY = 0.085
+VIX_ELASTICITY = -0.028   # rising fear alone weighs on demand outlook
+GAS_ELASTICITY = 0.030
+SUPPLY_SHOCKS = {          # preset → direct % impact on Brent
+    "normal": 0.0, "opec_cut": 4.5, "hormuz": 12.0,
+    "pipeline_attack": 3.0, "sanctions": 5.5,
+}
+DEMAND = {"weak": -2.5, "neutral": 0.0, "strong": 2.5}
+HORIZONS = {
+    "24_48h": {"factor": 0.55, "band": 0.02, "confidence": 78},
+    "0_24h":  {"factor": 0.35, "band": 0.015, "confidence": 84},
+    "72h":    {"factor": 0.75, "band": 0.03, "confidence": 66},
+    "7d":     {"factor": 1.0,  "band": 0.045, "confidence": 58},
+}
+
+# Bump when mining, matching or the artifact layout changes; stored
+# artifacts of another version are rebuilt.
+ARTIFACT_VERSION = 1
+MIN_ANALOG_SHIFT = 8
+MAX_ANALOGS = 3
+SHIFT_MIN = -50
+SHIFT_MAX = 100 + int(round(2 * max(SUPPLY_SHOCKS.values())))
+
+HISTORY_SERIES = ("geri", "brent", "vix")
+
+History = List[Dict[str, Any]]
+
+
+def _clamp(v, lo, hi):
+    return max(lo, min(hi, v))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Scenario model
+# ─────────────────────────────────────────────────────────────────────────────
+
+def compute_scenario(brent, geri_pct, vix_pct, gas_pct=0.0,
+                     supply="normal", demand="neutral"):
+    """Returns per-horizon projections + attribution (all % on full horizon)."""
+    geri_impact = GERI_ELASTICITY * geri_pct
+    vix_impact = VIX_ELASTICITY * vix_pct
+    # sustained fear >+40% starts adding a risk premium instead
+    if vix_pct > 40:
+        vix_impact = 0.012 * (vix_pct - 40) + VIX_ELASTICITY * 40
+    gas_impact = GAS_ELASTICITY * gas_pct
+    supply_impact = SUPPLY_SHOCKS.get(supply, 0.0)
+    demand_impact = DEMAND.get(demand, 0.0)
+    total_pct = geri_impact + vix_impact + gas_impact + supply_impact + demand_impact
+    total_pct = _clamp(total_pct, -35.0, 45.0)
+
+    horizons = {}
+    for hz, cfg in HORIZONS.items():
+        move = total_pct * cfg["factor"] / 100.0
+        mid = brent * (1 + move)
+        band = cfg["band"] * (1 + min(abs(total_pct) / 25.0, 1.2))
+        lo, hi = mid * (1 - band), mid * (1 + band)
+        conf = _clamp(int(cfg["confidence"] - abs(total_pct) * 0.45), 35, 90)
+        bias = "Bullish" if total_pct > 1.5 else "Bearish" if total_pct < -1.5 else "Neutral"
+        bull_prob = _clamp(int(round(50 + total_pct * 1.6)), 8, 92)
+        tail_dir = 1 if total_pct >= 0 else -1
+        tail = mid * (1 + tail_dir * band * 2.3)
+        horizons[hz] = {
+            "expected_low": round(lo, 2), "expected_high": round(hi, 2),
+            "most_likely": round(mid, 2), "move_pct": round(move * 100, 2),
+            "diff_vs_current": round(mid - brent, 2),
+            "bias": bias, "bullish_probability": bull_prob, "confidence": conf,
+            "distribution": {
+                "bearish": round(lo, 2), "base": round(mid, 2),
+                "bullish": round(hi, 2), "tail_risk": round(tail, 2),
+            },
+        }
+    attribution = {
+        "geri": round(geri_impact, 2), "vix": round(vix_impact, 2),
+        "gas_stress": round(gas_impact, 2), "supply": round(supply_impact, 2),
+        "demand": round(demand_impact, 2), "total": round(total_pct, 2),
+    }
+    return horizons, attribution, total_pct
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Real-data historical analog engine (production DB: intel_indices_daily +
+# oil_price_snapshots + vix_snapshots). Episodes of significant GERI shifts
+# are mined from the actual index history and paired with the real Brent
+# reaction. If no relevant episode matches a scenario, no analogs are shown.
+# ─────────────────────────────────────────────────────────────────────────────
+
+def load_history() -> History:
+    """Daily joined GERI / Brent / VIX history from the series store."""
+    from src.market.series_store import get_series_store
+
+    frame = get_series_store().align(list(HISTORY_SERIES), how="calendar").dropna(subset=["geri"])
+    return [
+        {"date": d, "geri": int(g), "brent": b, "vix": v}
+        for d, g, b, v in zip(frame.date_list(), frame.columns["geri"].tolist(),
+                              frame.values_or_none("brent"), frame.values_or_none("vix"))
+    ]
+
+
+def _brent_near(rows, idx, max_span=4):
+    """Nearest non-null Brent price at/around rows[idx]."""
+    n = len(rows)
+    for off in range(max_span + 1):
+        for j in (idx + off, idx - off):
+            if 0 <= j < n and rows[j]["brent"] is not None:
+                return rows[j]["brent"]
+    return None
+
+
+def mine_episodes(rows: History) -> List[Dict[str, Any]]:
+    """Detect significant GERI shift episodes and their real Brent reaction."""
+    episodes = []
+    n = len(rows)
+    i = 7
+    while i < n:
+        base_row, cur_row = rows[i - 7], rows[i]
+        if base_row["geri"] is None or cur_row["geri"] is None:
+            i += 1
+            continue
+        delta = cur_row["geri"] - base_row["geri"]
+        if abs(delta) < 15:
+            i += 1
+            continue
+        # extend to local extreme
+        j = i
+        while (j + 1 < n and rows[j + 1]["geri"] is not None
+               and ((delta > 0 and rows[j + 1]["geri"] >= rows[j]["geri"])
+                    or (delta < 0 and rows[j + 1]["geri"] <= rows[j]["geri"]))):
+            j += 1
+        start, peak = i - 7, j
+        base_g, peak_g = rows[start]["geri"], rows[peak]["geri"]
+        shift_pts = peak_g - base_g
+        shift_pct = round(shift_pts / max(base_g, 5) * 100.0)
+        b_before = _brent_near(rows, start)
+        b_peak = _brent_near(rows, peak)
+        b_7d = _brent_near(rows, peak + 7) if peak + 7 < n else None
+        b_30d = _brent_near(rows, peak + 30) if peak + 30 < n else None
+
+        def _pct(a, b):
+            return round((b - a) / a * 100.0, 1) if (a and b) else None
+
+        # risk faded: GERI back within 30% of base within 21 days after peak
+        faded = None
+        for k in range(peak + 1, min(peak + 22, n)):
+            g = rows[k]["geri"]
+            if g is None:
+                continue
+            if (shift_pts > 0 and g <= base_g + 0.3 * shift_pts) or \
+               (shift_pts < 0 and g >= base_g + 0.3 * shift_pts):
+                faded = (rows[k]["date"] - rows[peak]["date"]).days
+                break
+        if faded is None and peak + 21 >= n:
+            faded_state = "recent"      # too recent to judge
+        elif faded is None:
+            faded_state = "persisted"
+        else:
+            faded_state = "faded"
+
+        direction = "surge" if shift_pts > 0 else "drop"
+        episodes.append({
+            "label": f"{rows[start]['date']:%d %b %Y} — GERI {direction} "
+                     f"{'+' if shift_pts > 0 else ''}{shift_pts} pts ({base_g} → {peak_g})",
+            "period": f"{rows[start]['date']:%b %Y}",
+            "start_date": rows[start]["date"].isoformat(),
+            "peak_date": rows[peak]["date"].isoformat(),
+            "duration_days": (rows[peak]["date"] - rows[start]["date"]).days,
+            "geri_shift_pts": shift_pts,
+            "geri_shift_pct": shift_pct,
+            "brent_before": round(b_before, 2) if b_before else None,
+            "brent_at_peak": round(b_peak, 2) if b_peak else None,
+            "brent_after_7d": round(b_7d, 2) if b_7d else None,
+            "brent_after_30d": round(b_30d, 2) if b_30d else None,
+            "move_to_peak_pct": _pct(b_before, b_peak),
+            "move_7d_pct": _pct(b_peak, b_7d),
+            "move_30d_pct": _pct(b_peak, b_30d),
+            "risk_state": faded_state,
+            "faded_after_days": faded,
+        })
+        i = j + 8
+    return episodes
+
+
+def historical_sensitivity(rows: History) -> Dict[str, Any]:
+    """Regression slope of daily Brent % change vs daily GERI point change,
+    and vs daily VIX % change, from real history."""
+    g_pairs, v_pairs = [], []
+    prev = None
+    for r in rows:
+        if prev and r["brent"] and prev["brent"]:
+            b_ret = (r["brent"] - prev["brent"]) / prev["brent"] * 100.0
+            if r["geri"] is not None and prev["geri"] is not None:
+                g_pairs.append((r["geri"] - prev["geri"], b_ret))
+            if r["vix"] and prev["vix"]:
+                v_pairs.append(((r["vix"] - prev["vix"]) / prev["vix"] * 100.0, b_ret))
+        prev = r
+
+    def _slope(pairs):
+        if len(pairs) < 20:
+            return None
+        mx = sum(p[0] for p in pairs) / len(pairs)
+        my = sum(p[1] for p in pairs) / len(pairs)
+        var = sum((p[0] - mx) ** 2 for p in pairs)
+        if var == 0:
+            return None
+        return sum((p[0] - mx) * (p[1] - my) for p in pairs) / var
+
+    return {
+        "geri_slope_pct_per_pt": _slope(g_pairs),   # Brent % per 1 GERI pt
+        "vix_slope_pct_per_pct": _slope(v_pairs),   # Brent % per 1% VIX chg
+        "sample_days": len(g_pairs),
+    }
+
+
+def recent_geri_shift(rows: History) -> Optional[float]:
+    """GERI % change over the last week of history (the alerts' "current" scenario shift)."""
+    recent = [r for r in rows[-8:] if r["geri"] is not None]
+    if len(recent) >= 2 and recent[0]["geri"]:
+        return (recent[-1]["geri"] - recent[0]["geri"]) / max(recent[0]["geri"], 5) * 100
+    return None
+
+
+def score_analogs(episodes: List[Dict[str, Any]], scenario_shift_pct) -> List[Tuple[int, int]]:
+    """(episode index, match score) of the best matches for a scenario's GERI shift (%)."""
+    if abs(scenario_shift_pct) < MIN_ANALOG_SHIFT:
+        return []
+    scored = []
+    for i, ep in enumerate(episodes):
+        ep_shift = ep["geri_shift_pct"]
+        if ep_shift == 0:
+            continue
+        same_dir = (ep_shift > 0) == (scenario_shift_pct > 0)
+        diff = abs(abs(ep_shift) - abs(scenario_shift_pct))
+        score = 100 - min(diff, 100) * 0.55 - (0 if same_dir else 45)
+        score = _clamp(int(round(score)), 0, 97)
+        if score >= 55:
+            scored.append((i, score))
+    scored.sort(key=lambda x: -x[1])
+    return scored[:MAX_ANALOGS]
+
+
+def analog_entry(ep: Dict[str, Any], scenario_shift_pct, score: int) -> Dict[str, Any]:
+    ep_shift = ep["geri_shift_pct"]
+    same_dir = (ep_shift > 0) == (scenario_shift_pct > 0)
+    diff = abs(abs(ep_shift) - abs(scenario_shift_pct))
+    explanation = (
+        f"Scenario models a {'+' if scenario_shift_pct > 0 else ''}{int(scenario_shift_pct)}% GERI shift; "
+        f"this real episode saw {'+' if ep_shift > 0 else ''}{ep_shift}% "
+        f"({'same' if same_dir else 'opposite'} direction, "
+        f"{diff:.0f} pp magnitude difference).")
+    return {**ep, "match_pct": score, "similarity_explanation": explanation}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Per-data-day artifact
+# ─────────────────────────────────────────────────────────────────────────────
+
+@dataclass
+class ScenarioArtifact:
+    data_day: Optional[date]
+    sensitivity: Dict[str, Any]
+    episodes: List[Dict[str, Any]]
+    analog_index: np.ndarray     # (shifts, MAX_ANALOGS) episode index, -1 = none
+    analog_score: np.ndarray     # (shifts, MAX_ANALOGS) match score
+    recent_shift: Optional[float] = None
+    version: int = ARTIFACT_VERSION
+    built_ms: float = field(default=0.0, compare=False)
+
+    @classmethod
+    def build(cls, data_day: Optional[date], rows: History) -> 'ScenarioArtifact':
+        episodes = mine_episodes(rows)
+        shifts = SHIFT_MAX - SHIFT_MIN + 1
+        index = np.full((shifts, MAX_ANALOGS), -1, dtype=np.int16)
+        score = np.zeros((shifts, MAX_ANALOGS), dtype=np.int16)
+        for k in range(shifts):
+            for slot, (i, s) in enumerate(score_analogs(episodes, SHIFT_MIN + k)):
+                index[k, slot], score[k, slot] = i, s
+        return cls(data_day, historical_sensitivity(rows), episodes, index, score, recent_geri_shift(rows))
+
+    def analogs(self, scenario_shift_pct) -> List[Dict[str, Any]]:
+        """Best analogs for a scenario shift: a grid row when the shift is a whole
+        point inside the slider range, an exact match otherwise."""
+        if abs(scenario_shift_pct) < MIN_ANALOG_SHIFT:
+            return []
+        if scenario_shift_pct == int(scenario_shift_pct) and SHIFT_MIN <= scenario_shift_pct <= SHIFT_MAX:
+            k = int(scenario_shift_pct) - SHIFT_MIN
+            matches = [(int(i), int(s)) for i, s in zip(self.analog_index[k], self.analog_score[k]) if i >= 0]
+        else:
+            matches = score_analogs(self.episodes, scenario_shift_pct)
+        return [analog_entry(self.episodes[i], scenario_shift_pct, s) for i, s in matches]
+
+    def to_bytes(self) -> bytes:
+        sens = self.sensitivity
+        buf = io.BytesIO()
+        np.savez_compressed(
+            buf,
+            version=np.array(self.version),
+            data_day=np.array(self.data_day.isoformat() if self.data_day else ''),
+            sensitivity=np.array([
+                np.nan if sens.get("geri_slope_pct_per_pt") is None else sens["geri_slope_pct_per_pt"],
+                np.nan if sens.get("vix_slope_pct_per_pct") is None else sens["vix_slope_pct_per_pct"],
+                sens.get("sample_days") or 0,
+            ], dtype=np.float64),
+            episodes=np.array(json.dumps(self.episodes)),
+            analog_index=self.analog_index,
+            analog_score=self.analog_score,
+            recent_shift=np.array(np.nan if self.recent_shift is None else self.recent_shift),
+        )
+        return buf.getvalue()
+
+    @classmethod
+    def from_bytes(cls, body: bytes) -> 'ScenarioArtifact':
+        with np.load(io.BytesIO(body), allow_pickle=False) as data:
+            g, v, n = data["sensitivity"].tolist()
+            day = str(data["data_day"])
+            return cls(
+                data_day=date.fromisoformat(day) if day else None,
+                sensitivity={
+                    "geri_slope_pct_per_pt": None if np.isnan(g) else g,
+                    "vix_slope_pct_per_pct": None if np.isnan(v) else v,
+                    "sample_days": int(n),
+                },
+                episodes=json.loads(str(data["episodes"])),
+                analog_index=data["analog_index"],
+                analog_score=data["analog_score"],
+                recent_shift=None if np.isnan(data["recent_shift"]) else float(data["recent_shift"]),
+                version=int(data["version"]),
+            )
+
+
+def current_data_day() -> Optional[date]:
+    """Latest date across the series the artifact is built from."""
+    from src.market.series_store import get_series_store
+
+    store = get_series_store()
+    days = [d for d in (store.latest_date(name) for name in HISTORY_SERIES) if d]
+    return max(days) if days else None
+
+
+def run_brent_scenario_artifacts_migration():
+    from src.db.db import get_cursor
+
+    logger.info("Running Brent scenario artifacts migration...")
+    with get_cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS brent_scenario_artifacts (
+                data_day DATE PRIMARY KEY,
+                version INTEGER NOT NULL,
+                body BYTEA NOT NULL,
+                computed_at TIMESTAMPTZ DEFAULT NOW()
+            )
+        """)
+    logger.info("Brent scenario artifacts migration complete.")
+
+
+def _load_stored(data_day: Optional[date]) -> Optional[ScenarioArtifact]:
+    from src.db.db import get_cursor
+
+    try:
+        with get_cursor(commit=False) as cur:
+            cur.execute("SELECT body FROM brent_scenario_artifacts WHERE data_day = %s AND version = %s",
+                        (data_day, ARTIFACT_VERSION))
+            row = cur.fetchone()
+        return ScenarioArtifact.from_bytes(bytes(row["body"])) if row else None
+    except Exception as e:
+        logger.warning(f"Brent scenario artifact load failed: {e}")
+        return None
+
+
+def _save_stored(artifact: ScenarioArtifact) -> None:
+    from src.db.db import get_cursor
+
+    try:
+        with get_cursor() as cur:
+            cur.execute("""
+                INSERT INTO brent_scenario_artifacts (data_day, version, body, computed_at)
+                VALUES (%s, %s, %s, NOW())
+                ON CONFLICT (data_day) DO UPDATE SET
+                    version = EXCLUDED.version, body = EXCLUDED.body, computed_at = EXCLUDED.computed_at
+            """, (artifact.data_day, artifact.version, artifact.to_bytes()))
+    except Exception as e:
+        logger.warning(f"Brent scenario artifact save failed: {e}")
+
+
+class ArtifactCache:
+    """This worker's artifact, swapped when the data day moves."""
+
+    def __init__(self, data_day: Callable[[], Optional[date]] = current_data_day,
+                 load_rows: Callable[[], History] = load_history,
+                 load_stored: Callable[[Optional[date]], Optional[ScenarioArtifact]] = _load_stored,
+                 save_stored: Callable[[ScenarioArtifact], None] = _save_stored):
+        self.data_day = data_day
+        self.load_rows = load_rows
+        self.load_stored = load_stored
+        self.save_stored = save_stored
+        self._artifact: Optional[ScenarioArtifact] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ScenarioArtifact:
+        day = self.data_day()
+        artifact = self._artifact
+        if artifact is not None and artifact.data_day == day:
+            return artifact
+        with self._lock:
+            artifact = self._artifact
+            if artifact is not None and artifact.data_day == day:
+                return artifact
+            artifact = self.load_stored(day)
+            if artifact is None:
+                started = time.perf_counter()
+                artifact = ScenarioArtifact.build(day, self.load_rows())
+                artifact.built_ms = round((time.perf_counter() - started) * 1000, 1)
+                logger.info(f"Built Brent scenario artifact for {day}: {len(artifact.episodes)} episodes "
+                            f"in {artifact.built_ms} ms")
+                self.save_stored(artifact)
+            self._artifact = artifact
+            return artifact
+
+
+_cache = ArtifactCache()
+
+
+def get_scenario_artifact() -> ScenarioArtifact:
+    return _cache.get()
@@ -0,0 +1,420 @@
+"""
+Market Time-Series Store
+
+Process-wide, date-aligned store of the daily series the dashboards,
+research pages and ERIQ keep re-reading: GERI, EERI, EGSI-M, Brent, WTI,
+TTF, VIX, EUR/USD, EU gas storage and JKM.
+
+Every series is a float64 NumPy array on one shared calendar-day axis
+(NaN where a table has no value), so aligning two series is a slice, not
+a dict join. A table is loaded in full once, then topped up: at most every
+TIMESERIES_REFRESH_SECONDS a range query re-reads the last
+TIMESERIES_OVERLAP_DAYS before the newest loaded date (picking up new
+days and same-day upserts), and every TIMESERIES_FULL_RELOAD_SECONDS the
+table is reloaded to catch backfills and deletes.
+
+Usage:
+    from src.market.series_store import get_series_store
+
+    store = get_series_store()
+    brent = store.series('brent', start=date(2026, 1, 1))
+    brent.pct_change().rolling_mean(7).last()
+    frame = store.align(['geri', 'brent', 'vix'], start=..., how='inner')
+
+scripts/bench_timeseries_store.py compares memory and latency against the
+list-of-dicts + dict-join approach the callers used before.
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.market import stats
+
+logger = logging.getLogger(__name__)
+
+TIMESERIES_REFRESH_SECONDS = float(os.environ.get('TIMESERIES_REFRESH_SECONDS', '60'))
+TIMESERIES_OVERLAP_DAYS = int(os.environ.get('TIMESERIES_OVERLAP_DAYS', '3'))
+TIMESERIES_FULL_RELOAD_SECONDS = float(os.environ.get('TIMESERIES_FULL_RELOAD_SECONDS', '21600'))
+
+DAY = np.timedelta64(1, 'D')
+
+
+@dataclass(frozen=True)
+class SeriesSpec:
+    name: str
+    table: str
+    column: str
+    label: str
+    date_column: str = 'date'
+    where: Optional[str] = None
+
+
+SERIES: List[SeriesSpec] = [
+    SeriesSpec('geri', 'intel_indices_daily', 'value', 'GERI', where="index_id = 'global:geo_energy_risk'"),
+    SeriesSpec('eeri', 'reri_indices_daily', 'value', 'EERI', where="index_id = 'europe:eeri'"),
+    SeriesSpec('egsi_m', 'egsi_m_daily', 'index_value', 'EGSI-M', date_column='index_date',
+               where="region = 'Europe'"),
+    SeriesSpec('brent', 'oil_price_snapshots', 'brent_price', 'Brent Oil'),
+    SeriesSpec('wti', 'oil_price_snapshots', 'wti_price', 'WTI Oil'),
+    SeriesSpec('ttf', 'ttf_gas_snapshots', 'ttf_price', 'TTF Gas'),
+    SeriesSpec('vix', 'vix_snapshots', 'vix_close', 'VIX'),
+    SeriesSpec('eurusd', 'eurusd_snapshots', 'rate', 'EUR/USD'),
+    SeriesSpec('gas_storage', 'gas_storage_snapshots', 'eu_storage_percent', 'EU Gas Storage'),
+    SeriesSpec('gas_storage_risk', 'gas_storage_snapshots', 'risk_score', 'EU Gas Storage Risk'),
+    SeriesSpec('jkm', 'lng_price_snapshots', 'jkm_price', 'LNG (JKM)'),
+]
+
+
+def find_series(table: str, column: str) -> Optional[str]:
+    """Name of the registered series stored from table.column, if any."""
+    return next((spec.name for spec in SERIES if spec.table == table and spec.column == column), None)
+
+
+def to_day(value) -> np.datetime64:
+    return np.datetime64(value, 'D')
+
+
+def to_date(value: np.datetime64) -> date:
+    return value.astype('datetime64[D]').astype(date)
+
+
+def _to_float(value) -> float:
+    if value is None:
+        return np.nan
+    if isinstance(value, Decimal):
+        return float(value)
+    return float(value)
+
+
+class Series:
+    """An immutable slice of one series: parallel date and value arrays."""
+
+    __slots__ = ('name', 'dates', 'values')
+
+    def __init__(self, name: str, dates: np.ndarray, values: np.ndarray):
+        self.name = name
+        self.dates = dates
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _with(self, values: np.ndarray) -> 'Series':
+        return Series(self.name, self.dates, values)
+
+    def dropna(self) -> 'Series':
+        mask = ~np.isnan(self.values)
+        return Series(self.name, self.dates[mask], self.values[mask])
+
+    def between(self, start=None, end=None) -> 'Series':
+        lo = 0 if start is None else int(np.searchsorted(self.dates, to_day(start), 'left'))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, to_day(end), 'right'))
+        return Series(self.name, self.dates[lo:hi], self.values[lo:hi])
+
+    def tail(self, n: int) -> 'Series':
+        n = max(n, 0)
+        return Series(self.name, self.dates[len(self.dates) - n:], self.values[len(self.values) - n:])
+
+    def diff(self, periods: int = 1) -> 'Series':
+        out = np.full_like(self.values, np.nan)
+        if 0 < periods < len(self.values):
+            out[periods:] = self.values[periods:] - self.values[:-periods]
+        return self._with(out)
+
+    def pct_change(self, periods: int = 1) -> 'Series':
+        """Percent change (x100) between observations `periods` apart; NaN where the base is 0 or missing."""
+        out = np.full_like(self.values, np.nan)
+        if 0 < periods < len(self.values):
+            base = self.values[:-periods]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out[periods:] = np.where(base != 0, (self.values[periods:] - base) / np.abs(base) * 100.0, np.nan)
+        return self._with(out)
+
+    def rolling_mean(self, window: int, min_periods: Optional[int] = None) -> 'Series':
+        return self._rolling(stats.rolling_mean, window, min_periods)
+
+    def rolling_std(self, window: int, min_periods: Optional[int] = None, ddof: int = 1) -> 'Series':
+        return self._rolling(stats.rolling_std, window, min_periods, ddof=ddof)
+
+    def rolling_zscore(self, window: int, min_periods: Optional[int] = None) -> 'Series':
+        return self._rolling(stats.rolling_zscore, window, min_periods)
+
+    def _rolling(self, kernel: Callable, window: int, min_periods: Optional[int], **kwargs) -> 'Series':
+        """Trailing-window statistic; NaN until the first full window and below min_periods values."""
+        out = np.full_like(self.values, np.nan)
+        if window <= 0 or len(self.values) < window:
+            return self._with(out)
+        out[window - 1:] = kernel(self.values, window, min_periods, **kwargs)[window - 1:]
+        return self._with(out)
+
+    def last(self) -> Optional[Tuple[date, float]]:
+        valid = np.flatnonzero(~np.isnan(self.values))
+        if not len(valid):
+            return None
+        i = valid[-1]
+        return to_date(self.dates[i]), float(self.values[i])
+
+    def to_dict(self) -> Dict[date, float]:
+        s = self.dropna()
+        return dict(zip(s.dates.astype(date).tolist(), s.values.tolist()))
+
+    def to_rows(self, key: str = 'value', date_format: Optional[str] = None) -> List[Dict]:
+        """Non-missing points as [{'date': date, key: float}] (date as str when date_format='iso')."""
+        s = self.dropna()
+        dates = s.dates.astype(str).tolist() if date_format == 'iso' else s.dates.astype(date).tolist()
+        return [{'date': d, key: v} for d, v in zip(dates, s.values.tolist())]
+
+
+class Frame:
+    """Several series on one date index (the result of TimeSeriesStore.align)."""
+
+    def __init__(self, dates: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.dates = dates
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, name: str) -> Series:
+        return Series(name, self.dates, self.columns[name])
+
+    def dropna(self, how: str = 'any', subset: Optional[Sequence[str]] = None) -> 'Frame':
+        """Drop days where any (or all) of `subset` (default: every column) is missing."""
+        names = list(subset) if subset is not None else list(self.columns)
+        if not names:
+            return self
+        missing = np.isnan(np.vstack([self.columns[n] for n in names]))
+        mask = ~(missing.any(axis=0) if how == 'any' else missing.all(axis=0))
+        return Frame(self.dates[mask], {k: v[mask] for k, v in self.columns.items()})
+
+    def date_list(self) -> List[date]:
+        return self.dates.astype(date).tolist()
+
+    def iso_dates(self) -> List[str]:
+        return self.dates.astype(str).tolist()
+
+    def values_or_none(self, name: str) -> List[Optional[float]]:
+        """Column as a list with None for missing (JSON null)."""
+        values = self.columns[name]
+        return [None if np.isnan(v) else v for v in values.tolist()]
+
+
+def load_table(table: str, date_column: str, columns: Sequence[str], where: Optional[str],
+               since: Optional[date]) -> List[Dict]:
+    from src.db.db import execute_production_query
+
+    clauses = [f"{date_column} IS NOT NULL"]
+    params: Tuple = ()
+    if where:
+        clauses.append(where)
+    if since is not None:
+        clauses.append(f"{date_column} >= %s")
+        params = (since,)
+    select = ', '.join(columns)
+    return execute_production_query(
+        f"SELECT {date_column} AS date, {select} FROM {table} WHERE {' AND '.join(clauses)} ORDER BY {date_column}",
+        params,
+    ) or []
+
+
+@dataclass
+class _TableState:
+    date_column: str
+    where: Optional[str]
+    specs: List[SeriesSpec]
+    max_date: Optional[np.datetime64] = None
+    checked_at: float = float('-inf')
+    full_loaded_at: float = float('-inf')
+    rows_loaded: int = 0
+    load_ms: float = 0.0
+
+
+class TimeSeriesStore:
+    """Date-aligned NumPy arrays for SERIES, loaded lazily per table and refreshed incrementally."""
+
+    def __init__(self, specs: Sequence[SeriesSpec] = SERIES, loader: Callable = load_table,
+                 refresh_seconds: float = TIMESERIES_REFRESH_SECONDS,
+                 overlap_days: int = TIMESERIES_OVERLAP_DAYS,
+                 full_reload_seconds: float = TIMESERIES_FULL_RELOAD_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.specs = {spec.name: spec for spec in specs}
+        self.loader = loader
+        self.refresh_seconds = refresh_seconds
+        self.overlap_days = overlap_days
+        self.full_reload_seconds = full_reload_seconds
+        self.clock = clock
+        self._tables: Dict[Tuple[str, Optional[str]], _TableState] = {}
+        for spec in specs:
+            key = (spec.table, spec.where)
+            state = self._tables.setdefault(key, _TableState(spec.date_column, spec.where, []))
+            state.specs.append(spec)
+        self._origin: Optional[np.datetime64] = None
+        self._length = 0
+        self._values: Dict[str, np.ndarray] = {}
+        self._lock = threading.RLock()
+
+    # ── loading ─────────────────────────────────────────────────────────────
+
+    def _table_key(self, name: str) -> Tuple[str, Optional[str]]:
+        try:
+            spec = self.specs[name]
+        except KeyError:
+            raise KeyError(f"Unknown series '{name}' (known: {', '.join(self.specs)})") from None
+        return spec.table, spec.where
+
+    def refresh(self, names: Optional[Iterable[str]] = None, force: bool = False) -> None:
+        keys = {self._table_key(n) for n in (names if names is not None else self.specs)}
+        with self._lock:
+            now = self.clock()
+            for key in keys:
+                state = self._tables[key]
+                if not force and now - state.checked_at < self.refresh_seconds:
+                    continue
+                full = force or state.max_date is None or now - state.full_loaded_at >= self.full_reload_seconds
+                since = None if full else to_date(state.max_date - self.overlap_days * DAY)
+                try:
+                    self._load(key, state, since)
+                except Exception as e:
+                    # Keep serving what we have; retry on the next interval.
+                    logger.error(f"Time-series refresh of {key[0]} failed: {e}")
+                    state.checked_at = now
+                    if state.max_date is None:
+                        raise
+                    continue
+                state.checked_at = now
+                if full:
+                    state.full_loaded_at = now
+
+    def _load(self, key: Tuple[str, Optional[str]], state: _TableState, since: Optional[date]) -> None:
+        started = time.perf_counter()
+        columns = [spec.column for spec in state.specs]
+        rows = self.loader(key[0], state.date_column, columns, state.where, since)
+        days = np.array([to_day(r['date']) for r in rows], dtype='datetime64[D]')
+        if len(days):
+            self._ensure_axis(days.min(), days.max())
+        index = (days - self._origin).astype(np.int64) if len(days) else np.array([], dtype=np.int64)
+
+        for spec in state.specs:
+            values = np.array([_to_float(r.get(spec.column)) for r in rows], dtype=np.float64)
+            arr = self._values.get(spec.name)
+            if arr is None or since is None:
+                arr = np.full(self._length, np.nan)
+            else:
+                # rows in the overlap window that disappeared become missing
+                arr[max(int((to_day(since) - self._origin) / DAY), 0):] = np.nan
+            arr[index] = values
+            self._values[spec.name] = arr
+
+        if len(days):
+            newest = days.max()
+            state.max_date = newest if state.max_date is None or since is None else max(state.max_date, newest)
+        state.rows_loaded = len(rows) if since is None else state.rows_loaded
+        state.load_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    def _ensure_axis(self, first: np.datetime64, last: np.datetime64) -> None:
+        if self._origin is None:
+            # series from tables that loaded no rows were created on the empty axis
+            self._origin = first
+            self._length = int((last - first) / DAY) + 1
+            for name in self._values:
+                self._values[name] = np.full(self._length, np.nan)
+            return
+        if first < self._origin:
+            pad = int((self._origin - first) / DAY)
+            for name, arr in self._values.items():
+                self._values[name] = np.concatenate([np.full(pad, np.nan), arr])
+            self._origin = first
+            self._length += pad
+        end = self._origin + (self._length - 1) * DAY
+        if last > end:
+            grow = int((last - end) / DAY)
+            for name, arr in self._values.items():
+                self._values[name] = np.concatenate([arr, np.full(grow, np.nan)])
+            self._length += grow
+
+    # ── queries ─────────────────────────────────────────────────────────────
+
+    def _bounds(self, start, end) -> Tuple[int, int]:
+        lo = 0 if start is None else max(int((to_day(start) - self._origin) / DAY), 0)
+        hi = self._length if end is None else min(int((to_day(end) - self._origin) / DAY) + 1, self._length)
+        return lo, max(hi, lo)
+
+    def series(self, name: str, start=None, end=None, dropna: bool = True) -> Series:
+        """One series between start and end (inclusive); missing days dropped unless dropna=False."""
+        self.refresh([name])
+        with self._lock:
+            arr = self._values.get(name)
+            if arr is None or self._origin is None:
+                return Series(name, np.array([], dtype='datetime64[D]'), np.array([], dtype=np.float64))
+            lo, hi = self._bounds(start, end)
+            dates = self._origin + np.arange(lo, hi) * DAY
+            result = Series(name, dates, arr[lo:hi].copy())
+        return result.dropna() if dropna else result
+
+    def align(self, names: Sequence[str], start=None, end=None, how: str = 'inner') -> Frame:
+        """
+        Several series on one date index. how='inner' keeps days where all
+        have a value, 'outer' days where any does, 'calendar' every day.
+        """
+        self.refresh(names)
+        with self._lock:
+            if self._origin is None:
+                return Frame(np.array([], dtype='datetime64[D]'), {n: np.array([]) for n in names})
+            lo, hi = self._bounds(start, end)
+            dates = self._origin + np.arange(lo, hi) * DAY
+            columns = {n: (self._values[n][lo:hi].copy() if n in self._values else np.full(hi - lo, np.nan))
+                       for n in names}
+        frame = Frame(dates, columns)
+        if how == 'inner':
+            return frame.dropna('any')
+        if how == 'outer':
+            return frame.dropna('all')
+        return frame
+
+    def latest_date(self, name: str) -> Optional[date]:
+        last = self.series(name).last()
+        return last[0] if last else None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'origin': to_date(self._origin).isoformat() if self._origin is not None else None,
+                'days': self._length,
+                'series': len(self._values),
+                'bytes': int(sum(arr.nbytes for arr in self._values.values())),
+                'tables': {
+                    table: {
+                        'series': [s.name for s in state.specs],
+                        'max_date': to_date(state.max_date).isoformat() if state.max_date is not None else None,
+                        'rows': state.rows_loaded,
+                        'last_load_ms': state.load_ms,
+                    }
+                    for (table, _), state in self._tables.items()
+                },
+            }
+
+
+_store: Optional[TimeSeriesStore] = None
+_store_lock = threading.Lock()
+
+
+def get_series_store() -> TimeSeriesStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TimeSeriesStore()
+    return _store
+
+
+def reset_series_store() -> None:
+    global _store
+    with _store_lock:
+        _store = None
@@ -0,0 +1,221 @@
+"""
+Vectorized Statistics Kernel
+
+Correlation and rolling-window statistics shared by the trader-intel
+modules, batched over assets: inputs are 2-D arrays with one row per
+asset (a 1-D array is treated as a single row) and NaN for missing days.
+
+- lagged_correlations: Pearson correlation of x[i] against y[i + lag] for
+  every lag in -max_lag..+max_lag at once. The lagged cross-products come
+  from one FFT per row and the per-lag means/variances from prefix sums,
+  so the cost is O(n log n) instead of O(n * lags).
+- rolling_mean / rolling_std / rolling_zscore / rolling_correlation: O(n)
+  prefix-sum windows over the trailing `window` positions that skip NaNs
+  (pairwise-complete for correlation) and need min_periods points.
+
+Rows are centered before any prefix sum so price-level series do not lose
+precision to cancellation, and a variance below rounding noise counts as
+zero, which gives a correlation of 0 the same way the old loops'
+`sqrt(...) or 1e-9` guard did.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+_NOISE = 1e-12
+
+
+def _rows(values) -> np.ndarray:
+    arr = np.asarray(values, dtype=float)
+    return arr[None, :] if arr.ndim == 1 else arr
+
+
+def _center(values: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid='ignore'):
+        counts = np.sum(~np.isnan(values), axis=-1, keepdims=True)
+        means = np.where(counts > 0, np.nansum(values, axis=-1, keepdims=True) / np.maximum(counts, 1), 0.0)
+    return values - means
+
+
+def _scale(values: np.ndarray) -> np.ndarray:
+    filled = np.where(np.isnan(values), 0.0, np.abs(values))
+    return filled.max(axis=-1, keepdims=True) if filled.shape[-1] else np.zeros(filled.shape[:-1] + (1,))
+
+
+def _prefix(values: np.ndarray) -> np.ndarray:
+    out = np.zeros(values.shape[:-1] + (values.shape[-1] + 1,))
+    np.cumsum(values, axis=-1, out=out[..., 1:])
+    return out
+
+
+def _window_sum(prefix: np.ndarray, window: int) -> np.ndarray:
+    """Sum over the trailing `window` points ending at each position (shorter at the start)."""
+    n = prefix.shape[-1] - 1
+    ends = np.arange(1, n + 1)
+    starts = np.maximum(ends - window, 0)
+    return prefix[..., ends] - prefix[..., starts]
+
+
+def _correlation(sxy, sx, sy, sxx, syy, n, tol_x, tol_y):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = sxy - sx * sy / n
+        vx = sxx - sx * sx / n
+        vy = syy - sy * sy / n
+        flat = (vx <= tol_x * n) | (vy <= tol_y * n)
+        corr = cov / np.sqrt(np.where(flat, 1.0, vx * vy))
+    corr = np.where(flat, 0.0, np.clip(corr, -1.0, 1.0))
+    return np.where(n > 0, corr, np.nan)
+
+
+def pearson(x, y) -> Optional[float]:
+    """Pearson correlation of two equal-length sequences; None below 3 points."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(x) < 3 or len(x) != len(y):
+        return None
+    dx, dy = x - x.mean(), y - y.mean()
+    vx, vy = float(dx @ dx), float(dy @ dy)
+    if vx <= _NOISE * len(x) * float(np.max(np.abs(x))) ** 2 or vy <= _NOISE * len(y) * float(np.max(np.abs(y))) ** 2:
+        return 0.0
+    return float(np.clip((dx @ dy) / np.sqrt(vx * vy), -1.0, 1.0))
+
+
+def pack_pairs(x, ys, right: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Drop the days where x or a given y row is missing, per row.
+
+    x is one series (n,) and ys is (k, n) on the same day axis. Returns
+    (xs, ys, lengths): both (k, n), each row holding its complete pairs in
+    date order, left-aligned and NaN-padded after lengths[row] (or
+    right-aligned, padded in front, with right=True).
+    """
+    x = np.asarray(x, dtype=float)
+    ys = _rows(ys)
+    if right:
+        xs, packed, lengths = pack_pairs(x[::-1], ys[:, ::-1])
+        return xs[:, ::-1], packed[:, ::-1], lengths
+    valid = ~np.isnan(ys) & ~np.isnan(x)[None, :]
+    order = np.argsort(~valid, axis=1, kind='stable')
+    lengths = valid.sum(axis=1)
+    pad = np.arange(ys.shape[1])[None, :] >= lengths[:, None]
+    xs = np.where(pad, np.nan, np.broadcast_to(x, ys.shape)[np.arange(len(ys))[:, None], order])
+    packed = np.where(pad, np.nan, np.take_along_axis(ys, order, axis=1))
+    return xs, packed, lengths
+
+
+def lagged_correlations(x, y, lengths=None, max_lag: int = 7, min_pairs: int = 5) -> np.ndarray:
+    """Correlation of x[i] with y[i + lag] for lag = -max_lag..max_lag, per row.
+
+    x and y are (k, m), left-aligned with lengths[row] valid points (the
+    layout pack_pairs returns). Column j of the result is lag j - max_lag;
+    NaN where fewer than min_pairs pairs overlap.
+    """
+    x, y = _rows(x), _rows(y)
+    k, m = x.shape
+    if lengths is None:
+        lengths = np.full(k, m)
+    lengths = np.asarray(lengths)
+    live = np.arange(m)[None, :] < lengths[:, None]
+    x = np.where(live, _center(np.where(live, x, np.nan)), 0.0)
+    y = np.where(live, _center(np.where(live, y, np.nan)), 0.0)
+
+    size = 1 << max(int(2 * m - 1), 1).bit_length()
+    cross = np.fft.irfft(np.conj(np.fft.rfft(x, size)) * np.fft.rfft(y, size), size)
+    lags = np.arange(-max_lag, max_lag + 1)
+    sxy = cross[:, lags % size]
+
+    n = lengths[:, None]
+    x_start = np.minimum(np.maximum(-lags, 0)[None, :], n)
+    x_end = np.maximum(n - np.maximum(lags, 0)[None, :], x_start)
+    y_start = np.minimum(np.maximum(lags, 0)[None, :], n)
+    y_end = np.maximum(n - np.maximum(-lags, 0)[None, :], y_start)
+    pairs = x_end - x_start
+
+    def seg(prefix, start, end):
+        return np.take_along_axis(prefix, end, axis=1) - np.take_along_axis(prefix, start, axis=1)
+
+    px, py = _prefix(x), _prefix(y)
+    pxx, pyy = _prefix(x * x), _prefix(y * y)
+    corr = _correlation(sxy, seg(px, x_start, x_end), seg(py, y_start, y_end),
+                        seg(pxx, x_start, x_end), seg(pyy, y_start, y_end),
+                        pairs, _NOISE * _scale(x) ** 2, _NOISE * _scale(y) ** 2)
+    return np.where(pairs >= max(min_pairs, 1), corr, np.nan)
+
+
+def best_lags(corr: np.ndarray, max_lag: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per row, the lag with the largest |correlation| (earliest lag on ties) and that correlation.
+
+    Rows with no finite correlation get lag 0 and NaN.
+    """
+    corr = _rows(corr)
+    magnitude = np.where(np.isnan(corr), -1.0, np.abs(corr))
+    idx = magnitude.argmax(axis=1)
+    best = corr[np.arange(len(corr)), idx]
+    return np.where(np.isnan(best), 0, idx - max_lag), best
+
+
+def _rolling_moments(values: np.ndarray, window: int):
+    valid = ~np.isnan(values)
+    filled = np.where(valid, _center(values), 0.0)
+    counts = _window_sum(_prefix(valid.astype(float)), window)
+    sums = _window_sum(_prefix(filled), window)
+    squares = _window_sum(_prefix(filled * filled), window)
+    return counts, sums, squares, _NOISE * _scale(filled) ** 2
+
+
+def _gate(result, counts, window, min_periods):
+    min_periods = window if min_periods is None else min_periods
+    return np.where(counts >= max(min_periods, 1), result, np.nan)
+
+
+def rolling_mean(values, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """Mean of the non-missing points in each trailing window; NaN below min_periods (default: window) points."""
+    values = np.asarray(values, dtype=float)
+    if window <= 0:
+        return np.full(values.shape, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        raw = np.where(np.isnan(values), 0.0, values)
+        counts = _window_sum(_prefix((~np.isnan(values)).astype(float)), window)
+        mean = _window_sum(_prefix(raw), window) / counts
+    return _gate(mean, counts, window, min_periods)
+
+
+def rolling_std(values, window: int, min_periods: Optional[int] = None, ddof: int = 1) -> np.ndarray:
+    """Standard deviation (ddof=1 by default) of each trailing window, skipping NaNs."""
+    values = np.asarray(values, dtype=float)
+    if window <= 0:
+        return np.full(values.shape, np.nan)
+    counts, sums, squares, tol = _rolling_moments(values, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ss = squares - sums * sums / counts
+        ss = np.where(ss <= tol * counts, 0.0, ss)
+        std = np.where(counts > ddof, np.sqrt(ss / np.maximum(counts - ddof, 1)), np.nan)
+    return _gate(std, counts, window, min_periods)
+
+
+def rolling_zscore(values, window: int, min_periods: Optional[int] = None, ddof: int = 1) -> np.ndarray:
+    """(value - trailing mean) / trailing std; NaN where the window is flat or too short."""
+    values = np.asarray(values, dtype=float)
+    mean = rolling_mean(values, window, min_periods)
+    std = rolling_std(values, window, min_periods, ddof)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(std > 0, (values - mean) / std, np.nan)
+
+
+def rolling_correlation(x, y, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """Pearson correlation over each trailing window of the days both x and y have values.
+
+    x and y broadcast against each other along the last axis, so one GERI
+    row can be correlated with a (k, n) block of assets in one call.
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    if window <= 0:
+        return np.full(x.shape, np.nan)
+    both = ~np.isnan(x) & ~np.isnan(y)
+    x = np.where(both, _center(np.where(both, x, np.nan)), 0.0)
+    y = np.where(both, _center(np.where(both, y, np.nan)), 0.0)
+    counts = _window_sum(_prefix(both.astype(float)), window)
+    corr = _correlation(_window_sum(_prefix(x * y), window),
+                        _window_sum(_prefix(x), window), _window_sum(_prefix(y), window),
+                        _window_sum(_prefix(x * x), window), _window_sum(_prefix(y * y), window),
+                        counts, _NOISE * _scale(x) ** 2, _NOISE * _scale(y) ** 2)
+    return _gate(corr, counts, window, min_periods)
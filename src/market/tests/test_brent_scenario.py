@@ -0,0 +1,84 @@
+"""
+Unit tests for the Brent scenario engine and its per-data-day artifact.
+"""
+import random
+from datetime import date, timedelta
+
+from src.market.brent_scenario import (
+    SHIFT_MAX,
+    SHIFT_MIN,
+    SUPPLY_SHOCKS,
+    ArtifactCache,
+    ScenarioArtifact,
+    analog_entry,
+    compute_scenario,
+    score_analogs,
+)
+
+
+def _history(n=600, seed=5):
+    rng = random.Random(seed)
+    geri, rows = 40, []
+    for i in range(n):
+        geri = max(1, min(100, geri + rng.choice([-9, -4, -1, 0, 1, 3, 8, 15])))
+        rows.append({'date': date(2024, 1, 1) + timedelta(days=i), 'geri': geri,
+                     'brent': None if rng.random() < 0.2 else 70 + rng.random() * 10,
+                     'vix': 15 + rng.random() * 5})
+    return rows
+
+
+def _exact(episodes, shift):
+    return [analog_entry(episodes[i], shift, s) for i, s in score_analogs(episodes, shift)]
+
+
+def test_analog_grid_matches_exact_scoring():
+    artifact = ScenarioArtifact.build(date(2025, 8, 23), _history())
+    assert artifact.episodes
+    for shift in range(SHIFT_MIN, SHIFT_MAX + 1):
+        assert artifact.analogs(shift) == _exact(artifact.episodes, shift), shift
+    for shift in (12.5, -33.3, SHIFT_MAX + 6):
+        assert artifact.analogs(shift) == _exact(artifact.episodes, shift)
+    assert artifact.analogs(7) == []
+    # every slider position (whole GERI % plus a preset) lands on the grid
+    assert all(float(2 * shock).is_integer() for shock in SUPPLY_SHOCKS.values())
+
+
+def test_artifact_round_trips_through_bytes():
+    artifact = ScenarioArtifact.build(date(2025, 8, 23), _history())
+    loaded = ScenarioArtifact.from_bytes(artifact.to_bytes())
+    assert loaded.episodes == artifact.episodes and loaded.sensitivity == artifact.sensitivity
+    assert (loaded.analog_index == artifact.analog_index).all()
+    assert (loaded.analog_score == artifact.analog_score).all()
+    assert loaded.recent_shift == artifact.recent_shift and loaded.data_day == date(2025, 8, 23)
+
+    empty = ScenarioArtifact.from_bytes(ScenarioArtifact.build(None, []).to_bytes())
+    assert empty.sensitivity == {'geri_slope_pct_per_pt': None, 'vix_slope_pct_per_pct': None, 'sample_days': 0}
+    assert empty.recent_shift is None and empty.analogs(40) == []
+
+
+def test_cache_builds_once_per_data_day_and_prefers_stored():
+    day = [date(2025, 8, 22)]
+    stored, loads = {}, []
+    cache = ArtifactCache(data_day=lambda: day[0], load_rows=lambda: loads.append(1) or _history(),
+                          load_stored=lambda d: stored.get(d),
+                          save_stored=lambda a: stored.__setitem__(a.data_day, a))
+    first = cache.get()
+    assert cache.get() is first and len(loads) == 1
+
+    other_worker = ArtifactCache(data_day=lambda: day[0], load_rows=lambda: loads.append(1) or [],
+                                 load_stored=lambda d: stored.get(d), save_stored=lambda a: None)
+    assert other_worker.get() is first and len(loads) == 1
+
+    day[0] = date(2025, 8, 23)
+    assert cache.get().data_day == date(2025, 8, 23) and len(loads) == 2
+
+
+def test_scenario_attribution_sums_to_total():
+    horizons, attribution, total = compute_scenario(80.0, 100, 60, 50, 'hormuz', 'strong')
+    assert attribution == {'geri': 8.5, 'vix': -0.88, 'gas_stress': 1.5, 'supply': 12.0,
+                           'demand': 2.5, 'total': 23.62}
+    assert horizons['7d']['most_likely'] == round(80.0 * (1 + total / 100), 2)
+    assert horizons['0_24h']['bias'] == 'Bullish'
+
+    horizons, attribution, total = compute_scenario(80.0, -50, 100, -50, 'normal', 'weak')
+    assert attribution['total'] == -8.65 and horizons['24_48h']['bias'] == 'Bearish'
@@ -0,0 +1,123 @@
+"""
+Unit tests for the market time-series store.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.market.series_store import SeriesSpec, TimeSeriesStore
+
+SPECS = [
+    SeriesSpec('brent', 'oil', 'brent_price', 'Brent'),
+    SeriesSpec('wti', 'oil', 'wti_price', 'WTI'),
+    SeriesSpec('vix', 'vix', 'vix_close', 'VIX'),
+]
+
+D0 = date(2026, 1, 1)
+
+
+class FakeDB:
+    def __init__(self):
+        self.tables = {
+            'oil': {D0 + timedelta(i): {'brent_price': Decimal(70 + i), 'wti_price': 65.0 + i} for i in range(10)},
+            'vix': {D0 + timedelta(i): {'vix_close': 20.0 + i} for i in range(2, 12) if i not in (3, 4)},
+        }
+        self.calls = []
+
+    def load(self, table, date_column, columns, where, since):
+        self.calls.append((table, since))
+        rows = self.tables[table]
+        return [dict(values, date=d) for d, values in sorted(rows.items()) if since is None or d >= since]
+
+
+def _store(db, now):
+    return TimeSeriesStore(SPECS, loader=db.load, refresh_seconds=60, overlap_days=2,
+                           full_reload_seconds=3600, clock=lambda: now[0])
+
+
+def test_loads_each_table_once_and_shares_axis():
+    db, now = FakeDB(), [0.0]
+    store = _store(db, now)
+    brent = store.series('brent')
+    store.series('wti')
+    assert db.calls == [('oil', None)]
+    assert len(brent) == 10
+    assert brent.last() == (D0 + timedelta(9), 79.0)
+
+    frame = store.align(['brent', 'vix'])
+    assert frame.iso_dates()[0] == '2026-01-03'
+    assert len(frame) == 6
+    outer = store.align(['brent', 'vix'], how='outer')
+    assert outer.iso_dates()[-1] == '2026-01-12'
+    assert outer.values_or_none('brent')[-1] is None
+    assert store.stats()['days'] == 12
+
+
+def test_empty_first_table_is_resized_when_axis_is_set():
+    db, now = FakeDB(), [0.0]
+    db.tables['vix'] = {}
+    store = _store(db, now)
+    assert len(store.series('vix')) == 0
+
+    outer = store.align(['vix', 'brent'], how='outer')
+    assert len(outer) == 10
+    assert outer.values_or_none('vix') == [None] * 10
+    assert store.align(['vix', 'brent']).iso_dates() == []
+
+
+def test_incremental_refresh_picks_up_new_and_revised_days():
+    db, now = FakeDB(), [0.0]
+    store = _store(db, now)
+    store.series('brent')
+    db.tables['oil'][D0 + timedelta(9)] = {'brent_price': 90, 'wti_price': 80}
+    db.tables['oil'][D0 + timedelta(10)] = {'brent_price': 91, 'wti_price': 81}
+
+    assert store.series('brent').last()[1] == 79.0
+    now[0] = 61
+    brent = store.series('brent')
+    assert db.calls[-1] == ('oil', D0 + timedelta(7))
+    assert brent.to_dict()[D0 + timedelta(9)] == 90.0
+    assert brent.last() == (D0 + timedelta(10), 91.0)
+    assert len(brent) == 11
+
+
+def test_range_slice_and_transforms():
+    db, now = FakeDB(), [0.0]
+    store = _store(db, now)
+    brent = store.series('brent', start=D0 + timedelta(2), end=D0 + timedelta(5))
+    assert [r['date'] for r in brent.to_rows(date_format='iso')] == ['2026-01-03', '2026-01-04', '2026-01-05', '2026-01-06']
+    assert brent.diff().values[1] == 1.0
+    assert brent.pct_change().values[1] == pytest.approx(100 / 72)
+    assert np.isnan(brent.pct_change().values[0])
+
+    rolled = brent.rolling_mean(3)
+    assert np.isnan(rolled.values[1])
+    assert rolled.values[2] == pytest.approx(73.0)
+    assert brent.rolling_std(4).values[-1] == pytest.approx(np.std([72, 73, 74, 75], ddof=1))
+    assert brent.between(start=D0 + timedelta(4)).tail(1).last()[1] == 75.0
+
+
+def test_rolling_min_periods_skips_missing_days():
+    db, now = FakeDB(), [0.0]
+    store = _store(db, now)
+    vix = store.series('vix', dropna=False)
+    mean = vix.rolling_mean(3, min_periods=2)
+    assert not np.isnan(mean.values[-1])
+    assert np.isnan(vix.rolling_mean(3).values[-1]) == bool(np.isnan(vix.values[-3:]).any())
+
+
+def test_unknown_series_and_failed_refresh_keep_data():
+    db, now = FakeDB(), [0.0]
+    store = _store(db, now)
+    with pytest.raises(KeyError):
+        store.series('nope')
+    store.series('vix')
+
+    def broken(*args):
+        raise RuntimeError('db down')
+
+    store.loader = broken
+    now[0] = 61
+    assert len(store.series('vix')) == 8
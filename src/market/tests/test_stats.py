@@ -0,0 +1,80 @@
+"""
+Unit tests for the vectorized statistics kernel.
+"""
+import numpy as np
+import pytest
+
+from src.market import stats
+
+
+def _lagged_reference(x, y, max_lag, min_pairs):
+    out = []
+    for lag in range(-max_lag, max_lag + 1):
+        pairs = [(x[i], y[i + lag]) for i in range(len(x)) if 0 <= i + lag < len(y)]
+        out.append(np.corrcoef(*zip(*pairs))[0, 1] if len(pairs) >= min_pairs else np.nan)
+    return np.array(out)
+
+
+def test_lagged_correlations_match_direct_loop_per_row():
+    rng = np.random.default_rng(3)
+    lengths = np.array([40, 25, 9])
+    x = np.full((3, 40), np.nan)
+    y = np.full((3, 40), np.nan)
+    for row, n in enumerate(lengths):
+        x[row, :n] = 80 + np.cumsum(rng.normal(size=n))
+        y[row, :n] = np.roll(x[row, :n], 2) * 0.5 + rng.normal(size=n)
+
+    corr = stats.lagged_correlations(x, y, lengths, max_lag=7, min_pairs=5)
+    for row, n in enumerate(lengths):
+        ref = _lagged_reference(x[row, :n], y[row, :n], 7, 5)
+        np.testing.assert_allclose(corr[row], ref, atol=1e-9, equal_nan=True)
+
+    lags, best = stats.best_lags(corr, 7)
+    assert lags[0] == 2 and best[0] > 0.5
+
+
+def test_pack_pairs_keeps_complete_days_in_order():
+    x = np.array([1.0, 2.0, np.nan, 4.0, 5.0])
+    ys = np.array([[10.0, np.nan, 30.0, 40.0, 50.0],
+                   [np.nan, np.nan, np.nan, np.nan, 5.5]])
+    xs, packed, lengths = stats.pack_pairs(x, ys)
+    assert lengths.tolist() == [3, 1]
+    assert xs[0, :3].tolist() == [1.0, 4.0, 5.0] and packed[0, :3].tolist() == [10.0, 40.0, 50.0]
+    assert np.isnan(packed[0, 3:]).all()
+    _, right, _ = stats.pack_pairs(x, ys, right=True)
+    assert right[1, -1] == 5.5 and np.isnan(right[1, :-1]).all()
+
+
+def test_rolling_statistics_skip_missing_days():
+    rng = np.random.default_rng(5)
+    values = 1000 + np.cumsum(rng.normal(size=120))
+    values[rng.random(120) < 0.25] = np.nan
+    other = values * -0.3 + rng.normal(size=120)
+    window = 10
+
+    mean = stats.rolling_mean(values, window, min_periods=4)
+    std = stats.rolling_std(values, window, min_periods=4)
+    z = stats.rolling_zscore(values, window, min_periods=4)
+    corr = stats.rolling_correlation(values, other, window, min_periods=4)
+    for i in range(len(values)):
+        w = values[max(0, i - window + 1):i + 1]
+        o = other[max(0, i - window + 1):i + 1]
+        ok = ~np.isnan(w)
+        if ok.sum() < 4:
+            assert np.isnan(mean[i]) and np.isnan(corr[i])
+            continue
+        assert mean[i] == pytest.approx(w[ok].mean(), abs=1e-9)
+        assert std[i] == pytest.approx(w[ok].std(ddof=1), abs=1e-9)
+        if not np.isnan(values[i]):
+            assert z[i] == pytest.approx((values[i] - w[ok].mean()) / w[ok].std(ddof=1), abs=1e-6)
+        assert corr[i] == pytest.approx(np.corrcoef(w[ok], o[ok])[0, 1], abs=1e-9)
+
+
+def test_flat_windows_give_zero_correlation_not_noise():
+    flat = np.full(30, 84.37)
+    moving = np.arange(30.0)
+    assert stats.pearson(flat[:10], moving[:10]) == 0.0
+    assert stats.pearson([1, 2], [3, 4]) is None
+    assert np.all(stats.rolling_correlation(flat, moving, 10)[9:] == 0.0)
+    assert np.all(stats.rolling_std(flat, 10)[9:] == 0.0)
+    assert np.isnan(stats.rolling_zscore(flat, 10)).all()
@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 import json
 import logging
 from src.db.db import get_cursor
+from src.billing.entitlements import entitlements_changed
 
 logger = logging.getLogger(__name__)
 
@@ -246,6 +247,7 @@ def apply_plan_settings_to_user(user_id: int, plan_code: str) -> bool:
             ))
         
         logger.info(f"Applied plan settings '{plan_code}' to user {user_id}")
+        entitlements_changed(user_id)
         
         sync_user_settings_on_plan_change(user_id, plan_code)
         
@@ -8,7 +8,16 @@ from datetime import date, timedelta
 from typing import Optional, Dict, Any
 
 from src.db.db import get_cursor
+from src.reri import ENABLE_EERI
+from src.reri.types import EERI_INDEX_ID
 from src.reri.service import compute_eeri_for_date
+from src.reri.engine import (
+    HistoryRow,
+    RegionalHistory,
+    partition_alerts_by_region,
+    build_eeri_result,
+    BASELINE_LOOKBACK_DAYS,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +67,7 @@ def run_eeri_backfill(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     force: bool = False,
+    bulk: bool = True,
 ) -> Dict[str, Any]:
     """
     Backfill EERI indices from historical alert_events.
@@ -66,6 +76,8 @@ def run_eeri_backfill(
         start_date: Start date (auto-detect from earliest alert if not specified)
         end_date: End date (yesterday if not specified)
         force: Whether to overwrite existing values
+        bulk: Use the multi-date engine (one alert/history load, batched
+              writes) instead of computing each date independently
     
     Returns:
         Dict with backfill statistics
@@ -96,6 +108,9 @@ def run_eeri_backfill(
     
     logger.info(f"Backfill range: {start_date} to {end_date}")
     
+    if bulk:
+        return run_bulk_eeri_backfill(start_date, end_date, force=force)
+    
     dates_with_alerts = get_dates_with_alerts(start_date, end_date)
     
     if not dates_with_alerts:
@@ -149,3 +164,127 @@ def run_eeri_backfill(
         'end_date': end_date.isoformat(),
         'results': results,
     }
+
+
+def run_bulk_eeri_backfill(
+    start_date: date,
+    end_date: date,
+    force: bool = False,
+    batch_size: int = 50,
+) -> Dict[str, Any]:
+    """
+    Multi-date EERI backfill in one pass.
+    
+    Loads all alerts for the range and the index history they depend on
+    once, computes RERI for every region plus EERI per date from an
+    in-memory RegionalHistory, and persists results in batches. Each date
+    sees the same history a date-by-date run would, including results
+    computed earlier in the run.
+    
+    Returns:
+        Dict with the same statistics as run_eeri_backfill, plus the
+        per-region RERI values for each computed date
+    """
+    from src.reri.repo import (
+        count_days_of_history,
+        fetch_alerts_for_range,
+        fetch_history_rows,
+        save_reri_results_batch,
+    )
+    
+    if not ENABLE_EERI:
+        logger.info("EERI is disabled (ENABLE_EERI=false)")
+        return {
+            'total_days': 0,
+            'computed': 0,
+            'skipped': 0,
+            'errors': 0,
+            'message': 'EERI is disabled',
+        }
+    
+    alerts_by_date = fetch_alerts_for_range(start_date, end_date)
+    dates_with_alerts = sorted(alerts_by_date)
+    
+    if not dates_with_alerts:
+        logger.warning(f"No alerts found between {start_date} and {end_date}")
+        return {
+            'total_days': 0,
+            'computed': 0,
+            'skipped': 0,
+            'errors': 0,
+            'message': f'No alerts found between {start_date} and {end_date}',
+        }
+    
+    history = RegionalHistory(
+        [HistoryRow(**row) for row in fetch_history_rows(
+            start_date - timedelta(days=BASELINE_LOOKBACK_DAYS), end_date
+        )],
+        index_day_counts={EERI_INDEX_ID: count_days_of_history(EERI_INDEX_ID)},
+    )
+    
+    total_days = len(dates_with_alerts)
+    computed = 0
+    skipped = 0
+    errors = 0
+    results = []
+    pending = []
+    pending_rows = []
+    
+    logger.info(f"Found {total_days} days with alerts to process (bulk)")
+    
+    def flush():
+        nonlocal computed, errors
+        if not pending:
+            return
+        try:
+            save_reri_results_batch(pending)
+            computed += len(pending)
+            results.extend(pending_rows)
+        except Exception as e:
+            errors += len(pending)
+            logger.error(f"  -> Batch save failed ({pending[0].index_date} to {pending[-1].index_date}): {e}")
+        pending.clear()
+        pending_rows.clear()
+    
+    for i, target_date in enumerate(dates_with_alerts, 1):
+        if history.has(EERI_INDEX_ID, target_date) and not force:
+            skipped += 1
+            logger.info(f"[{i}/{total_days}] {target_date} skipped (already exists)")
+            continue
+        
+        try:
+            region_alerts = partition_alerts_by_region(alerts_by_date[target_date])
+            result, regional_values = build_eeri_result(
+                target_date, region_alerts, history.day_history(target_date)
+            )
+        except Exception as e:
+            errors += 1
+            logger.error(f"[{i}/{total_days}] {target_date} error: {e}")
+            continue
+        
+        history.record(result)
+        pending.append(result)
+        pending_rows.append({
+            'date': target_date.isoformat(),
+            'value': result.value,
+            'band': result.band.value,
+            'reri': regional_values,
+        })
+        logger.info(f"[{i}/{total_days}] {target_date} EERI = {result.value} ({result.band.value})")
+        
+        if len(pending) >= batch_size:
+            flush()
+    
+    flush()
+    
+    logger.info(f"Bulk backfill complete: {computed} computed, {skipped} skipped, {errors} errors")
+    
+    return {
+        'total_days': total_days,
+        'computed': computed,
+        'skipped': skipped,
+        'errors': errors,
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'results': results,
+    }
@@ -119,6 +119,7 @@ def cmd_backfill(args):
         start_date=start_date,
         end_date=end_date,
         force=args.force,
+        bulk=not args.per_day,
     )
     
     print(f"\nBackfill Complete:")
@@ -147,6 +148,7 @@ def main():
     backfill_parser.add_argument('--start', help='Start date (YYYY-MM-DD), auto-detect if not specified')
     backfill_parser.add_argument('--end', help='End date (YYYY-MM-DD), defaults to yesterday')
     backfill_parser.add_argument('--force', action='store_true', help='Overwrite existing values')
+    backfill_parser.add_argument('--per-day', action='store_true', help='Compute each date independently instead of the multi-date engine')
     
     args = parser.parse_args()
     
@@ -235,6 +235,35 @@ def compute_reri_components(
     return components
 
 
+def compute_trends(
+    current_value: int,
+    previous_values: List[Dict[str, Any]]
+) -> tuple[Optional[int], Optional[int]]:
+    """
+    Compute 1-day and 7-day trends.
+    
+    Returns:
+        (trend_1d, trend_7d) where each is current - previous
+    """
+    trend_1d = None
+    trend_7d = None
+    
+    if previous_values:
+        yesterday = previous_values[0]['value'] if previous_values else None
+        if yesterday is not None:
+            trend_1d = current_value - yesterday
+        
+        if len(previous_values) >= 7:
+            week_ago = previous_values[6]['value']
+            if week_ago is not None:
+                trend_7d = current_value - week_ago
+        elif len(previous_values) >= 3:
+            avg_value = sum(v['value'] for v in previous_values) / len(previous_values)
+            trend_7d = current_value - int(avg_value)
+    
+    return trend_1d, trend_7d
+
+
 def compute_reri_value(components: RERIComponents) -> int:
     """
     Compute RERI value from normalized components.
@@ -2,13 +2,17 @@
 EERI History Service
 
 Provides functions for retrieving historical EERI data for SEO pages.
+
+Date lists, month lists, adjacency and aggregate stats come from the
+in-memory date index (src/seo/history_index.py).
 """
 import logging
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 from typing import Optional, List, Dict, Any
 
 from src.db.db import get_cursor, execute_query, get_production_cursor
 from src.reri.types import EERI_INDEX_ID, RERIResult, EERIComponents, RiskBand, get_band
+from src.seo.history_index import get_history_index, public_cutoff
 import json
 
 
@@ -30,20 +34,9 @@ def get_all_eeri_dates(public_only: bool = False) -> List[str]:
     
     Returns list of ISO date strings in descending order.
     """
-    yesterday = (date.today() - timedelta(days=1)).isoformat()
-    date_filter = f"AND date <= '{yesterday}'" if public_only else ""
-    
-    query = f"""
-        SELECT DISTINCT date
-        FROM reri_indices_daily
-        WHERE index_id = %s {date_filter}
-        ORDER BY date DESC
-    """
     try:
-        with get_production_cursor() as cursor:
-            cursor.execute(query, (EERI_INDEX_ID,))
-            rows = cursor.fetchall()
-        return [row['date'].isoformat() if hasattr(row['date'], 'isoformat') else str(row['date']) for row in rows]
+        index = get_history_index(EERI_INDEX_ID)
+        return [d.isoformat() for d in index.dates_desc(until=public_cutoff() if public_only else None)]
     except Exception as e:
         logger.error(f"Error fetching EERI dates: {e}")
         return []
@@ -58,36 +51,17 @@ def get_eeri_available_months(public_only: bool = False) -> List[Dict[str, Any]]
     
     Returns list of {year, month, count, max_date} dicts.
     """
-    yesterday = (date.today() - timedelta(days=1)).isoformat()
-    date_filter = f"AND date <= '{yesterday}'" if public_only else ""
-    
-    query = f"""
-        SELECT 
-            EXTRACT(YEAR FROM date)::int as year,
-            EXTRACT(MONTH FROM date)::int as month,
-            COUNT(*) as count,
-            MAX(date) as max_date
-        FROM reri_indices_daily
-        WHERE index_id = %s {date_filter}
-        GROUP BY EXTRACT(YEAR FROM date), EXTRACT(MONTH FROM date)
-        ORDER BY year DESC, month DESC
-    """
     try:
-        with get_production_cursor() as cursor:
-            cursor.execute(query, (EERI_INDEX_ID,))
-            rows = cursor.fetchall()
-        result = []
-        for row in rows:
-            max_date = row['max_date']
-            if hasattr(max_date, 'isoformat'):
-                max_date = max_date.isoformat()
-            result.append({
-                'year': row['year'],
-                'month': row['month'],
-                'count': row['count'],
-                'max_date': max_date,
-            })
-        return result
+        index = get_history_index(EERI_INDEX_ID)
+        return [
+            {
+                'year': m['year'],
+                'month': m['month'],
+                'count': m['count'],
+                'max_date': m['max_date'].isoformat(),
+            }
+            for m in index.month_summaries(until=public_cutoff() if public_only else None)
+        ]
     except Exception as e:
         logger.error(f"Error fetching EERI months: {e}")
         return []
@@ -274,31 +248,12 @@ def get_eeri_adjacent_dates(target_date: date) -> Dict[str, Optional[str]]:
     """
     Get previous and next dates that have EERI data relative to target date.
     """
-    prev_query = """
-        SELECT date FROM reri_indices_daily
-        WHERE index_id = %s AND date < %s
-        ORDER BY date DESC LIMIT 1
-    """
-    next_query = """
-        SELECT date FROM reri_indices_daily
-        WHERE index_id = %s AND date > %s
-        ORDER BY date ASC LIMIT 1
-    """
     try:
-        with get_production_cursor() as cursor:
-            cursor.execute(prev_query, (EERI_INDEX_ID, target_date))
-            prev_row = cursor.fetchone()
-            cursor.execute(next_query, (EERI_INDEX_ID, target_date))
-            next_row = cursor.fetchone()
-        
-        prev_date = None
-        next_date = None
-        if prev_row:
-            prev_date = prev_row['date'].isoformat() if hasattr(prev_row['date'], 'isoformat') else str(prev_row['date'])
-        if next_row:
-            next_date = next_row['date'].isoformat() if hasattr(next_row['date'], 'isoformat') else str(next_row['date'])
-        
-        return {'prev': prev_date, 'next': next_date}
+        prev_date, next_date = get_history_index(EERI_INDEX_ID).adjacent(target_date)
+        return {
+            'prev': prev_date.isoformat() if prev_date else None,
+            'next': next_date.isoformat() if next_date else None,
+        }
     except Exception as e:
         logger.error(f"Error fetching adjacent EERI dates: {e}")
         return {'prev': None, 'next': None}
@@ -308,32 +263,20 @@ def get_eeri_monthly_stats() -> Dict[str, Any]:
     """
     Get aggregate statistics across all EERI history.
     """
-    query = """
-        SELECT 
-            COUNT(*) as total_days,
-            AVG(value) as avg_value,
-            MAX(value) as max_value,
-            MIN(value) as min_value,
-            MIN(date) as first_date,
-            MAX(date) as last_date
-        FROM reri_indices_daily
-        WHERE index_id = %s
-    """
     try:
-        with get_production_cursor() as cursor:
-            cursor.execute(query, (EERI_INDEX_ID,))
-            row = cursor.fetchone()
-        
-        if not row or row['total_days'] == 0:
+        index = get_history_index(EERI_INDEX_ID)
+        if not len(index):
             return {}
         
+        values = [v for v in index.values if v is not None]
+        avg_value = sum(float(v) for v in values) / len(values) if values else None
         return {
-            'total_days': row['total_days'],
-            'avg_value': round(float(row['avg_value']), 1) if row['avg_value'] else 0,
-            'max_value': row['max_value'],
-            'min_value': row['min_value'],
-            'first_date': row['first_date'].isoformat() if hasattr(row['first_date'], 'isoformat') else str(row['first_date']),
-            'last_date': row['last_date'].isoformat() if hasattr(row['last_date'], 'isoformat') else str(row['last_date']),
+            'total_days': len(index),
+            'avg_value': round(avg_value, 1) if avg_value else 0,
+            'max_value': max(values) if values else None,
+            'min_value': min(values) if values else None,
+            'first_date': index.dates[0].isoformat(),
+            'last_date': index.dates[-1].isoformat(),
         }
     except Exception as e:
         logger.error(f"Error fetching EERI stats: {e}")
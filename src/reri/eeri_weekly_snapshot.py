@@ -4,17 +4,27 @@ EERI Weekly Snapshot Service
 Computes weekly risk overview, cross-asset confirmation, divergence status,
 and historical tendencies from production data for the public /eeri page
 and plan-tiered dashboard snapshots.
+
+The full weekly object (including reaction speeds and component
+attribution) is built once after EERI compute and stored in
+eeri_weekly_snapshots, keyed by week; each plan tier is a projection of
+it (project_weekly_snapshot). It is rebuilt on read only when a newer
+EERI day or a new week has arrived since it was stored.
 """
+import json
 import logging
+import threading
 from datetime import date, datetime, timedelta
 from typing import Optional, Dict, Any, List, Tuple
 
-from src.db.db import get_cursor, get_production_cursor
 
 logger = logging.getLogger(__name__)
 
 EERI_INDEX_ID = 'europe:eeri'
 
+# Bump when the stored snapshot's shape changes; older rows are then ignored.
+SNAPSHOT_VERSION = 1
+
 PLAN_TIERS = {
     'free': 0,
     'personal': 1,
@@ -114,6 +124,15 @@ SCENARIO_TEMPLATES = {
     },
 }
 
+ASSET_CONFIGS = [
+    ('ttf', 'TTF Gas', 'ttf_gas_snapshots', 'date', 'ttf_price'),
+    ('brent', 'Brent Oil', 'oil_price_snapshots', 'date', 'brent_price'),
+    ('vix', 'VIX', 'vix_snapshots', 'date', 'vix_close'),
+    ('eurusd', 'EUR/USD', 'eurusd_snapshots', 'date', 'rate'),
+    ('storage', 'EU Gas Storage', 'gas_storage_snapshots', 'date', 'eu_storage_percent'),
+    ('lng', 'LNG (JKM)', 'lng_price_snapshots', 'date', 'jkm_price'),
+]
+
 DAY_NAMES = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
 
 BAND_ORDER = ['LOW', 'MODERATE', 'ELEVATED', 'SEVERE', 'CRITICAL']
@@ -222,6 +241,8 @@ def _get_current_partial_week() -> Tuple[date, date]:
 
 def _fetch_eeri_week(start: date, end: date) -> List[Dict[str, Any]]:
     """Fetch EERI daily values for a date range."""
+    from src.db.db import get_production_cursor
+
     query = """
         SELECT date, value, band, trend_7d
         FROM reri_indices_daily
@@ -239,7 +260,17 @@ def _fetch_eeri_week(start: date, end: date) -> List[Dict[str, Any]]:
 
 
 def _fetch_asset_week(table: str, date_col: str, value_col: str, start: date, end: date) -> List[Dict[str, Any]]:
-    """Fetch asset daily values for a date range."""
+    """Fetch asset daily values for a date range (from the shared series store when it holds them)."""
+    from src.db.db import get_production_cursor
+    from src.market.series_store import find_series, get_series_store
+
+    name = find_series(table, value_col)
+    if name:
+        try:
+            return get_series_store().series(name, start, end).to_rows()
+        except Exception as e:
+            logger.error(f"Error reading {name} from series store: {e}")
+            return []
     query = f"""
         SELECT {date_col} as date, {value_col} as value
         FROM {table}
@@ -359,6 +390,8 @@ def _get_divergence_status(cross_asset: List[Dict[str, Any]]) -> Tuple[str, str]
 
 def _get_latest_eeri_data_week() -> Tuple[date, date, list]:
     """Find the latest available 7-day window of EERI data with at least 3 days."""
+    from src.db.db import get_production_cursor
+
     query = """
         SELECT date, value, band, trend_7d
         FROM reri_indices_daily
@@ -381,10 +414,10 @@ def _get_latest_eeri_data_week() -> Tuple[date, date, list]:
         return None, None, []
 
 
-def get_weekly_snapshot() -> Optional[Dict[str, Any]]:
+def _compute_weekly_snapshot() -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]]:
     """
-    Compute the full EERI Weekly Snapshot for the public /eeri page.
-    Returns None if insufficient data.
+    Compute the EERI Weekly Snapshot together with the EERI and per-asset
+    rows it was built from, or None if insufficient data.
     Uses the latest available EERI data window, ensuring asset queries
     use the exact same date range for consistency.
     """
@@ -452,20 +485,13 @@ def get_weekly_snapshot() -> Optional[Dict[str, Any]]:
 
     sorted_regime = sorted(regime_dist.items(), key=lambda x: BAND_ORDER.index(x[0]) if x[0] in BAND_ORDER else 0, reverse=True)
 
-    asset_configs = [
-        ('ttf', 'TTF Gas', 'ttf_gas_snapshots', 'date', 'ttf_price'),
-        ('brent', 'Brent Oil', 'oil_price_snapshots', 'date', 'brent_price'),
-        ('vix', 'VIX', 'vix_snapshots', 'date', 'vix_close'),
-        ('eurusd', 'EUR/USD', 'eurusd_snapshots', 'date', 'rate'),
-        ('storage', 'EU Gas Storage', 'gas_storage_snapshots', 'date', 'eu_storage_percent'),
-        ('lng', 'LNG (JKM)', 'lng_price_snapshots', 'date', 'jkm_price'),
-    ]
-
     cross_asset = []
     chart_data = {}
+    asset_rows = {}
 
-    for key, name, table, date_col, val_col in asset_configs:
+    for key, name, table, date_col, val_col in ASSET_CONFIGS:
         asset_data = _fetch_asset_week(table, date_col, val_col, week_start, week_end)
+        asset_rows[key] = asset_data
         move_pct = _compute_weekly_move_pct(asset_data)
         alignment = _determine_alignment(key, move_pct, eeri_avg, trend_vs_prior)
         context = ASSET_CONTEXT_TEMPLATES.get(key, {}).get(alignment, '')
@@ -506,7 +532,7 @@ def get_weekly_snapshot() -> Optional[Dict[str, Any]]:
 
     prior_avg_val = prior_avg if prior_data else None
 
-    return {
+    snapshot = {
         'week_start': ws,
         'week_end': we,
         'overview': {
@@ -526,6 +552,16 @@ def get_weekly_snapshot() -> Optional[Dict[str, Any]]:
         'tendencies': tendencies,
         'data_days': len(eeri_data),
     }
+    return snapshot, eeri_data, asset_rows
+
+
+def get_weekly_snapshot() -> Optional[Dict[str, Any]]:
+    """
+    Compute the full EERI Weekly Snapshot for the public /eeri page.
+    Returns None if insufficient data.
+    """
+    computed = _compute_weekly_snapshot()
+    return computed[0] if computed else None
 
 
 def _compute_reaction_speed(eeri_data: List[Dict], asset_data: List[Dict]) -> str:
@@ -589,6 +625,8 @@ def _compute_risk_momentum(eeri_avg: float, prior_avg: Optional[float], trend: s
 
 def _get_component_attribution(week_start: date, week_end: date) -> List[Dict[str, Any]]:
     """Get EERI component attribution for the week from daily data."""
+    from src.db.db import get_production_cursor
+
     query = """
         SELECT components
         FROM reri_indices_daily
@@ -603,7 +641,6 @@ def _get_component_attribution(week_start: date, week_end: date) -> List[Dict[st
         if not row or not row.get('components'):
             return []
 
-        import json
         comp = row['components']
         if isinstance(comp, str):
             comp = json.loads(comp)
@@ -632,9 +669,30 @@ def _get_component_attribution(week_start: date, week_end: date) -> List[Dict[st
         return []
 
 
-def get_weekly_snapshot_tiered(plan: str = 'free') -> Optional[Dict[str, Any]]:
+def build_weekly_snapshot() -> Optional[Dict[str, Any]]:
+    """
+    Compute the stored weekly object: the public snapshot plus everything
+    the plan tiers add that needs data (reaction speeds, component
+    attribution). Returns None if insufficient data.
+    """
+    computed = _compute_weekly_snapshot()
+    if not computed:
+        return None
+    snapshot, eeri_data, asset_rows = computed
+
+    week_start = date.fromisoformat(snapshot['week_start'])
+    week_end = date.fromisoformat(snapshot['week_end'])
+    snapshot['reaction_speeds'] = {
+        key: _compute_reaction_speed(eeri_data, asset_rows.get(key, []))
+        for key, _, _, _, _ in ASSET_CONFIGS
+    }
+    snapshot['component_attribution'] = _get_component_attribution(week_start, week_end)
+    return snapshot
+
+
+def project_weekly_snapshot(snapshot: Dict[str, Any], plan: str = 'free') -> Dict[str, Any]:
     """
-    Compute plan-tiered EERI Weekly Snapshot for the user dashboard.
+    Plan-tiered view of a stored weekly snapshot (see build_weekly_snapshot).
 
     Plan visibility:
     - free: overview, asset directions, basic interpretation, basic outlook
@@ -643,20 +701,16 @@ def get_weekly_snapshot_tiered(plan: str = 'free') -> Optional[Dict[str, Any]]:
     - pro: + component attribution, regime persistence, scenarios, analog framing
     - enterprise: + all pro features (sector/spillover data when available)
     """
-    base_snapshot = get_weekly_snapshot()
-    if not base_snapshot:
-        return None
-
     plan_level = PLAN_TIERS.get(plan, 0)
-    ov = base_snapshot['overview']
+    ov = snapshot['overview']
     band = ov['band']
     trend = ov['trend_vs_prior']
 
     result = {
         'plan': plan,
-        'week_start': base_snapshot['week_start'],
-        'week_end': base_snapshot['week_end'],
-        'data_days': base_snapshot['data_days'],
+        'week_start': snapshot['week_start'],
+        'week_end': snapshot['week_end'],
+        'data_days': snapshot['data_days'],
     }
 
     result['overview'] = {
@@ -667,8 +721,9 @@ def get_weekly_snapshot_tiered(plan: str = 'free') -> Optional[Dict[str, Any]]:
         'trend_vs_prior': trend,
     }
 
+    reaction_speeds = snapshot.get('reaction_speeds', {})
     asset_direction = []
-    for a in base_snapshot['cross_asset']:
+    for a in snapshot['cross_asset']:
         direction = 'flat'
         if a['weekly_move_pct'] is not None:
             if a['weekly_move_pct'] > 0.5:
@@ -683,17 +738,19 @@ def get_weekly_snapshot_tiered(plan: str = 'free') -> Optional[Dict[str, Any]]:
         if plan_level >= 1:
             entry['alignment'] = a['alignment']
             entry['context'] = a['context']
+        if plan_level >= 2:
+            entry['reaction_speed'] = reaction_speeds.get(a['key'], 'medium')
         asset_direction.append(entry)
     result['asset_table'] = asset_direction
 
     regime_dist = {}
-    for band_name, days in base_snapshot['regime_distribution']:
+    for band_name, days in snapshot['regime_distribution']:
         regime_dist[band_name] = days
     result['regime_distribution'] = regime_dist
 
-    result['divergence_status'] = base_snapshot['divergence_status']
+    result['divergence_status'] = snapshot['divergence_status']
 
-    interpretation = _generate_basic_interpretation(ov, base_snapshot['cross_asset'], base_snapshot['divergence_status'])
+    interpretation = _generate_basic_interpretation(ov, snapshot['cross_asset'], snapshot['divergence_status'])
     result['interpretation'] = interpretation
 
     outlook = _generate_basic_outlook(band)
@@ -701,43 +758,15 @@ def get_weekly_snapshot_tiered(plan: str = 'free') -> Optional[Dict[str, Any]]:
 
     if plan_level >= 1:
         result['charts_enabled'] = True
-        result['chart_data'] = base_snapshot['chart_data']
-        result['historical_context'] = base_snapshot['historical_context']
-        result['tendencies'] = base_snapshot['tendencies']
-        result['divergence_narrative'] = base_snapshot['divergence_narrative']
+        result['chart_data'] = snapshot['chart_data']
+        result['historical_context'] = snapshot['historical_context']
+        result['tendencies'] = snapshot['tendencies']
+        result['divergence_narrative'] = snapshot['divergence_narrative']
     else:
         result['charts_enabled'] = False
 
     if plan_level >= 2:
-        week_start = date.fromisoformat(base_snapshot['week_start'])
-        week_end = date.fromisoformat(base_snapshot['week_end'])
-
-        asset_configs = [
-            ('ttf', 'TTF Gas', 'ttf_gas_snapshots', 'date', 'ttf_price'),
-            ('brent', 'Brent Oil', 'oil_price_snapshots', 'date', 'brent_price'),
-            ('vix', 'VIX', 'vix_snapshots', 'date', 'vix_close'),
-            ('eurusd', 'EUR/USD', 'eurusd_snapshots', 'date', 'rate'),
-            ('storage', 'EU Gas Storage', 'gas_storage_snapshots', 'date', 'eu_storage_percent'),
-            ('lng', 'LNG (JKM)', 'lng_price_snapshots', 'date', 'jkm_price'),
-        ]
-
-        eeri_data = _fetch_eeri_week(week_start, week_end)
-        reaction_speeds = {}
-        for key, name, table, date_col, val_col in asset_configs:
-            asset_data = _fetch_asset_week(table, date_col, val_col, week_start, week_end)
-            speed = _compute_reaction_speed(eeri_data, asset_data)
-            reaction_speeds[key] = speed
-
-        for entry in result['asset_table']:
-            key = None
-            for k, n, _, _, _ in asset_configs:
-                if n == entry['asset']:
-                    key = k
-                    break
-            if key:
-                entry['reaction_speed'] = reaction_speeds.get(key, 'medium')
-
-        prior_avg = base_snapshot.get('prior_avg')
+        prior_avg = snapshot.get('prior_avg')
         momentum = _compute_risk_momentum(ov['average'], prior_avg, trend)
         result['momentum'] = momentum
 
@@ -747,7 +776,7 @@ def get_weekly_snapshot_tiered(plan: str = 'free') -> Optional[Dict[str, Any]]:
             result['conditional_tendencies'] = CONDITIONAL_TENDENCIES[cond_key][trend_key]
             result['conditional_state'] = f"{band.capitalize()} + {trend.capitalize()}"
         else:
-            result['conditional_tendencies'] = base_snapshot['tendencies']
+            result['conditional_tendencies'] = snapshot['tendencies']
             result['conditional_state'] = f"{band.capitalize()} + {trend.capitalize()}"
 
         result['volatility_commentary'] = _generate_volatility_commentary(band, trend, momentum['label'])
@@ -756,11 +785,7 @@ def get_weekly_snapshot_tiered(plan: str = 'free') -> Optional[Dict[str, Any]]:
         result['regime_persistence'] = persistence
 
     if plan_level >= 3:
-        week_start = date.fromisoformat(base_snapshot['week_start'])
-        week_end = date.fromisoformat(base_snapshot['week_end'])
-
-        attribution = _get_component_attribution(week_start, week_end)
-        result['component_attribution'] = attribution
+        result['component_attribution'] = snapshot.get('component_attribution', [])
 
         scenarios = SCENARIO_TEMPLATES.get(band, SCENARIO_TEMPLATES['MODERATE'])
         result['scenario_outlook'] = [
@@ -777,6 +802,129 @@ def get_weekly_snapshot_tiered(plan: str = 'free') -> Optional[Dict[str, Any]]:
     return result
 
 
+def _snapshot_key() -> Tuple[date, Optional[date]]:
+    """
+    What a stored snapshot depends on: the week it was anchored to (the
+    last complete week moves every Monday) and the latest EERI date.
+    """
+    from src.seo.history_index import get_history_index
+
+    return _get_last_complete_week()[0], get_history_index(EERI_INDEX_ID).latest()
+
+
+def _is_current(stored: Optional[Dict[str, Any]], key: Tuple[date, Optional[date]]) -> bool:
+    return bool(stored) and stored['version'] == SNAPSHOT_VERSION and (stored['anchor_week'], stored['eeri_through']) == key
+
+
+def _load_stored_snapshot() -> Optional[Dict[str, Any]]:
+    """Latest stored weekly snapshot row, or None."""
+    from src.db.db import get_cursor
+
+    query = """
+        SELECT week_start, version, anchor_week, eeri_through, snapshot
+        FROM eeri_weekly_snapshots
+        WHERE version = %s
+        ORDER BY computed_at DESC
+        LIMIT 1
+    """
+    try:
+        with get_cursor(commit=False) as cursor:
+            cursor.execute(query, (SNAPSHOT_VERSION,))
+            row = cursor.fetchone()
+        return dict(row) if row else None
+    except Exception as e:
+        logger.error(f"Error loading stored EERI weekly snapshot: {e}")
+        return None
+
+
+def _save_stored_snapshot(stored: Dict[str, Any]) -> None:
+    """Upsert the snapshot row for its week."""
+    from src.db.db import get_cursor
+
+    with get_cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO eeri_weekly_snapshots (week_start, week_end, version, anchor_week, eeri_through, snapshot, computed_at)
+            VALUES (%s, %s, %s, %s, %s, %s, NOW())
+            ON CONFLICT (week_start) DO UPDATE SET
+                week_end = EXCLUDED.week_end,
+                version = EXCLUDED.version,
+                anchor_week = EXCLUDED.anchor_week,
+                eeri_through = EXCLUDED.eeri_through,
+                snapshot = EXCLUDED.snapshot,
+                computed_at = EXCLUDED.computed_at
+        """, (
+            stored['week_start'],
+            stored['snapshot']['week_end'],
+            stored['version'],
+            stored['anchor_week'],
+            stored['eeri_through'],
+            json.dumps(stored['snapshot']),
+        ))
+
+
+_stored_lock = threading.RLock()
+_stored: Optional[Dict[str, Any]] = None
+
+
+def refresh_weekly_snapshot() -> Optional[Dict[str, Any]]:
+    """
+    Rebuild and store the weekly snapshot. Called after EERI compute; also
+    run on demand when the stored one is out of date.
+    """
+    global _stored
+    key = _snapshot_key()
+    snapshot = build_weekly_snapshot()
+    if not snapshot:
+        return None
+    stored = {
+        'week_start': date.fromisoformat(snapshot['week_start']),
+        'version': SNAPSHOT_VERSION,
+        'anchor_week': key[0],
+        'eeri_through': key[1],
+        'snapshot': json.loads(json.dumps(snapshot)),
+    }
+    try:
+        _save_stored_snapshot(stored)
+    except Exception as e:
+        logger.error(f"Error saving EERI weekly snapshot: {e}")
+    with _stored_lock:
+        _stored = stored
+    logger.info(f"Stored EERI weekly snapshot for {snapshot['week_start']} to {snapshot['week_end']} "
+                f"(EERI through {key[1]})")
+    return stored['snapshot']
+
+
+def load_weekly_snapshot() -> Optional[Dict[str, Any]]:
+    """
+    The stored weekly snapshot (a superset of get_weekly_snapshot()),
+    rebuilt only when a newer EERI day or a new week has arrived since it
+    was computed.
+    """
+    global _stored
+    key = _snapshot_key()
+    if _is_current(_stored, key):
+        return _stored['snapshot']
+    with _stored_lock:
+        if _is_current(_stored, key):
+            return _stored['snapshot']
+        stored = _load_stored_snapshot()
+        if _is_current(stored, key):
+            _stored = stored
+            return stored['snapshot']
+        return refresh_weekly_snapshot()
+
+
+def get_weekly_snapshot_tiered(plan: str = 'free') -> Optional[Dict[str, Any]]:
+    """
+    Plan-tiered EERI Weekly Snapshot for the user dashboard: a projection
+    of the stored weekly snapshot.
+    """
+    snapshot = load_weekly_snapshot()
+    if not snapshot:
+        return None
+    return project_weekly_snapshot(snapshot, plan)
+
+
 def _generate_basic_interpretation(overview: Dict, cross_asset: List[Dict], divergence: str) -> str:
     """Generate a basic market interpretation paragraph."""
     avg = overview['average']
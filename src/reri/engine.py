@@ -0,0 +1,292 @@
+"""
+RERI/EERI Multi-Region Compute Engine
+
+Computes RERI for every canonical region and EERI for a day from a single
+alert load. Alerts are partitioned by normalized region in one pass, and
+historical inputs (severity for velocity, rolling component baselines,
+previous values, history depth) come either from the repo (single day) or
+from an in-memory RegionalHistory that is seeded once and updated as a
+multi-date backfill walks forward.
+"""
+import bisect
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Optional, List, Dict, Any, Tuple
+
+from src.reri.types import (
+    AlertRecord,
+    RERIResult,
+    CANONICAL_REGIONS,
+    CONTAGION_NEIGHBORS,
+    EERI_INDEX_ID,
+    MODEL_VERSION,
+    get_band,
+)
+from src.reri.compute import (
+    normalize_region,
+    compute_reri_components,
+    compute_reri_value,
+    compute_eeri_components,
+    compute_eeri_value,
+    extract_top_drivers,
+    compute_trends,
+)
+from src.reri.normalize import (
+    should_use_rolling_normalization,
+    compute_rolling_baseline,
+)
+
+logger = logging.getLogger(__name__)
+
+VELOCITY_LOOKBACK_DAYS = 3
+BASELINE_LOOKBACK_DAYS = 90
+TREND_LOOKBACK_DAYS = 7
+
+
+@dataclass
+class DayHistory:
+    """Historical inputs needed to compute one day."""
+    severity_values: Dict[str, List[float]] = field(default_factory=dict)
+    component_values: Optional[List[Dict[str, Any]]] = None
+    days_history: int = 0
+    previous_values: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class HistoryRow:
+    """One reri_indices_daily row, reduced to the fields used as history."""
+    index_id: str
+    region_id: str
+    date: date
+    value: Optional[int]
+    severity_pressure: Optional[float]
+    high_impact_count: Optional[int]
+    asset_overlap: Optional[int]
+    velocity: Optional[float]
+
+
+def partition_alerts_by_region(alerts: List[AlertRecord]) -> Dict[str, List[AlertRecord]]:
+    """
+    Split a day's alerts by canonical region in a single pass.
+    Order within each region is preserved; unmatched alerts are dropped.
+    """
+    partitioned: Dict[str, List[AlertRecord]] = {region_id: [] for region_id in CANONICAL_REGIONS}
+    for alert in alerts:
+        region_id = normalize_region(alert.region)
+        if region_id is not None:
+            partitioned.setdefault(region_id, []).append(alert)
+    return partitioned
+
+
+def build_eeri_result(
+    target_date: date,
+    region_alerts: Dict[str, List[AlertRecord]],
+    history: DayHistory,
+) -> Tuple[RERIResult, Dict[str, int]]:
+    """
+    Compute RERI for each region with alerts, then EERI, from loaded inputs.
+
+    Returns:
+        (EERI result, {region_id: RERI value}). Europe is always present;
+        neighbors only when they had alerts, matching what feeds contagion.
+    """
+    europe_alerts = region_alerts.get('europe', [])
+
+    use_rolling = should_use_rolling_normalization(history.days_history)
+    baseline_caps = None
+
+    if use_rolling:
+        if history.component_values:
+            baseline = compute_rolling_baseline(history.component_values, days=BASELINE_LOOKBACK_DAYS)
+            baseline_caps = {
+                'severity_max': baseline.severity_max,
+                'high_impact_max': baseline.high_impact_max,
+                'asset_overlap_max': baseline.asset_overlap_max,
+                'velocity_range': baseline.velocity_max - baseline.velocity_min,
+            }
+            logger.info(f"Using rolling normalization (days={history.days_history})")
+    else:
+        logger.info(f"Using fallback caps (days={history.days_history})")
+
+    reri_components = compute_reri_components(
+        europe_alerts,
+        history.severity_values.get('europe', []),
+        use_rolling_normalization=use_rolling,
+        baseline_caps=baseline_caps,
+    )
+    reri_eu_value = compute_reri_value(reri_components)
+    regional_values = {'europe': reri_eu_value}
+
+    neighbor_reri_values = {}
+    for neighbor_id in CONTAGION_NEIGHBORS['europe']:
+        neighbor_alerts = region_alerts.get(neighbor_id, [])
+        if neighbor_alerts:
+            neighbor_components = compute_reri_components(
+                neighbor_alerts,
+                history.severity_values.get(neighbor_id, []),
+            )
+            neighbor_reri_values[neighbor_id] = compute_reri_value(neighbor_components)
+            regional_values[neighbor_id] = neighbor_reri_values[neighbor_id]
+
+    eeri_components = compute_eeri_components(
+        europe_alerts,
+        reri_eu_value,
+        reri_components,
+        neighbor_reri_values=neighbor_reri_values,
+    )
+
+    eeri_value = compute_eeri_value(eeri_components)
+    band = get_band(eeri_value)
+
+    drivers = extract_top_drivers(europe_alerts, limit=5)
+    eeri_components.top_drivers = drivers
+
+    # Generate AI-powered interpretation (unique per day)
+    from src.reri.interpretation import generate_eeri_interpretation
+    eeri_components.interpretation = generate_eeri_interpretation(
+        value=eeri_value,
+        band=band.value,
+        drivers=drivers,
+        components={
+            'reri_eu': eeri_components.reri_eu_value,
+            'theme_pressure': eeri_components.theme_pressure_norm,
+            'asset_transmission': eeri_components.asset_transmission_norm,
+            'contagion': eeri_components.contagion_norm,
+        },
+        index_date=target_date.isoformat()
+    )
+
+    trend_1d, trend_7d = compute_trends(eeri_value, history.previous_values)
+
+    result = RERIResult(
+        index_id=EERI_INDEX_ID,
+        region_id='europe',
+        index_date=target_date,
+        value=eeri_value,
+        band=band,
+        trend_1d=trend_1d,
+        trend_7d=trend_7d,
+        components=eeri_components,
+        drivers=drivers,
+        model_version=MODEL_VERSION,
+        computed_at=datetime.utcnow(),
+    )
+
+    return result, regional_values
+
+
+class RegionalHistory:
+    """
+    In-memory view of reri_indices_daily for a backfill range.
+
+    Answers the same questions as the repo history helpers
+    (fetch_historical_severity_values, fetch_historical_component_values,
+    fetch_previous_values, count_days_of_history) without a query per day.
+    Rows recorded during the walk replace stored rows for the same
+    (index_id, date), exactly as save_reri_result would.
+    """
+
+    def __init__(self, rows: List[HistoryRow], index_day_counts: Optional[Dict[str, int]] = None):
+        self._rows: Dict[date, Dict[str, HistoryRow]] = {}
+        self._dates: List[date] = []
+        self._index_dates: Dict[str, set] = {}
+        for row in rows:
+            self._add(row)
+        # Days stored outside the loaded range still count towards history depth
+        self._extra_days: Dict[str, int] = {
+            index_id: count - len(self._index_dates.get(index_id, ()))
+            for index_id, count in (index_day_counts or {}).items()
+        }
+
+    def _add(self, row: HistoryRow) -> None:
+        by_index = self._rows.get(row.date)
+        if by_index is None:
+            by_index = self._rows[row.date] = {}
+            bisect.insort(self._dates, row.date)
+        by_index[row.index_id] = row
+        self._index_dates.setdefault(row.index_id, set()).add(row.date)
+
+    def _window(self, before: date, days: int):
+        start = before - timedelta(days=days)
+        lo = bisect.bisect_left(self._dates, start)
+        hi = bisect.bisect_left(self._dates, before)
+        for day in self._dates[lo:hi]:
+            by_index = self._rows[day]
+            for index_id in sorted(by_index):
+                yield by_index[index_id]
+
+    def has(self, index_id: str, day: date) -> bool:
+        return index_id in self._rows.get(day, {})
+
+    def severity_values(self, region_id: str, before: date, days: int = VELOCITY_LOOKBACK_DAYS) -> List[float]:
+        return [
+            row.severity_pressure for row in self._window(before, days)
+            if row.region_id == region_id and row.severity_pressure is not None
+        ]
+
+    def component_values(self, region_id: str, before: date, days: int = BASELINE_LOOKBACK_DAYS) -> List[Dict[str, Any]]:
+        return [
+            {
+                'date': row.date,
+                'severity_pressure': row.severity_pressure or 0.0,
+                'high_impact_count': row.high_impact_count or 0,
+                'asset_overlap': row.asset_overlap or 0,
+                'velocity': row.velocity or 0.0,
+            }
+            for row in self._window(before, days)
+            if row.region_id == region_id
+        ]
+
+    def previous_values(self, index_id: str, before: date, days: int = TREND_LOOKBACK_DAYS) -> List[Dict[str, Any]]:
+        values = [
+            {'date': row.date, 'value': row.value}
+            for row in self._window(before, days)
+            if row.index_id == index_id
+        ]
+        values.reverse()
+        return values
+
+    def days_of_history(self, index_id: str) -> int:
+        return self._extra_days.get(index_id, 0) + len(self._index_dates.get(index_id, ()))
+
+    def day_history(self, target_date: date) -> DayHistory:
+        """Assemble the inputs compute_eeri_for_date would fetch for target_date."""
+        days_history = self.days_of_history(EERI_INDEX_ID)
+        component_values = None
+        if should_use_rolling_normalization(days_history):
+            component_values = self.component_values('europe', target_date)
+
+        return DayHistory(
+            severity_values={
+                region_id: self.severity_values(region_id, target_date)
+                for region_id in CANONICAL_REGIONS
+            },
+            component_values=component_values,
+            days_history=days_history,
+            previous_values=self.previous_values(EERI_INDEX_ID, target_date),
+        )
+
+    def record(self, result: RERIResult) -> None:
+        """Add a freshly computed result, as it would read back once saved."""
+        stored = result.components.to_dict()
+        reri_components = (stored.get('reri_eu') or {}).get('components') or {}
+
+        def raw(key):
+            return (reri_components.get(key) or {}).get('raw')
+
+        severity = raw('severity_pressure')
+        high_impact = raw('high_impact_count')
+        asset_overlap = raw('asset_overlap')
+        velocity = raw('velocity')
+
+        self._add(HistoryRow(
+            index_id=result.index_id,
+            region_id=result.region_id,
+            date=result.index_date,
+            value=result.value,
+            severity_pressure=float(severity) if severity is not None else None,
+            high_impact_count=int(high_impact) if high_impact is not None else None,
+            asset_overlap=int(asset_overlap) if asset_overlap is not None else None,
+            velocity=float(velocity) if velocity is not None else None,
+        ))
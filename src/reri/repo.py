@@ -8,6 +8,8 @@ from datetime import date, datetime, timedelta
 from typing import Optional, List, Dict, Any
 import json
 
+from psycopg2.extras import execute_values
+
 from src.db.db import get_cursor, get_production_cursor
 from src.reri.types import (
     AlertRecord,
@@ -18,6 +20,7 @@ from src.reri.types import (
     EERI_INDEX_ID,
     MODEL_VERSION,
 )
+from src.seo.history_index import invalidate_history_index
 
 logger = logging.getLogger(__name__)
 
@@ -61,26 +64,58 @@ def fetch_alerts_for_date(
         
         rows = cursor.fetchall()
     
-    alerts = []
-    for row in rows:
-        assets = row['scope_assets'] if row['scope_assets'] else []
-        if isinstance(assets, str):
-            assets = [assets]
+    return [_row_to_alert(row) for row in rows]
+
+
+def _row_to_alert(row: Dict[str, Any]) -> AlertRecord:
+    """Build an AlertRecord from an alert_events row."""
+    assets = row['scope_assets'] if row['scope_assets'] else []
+    if isinstance(assets, str):
+        assets = [assets]
+    
+    return AlertRecord(
+        id=row['id'],
+        alert_type=row['alert_type'],
+        severity=row['severity'],
+        confidence=float(row['confidence']) if row['confidence'] else None,
+        region=row['scope_region'],
+        assets=assets,
+        headline=row['headline'],
+        body=row['body'],
+        category=row['category'],
+        created_at=row['created_at'],
+    )
+
+
+def fetch_alerts_for_range(
+    start_date: date,
+    end_date: date
+) -> Dict[date, List[AlertRecord]]:
+    """
+    Fetch all alerts between two dates (inclusive) in a single query.
+    
+    Returns:
+        Alerts grouped by date, each list ordered like fetch_alerts_for_date
+        (created_at DESC). Dates without alerts are absent.
+    """
+    with get_cursor() as cursor:
+        cursor.execute("""
+            SELECT 
+                id, alert_type, severity, confidence,
+                scope_region, scope_assets, headline, body,
+                category, created_at, DATE(created_at) as alert_date
+            FROM alert_events
+            WHERE DATE(created_at) BETWEEN %s AND %s
+            ORDER BY created_at DESC
+        """, (start_date, end_date))
         
-        alerts.append(AlertRecord(
-            id=row['id'],
-            alert_type=row['alert_type'],
-            severity=row['severity'],
-            confidence=float(row['confidence']) if row['confidence'] else None,
-            region=row['scope_region'],
-            assets=assets,
-            headline=row['headline'],
-            body=row['body'],
-            category=row['category'],
-            created_at=row['created_at'],
-        ))
+        rows = cursor.fetchall()
+    
+    alerts_by_date: Dict[date, List[AlertRecord]] = {}
+    for row in rows:
+        alerts_by_date.setdefault(row['alert_date'], []).append(_row_to_alert(row))
     
-    return alerts
+    return alerts_by_date
 
 
 def fetch_historical_severity_values(
@@ -176,33 +211,91 @@ def fetch_previous_values(
     return [{'date': row['date'], 'value': row['value']} for row in rows]
 
 
-def compute_trends(
-    current_value: int,
-    previous_values: List[Dict[str, Any]]
-) -> tuple[Optional[int], Optional[int]]:
+def fetch_history_rows(
+    start_date: date,
+    end_date: date
+) -> List[Dict[str, Any]]:
+    """
+    Fetch every index row between two dates (inclusive) with the raw
+    component values used for velocity, rolling normalization and trends.
+    Seeds the in-memory history of the multi-date backfill.
+    """
+    with get_cursor() as cursor:
+        cursor.execute("""
+            SELECT 
+                index_id,
+                region_id,
+                date,
+                value,
+                (components->'reri_eu'->'components'->'severity_pressure'->>'raw')::float as severity_pressure,
+                (components->'reri_eu'->'components'->'high_impact_count'->>'raw')::int as high_impact_count,
+                (components->'reri_eu'->'components'->'asset_overlap'->>'raw')::int as asset_overlap,
+                (components->'reri_eu'->'components'->'velocity'->>'raw')::float as velocity
+            FROM reri_indices_daily
+            WHERE date >= %s
+              AND date <= %s
+            ORDER BY date ASC
+        """, (start_date, end_date))
+        
+        rows = cursor.fetchall()
+    
+    return [dict(row) for row in rows]
+
+
+def save_reri_results_batch(results: List[RERIResult]) -> int:
     """
-    Compute 1-day and 7-day trends.
+    Save many RERI/EERI results in one statement.
+    Same upsert semantics as save_reri_result.
     
     Returns:
-        (trend_1d, trend_7d) where each is current - previous
+        Number of rows written
     """
-    trend_1d = None
-    trend_7d = None
+    if not results:
+        return 0
     
-    if previous_values:
-        yesterday = previous_values[0]['value'] if previous_values else None
-        if yesterday is not None:
-            trend_1d = current_value - yesterday
-        
-        if len(previous_values) >= 7:
-            week_ago = previous_values[6]['value']
-            if week_ago is not None:
-                trend_7d = current_value - week_ago
-        elif len(previous_values) >= 3:
-            avg_value = sum(v['value'] for v in previous_values) / len(previous_values)
-            trend_7d = current_value - int(avg_value)
+    values = [
+        (
+            result.index_id,
+            result.region_id,
+            result.index_date,
+            result.value,
+            result.band.value,
+            result.trend_1d,
+            result.trend_7d,
+            json.dumps(result.components.to_dict()),
+            json.dumps(result.drivers),
+            getattr(result.components, 'interpretation', None) or '',
+            result.model_version,
+            result.computed_at or datetime.utcnow(),
+        )
+        for result in results
+    ]
+    
+    with get_cursor() as cursor:
+        rows = execute_values(cursor, """
+            INSERT INTO reri_indices_daily (
+                index_id, region_id, date, value, band,
+                trend_1d, trend_7d, components, drivers,
+                interpretation, model_version, computed_at
+            ) VALUES %s
+            ON CONFLICT (index_id, date) DO UPDATE SET
+                value = EXCLUDED.value,
+                band = EXCLUDED.band,
+                trend_1d = EXCLUDED.trend_1d,
+                trend_7d = EXCLUDED.trend_7d,
+                components = EXCLUDED.components,
+                drivers = EXCLUDED.drivers,
+                interpretation = EXCLUDED.interpretation,
+                model_version = EXCLUDED.model_version,
+                computed_at = EXCLUDED.computed_at
+            RETURNING id
+        """, values, page_size=len(values), fetch=True)
     
-    return trend_1d, trend_7d
+    for index_id in {result.index_id for result in results}:
+        invalidate_history_index(index_id)
+    logger.info(f"Saved {len(rows)} RERI results "
+                f"({results[0].index_date} to {results[-1].index_date})")
+    return len(rows)
 
 
 def save_reri_result(result: RERIResult) -> int:
@@ -253,6 +346,7 @@ def save_reri_result(result: RERIResult) -> int:
         row = cursor.fetchone()
         row_id = row['id'] if row else 0
     
+    invalidate_history_index(result.index_id)
     logger.info(f"Saved RERI result: {result.index_id} = {result.value} ({result.band.value})")
     return row_id
 
@@ -35,7 +35,7 @@ from src.reri.eeri_history_service import (
     get_eeri_adjacent_dates,
     get_eeri_monthly_stats,
 )
-from src.reri.eeri_weekly_snapshot import get_weekly_snapshot, BAND_COLORS as WEEKLY_BAND_COLORS
+from src.reri.eeri_weekly_snapshot import load_weekly_snapshot, BAND_COLORS as WEEKLY_BAND_COLORS
 
 router = APIRouter(tags=["eeri-seo"])
 
@@ -830,7 +830,7 @@ def _render_eeri_page(eeri: dict):
     """
 
     try:
-        weekly_snapshot = get_weekly_snapshot()
+        weekly_snapshot = load_weekly_snapshot()
         weekly_snapshot_html = _build_weekly_snapshot_html(weekly_snapshot)
     except Exception as e:
         logger.error(f"Error building weekly snapshot: {e}")
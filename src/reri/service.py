@@ -4,44 +4,39 @@ EERI Service Layer
 Orchestrates EERI computation workflow.
 """
 import logging
-from datetime import date, datetime
+from datetime import date, timedelta
 from typing import Optional
 
 from src.reri import ENABLE_EERI
 from src.reri.types import (
     EERI_INDEX_ID,
     MODEL_VERSION,
+    CONTAGION_NEIGHBORS,
     RERIResult,
-    EERIComponents,
-    RERIComponents,
-    get_band,
-)
-from src.reri.compute import (
-    filter_alerts_by_region,
-    compute_reri_components,
-    compute_reri_value,
-    compute_eeri_components,
-    compute_eeri_value,
-    extract_top_drivers,
-    generate_interpretation,
 )
 from src.reri.repo import (
     fetch_alerts_for_date,
     fetch_historical_severity_values,
     fetch_previous_values,
-    compute_trends,
     save_reri_result,
     get_latest_reri,
     count_days_of_history,
     fetch_historical_component_values,
 )
-from src.reri.normalize import (
-    should_use_rolling_normalization,
-    compute_rolling_baseline,
+from src.reri.normalize import should_use_rolling_normalization
+from src.reri.engine import (
+    DayHistory,
+    partition_alerts_by_region,
+    build_eeri_result,
 )
+from src.reri.eeri_weekly_snapshot import refresh_weekly_snapshot
 
 logger = logging.getLogger(__name__)
 
+# Dates old enough to fall outside any weekly snapshot window (last
+# complete week plus its prior week) don't trigger a snapshot rebuild.
+WEEKLY_SNAPSHOT_WINDOW_DAYS = 21
+
 
 def compute_eeri_for_date(
     target_date: date,
@@ -74,105 +69,33 @@ def compute_eeri_for_date(
     all_alerts = fetch_alerts_for_date(target_date)
     logger.info(f"Fetched {len(all_alerts)} total alerts for {target_date}")
     
-    europe_alerts = filter_alerts_by_region(all_alerts, 'europe')
-    logger.info(f"Filtered to {len(europe_alerts)} Europe alerts")
-    
-    historical_s = fetch_historical_severity_values('europe', target_date, days=3)
-    
-    days_history = count_days_of_history(EERI_INDEX_ID)
-    use_rolling = should_use_rolling_normalization(days_history)
-    baseline_caps = None
-    
-    if use_rolling:
-        historical_components = fetch_historical_component_values('europe', target_date, days=90)
-        if historical_components:
-            baseline = compute_rolling_baseline(historical_components, days=90)
-            baseline_caps = {
-                'severity_max': baseline.severity_max,
-                'high_impact_max': baseline.high_impact_max,
-                'asset_overlap_max': baseline.asset_overlap_max,
-                'velocity_range': baseline.velocity_max - baseline.velocity_min,
-            }
-            logger.info(f"Using rolling normalization (days={days_history})")
-    else:
-        logger.info(f"Using fallback caps (days={days_history})")
+    region_alerts = partition_alerts_by_region(all_alerts)
+    logger.info(f"Filtered to {len(region_alerts['europe'])} Europe alerts")
     
-    reri_components = compute_reri_components(
-        europe_alerts, 
-        historical_s,
-        use_rolling_normalization=use_rolling,
-        baseline_caps=baseline_caps,
+    history = DayHistory(
+        severity_values={'europe': fetch_historical_severity_values('europe', target_date, days=3)},
+        days_history=count_days_of_history(EERI_INDEX_ID),
     )
-    reri_eu_value = compute_reri_value(reri_components)
-    logger.info(f"Computed RERI_EU = {reri_eu_value}")
-    
-    neighbor_reri_values = {}
-    
-    me_alerts = filter_alerts_by_region(all_alerts, 'middle-east')
-    if me_alerts:
-        me_historical_s = fetch_historical_severity_values('middle-east', target_date, days=3)
-        me_components = compute_reri_components(me_alerts, me_historical_s)
-        neighbor_reri_values['middle-east'] = compute_reri_value(me_components)
-        logger.info(f"Computed RERI Middle East = {neighbor_reri_values['middle-east']} ({len(me_alerts)} alerts)")
+    if should_use_rolling_normalization(history.days_history):
+        history.component_values = fetch_historical_component_values('europe', target_date, days=90)
+    for neighbor_id in CONTAGION_NEIGHBORS['europe']:
+        if region_alerts.get(neighbor_id):
+            history.severity_values[neighbor_id] = fetch_historical_severity_values(neighbor_id, target_date, days=3)
+    history.previous_values = fetch_previous_values(EERI_INDEX_ID, target_date, days=7)
     
-    bs_alerts = filter_alerts_by_region(all_alerts, 'black-sea')
-    if bs_alerts:
-        bs_historical_s = fetch_historical_severity_values('black-sea', target_date, days=3)
-        bs_components = compute_reri_components(bs_alerts, bs_historical_s)
-        neighbor_reri_values['black-sea'] = compute_reri_value(bs_components)
-        logger.info(f"Computed RERI Black Sea = {neighbor_reri_values['black-sea']} ({len(bs_alerts)} alerts)")
-    
-    eeri_components = compute_eeri_components(
-        europe_alerts,
-        reri_eu_value,
-        reri_components,
-        neighbor_reri_values=neighbor_reri_values,
-    )
-    
-    eeri_value = compute_eeri_value(eeri_components)
-    band = get_band(eeri_value)
-    logger.info(f"Computed EERI = {eeri_value} ({band.value})")
-    
-    drivers = extract_top_drivers(europe_alerts, limit=5)
-    eeri_components.top_drivers = drivers
-    
-    # Generate AI-powered interpretation (unique per day)
-    from src.reri.interpretation import generate_eeri_interpretation
-    ai_interpretation = generate_eeri_interpretation(
-        value=eeri_value,
-        band=band.value,
-        drivers=drivers,
-        components={
-            'reri_eu': eeri_components.reri_eu_value,
-            'theme_pressure': eeri_components.theme_pressure_norm,
-            'asset_transmission': eeri_components.asset_transmission_norm,
-            'contagion': eeri_components.contagion_norm,
-        },
-        index_date=target_date.isoformat()
-    )
-    eeri_components.interpretation = ai_interpretation
-    
-    previous_values = fetch_previous_values(EERI_INDEX_ID, target_date, days=7)
-    trend_1d, trend_7d = compute_trends(eeri_value, previous_values)
-    
-    result = RERIResult(
-        index_id=EERI_INDEX_ID,
-        region_id='europe',
-        index_date=target_date,
-        value=eeri_value,
-        band=band,
-        trend_1d=trend_1d,
-        trend_7d=trend_7d,
-        components=eeri_components,
-        drivers=drivers,
-        model_version=MODEL_VERSION,
-        computed_at=datetime.utcnow(),
-    )
+    result, regional_values = build_eeri_result(target_date, region_alerts, history)
+    logger.info(f"Computed RERI by region = {regional_values}")
+    logger.info(f"Computed EERI = {result.value} ({result.band.value})")
     
     if save:
         save_reri_result(result)
         logger.info(f"Saved EERI result for {target_date}")
-    
+        if target_date >= date.today() - timedelta(days=WEEKLY_SNAPSHOT_WINDOW_DAYS):
+            try:
+                refresh_weekly_snapshot()
+            except Exception as e:
+                logger.error(f"Error refreshing EERI weekly snapshot: {e}")
+
     return result
 
 
@@ -0,0 +1,71 @@
+"""
+Unit tests for the stored EERI weekly snapshot and its plan-tier projections.
+"""
+from datetime import date
+
+from src.reri import eeri_weekly_snapshot as weekly
+from src.reri.eeri_weekly_snapshot import PLAN_TIERS, project_weekly_snapshot
+
+
+def _snapshot():
+    return {
+        'week_start': '2026-10-05',
+        'week_end': '2026-10-11',
+        'overview': {'average': 58, 'band': 'ELEVATED', 'high': {'value': 63, 'day': 'Thu'},
+                     'low': {'value': 52, 'day': 'Mon'}, 'trend_vs_prior': 'rising'},
+        'prior_avg': 51,
+        'regime_distribution': [['SEVERE', 2], ['ELEVATED', 5]],
+        'cross_asset': [
+            {'asset': 'TTF Gas', 'key': 'ttf', 'weekly_move_pct': 4.2, 'alignment': 'confirming', 'context': 'c1'},
+            {'asset': 'VIX', 'key': 'vix', 'weekly_move_pct': None, 'alignment': 'neutral', 'context': ''},
+        ],
+        'chart_data': {'eeri': [{'date': '2026-10-05', 'value': 52}]},
+        'divergence_status': 'confirming',
+        'divergence_narrative': 'n',
+        'historical_context': [],
+        'tendencies': [],
+        'data_days': 7,
+        'reaction_speeds': {'ttf': 'fast', 'vix': 'lagging'},
+        'component_attribution': [{'component': 'Contagion', 'value': 10.0, 'weight': 0.1, 'contribution': 1.0}],
+    }
+
+
+def test_tiers_are_nested_projections_of_one_snapshot():
+    snapshot = _snapshot()
+    views = {plan: project_weekly_snapshot(snapshot, plan) for plan in PLAN_TIERS}
+
+    assert views['free']['charts_enabled'] is False
+    assert views['free']['asset_table'][0] == {'asset': 'TTF Gas', 'direction': 'up', 'weekly_move_pct': 4.2}
+    assert views['free']['regime_distribution'] == {'SEVERE': 2, 'ELEVATED': 5}
+    assert views['personal']['asset_table'][1]['alignment'] == 'neutral'
+    assert [a['reaction_speed'] for a in views['trader']['asset_table']] == ['fast', 'lagging']
+    assert views['trader']['momentum']['label'] == 'accelerating'
+    assert 'component_attribution' not in views['trader']
+    assert views['pro']['component_attribution'] == snapshot['component_attribution']
+    assert views['enterprise']['enterprise'] is True
+    for lower, higher in zip(list(PLAN_TIERS), list(PLAN_TIERS)[1:]):
+        assert set(views[lower]) <= set(views[higher])
+    assert project_weekly_snapshot(snapshot, 'unknown') == {**views['free'], 'plan': 'unknown'}
+    assert snapshot == _snapshot()
+
+
+def test_load_rebuilds_only_when_week_or_eeri_data_moves(monkeypatch):
+    key = [(date(2026, 10, 5), date(2026, 10, 16))]
+    builds, db_rows = [], []
+    monkeypatch.setattr(weekly, '_stored', None)
+    monkeypatch.setattr(weekly, '_snapshot_key', lambda: key[0])
+    monkeypatch.setattr(weekly, 'build_weekly_snapshot', lambda: builds.append(1) or _snapshot())
+    monkeypatch.setattr(weekly, '_load_stored_snapshot', lambda: db_rows[-1] if db_rows else None)
+    monkeypatch.setattr(weekly, '_save_stored_snapshot', db_rows.append)
+
+    first = weekly.get_weekly_snapshot_tiered('pro')
+    assert first['week_start'] == '2026-10-05' and len(builds) == 1
+    assert weekly.get_weekly_snapshot_tiered('free')['plan'] == 'free' and len(builds) == 1
+
+    monkeypatch.setattr(weekly, '_stored', None)
+    weekly.load_weekly_snapshot()
+    assert len(builds) == 1
+
+    key[0] = (date(2026, 10, 5), date(2026, 10, 17))
+    weekly.load_weekly_snapshot()
+    assert len(builds) == 2 and db_rows[-1]['eeri_through'] == date(2026, 10, 17)
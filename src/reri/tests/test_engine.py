@@ -0,0 +1,137 @@
+"""
+Unit tests for the multi-region RERI/EERI engine.
+"""
+import random
+from datetime import date, datetime, timedelta
+
+from src.reri.types import AlertRecord, EERI_INDEX_ID
+from src.reri.compute import filter_alerts_by_region
+from src.reri.normalize import should_use_rolling_normalization
+from src.reri.engine import (
+    DayHistory,
+    HistoryRow,
+    RegionalHistory,
+    partition_alerts_by_region,
+    build_eeri_result,
+)
+
+REGIONS = ['Europe', 'EU', 'Middle East', 'Persian Gulf', 'Black Sea', 'Ukraine', 'Asia', None]
+ALERT_TYPES = ['HIGH_IMPACT_EVENT', 'REGIONAL_RISK_SPIKE', 'ASSET_RISK_SPIKE']
+
+
+def _random_alerts(day: date, rng: random.Random, start_id: int):
+    return [
+        AlertRecord(
+            id=start_id + i,
+            alert_type=rng.choice(ALERT_TYPES),
+            severity=rng.choice([None, 2, 3, 4, 5]),
+            confidence=rng.choice([None, 0.5, 0.8, 1.0]),
+            region=rng.choice(REGIONS),
+            assets=rng.sample(['gas', 'oil', 'power', 'freight'], rng.randint(0, 2)),
+            created_at=datetime.combine(day, datetime.min.time()) + timedelta(minutes=i),
+            headline=f"Pipeline outage {i}",
+            body="Event: Pipeline outage\nCategory: ENERGY\nRegion: Europe",
+        )
+        for i in range(rng.randint(1, 10))
+    ]
+
+
+def _to_row(result) -> dict:
+    reri = result.components.to_dict()['reri_eu']['components']
+    return {
+        'index_id': result.index_id,
+        'region_id': result.region_id,
+        'date': result.index_date,
+        'value': result.value,
+        'severity_pressure': float(reri['severity_pressure']['raw']),
+        'high_impact_count': int(reri['high_impact_count']['raw']),
+        'asset_overlap': int(reri['asset_overlap']['raw']),
+        'velocity': float(reri['velocity']['raw']),
+    }
+
+
+def _table_history(table: dict, target_date: date, region_alerts) -> DayHistory:
+    """Repo-query semantics of compute_eeri_for_date over an in-memory table."""
+    def window(days):
+        start = target_date - timedelta(days=days)
+        return [table[d] for d in sorted(table) if start <= d < target_date]
+
+    history = DayHistory(
+        severity_values={'europe': [r['severity_pressure'] for r in window(3)]},
+        days_history=len(table),
+    )
+    if should_use_rolling_normalization(history.days_history):
+        history.component_values = [
+            {
+                'date': r['date'],
+                'severity_pressure': r['severity_pressure'] or 0.0,
+                'high_impact_count': r['high_impact_count'] or 0,
+                'asset_overlap': r['asset_overlap'] or 0,
+                'velocity': r['velocity'] or 0.0,
+            }
+            for r in window(90)
+        ]
+    for neighbor_id in ('middle-east', 'black-sea'):
+        if region_alerts.get(neighbor_id):
+            history.severity_values[neighbor_id] = []
+    history.previous_values = [
+        {'date': r['date'], 'value': r['value']} for r in reversed(window(7))
+    ]
+    return history
+
+
+def test_partition_matches_filter_by_region():
+    rng = random.Random(1)
+    alerts = _random_alerts(date(2025, 5, 1), rng, 1) + _random_alerts(date(2025, 5, 1), rng, 100)
+    partitioned = partition_alerts_by_region(alerts)
+    for region_id in ('europe', 'middle-east', 'black-sea'):
+        assert partitioned[region_id] == filter_alerts_by_region(alerts, region_id)
+
+
+def test_regional_history_windows():
+    rows = [
+        HistoryRow(EERI_INDEX_ID, 'europe', date(2025, 1, d), 10 * d, float(d), d, 1, 0.5)
+        for d in range(1, 11)
+    ]
+    history = RegionalHistory(rows, index_day_counts={EERI_INDEX_ID: 25})
+
+    assert history.severity_values('europe', date(2025, 1, 8)) == [5.0, 6.0, 7.0]
+    assert history.severity_values('black-sea', date(2025, 1, 8)) == []
+    assert [v['value'] for v in history.previous_values(EERI_INDEX_ID, date(2025, 1, 9))] == [
+        80, 70, 60, 50, 40, 30, 20
+    ]
+    assert history.days_of_history(EERI_INDEX_ID) == 25
+    assert len(history.component_values('europe', date(2025, 1, 5))) == 4
+
+
+def test_bulk_walk_matches_per_date_semantics():
+    rng = random.Random(7)
+    start = date(2025, 1, 1)
+    days = [start + timedelta(days=i) for i in range(80) if rng.random() < 0.85]
+
+    alerts_by_date = {}
+    next_id = 1
+    for day in days:
+        alerts_by_date[day] = _random_alerts(day, rng, next_id)
+        next_id += 100
+
+    table = {}
+    history = RegionalHistory([], index_day_counts={EERI_INDEX_ID: 0})
+
+    for day in days:
+        region_alerts = partition_alerts_by_region(alerts_by_date[day])
+
+        expected, expected_regional = build_eeri_result(
+            day, region_alerts, _table_history(table, day, region_alerts)
+        )
+        actual, actual_regional = build_eeri_result(day, region_alerts, history.day_history(day))
+
+        expected_dict = expected.to_dict()
+        actual_dict = actual.to_dict()
+        expected_dict.pop('computed_at')
+        actual_dict.pop('computed_at')
+        assert actual_dict == expected_dict
+        assert actual_regional == expected_regional
+
+        table[day] = _to_row(expected)
+        history.record(actual)
@@ -249,6 +249,17 @@ def get_recent_public_digest_pages(limit: int = 90) -> List[Dict]:
     return results if results else []
 
 
+def get_public_digest_sitemap_rows(limit: int = 60) -> List[Dict]:
+    query = """
+    SELECT page_date, updated_at
+    FROM public_digest_pages
+    ORDER BY page_date DESC
+    LIMIT %s
+    """
+    results = execute_production_query(query, (limit,))
+    return results if results else []
+
+
 def get_public_digest_available_dates() -> List[str]:
     query = """
     SELECT page_date
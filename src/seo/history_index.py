@@ -0,0 +1,279 @@
+"""
+History Date Index
+
+In-memory, sorted (date, value) index per history table, for the GERI,
+EERI and EGSI-M history services. The SEO history and monthly pages ask
+for adjacent dates, month lists, monthly stats and sitemap date lists
+several times per render; each used to be its own aggregate query.
+
+Each table is loaded once as a sorted list (one narrow query) and every
+one of those questions becomes a bisect over it:
+
+- adjacent(d): previous / next stored date
+- dates(until): all dates, newest first (sitemaps)
+- months(until): per-month count, first and last date, newest first
+- month_values / adjacent_months / between: monthly pages and listings
+
+An index is dropped when its repo saves a new daily row (invalidate(),
+called from src/{geri,reri,egsi}/repo.py) and rebuilt on next use; rows
+written by another process are picked up after HISTORY_INDEX_TTL_SECONDS.
+
+The same invalidation clears a small LRU of snapshot view objects keyed by
+(index_id, date), so a history page does not re-fetch and re-parse a
+day's components JSON on every render. Memoized snapshots expire on the
+same TTL, so a recompute in another process (a forced run on another
+instance, the GERI CLI backfill, the worker) reaches every instance.
+"""
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.egsi.types import EGSI_M_INDEX_ID
+from src.geri.types import INDEX_ID as GERI_INDEX_ID
+from src.reri.types import EERI_INDEX_ID
+
+logger = logging.getLogger(__name__)
+
+HISTORY_INDEX_TTL_SECONDS = float(os.environ.get('HISTORY_INDEX_TTL_SECONDS', '300'))
+HISTORY_SNAPSHOT_CACHE_SIZE = int(os.environ.get('HISTORY_SNAPSHOT_CACHE_SIZE', '2048'))
+
+Month = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class IndexTable:
+    index_id: str
+    table: str
+    date_column: str = 'date'
+    value_column: str = 'value'
+    where: str = ''
+
+    @property
+    def query(self) -> str:
+        where = f"WHERE {self.where}" if self.where else ''
+        return (f"SELECT {self.date_column} AS date, {self.value_column} AS value "
+                f"FROM {self.table} {where} ORDER BY {self.date_column}")
+
+
+TABLES: Dict[str, IndexTable] = {
+    GERI_INDEX_ID: IndexTable(GERI_INDEX_ID, 'intel_indices_daily', where=f"index_id = '{GERI_INDEX_ID}'"),
+    EERI_INDEX_ID: IndexTable(EERI_INDEX_ID, 'reri_indices_daily', where=f"index_id = '{EERI_INDEX_ID}'"),
+    EGSI_M_INDEX_ID: IndexTable(EGSI_M_INDEX_ID, 'egsi_m_daily', 'index_date', 'index_value'),
+}
+
+
+def as_date(value) -> date:
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def public_cutoff() -> date:
+    """Last date shown to the public (24h delay)."""
+    return date.today() - timedelta(days=1)
+
+
+def avg_numeric(values: Sequence, places: int = 2) -> Optional[Decimal]:
+    """AVG(x)::numeric(p, places) as Postgres computes it (half away from zero)."""
+    if not values:
+        return None
+    mean = sum(Decimal(str(v)) for v in values) / Decimal(len(values))
+    return mean.quantize(Decimal(1).scaleb(-places), rounding=ROUND_HALF_UP)
+
+
+class DateIndex:
+    """Sorted dates and values of one history table; rows may share a date."""
+
+    def __init__(self, rows: Iterable[Tuple[Any, Any]]):
+        pairs = sorted(((as_date(d), v) for d, v in rows), key=lambda p: p[0])
+        self.dates: List[date] = [d for d, _ in pairs]
+        self.values: List[Any] = [v for _, v in pairs]
+        self.months: List[Month] = []
+        self._bounds: List[int] = []
+        for i, d in enumerate(self.dates):
+            if not self.months or self.months[-1] != (d.year, d.month):
+                self.months.append((d.year, d.month))
+                self._bounds.append(i)
+        self._bounds.append(len(self.dates))
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def _end(self, until: Optional[date]) -> int:
+        return len(self.dates) if until is None else bisect_right(self.dates, until)
+
+    def __contains__(self, day) -> bool:
+        day = as_date(day)
+        i = bisect_left(self.dates, day)
+        return i < len(self.dates) and self.dates[i] == day
+
+    def adjacent(self, day) -> Tuple[Optional[date], Optional[date]]:
+        day = as_date(day)
+        lo, hi = bisect_left(self.dates, day), bisect_right(self.dates, day)
+        return (self.dates[lo - 1] if lo else None,
+                self.dates[hi] if hi < len(self.dates) else None)
+
+    def latest(self, until: Optional[date] = None) -> Optional[date]:
+        end = self._end(until)
+        return self.dates[end - 1] if end else None
+
+    def dates_desc(self, until: Optional[date] = None) -> List[date]:
+        out: List[date] = []
+        for d in reversed(self.dates[:self._end(until)]):
+            if not out or out[-1] != d:
+                out.append(d)
+        return out
+
+    def between(self, start=None, end=None) -> List[date]:
+        """Distinct dates in [start, end], ascending."""
+        lo = 0 if start is None else bisect_left(self.dates, as_date(start))
+        hi = len(self.dates) if end is None else bisect_right(self.dates, as_date(end))
+        return sorted(set(self.dates[lo:hi]))
+
+    def _month_slice(self, year: int, month: int) -> Tuple[int, int]:
+        i = bisect_left(self.months, (year, month))
+        if i < len(self.months) and self.months[i] == (year, month):
+            return self._bounds[i], self._bounds[i + 1]
+        return 0, 0
+
+    def month_values(self, year: int, month: int) -> List[Any]:
+        lo, hi = self._month_slice(year, month)
+        return self.values[lo:hi]
+
+    def month_dates(self, year: int, month: int) -> List[date]:
+        lo, hi = self._month_slice(year, month)
+        return sorted(set(self.dates[lo:hi]))
+
+    def month_summaries(self, until: Optional[date] = None) -> List[Dict[str, Any]]:
+        """year, month, count (rows), min_date, max_date per month, newest month first."""
+        end = self._end(until)
+        out = []
+        for i, (year, month) in enumerate(self.months):
+            lo, hi = self._bounds[i], min(self._bounds[i + 1], end)
+            if lo >= hi:
+                break
+            out.append({'year': year, 'month': month, 'count': hi - lo,
+                        'min_date': self.dates[lo], 'max_date': self.dates[hi - 1]})
+        out.reverse()
+        return out
+
+    def adjacent_months(self, year: int, month: int) -> Tuple[Optional[Month], Optional[Month]]:
+        lo = bisect_left(self.months, (year, month))
+        hi = bisect_right(self.months, (year, month))
+        return (self.months[lo - 1] if lo else None,
+                self.months[hi] if hi < len(self.months) else None)
+
+
+def _load_rows(table: IndexTable) -> List[Tuple[Any, Any]]:
+    from src.db.db import get_production_cursor
+
+    with get_production_cursor() as cursor:
+        cursor.execute(table.query)
+        return [(row['date'], row['value']) for row in cursor.fetchall()]
+
+
+class HistoryIndex:
+    """Process-wide DateIndex per table plus the snapshot memo, both invalidated on save."""
+
+    def __init__(self, loader: Callable[[IndexTable], List[Tuple[Any, Any]]] = _load_rows,
+                 ttl: float = HISTORY_INDEX_TTL_SECONDS, snapshot_cache_size: int = HISTORY_SNAPSHOT_CACHE_SIZE,
+                 clock: Callable[[], float] = time.monotonic):
+        self.loader = loader
+        self.ttl = ttl
+        self.clock = clock
+        self.snapshot_cache_size = snapshot_cache_size
+        self._indexes: Dict[str, Tuple[float, DateIndex]] = {}
+        self._snapshots: 'OrderedDict[Tuple[str, str], Tuple[float, Any]]' = OrderedDict()
+        self._generation: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {index_id: threading.Lock() for index_id in TABLES}
+
+    def get(self, index_id: str) -> DateIndex:
+        entry = self._indexes.get(index_id)
+        if entry and self.clock() - entry[0] < self.ttl:
+            return entry[1]
+        with self._build_locks[index_id]:
+            entry = self._indexes.get(index_id)
+            if entry and self.clock() - entry[0] < self.ttl:
+                return entry[1]
+            generation = self._generation.get(index_id, 0)
+            started = self.clock()
+            index = DateIndex(self.loader(TABLES[index_id]))
+            with self._lock:
+                # A save during the load invalidated what was just read; serve it once, don't keep it.
+                if self._generation.get(index_id, 0) == generation:
+                    self._indexes[index_id] = (started, index)
+            logger.debug(f"History index {index_id}: {len(index)} rows")
+            return index
+
+    def invalidate(self, index_id: Optional[str] = None) -> None:
+        with self._lock:
+            ids = list(TABLES) if index_id is None else [index_id]
+            for i in ids:
+                self._indexes.pop(i, None)
+                self._generation[i] = self._generation.get(i, 0) + 1
+            for key in [k for k in self._snapshots if k[0] in ids]:
+                del self._snapshots[key]
+
+    def cached_snapshot(self, index_id: str, day) -> Optional[Any]:
+        key = (index_id, as_date(day).isoformat())
+        with self._lock:
+            entry = self._snapshots.get(key)
+            if entry is None:
+                return None
+            if self.clock() - entry[0] >= self.ttl:
+                del self._snapshots[key]
+                return None
+            self._snapshots.move_to_end(key)
+            return entry[1]
+
+    def generation(self, index_id: str) -> int:
+        """Bumped by every invalidate(); read it before fetching a snapshot you mean to remember."""
+        return self._generation.get(index_id, 0)
+
+    def remember_snapshot(self, index_id: str, day, snapshot: Any, generation: Optional[int] = None) -> Any:
+        with self._lock:
+            if generation is not None and generation != self._generation.get(index_id, 0):
+                return snapshot
+            key = (index_id, as_date(day).isoformat())
+            self._snapshots[key] = (self.clock(), snapshot)
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.snapshot_cache_size:
+                self._snapshots.popitem(last=False)
+        return snapshot
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'indexes': {i: len(idx) for i, (_, idx) in self._indexes.items()},
+                    'snapshots': len(self._snapshots), 'ttl_seconds': self.ttl}
+
+
+_history_index = HistoryIndex()
+
+
+def get_history_index(index_id: str) -> DateIndex:
+    return _history_index.get(index_id)
+
+
+def invalidate_history_index(index_id: Optional[str] = None) -> None:
+    """Call after saving daily rows for index_id (None: every table)."""
+    _history_index.invalidate(index_id)
+
+
+def cached_snapshot(index_id: str, day) -> Optional[Any]:
+    return _history_index.cached_snapshot(index_id, day)
+
+
+def snapshot_generation(index_id: str) -> int:
+    return _history_index.generation(index_id)
+
+
+def remember_snapshot(index_id: str, day, snapshot: Any, generation: Optional[int] = None) -> Any:
+    return _history_index.remember_snapshot(index_id, day, snapshot, generation)
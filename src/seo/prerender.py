@@ -0,0 +1,155 @@
+"""
+SEO Page Prerenderer
+
+Renders the SEO page tree through the same render_* functions the
+seo_routes handlers use and stores the output in the snapshot store.
+prerender_for_date() refreshes only the pages a new day touches;
+prerender_live_pages() refreshes /indices and the research pages after
+EERI or EGSI lands; prerender_all() fills the store for the whole archive.
+"""
+import logging
+import re
+from datetime import datetime, date
+from typing import Optional, Tuple, List
+
+from src.seo.seo_generator import get_yesterday_date, get_recent_daily_pages
+from src.seo.snapshot_store import (
+    affected_paths,
+    month_path,
+    save_snapshot,
+    list_snapshot_paths,
+    delete_stale_snapshots,
+    LIVE_PATHS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def render_snapshot_page(path: str) -> Optional[Tuple[str, str, Optional[date]]]:
+    """
+    Render one prerenderable path through the same functions the handlers use.
+
+    Returns (page_type, html, source_date), or None when the page would be a
+    404 (no data yet) or is not prerenderable.
+    """
+    from src.api import seo_routes
+
+    match = re.match(r'^/geri/(\d{4})-(\d{2})-(\d{2})$', path)
+    if match:
+        source_date = date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        html = seo_routes.render_geri_daily_html(source_date.isoformat())
+        return ('geri_daily', html, source_date) if html is not None else None
+
+    match = re.match(r'^/geri/(\d{4})/(\d{2})$', path)
+    if match:
+        year, month = int(match.group(1)), int(match.group(2))
+        html = seo_routes.render_geri_monthly_html(year, month)
+        return ('geri_monthly', html, date(year, month, 1)) if html is not None else None
+
+    match = re.match(r'^/alerts/daily/(\d{4})-(\d{2})-(\d{2})$', path)
+    if match:
+        source_date = date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        if source_date > get_yesterday_date():
+            return None
+        return 'alerts_daily', seo_routes.render_daily_alerts_html(source_date), source_date
+
+    match = re.match(r'^/alerts/(\d{4})/(\d{2})$', path)
+    if match:
+        year, month = int(match.group(1)), int(match.group(2))
+        return 'alerts_monthly', seo_routes.render_alerts_monthly_html(year, month), date(year, month, 1)
+
+    if path == '/indices':
+        return 'indices', seo_routes.render_indices_hub_html(), None
+    if path == '/research/global-energy-risk-index':
+        return 'research', seo_routes.render_geri_research_html(), None
+    if path == '/research/global-energy-risk-timeline':
+        return 'research', seo_routes.render_energy_risk_timeline_html(), None
+
+    return None
+
+
+def prerender_paths(paths: List[str], dry_run: bool = False) -> dict:
+    """Render and store each path; failures are logged and counted, not raised."""
+    summary = {'rendered': 0, 'changed': 0, 'skipped': 0, 'failed': 0, 'errors': []}
+
+    for path in paths:
+        try:
+            rendered = render_snapshot_page(path)
+            if rendered is None:
+                summary['skipped'] += 1
+                continue
+            page_type, html, source_date = rendered
+            summary['rendered'] += 1
+            if dry_run:
+                logger.info(f"[DRY RUN] Would store snapshot {path} ({len(html)} bytes)")
+                continue
+            if save_snapshot(path, page_type, html, source_date):
+                summary['changed'] += 1
+        except Exception as e:
+            logger.error(f"Error prerendering {path}: {e}")
+            summary['failed'] += 1
+            summary['errors'].append({'path': path, 'error': str(e)})
+
+    logger.info(
+        f"Prerender: {summary['rendered']} rendered, {summary['changed']} changed, "
+        f"{summary['skipped']} skipped, {summary['failed']} failed"
+    )
+    return summary
+
+
+def prerender_for_date(target_date: date, dry_run: bool = False) -> dict:
+    """
+    Refresh the snapshots touched by a new day's data: the day's GERI and
+    alerts pages, their month archives, the previous GERI day (whose "next"
+    link changes), /indices and the research pages.
+    """
+    from src.geri.geri_history_service import get_adjacent_dates
+
+    prev = get_adjacent_dates(target_date.isoformat()).get('prev')
+    previous_date = datetime.strptime(prev, '%Y-%m-%d').date() if prev else None
+
+    paths = affected_paths(target_date, previous_date)
+    logger.info(f"Prerendering {len(paths)} pages affected by {target_date.isoformat()}")
+    return prerender_paths(paths, dry_run=dry_run)
+
+
+def prerender_live_pages(dry_run: bool = False) -> dict:
+    """Refresh /indices and the research pages, which show the latest EERI, EGSI and market values."""
+    logger.info(f"Prerendering {len(LIVE_PATHS)} live-data pages")
+    return prerender_paths(LIVE_PATHS, dry_run=dry_run)
+
+
+def prerender_all(force: bool = False, dry_run: bool = False) -> dict:
+    """
+    Prerender the whole archive: every GERI day and month, every alerts
+    daily page and month, plus /indices and the research pages.
+
+    Without force, archive pages that already have a current-version
+    snapshot are left alone; /indices and research pages are always redone.
+    """
+    from src.geri.geri_history_service import get_all_snapshot_dates
+
+    if not dry_run:
+        removed = delete_stale_snapshots()
+        if removed:
+            logger.info(f"Removed {removed} snapshots from older template versions")
+
+    geri_dates = [datetime.strptime(d, '%Y-%m-%d').date() for d in get_all_snapshot_dates()]
+    alert_dates = [
+        p['page_date'] if isinstance(p['page_date'], date) else datetime.fromisoformat(str(p['page_date'])).date()
+        for p in get_recent_daily_pages(limit=100000)
+    ]
+
+    archive_paths = []
+    archive_paths.extend(f"/geri/{d.isoformat()}" for d in geri_dates)
+    archive_paths.extend(sorted({month_path('/geri', d) for d in geri_dates}))
+    archive_paths.extend(f"/alerts/daily/{d.isoformat()}" for d in alert_dates)
+    archive_paths.extend(sorted({month_path('/alerts', d) for d in alert_dates}))
+
+    if not force and not dry_run:
+        existing = set(list_snapshot_paths())
+        archive_paths = [p for p in archive_paths if p not in existing]
+
+    paths = archive_paths + LIVE_PATHS
+    logger.info(f"Prerendering {len(paths)} pages (force={force})")
+    return prerender_paths(paths, dry_run=dry_run)
@@ -6,6 +6,8 @@ Usage:
     python -m src.seo.runner --date 2026-01-15
     python -m src.seo.runner --rebuild-sitemaps
     python -m src.seo.runner --dry-run --date 2026-01-15
+    python -m src.seo.runner --prerender --date 2026-01-15
+    python -m src.seo.runner --prerender-all [--force]
 """
 
 import argparse
@@ -17,18 +19,19 @@ from datetime import datetime, date, timedelta
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.db.migrations import run_migrations
+from src.db.migrations import run_migrations, run_seo_tables_migration
 from src.seo.seo_generator import (
     get_yesterday_date,
     generate_daily_page_model,
     save_daily_page,
     get_daily_page,
-    generate_sitemap_entries,
     get_available_months,
     get_recent_daily_pages,
     generate_and_save_regional_daily_page,
     REGION_DISPLAY_NAMES,
 )
+from src.seo.prerender import prerender_for_date, prerender_all
+from src.seo.sitemap_generator import regenerate_sitemaps
 
 logging.basicConfig(
     level=os.environ.get('LOG_LEVEL', 'INFO'),
@@ -144,28 +147,16 @@ def generate_regional_pages(target_date: date, dry_run: bool = False) -> list:
 
 
 def rebuild_sitemaps(dry_run: bool = False) -> dict:
-    """Rebuild sitemap.xml entries."""
+    """Regenerate the sharded sitemap files; only changed shards are rewritten."""
     logger.info("Rebuilding sitemaps...")
     
-    entries = generate_sitemap_entries()
+    summary = regenerate_sitemaps(dry_run=dry_run)
     
-    logger.info(f"Generated {len(entries)} sitemap entries")
-    
-    if dry_run:
-        logger.info("[DRY RUN] Sitemap entries:")
-        for e in entries[:10]:
-            logger.info(f"  {e['loc']} (priority={e['priority']})")
-        if len(entries) > 10:
-            logger.info(f"  ... and {len(entries) - 10} more")
-        return {
-            'status': 'dry_run',
-            'entry_count': len(entries)
-        }
+    logger.info(f"Generated {summary['entry_count']} sitemap entries in {summary['files']} files")
     
     return {
-        'status': 'success',
-        'entry_count': len(entries),
-        'entries': entries
+        'status': 'dry_run' if dry_run else 'success',
+        **summary
     }
 
 
@@ -177,11 +168,24 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='Preview without saving')
     parser.add_argument('--backfill', type=int, help='Backfill N days of pages')
     parser.add_argument('--skip-regional', action='store_true', help='Skip regional page generation')
+    parser.add_argument('--prerender', action='store_true', help='Refresh page snapshots affected by the generated date')
+    parser.add_argument('--prerender-all', action='store_true', help='Prerender every archive page into the snapshot store')
+    parser.add_argument('--force', action='store_true', help='With --prerender-all, re-render pages that already have snapshots')
     
     args = parser.parse_args()
     
     run_migrations()
     run_seo_migration()
+    run_seo_tables_migration()
+    
+    if args.prerender_all:
+        results = {
+            'generated_at': datetime.utcnow().isoformat(),
+            'dry_run': args.dry_run,
+            'snapshots': prerender_all(force=args.force, dry_run=args.dry_run),
+        }
+        print(json.dumps(results, indent=2, default=str))
+        return results
     
     results = {
         'generated_at': datetime.utcnow().isoformat(),
@@ -223,6 +227,12 @@ def main():
     if args.rebuild_sitemaps or not args.date:
         results['sitemap'] = rebuild_sitemaps(dry_run=args.dry_run)
     
+    if args.prerender:
+        results['snapshots'] = [
+            prerender_for_date(datetime.strptime(p['date'], '%Y-%m-%d').date(), dry_run=args.dry_run)
+            for p in results['pages']
+        ]
+    
     print("\n" + "=" * 60)
     print("EnergyRiskIQ SEO Generator - Results")
     print("=" * 60)
@@ -791,25 +791,56 @@ def _date_to_str(d) -> str:
     return str(d)[:10]
 
 
-def generate_sitemap_core_entries() -> List[Dict]:
+SITEMAP_STATIC_LASTMOD = '2025-01-15'
+
+
+def get_sitemap_lastmods() -> Dict[str, str]:
+    """
+    Real content dates for sitemap lastmod, keyed by data source.
+
+    Index pages show 24h-delayed values, so their content changes on the
+    latest published (<= yesterday) date, not on every crawl. Sources with
+    no rows fall back to the generation date.
+    """
+    from src.geri.types import INDEX_ID as GERI_INDEX_ID
+    from src.reri.types import EERI_INDEX_ID
+
+    yesterday = get_yesterday_date()
+    row = execute_production_one("""
+    SELECT
+        (SELECT MAX(date) FROM intel_indices_daily WHERE index_id = %s AND date <= %s) AS geri,
+        (SELECT MAX(date) FROM reri_indices_daily WHERE index_id = %s AND date <= %s) AS eeri,
+        (SELECT MAX(index_date) FROM egsi_m_daily WHERE index_date <= %s) AS egsi,
+        (SELECT MAX(updated_at) FROM public_digest_pages) AS digest
+    """, (GERI_INDEX_ID, yesterday, EERI_INDEX_ID, yesterday, yesterday)) or {}
+
+    generated = date.today().isoformat()
+    lastmods = {'static': SITEMAP_STATIC_LASTMOD, 'generated': generated}
+    for key in ('geri', 'eeri', 'egsi', 'digest'):
+        lastmods[key] = _date_to_str(row[key])[:10] if row.get(key) else generated
+    lastmods['indices'] = max(lastmods['geri'], lastmods['eeri'], lastmods['egsi'])
+    return lastmods
+
+
+def generate_sitemap_core_entries(lastmods: Optional[Dict[str, str]] = None) -> List[Dict]:
     """Core authority pages only (~10-30 URLs). High-value, stable pages."""
-    from datetime import date as _date
-    today = _date.today().isoformat()
-    static_lastmod = '2025-01-15'
+    if lastmods is None:
+        lastmods = get_sitemap_lastmods()
+    static_lastmod = lastmods['static']
 
     entries = [
-        {'loc': '/', 'priority': '0.8', 'changefreq': 'weekly', 'lastmod': today},
-        {'loc': '/indices/global-energy-risk-index', 'priority': '0.8', 'changefreq': 'weekly', 'lastmod': today},
-        {'loc': '/geri/methodology', 'priority': '0.7', 'changefreq': 'monthly', 'lastmod': today},
-        {'loc': '/why-geri', 'priority': '0.7', 'changefreq': 'monthly', 'lastmod': today},
-        {'loc': '/indices/europe-energy-risk-index', 'priority': '0.8', 'changefreq': 'weekly', 'lastmod': today},
-        {'loc': '/eeri/methodology', 'priority': '0.7', 'changefreq': 'monthly', 'lastmod': today},
-        {'loc': '/egsi', 'priority': '0.8', 'changefreq': 'weekly', 'lastmod': today},
-        {'loc': '/egsi/methodology', 'priority': '0.7', 'changefreq': 'monthly', 'lastmod': today},
-        {'loc': '/daily-geo-energy-intelligence-digest', 'priority': '0.7', 'changefreq': 'weekly', 'lastmod': today},
-        {'loc': '/daily-geo-energy-intelligence-digest/history', 'priority': '0.6', 'changefreq': 'weekly', 'lastmod': today},
-        {'loc': '/blog', 'priority': '0.6', 'changefreq': 'weekly', 'lastmod': today},
-        {'loc': '/users', 'priority': '0.6', 'changefreq': 'monthly', 'lastmod': today},
+        {'loc': '/', 'priority': '0.8', 'changefreq': 'weekly', 'lastmod': lastmods['indices']},
+        {'loc': '/indices/global-energy-risk-index', 'priority': '0.8', 'changefreq': 'weekly', 'lastmod': lastmods['geri']},
+        {'loc': '/geri/methodology', 'priority': '0.7', 'changefreq': 'monthly', 'lastmod': static_lastmod},
+        {'loc': '/why-geri', 'priority': '0.7', 'changefreq': 'monthly', 'lastmod': static_lastmod},
+        {'loc': '/indices/europe-energy-risk-index', 'priority': '0.8', 'changefreq': 'weekly', 'lastmod': lastmods['eeri']},
+        {'loc': '/eeri/methodology', 'priority': '0.7', 'changefreq': 'monthly', 'lastmod': static_lastmod},
+        {'loc': '/egsi', 'priority': '0.8', 'changefreq': 'weekly', 'lastmod': lastmods['egsi']},
+        {'loc': '/egsi/methodology', 'priority': '0.7', 'changefreq': 'monthly', 'lastmod': static_lastmod},
+        {'loc': '/daily-geo-energy-intelligence-digest', 'priority': '0.7', 'changefreq': 'weekly', 'lastmod': lastmods['digest']},
+        {'loc': '/daily-geo-energy-intelligence-digest/history', 'priority': '0.6', 'changefreq': 'weekly', 'lastmod': lastmods['digest']},
+        {'loc': '/blog', 'priority': '0.6', 'changefreq': 'weekly', 'lastmod': lastmods['generated']},
+        {'loc': '/users', 'priority': '0.6', 'changefreq': 'monthly', 'lastmod': static_lastmod},
         {'loc': '/privacy', 'priority': '0.3', 'changefreq': 'yearly', 'lastmod': static_lastmod},
         {'loc': '/terms', 'priority': '0.3', 'changefreq': 'yearly', 'lastmod': static_lastmod},
         {'loc': '/disclaimer', 'priority': '0.3', 'changefreq': 'yearly', 'lastmod': static_lastmod},
@@ -832,14 +863,48 @@ def generate_sitemap_indices_entries(limit: int = 60) -> List[Dict]:
     return []
 
 
+def generate_sitemap_index_hub_entries(lastmods: Optional[Dict[str, str]] = None) -> List[Dict]:
+    """Public index hub pages (the /indices tree, not the gated snapshots)."""
+    if lastmods is None:
+        lastmods = get_sitemap_lastmods()
+    return [
+        {'loc': '/indices', 'changefreq': 'weekly', 'priority': '0.9', 'lastmod': lastmods['indices']},
+        {'loc': '/indices/global-energy-risk-index', 'changefreq': 'daily', 'priority': '0.9', 'lastmod': lastmods['geri']},
+        {'loc': '/indices/european-energy-risk-index', 'changefreq': 'daily', 'priority': '0.9', 'lastmod': lastmods['eeri']},
+        {'loc': '/indices/europe-gas-stress-index', 'changefreq': 'daily', 'priority': '0.9', 'lastmod': lastmods['egsi']},
+    ]
+
+
+def generate_sitemap_research_entries(lastmods: Optional[Dict[str, str]] = None) -> List[Dict]:
+    """Research and data pages. Market data pages change with each daily capture."""
+    if lastmods is None:
+        lastmods = get_sitemap_lastmods()
+    daily = lastmods['generated']
+    return [
+        {'loc': '/research/what-drives-lng-prices', 'changefreq': 'daily', 'priority': '0.9', 'lastmod': daily},
+        {'loc': '/research/global-energy-risk-index', 'changefreq': 'monthly', 'priority': '0.8', 'lastmod': lastmods['geri']},
+        {'loc': '/research/global-energy-risk-timeline', 'changefreq': 'monthly', 'priority': '0.8', 'lastmod': lastmods['indices']},
+        {'loc': '/data/energy-risk-snapshot', 'changefreq': 'daily', 'priority': '0.9', 'lastmod': lastmods['indices']},
+        {'loc': '/data/global-energy-risk-forecast', 'changefreq': 'daily', 'priority': '0.9', 'lastmod': lastmods['geri']},
+        {'loc': '/data/europe-lng-supply-demand', 'changefreq': 'daily', 'priority': '0.9', 'lastmod': daily},
+        {'loc': '/data/jkm-lng-spot-price', 'changefreq': 'daily', 'priority': '0.9', 'lastmod': daily},
+        {'loc': '/data/ttf-gas-price-today', 'changefreq': 'daily', 'priority': '0.9', 'lastmod': daily},
+        {'loc': '/gas-storage-levels-in-europe', 'changefreq': 'daily', 'priority': '0.9', 'lastmod': daily},
+        {'loc': '/gas-storage-levels-germany', 'changefreq': 'daily', 'priority': '0.9', 'lastmod': daily},
+        {'loc': '/data-license', 'changefreq': 'monthly', 'priority': '0.5', 'lastmod': lastmods['static']},
+    ]
+
+
 def generate_sitemap_digest_entries(limit: int = 60) -> List[Dict]:
-    """Daily digest pages - last N days only."""
+    """Daily digest pages - last N days only, lastmod from when each page was last written."""
     entries = []
     try:
-        from src.seo.digest_page_generator import get_public_digest_available_dates
-        digest_dates = get_public_digest_available_dates()
-        for dd in digest_dates[:limit]:
-            entries.append({'loc': f"/daily-geo-energy-intelligence-digest/{dd}", 'lastmod': _date_to_str(dd)})
+        from src.seo.digest_page_generator import get_public_digest_sitemap_rows
+        for row in get_public_digest_sitemap_rows(limit):
+            entries.append({
+                'loc': f"/daily-geo-energy-intelligence-digest/{_date_to_str(row['page_date'])}",
+                'lastmod': _date_to_str(row.get('updated_at') or row['page_date'])[:10],
+            })
     except Exception:
         pass
     return entries
@@ -0,0 +1,171 @@
+"""
+Sitemap Generator
+
+Builds the XML sitemaps once per SEO run instead of on every crawler hit.
+Each sitemap family (core, indices, digest, research, alerts) is split into
+shards of at most MAX_URLS_PER_SHARD URLs; the first shard keeps the
+family's historical URL (/sitemap-core.xml), later shards are numbered
+(/sitemap-digest-2.xml). The sitemap index lists every non-empty shard
+with the newest lastmod of its entries.
+
+Files are stored in the page snapshot store (page_type 'sitemap'), so
+they are served gzip-precompressed with an ETag, and a regeneration only
+rewrites shards whose bytes actually changed.
+"""
+import logging
+import os
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = os.environ.get('ALERTS_APP_BASE_URL', 'https://energyriskiq.com')
+
+MAX_URLS_PER_SHARD = 50000
+SITEMAP_PAGE_TYPE = 'sitemap'
+SITEMAP_INDEX_PATHS = ['/sitemap.xml', '/sitemap-index.xml']
+SITEMAP_HTML_PATH = '/sitemap.html'
+
+SITEMAP_FAMILIES = ['core', 'indices', 'digest', 'research', 'alerts']
+
+# Served by other routers; listed in the index but not generated here.
+EXTERNAL_SITEMAPS = ['/sitemap-data.xml']
+
+
+def shard_path(family: str, shard: int) -> str:
+    if shard == 1:
+        return f"/sitemap-{family}.xml"
+    return f"/sitemap-{family}-{shard}.xml"
+
+
+def shard_entries(entries: List[Dict], max_urls: int = MAX_URLS_PER_SHARD) -> List[List[Dict]]:
+    """Split entries into shards; an empty family still yields one empty shard."""
+    if not entries:
+        return [[]]
+    return [entries[i:i + max_urls] for i in range(0, len(entries), max_urls)]
+
+
+def render_urlset_xml(entries: List[Dict], base_url: str) -> str:
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n']
+    for e in entries:
+        parts.append(f"    <url>\n        <loc>{escape(base_url + e['loc'])}</loc>\n")
+        if e.get('lastmod'):
+            parts.append(f"        <lastmod>{e['lastmod']}</lastmod>\n")
+        if e.get('priority'):
+            parts.append(f"        <priority>{e['priority']}</priority>\n")
+        if e.get('changefreq'):
+            parts.append(f"        <changefreq>{e['changefreq']}</changefreq>\n")
+        parts.append("    </url>\n")
+    parts.append('</urlset>')
+    return ''.join(parts)
+
+
+def render_sitemap_index_xml(sitemaps: List[Tuple[str, Optional[str]]], base_url: str) -> str:
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n']
+    for path, lastmod in sitemaps:
+        parts.append(f"    <sitemap>\n        <loc>{escape(base_url + path)}</loc>\n")
+        if lastmod:
+            parts.append(f"        <lastmod>{lastmod}</lastmod>\n")
+        parts.append("    </sitemap>\n")
+    parts.append('</sitemapindex>')
+    return ''.join(parts)
+
+
+def build_sitemap_files(
+    families: Dict[str, List[Dict]],
+    base_url: str,
+    generated_on: Optional[str] = None,
+    max_urls: int = MAX_URLS_PER_SHARD,
+) -> Dict[str, str]:
+    """
+    Render every shard plus the index. Returns {path: xml}.
+
+    Empty families still get their first shard (an empty urlset) so their
+    historical URL keeps answering 200, but are left out of the index.
+    """
+    generated_on = generated_on or date.today().isoformat()
+    files: Dict[str, str] = {}
+    index_entries: List[Tuple[str, Optional[str]]] = []
+
+    for family in SITEMAP_FAMILIES:
+        entries = families.get(family, [])
+        for number, shard in enumerate(shard_entries(entries, max_urls), start=1):
+            path = shard_path(family, number)
+            files[path] = render_urlset_xml(shard, base_url)
+            if shard:
+                lastmods = [e['lastmod'] for e in shard if e.get('lastmod')]
+                index_entries.append((path, max(lastmods) if lastmods else generated_on))
+
+    for path in EXTERNAL_SITEMAPS:
+        index_entries.append((path, generated_on))
+
+    index_xml = render_sitemap_index_xml(index_entries, base_url)
+    for path in SITEMAP_INDEX_PATHS:
+        files[path] = index_xml
+    return files
+
+
+def collect_sitemap_entries() -> Dict[str, List[Dict]]:
+    """Query every family's entries, sharing one lastmod lookup."""
+    from src.seo.seo_generator import (
+        get_sitemap_lastmods,
+        generate_sitemap_core_entries,
+        generate_sitemap_alerts_entries,
+        generate_sitemap_digest_entries,
+        generate_sitemap_index_hub_entries,
+        generate_sitemap_research_entries,
+    )
+
+    lastmods = get_sitemap_lastmods()
+    return {
+        'core': generate_sitemap_core_entries(lastmods),
+        'indices': generate_sitemap_index_hub_entries(lastmods),
+        'digest': generate_sitemap_digest_entries(limit=60),
+        'research': generate_sitemap_research_entries(lastmods),
+        'alerts': generate_sitemap_alerts_entries(limit=60),
+    }
+
+
+def render_sitemap_file(path: str, base_url: str) -> Optional[str]:
+    """Live fallback for one sitemap path when the store has no copy."""
+    return build_sitemap_files(collect_sitemap_entries(), base_url).get(path)
+
+
+def regenerate_sitemaps(base_url: str = BASE_URL, dry_run: bool = False) -> dict:
+    """
+    Rebuild all sitemap files and store the ones that changed.
+
+    Also refreshes the HTML sitemap and drops stored shards that are no
+    longer produced (e.g. after a family shrinks below a shard boundary).
+    """
+    from src.seo.snapshot_store import save_snapshot, delete_snapshots_except
+
+    families = collect_sitemap_entries()
+    files = build_sitemap_files(families, base_url)
+
+    from src.api.seo_routes import render_sitemap_html
+    files[SITEMAP_HTML_PATH] = render_sitemap_html()
+
+    summary = {
+        'entry_count': sum(len(entries) for entries in families.values()),
+        'files': len(files),
+        'changed': [],
+        'removed': 0,
+    }
+    if dry_run:
+        logger.info(f"[DRY RUN] Would store {len(files)} sitemap files")
+        return summary
+
+    for path, body in files.items():
+        if save_snapshot(path, SITEMAP_PAGE_TYPE, body):
+            summary['changed'].append(path)
+    summary['removed'] = delete_snapshots_except(SITEMAP_PAGE_TYPE, list(files))
+
+    logger.info(
+        f"Sitemaps: {summary['entry_count']} URLs in {len(files)} files, "
+        f"{len(summary['changed'])} changed, {summary['removed']} removed"
+    )
+    return summary
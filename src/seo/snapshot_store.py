@@ -0,0 +1,338 @@
+"""
+SEO Page Snapshot Store
+
+Prerendered HTML for the SEO page tree (GERI daily/monthly archives, alerts
+daily/monthly archives, /indices and the research pages), stored
+gzip-compressed in seo_page_snapshots with a precomputed ETag.
+
+Handlers keep their gating, anti-scraping and view tracking, then await
+serve_snapshot() and fall back to live rendering when it returns None.
+Snapshots are written only by src/seo/runner.py (--prerender /
+--prerender-all) and the internal SEO/GERI jobs, never on the request path.
+
+Generated sitemap files are stored here too (page_type 'sitemap', see
+src/seo/sitemap_generator.py).
+
+Every snapshot is stamped with RENDER_VERSION, a hash of the template
+sources, so a deploy that changes page markup stops serving old snapshots
+until the runner renders them again.
+"""
+import gzip
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional, List, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TEMPLATE_SOURCES = [
+    os.path.join(_SRC_DIR, 'api', 'seo_routes.py'),
+    os.path.join(_SRC_DIR, 'seo', 'seo_generator.py'),
+    os.path.join(_SRC_DIR, 'utils', 'contextual_linking.py'),
+]
+
+MEMORY_CACHE_SIZE = 256
+MEMORY_CACHE_TTL_SECONDS = 300
+
+RESEARCH_PATHS = [
+    '/research/global-energy-risk-index',
+    '/research/global-energy-risk-timeline',
+]
+
+# Pages that embed the latest EERI, EGSI and market values rather than one
+# day's archive; they are re-prerendered whenever any of those indices lands.
+LIVE_PATHS = ['/indices'] + RESEARCH_PATHS
+
+
+@dataclass
+class PageSnapshot:
+    """A stored, gzip-compressed rendering of one page."""
+    path: str
+    page_type: str
+    body_gzip: bytes
+    etag: str
+
+    @property
+    def html(self) -> str:
+        return gzip.decompress(self.body_gzip).decode('utf-8')
+
+
+def _compute_render_version() -> str:
+    digest = hashlib.sha256()
+    for source in TEMPLATE_SOURCES:
+        try:
+            with open(source, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(source.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+RENDER_VERSION = _compute_render_version()
+
+
+def encode_snapshot(html: str) -> Tuple[bytes, str]:
+    """
+    Compress HTML and derive its strong ETag.
+
+    gzip mtime is pinned so identical HTML always yields identical bytes.
+    """
+    raw = html.encode('utf-8')
+    etag = f'"{hashlib.sha256(raw).hexdigest()[:32]}"'
+    return gzip.compress(raw, compresslevel=9, mtime=0), etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value covers the given ETag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == '*' or candidate == etag:
+            return True
+    return False
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """True if an Accept-Encoding header value allows gzip (q > 0)."""
+    if not accept_encoding:
+        return False
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        if coding.strip().lower() not in ('gzip', '*'):
+            continue
+        params = params.strip().replace(' ', '')
+        if params.startswith('q='):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def month_path(prefix: str, day: date) -> str:
+    return f"{prefix}/{day.year}/{day.month:02d}"
+
+
+def affected_paths(new_date: date, previous_date: Optional[date] = None) -> List[str]:
+    """
+    Pages whose HTML changes when GERI and the alerts page for new_date land.
+
+    previous_date is the latest GERI date before new_date; its page gains a
+    "next" link, and if it sits in an earlier month that month's archive
+    gains a "next month" link.
+    """
+    paths = [
+        f"/geri/{new_date.isoformat()}",
+        month_path('/geri', new_date),
+        f"/alerts/daily/{new_date.isoformat()}",
+        month_path('/alerts', new_date),
+    ]
+    if previous_date:
+        paths.append(f"/geri/{previous_date.isoformat()}")
+        if (previous_date.year, previous_date.month) != (new_date.year, new_date.month):
+            paths.append(month_path('/geri', previous_date))
+    paths.extend(LIVE_PATHS)
+    return paths
+
+
+class _MemoryCache:
+    """Small LRU of recently served snapshots, bounded in size and age."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._entries: "OrderedDict[str, Tuple[float, PageSnapshot]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Optional[PageSnapshot]:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return None
+            stored_at, snapshot = entry
+            if time.monotonic() - stored_at > self._ttl:
+                del self._entries[path]
+                return None
+            self._entries.move_to_end(path)
+            return snapshot
+
+    def put(self, snapshot: PageSnapshot) -> None:
+        with self._lock:
+            self._entries[snapshot.path] = (time.monotonic(), snapshot)
+            self._entries.move_to_end(snapshot.path)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, path: str) -> None:
+        with self._lock:
+            self._entries.pop(path, None)
+
+
+_memory_cache = _MemoryCache(MEMORY_CACHE_SIZE, MEMORY_CACHE_TTL_SECONDS)
+
+
+def get_snapshot(path: str) -> Optional[PageSnapshot]:
+    """Fetch the current-version snapshot for a path, or None."""
+    cached = _memory_cache.get(path)
+    if cached is not None:
+        return cached
+
+    from src.db.db import execute_one
+
+    row = execute_one("""
+        SELECT path, page_type, body, etag
+        FROM seo_page_snapshots
+        WHERE path = %s AND render_version = %s
+    """, (path, RENDER_VERSION))
+    if not row:
+        return None
+
+    snapshot = PageSnapshot(
+        path=row['path'],
+        page_type=row['page_type'],
+        body_gzip=bytes(row['body']),
+        etag=row['etag'],
+    )
+    _memory_cache.put(snapshot)
+    return snapshot
+
+
+def save_snapshot(path: str, page_type: str, html: str, source_date: Optional[date] = None) -> bool:
+    """
+    Store a rendered page. Returns True if the stored body changed.
+
+    An unchanged body at the current render version is left alone so
+    generated_at keeps pointing at the last real change.
+    """
+    from psycopg2 import Binary
+    from src.db.db import get_cursor
+
+    body, etag = encode_snapshot(html)
+    with get_cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO seo_page_snapshots
+                (path, page_type, body, etag, render_version, source_date, generated_at)
+            VALUES (%s, %s, %s, %s, %s, %s, NOW())
+            ON CONFLICT (path) DO UPDATE SET
+                page_type = EXCLUDED.page_type,
+                body = EXCLUDED.body,
+                etag = EXCLUDED.etag,
+                render_version = EXCLUDED.render_version,
+                source_date = EXCLUDED.source_date,
+                generated_at = NOW()
+            WHERE seo_page_snapshots.etag IS DISTINCT FROM EXCLUDED.etag
+               OR seo_page_snapshots.render_version IS DISTINCT FROM EXCLUDED.render_version
+            RETURNING path
+        """, (path, page_type, Binary(body), etag, RENDER_VERSION, source_date))
+        changed = cursor.fetchone() is not None
+
+    _memory_cache.discard(path)
+    return changed
+
+
+def list_snapshot_paths(page_type: Optional[str] = None) -> List[str]:
+    """Paths that already have a current-version snapshot."""
+    from src.db.db import execute_query
+
+    if page_type:
+        rows = execute_query("""
+            SELECT path FROM seo_page_snapshots
+            WHERE render_version = %s AND page_type = %s
+        """, (RENDER_VERSION, page_type))
+    else:
+        rows = execute_query("""
+            SELECT path FROM seo_page_snapshots WHERE render_version = %s
+        """, (RENDER_VERSION,))
+    return [row['path'] for row in rows or []]
+
+
+def delete_stale_snapshots() -> int:
+    """Remove snapshots rendered by older template versions."""
+    from src.db.db import get_cursor
+
+    with get_cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM seo_page_snapshots WHERE render_version <> %s",
+            (RENDER_VERSION,)
+        )
+        return cursor.rowcount
+
+
+def delete_snapshots_except(page_type: str, keep_paths: List[str]) -> int:
+    """Remove snapshots of a page type whose path is no longer produced."""
+    from src.db.db import get_cursor
+
+    with get_cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM seo_page_snapshots WHERE page_type = %s AND NOT (path = ANY(%s))",
+            (page_type, list(keep_paths))
+        )
+        removed = cursor.rowcount
+    for path in list(keep_paths):
+        _memory_cache.discard(path)
+    return removed
+
+
+def snapshot_response(
+    request,
+    snapshot: PageSnapshot,
+    headers: Optional[Dict[str, str]] = None,
+    media_type: str = 'text/html',
+):
+    """
+    Build the HTTP response for a stored snapshot.
+
+    Answers 304 when If-None-Match matches, sends the stored gzip bytes
+    as-is to clients that accept gzip and decompresses for the rest.
+    """
+    from fastapi.responses import Response
+
+    response_headers = dict(headers or {})
+    response_headers['ETag'] = snapshot.etag
+    response_headers['Vary'] = 'Accept-Encoding'
+
+    if etag_matches(request.headers.get('if-none-match'), snapshot.etag):
+        return Response(status_code=304, headers=response_headers)
+
+    if accepts_gzip(request.headers.get('accept-encoding')):
+        response_headers['Content-Encoding'] = 'gzip'
+        return Response(content=snapshot.body_gzip, media_type=media_type, headers=response_headers)
+
+    return Response(content=snapshot.html, media_type=media_type, headers=response_headers)
+
+
+async def serve_snapshot(
+    request,
+    path: str,
+    headers: Optional[Dict[str, str]] = None,
+    media_type: str = 'text/html',
+):
+    """
+    Response for a stored snapshot of path, or None to render live.
+
+    Memory-cache hits are answered on the event loop; store lookups run on
+    the DB thread pool. Store errors are logged and treated as a miss so a
+    snapshot outage never takes the page down.
+    """
+    try:
+        snapshot = _memory_cache.get(path)
+        if snapshot is None:
+            from src.db.async_db import run_db
+            snapshot = await run_db(get_snapshot, path)
+    except Exception as e:
+        logger.warning(f"Snapshot lookup failed for {path}: {e}")
+        return None
+    if snapshot is None:
+        return None
+    return snapshot_response(request, snapshot, headers, media_type)
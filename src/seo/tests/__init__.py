@@ -0,0 +1 @@
+"""SEO Tests"""
@@ -0,0 +1,106 @@
+"""
+Unit tests for the in-memory history date index.
+"""
+from datetime import date
+from decimal import Decimal
+
+from src.geri.types import INDEX_ID as GERI_INDEX_ID
+from src.reri.types import EERI_INDEX_ID
+from src.seo.history_index import DateIndex, HistoryIndex, avg_numeric
+
+ROWS = [
+    ('2026-01-30', 40), ('2026-01-31', 42), ('2026-02-02', 50),
+    ('2026-02-02', 51), ('2026-02-10', None), ('2026-03-01', 60),
+]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _history(rows=ROWS, ttl=60):
+    calls = []
+
+    def loader(table):
+        calls.append(table.index_id)
+        return list(rows)
+
+    return HistoryIndex(loader=loader, ttl=ttl, snapshot_cache_size=2, clock=Clock()), calls
+
+
+def test_adjacency_and_date_lists():
+    index = DateIndex(reversed(ROWS))
+    assert index.adjacent('2026-02-02') == (date(2026, 1, 31), date(2026, 2, 10))
+    assert index.adjacent(date(2026, 2, 5)) == (date(2026, 2, 2), date(2026, 2, 10))
+    assert index.adjacent('2026-01-30') == (None, date(2026, 1, 31))
+    assert index.adjacent('2026-03-01') == (date(2026, 2, 10), None)
+    assert '2026-02-02' in index and '2026-02-03' not in index
+    assert index.dates_desc(until=date(2026, 2, 9)) == [date(2026, 2, 2), date(2026, 1, 31), date(2026, 1, 30)]
+    assert index.latest(until=date(2026, 2, 28)) == date(2026, 2, 10)
+    assert index.between('2026-01-31', '2026-02-10') == [date(2026, 1, 31), date(2026, 2, 2), date(2026, 2, 10)]
+
+
+def test_months_match_group_by_semantics():
+    index = DateIndex(ROWS)
+    summaries = index.month_summaries(until=date(2026, 2, 5))
+    assert [(m['year'], m['month'], m['count']) for m in summaries] == [(2026, 2, 2), (2026, 1, 2)]
+    assert summaries[0]['min_date'] == summaries[0]['max_date'] == date(2026, 2, 2)
+    assert index.month_values(2026, 2) == [50, 51, None]
+    assert index.month_values(2025, 12) == []
+    assert index.month_dates(2026, 2) == [date(2026, 2, 2), date(2026, 2, 10)]
+    assert index.adjacent_months(2026, 2) == ((2026, 1), (2026, 3))
+    assert index.adjacent_months(2026, 3) == ((2026, 2), None)
+
+
+def test_avg_numeric_rounds_half_away_from_zero():
+    assert avg_numeric([1, 2]) == Decimal('1.50')
+    assert avg_numeric([0.125]) == Decimal('0.13')
+    assert avg_numeric([-0.125]) == Decimal('-0.13')
+    assert avg_numeric([]) is None
+
+
+def test_index_is_cached_until_ttl_or_invalidate():
+    history, calls = _history()
+    assert history.get(GERI_INDEX_ID) is history.get(GERI_INDEX_ID)
+    history.clock.now = 61
+    history.get(GERI_INDEX_ID)
+    history.invalidate(EERI_INDEX_ID)
+    history.get(GERI_INDEX_ID)
+    history.invalidate(GERI_INDEX_ID)
+    history.get(GERI_INDEX_ID)
+    assert calls == [GERI_INDEX_ID] * 3
+
+
+def test_invalidate_clears_memoized_snapshots_and_rejects_stale_ones():
+    history, _ = _history()
+    history.remember_snapshot(GERI_INDEX_ID, '2026-02-02', {'value': 50})
+    history.remember_snapshot(EERI_INDEX_ID, date(2026, 2, 2), {'value': 7})
+    assert history.cached_snapshot(GERI_INDEX_ID, date(2026, 2, 2)) == {'value': 50}
+
+    generation = history.generation(GERI_INDEX_ID)
+    history.invalidate(GERI_INDEX_ID)
+    assert history.cached_snapshot(GERI_INDEX_ID, '2026-02-02') is None
+    assert history.cached_snapshot(EERI_INDEX_ID, '2026-02-02') == {'value': 7}
+
+    history.remember_snapshot(GERI_INDEX_ID, '2026-02-02', {'value': 'stale'}, generation)
+    assert history.cached_snapshot(GERI_INDEX_ID, '2026-02-02') is None
+
+    for day in ('2026-01-30', '2026-01-31'):
+        history.remember_snapshot(GERI_INDEX_ID, day, {'day': day})
+    assert history.stats()['snapshots'] == 2
+    assert history.cached_snapshot(EERI_INDEX_ID, '2026-02-02') is None
+
+
+def test_memoized_snapshots_expire_on_the_index_ttl():
+    history, _ = _history(ttl=60)
+    history.remember_snapshot(GERI_INDEX_ID, '2026-02-02', {'value': 50})
+    history.clock.now = 59
+    assert history.cached_snapshot(GERI_INDEX_ID, '2026-02-02') == {'value': 50}
+    # a recompute in another process is only visible once the entry expires
+    history.clock.now = 60
+    assert history.cached_snapshot(GERI_INDEX_ID, '2026-02-02') is None
+    assert history.stats()['snapshots'] == 0
@@ -0,0 +1,70 @@
+"""
+Unit tests for sitemap sharding and XML rendering.
+"""
+import re
+import xml.etree.ElementTree as ET
+
+from src.seo.sitemap_generator import (
+    shard_entries,
+    shard_path,
+    render_urlset_xml,
+    build_sitemap_files,
+)
+
+NS = {'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+BASE = 'https://example.com'
+
+
+def _entries(n, prefix='/daily-geo-energy-intelligence-digest'):
+    return [{'loc': f"{prefix}/2025-01-{i:05d}", 'lastmod': f"2025-{1 + i % 12:02d}-01"} for i in range(n)]
+
+
+def test_shard_entries_boundaries():
+    assert shard_entries([], 3) == [[]]
+    assert [len(s) for s in shard_entries(_entries(3), 3)] == [3]
+    assert [len(s) for s in shard_entries(_entries(7), 3)] == [3, 3, 1]
+
+
+def test_shard_paths_keep_historical_first_url():
+    assert shard_path('digest', 1) == '/sitemap-digest.xml'
+    assert shard_path('digest', 3) == '/sitemap-digest-3.xml'
+
+
+def test_urlset_is_valid_xml_and_escaped():
+    xml = render_urlset_xml([{'loc': '/a?x=1&y=2', 'lastmod': '2025-01-02', 'priority': '0.5'}], BASE)
+    root = ET.fromstring(xml)
+    urls = root.findall('sm:url', NS)
+    assert len(urls) == 1
+    assert urls[0].find('sm:loc', NS).text == f"{BASE}/a?x=1&y=2"
+    assert urls[0].find('sm:lastmod', NS).text == '2025-01-02'
+
+
+def test_build_files_shards_and_index():
+    families = {
+        'core': [{'loc': '/', 'lastmod': '2025-03-01'}],
+        'digest': _entries(5),
+        'alerts': [],
+    }
+    files = build_sitemap_files(families, BASE, generated_on='2025-06-30', max_urls=2)
+
+    assert {'/sitemap-digest.xml', '/sitemap-digest-2.xml', '/sitemap-digest-3.xml'} <= set(files)
+    assert '/sitemap-digest-4.xml' not in files
+    # Empty family keeps its URL but is not advertised in the index
+    assert '/sitemap-alerts.xml' in files
+    assert files['/sitemap.xml'] == files['/sitemap-index.xml']
+
+    index = ET.fromstring(files['/sitemap.xml'])
+    listed = {
+        s.find('sm:loc', NS).text[len(BASE):]: s.find('sm:lastmod', NS).text
+        for s in index.findall('sm:sitemap', NS)
+    }
+    assert '/sitemap-alerts.xml' not in listed
+    assert listed['/sitemap-core.xml'] == '2025-03-01'
+    assert listed['/sitemap-digest.xml'] == max(e['lastmod'] for e in _entries(5)[:2])
+    assert listed['/sitemap-data.xml'] == '2025-06-30'
+
+    total = sum(
+        len(ET.fromstring(files[p]).findall('sm:url', NS))
+        for p in files if re.match(r'^/sitemap-digest(-\d+)?\.xml$', p)
+    )
+    assert total == 5
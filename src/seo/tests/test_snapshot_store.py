@@ -0,0 +1,74 @@
+"""
+Unit tests for the SEO page snapshot store helpers.
+"""
+import gzip
+from datetime import date
+
+from src.seo.snapshot_store import (
+    PageSnapshot,
+    encode_snapshot,
+    etag_matches,
+    accepts_gzip,
+    affected_paths,
+    LIVE_PATHS,
+    RESEARCH_PATHS,
+)
+
+
+def test_encode_snapshot_roundtrip_and_stable():
+    html = "<html><body>GERI 2026-01-15 — 42 ELEVATED</body></html>"
+    body, etag = encode_snapshot(html)
+    body_again, etag_again = encode_snapshot(html)
+
+    assert gzip.decompress(body).decode('utf-8') == html
+    assert body == body_again
+    assert etag == etag_again
+    assert etag.startswith('"') and etag.endswith('"')
+    assert encode_snapshot(html + " ")[1] != etag
+    assert PageSnapshot('/geri/2026-01-15', 'geri_daily', body, etag).html == html
+
+
+def test_etag_matches():
+    etag = '"abc"'
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('"x", W/"abc"', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches('"abd"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_accepts_gzip():
+    assert accepts_gzip('gzip, deflate, br')
+    assert accepts_gzip('br;q=1.0, gzip;q=0.8')
+    assert accepts_gzip('*')
+    assert not accepts_gzip('gzip;q=0')
+    assert not accepts_gzip('br, deflate')
+    assert not accepts_gzip(None)
+
+
+def test_affected_paths_same_month():
+    paths = affected_paths(date(2026, 1, 15), date(2026, 1, 14))
+    assert paths[:5] == [
+        '/geri/2026-01-15',
+        '/geri/2026/01',
+        '/alerts/daily/2026-01-15',
+        '/alerts/2026/01',
+        '/geri/2026-01-14',
+    ]
+    assert '/indices' in paths
+    assert len(paths) == len(set(paths))
+
+
+def test_affected_paths_month_boundary():
+    paths = affected_paths(date(2026, 2, 1), date(2026, 1, 31))
+    assert '/geri/2026/02' in paths
+    assert '/geri/2026/01' in paths
+    assert '/geri/2026-01-31' in paths
+
+    first = affected_paths(date(2026, 2, 1))
+    assert '/geri/2026/01' not in first
+
+
+def test_live_pages_are_refreshed_with_every_new_day():
+    assert LIVE_PATHS == ['/indices'] + RESEARCH_PATHS
+    assert set(LIVE_PATHS) <= set(affected_paths(date(2026, 2, 1)))